@@ -0,0 +1,32 @@
+-- ================================================================================================================================================
+--
+-- WORK LEASE TABLE (lease-based multi-instance distribution)
+--
+--	Required before running launch_parallel_instances.py --sharding lease (or production_processor.py --lease-run-id)
+--	against SQL Server. Create it in the contract's target_schema - the same schema as processing_log.
+--	The application only reads and updates this table; it never creates or drops it.
+--
+--	One row per app_id block of a run: pending -> leased (instance_id, lease_expires_at) -> done.
+--	Times are epoch seconds from the database clock (SYSUTCDATETIME) so instances on different hosts agree on expiry.
+--
+	CREATE TABLE dbo.work_lease (
+		run_id				varchar(64)		NOT NULL,
+		block_id			int				NOT NULL,
+		start_id			int				NOT NULL,
+		end_id				int				NOT NULL,
+		[status]			varchar(10)		NOT NULL CONSTRAINT DF_work_lease_status DEFAULT 'pending',
+		instance_id			varchar(64)		NULL,
+		lease_expires_at	float			NULL,
+		attempts			int				NOT NULL CONSTRAINT DF_work_lease_attempts DEFAULT 0,
+		claimed_at			float			NULL,
+		completed_at		float			NULL,
+		processed_count		int				NULL,
+		CONSTRAINT PK_work_lease PRIMARY KEY (run_id, block_id)
+	);
+
+	-- For other schemas (e.g. sandbox), replace dbo above:
+	-- CREATE TABLE sandbox.work_lease ( ... );
+
+--	Finished runs can be cleared manually once their results are checked:
+--	DELETE FROM dbo.work_lease WHERE run_id = '<run_id>';
+-- ================================================================================================================================================
@@ -24,8 +24,21 @@ Usage
 - Use local XML file instead of DB source fetch:
   python diagnostics/backfill_kv_rows.py --xml-file config/samples/sample-source-xml-contact-test.xml --apply
 
+- Range mode (every source app_id in LOW..HIGH; dry-run unless --apply):
+  python diagnostics/backfill_kv_rows.py --range 1:500000 --workers 8 --apply
+
+Range mode
+- Source XML is read in keyset chunks (--chunk-size apps) and mapped in a process pool.
+- Mapped KV rows are staged in #temp tables; missing rows are found with NOT EXISTS anti-joins
+  against the destination (and inserted with one INSERT ... SELECT per table and chunk, committed
+  per chunk). Value mismatches and extra destination rows are counted the same way.
+- Apps without a [target_schema].[app_base] row (not migrated yet) are skipped and reported; their
+  KV rows would violate the app_id foreign key and are not counted as missing.
+- One aggregated report for the whole range.
+
 Outputs
 - Writes a JSON report to metrics/kv_backfill_<app_id>_<timestamp>.json
+  (range mode: metrics/kv_backfill_range_<low>_<high>_<timestamp>.json)
 """
 
 from __future__ import annotations
@@ -33,9 +46,13 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import os
 import sys
-from dataclasses import dataclass
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from decimal import Decimal
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -81,10 +98,14 @@ def _load_contract_json(contract_path: Path) -> Dict[str, Any]:
     return json.loads(contract_path.read_text(encoding="utf-8-sig"))
 
 
+def _source_table_candidates(source_table: str) -> List[str]:
+    """Names to try for the source table, in order: dbo-qualified, then as given in the contract."""
+    return [f"dbo.{source_table}", source_table]
+
+
 def _fetch_source_xml_from_db(conn: pyodbc.Connection, source_table: str, source_column: str, app_id: int) -> Optional[str]:
     cursor = conn.cursor()
-    attempts = [f"dbo.{source_table}", source_table]
-    for table in attempts:
+    for table in _source_table_candidates(source_table):
         try:
             cursor.execute(f"SELECT {source_column} FROM {table} WITH (NOLOCK) WHERE app_id = ?", app_id)
             row = cursor.fetchone()
@@ -94,6 +115,19 @@ def _fetch_source_xml_from_db(conn: pyodbc.Connection, source_table: str, source
     return None
 
 
+def _resolve_source_table(conn: pyodbc.Connection, source_table: str, source_column: str) -> str:
+    """First of _source_table_candidates that can be read (the name _fetch_source_xml_from_db would use)."""
+    cursor = conn.cursor()
+    for table in _source_table_candidates(source_table):
+        try:
+            cursor.execute(f"SELECT TOP (0) app_id, {source_column} FROM {table} WITH (NOLOCK)")
+            cursor.fetchall()
+            return table
+        except Exception:
+            continue
+    raise RuntimeError(f"Source table not found: {' / '.join(_source_table_candidates(source_table))}")
+
+
 def _query_dest_kv_keys(conn: pyodbc.Connection, target_schema: str, app_id: int) -> Dict[str, Any]:
     cursor = conn.cursor()
     qualified = lambda t: f"[{target_schema}].[{t}]"
@@ -145,18 +179,27 @@ def _normalize_app_id(app_id: Any) -> int:
     return int(s)
 
 
+# Per-process (validator, parser, mapper), keyed by contract path; range-mode workers map many apps
+_COMPONENTS: Dict[str, Tuple[PreProcessingValidator, XMLParser, DataMapper]] = {}
+
+
+def _mapping_components(contract_path: Path) -> Tuple[PreProcessingValidator, XMLParser, DataMapper]:
+    key = str(contract_path)
+    if key not in _COMPONENTS:
+        _COMPONENTS[key] = (PreProcessingValidator(), XMLParser(), DataMapper(mapping_contract_path=key))
+    return _COMPONENTS[key]
+
+
 def _compute_mapper_kv_records(app_id: int, xml_content: str, contract_path: Path) -> Dict[str, List[Dict[str, Any]]]:
-    validator = PreProcessingValidator()
+    validator, parser, mapper = _mapping_components(contract_path)
     validation = validator.validate_xml_for_processing(xml_content, source_record_id="kv_backfill")
     if not validation.is_valid or not validation.can_process:
         errors = getattr(validation, "validation_errors", None) or []
         raise RuntimeError(f"XML failed pre-processing validation: {errors}")
 
-    parser = XMLParser()
     xml_root = parser.parse_xml_stream(xml_content)
     xml_data = parser.extract_elements(xml_root)
 
-    mapper = DataMapper(mapping_contract_path=str(contract_path))
     mapped = mapper.map_xml_to_database(xml_data, str(app_id), validation.valid_contacts, xml_root)
 
     return {t: list(mapped.get(t, [])) for t in KV_TABLES}
@@ -189,10 +232,324 @@ def _insert_missing(conn: pyodbc.Connection, target_schema: str, table: str, rec
     return cursor.rowcount if cursor.rowcount != -1 else len(records)
 
 
+# ---------------------------------------------------------------------------
+# Range mode: parallel mapping, set-based diff and insert
+# ---------------------------------------------------------------------------
+
+# Row identity and compared value columns per KV table (same keys as _record_key / _insert_missing)
+KV_KEY_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "scores": ("score_identifier",),
+    "indicators": ("indicator",),
+    "app_historical_lookup": ("name", "source"),
+    "app_report_results_lookup": ("name",),
+}
+KV_VALUE_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "scores": ("score",),
+    "indicators": ("value",),
+    "app_historical_lookup": ("value",),
+    "app_report_results_lookup": ("value", "source_report_key"),
+}
+# Key columns that may be NULL (matched with IS-equality; the rest use plain, index-friendly equality)
+KV_NULLABLE_KEYS = {"source"}
+# Staging column types (destination widths; scores staged as decimal so int/decimal scores compare)
+KV_STAGE_TYPES: Dict[str, str] = {
+    "score_identifier": "varchar(50)",
+    "score": "decimal(19, 4)",
+    "indicator": "varchar(100)",
+    "name": "varchar(100)",
+    "source": "varchar(50)",
+    "value": "varchar(250)",
+    "source_report_key": "varchar(20)",
+}
+MAX_EXAMPLES = 10
+
+
+def _kv_columns(table: str) -> Tuple[str, ...]:
+    return ("app_id",) + KV_KEY_COLUMNS[table] + KV_VALUE_COLUMNS[table]
+
+
+def _kv_stage_value(column: str, value: Any) -> Any:
+    if value is None:
+        return None
+    return Decimal(str(value)) if column == "score" else str(value)
+
+
+def map_kv_chunk(rows: List[Tuple[int, str]], contract_path: str) -> Dict[str, Any]:
+    """Pool worker: map a chunk of (app_id, xml) to staged KV tuples, per table in _kv_columns order."""
+    mapped_apps: List[int] = []
+    failed: List[Dict[str, Any]] = []
+    staged: Dict[str, List[Tuple[Any, ...]]] = {t: [] for t in KV_TABLES}
+    for app_id, xml_content in rows:
+        try:
+            records = _compute_mapper_kv_records(app_id, xml_content, Path(contract_path))
+        except Exception as e:
+            failed.append({"app_id": app_id, "error": str(e)[:300]})
+            continue
+        mapped_apps.append(app_id)
+        for table in KV_TABLES:
+            columns = _kv_columns(table)[1:]
+            seen = set()
+            for record in records.get(table, []):
+                # One staged row per destination key (first wins), as the per-app diff keys them
+                key = _record_key(table, record)
+                if key in seen:
+                    continue
+                seen.add(key)
+                staged[table].append((app_id,) + tuple(_kv_stage_value(c, record.get(c)) for c in columns))
+    return {"apps": len(rows), "mapped_apps": mapped_apps, "failed": failed, "staged": staged}
+
+
+@dataclass
+class RangeBackfillResult:
+    app_range: Tuple[int, int]
+    target_schema: str
+    xml_source: str
+    generated_at_utc: str
+    dry_run: bool
+
+    apps_scanned: int = 0
+    apps_mapped: int = 0
+    apps_failed: int = 0
+    apps_skipped: int = 0
+    elapsed_seconds: float = 0.0
+
+    mapped_counts: Dict[str, int] = field(default_factory=lambda: {t: 0 for t in KV_TABLES})
+    missing_counts: Dict[str, int] = field(default_factory=lambda: {t: 0 for t in KV_TABLES})
+    inserted_counts: Dict[str, int] = field(default_factory=lambda: {t: 0 for t in KV_TABLES})
+    mismatch_counts: Dict[str, int] = field(default_factory=lambda: {t: 0 for t in KV_TABLES})
+    extra_counts: Dict[str, int] = field(default_factory=lambda: {t: 0 for t in KV_TABLES})
+
+    missing_examples: Dict[str, List[Dict[str, Any]]] = field(default_factory=lambda: {t: [] for t in KV_TABLES})
+    failed_examples: List[Dict[str, Any]] = field(default_factory=list)
+    skipped_examples: List[int] = field(default_factory=list)
+
+
+def _create_kv_staging(cursor) -> None:
+    cursor.execute("IF OBJECT_ID('tempdb..#kv_apps') IS NOT NULL DROP TABLE #kv_apps")
+    cursor.execute("CREATE TABLE #kv_apps (app_id int NOT NULL PRIMARY KEY)")
+    for table in KV_TABLES:
+        # DATABASE_DEFAULT: compare with destination columns regardless of the tempdb collation
+        columns = ", ".join(
+            f"[{c}] {KV_STAGE_TYPES[c]}{' COLLATE DATABASE_DEFAULT' if 'char' in KV_STAGE_TYPES[c] else ''} NULL"
+            for c in _kv_columns(table)[1:]
+        )
+        cursor.execute(f"IF OBJECT_ID('tempdb..#kv_{table}') IS NOT NULL DROP TABLE #kv_{table}")
+        cursor.execute(f"CREATE TABLE #kv_{table} (app_id int NOT NULL, {columns})")
+
+
+def _null_safe_equal(left: str, right: str) -> str:
+    return f"EXISTS (SELECT {left} INTERSECT SELECT {right})"
+
+
+def _diff_kv_chunk(cursor, target_schema: str, table: str, apply: bool) -> Tuple[List[Tuple[Any, ...]], int, int]:
+    """Anti-join one staged table against the destination; insert the missing rows when applying.
+
+    Returns (missing rows as (app_id, keys...), value mismatch count, extra destination row count).
+    """
+    # Applying reads the destination under normal locking so the anti-join sees committed rows only
+    target = f"[{target_schema}].[{table}]"
+    hint = "" if apply else " WITH (NOLOCK)"
+    keys = KV_KEY_COLUMNS[table]
+    key_match = " AND ".join(
+        ["d.app_id = s.app_id"]
+        + [_null_safe_equal(f"d.[{k}]", f"s.[{k}]") if k in KV_NULLABLE_KEYS else f"d.[{k}] = s.[{k}]" for k in keys]
+    )
+    value_match = " AND ".join(_null_safe_equal(f"d.[{v}]", f"s.[{v}]") for v in KV_VALUE_COLUMNS[table])
+
+    cursor.execute(f"""
+        SELECT
+            (SELECT COUNT(*) FROM #kv_{table} AS s
+             JOIN {target} AS d{hint} ON {key_match}
+             WHERE NOT ({value_match})),
+            (SELECT COUNT(*) FROM {target} AS d{hint}
+             JOIN #kv_apps AS a ON a.app_id = d.app_id
+             WHERE NOT EXISTS (SELECT 1 FROM #kv_{table} AS s WHERE {key_match}))
+    """)
+    mismatches, extras = cursor.fetchone()
+
+    columns = _kv_columns(table)
+    column_list = ", ".join(f"[{c}]" for c in columns)
+    returned = ", ".join(f"{{prefix}}.[{c}]" for c in ("app_id",) + keys)
+    anti_join = f"FROM #kv_{table} AS s WHERE NOT EXISTS (SELECT 1 FROM {target} AS d{hint} WHERE {key_match})"
+    if apply:
+        cursor.execute(
+            f"INSERT INTO {target} ({column_list}) OUTPUT {returned.format(prefix='inserted')} "
+            f"SELECT {', '.join(f's.[{c}]' for c in columns)} {anti_join}"
+        )
+    else:
+        cursor.execute(f"SELECT {returned.format(prefix='s')} {anti_join}")
+    return cursor.fetchall(), mismatches, extras
+
+
+def _skip_unmigrated_apps(cursor, target_schema: str, apply: bool) -> List[int]:
+    """Remove #kv_apps rows without a [target_schema].[app_base] row; returns the removed app_ids.
+
+    KV rows reference app_base, so those apps cannot be backfilled (and are not "missing" KV rows).
+    """
+    hint = "" if apply else " WITH (NOLOCK)"
+    cursor.execute(
+        f"DELETE a OUTPUT deleted.app_id FROM #kv_apps AS a "
+        f"WHERE NOT EXISTS (SELECT 1 FROM [{target_schema}].[app_base] AS b{hint} WHERE b.app_id = a.app_id)"
+    )
+    return sorted(int(r[0]) for r in cursor.fetchall())
+
+
+def _source_chunks(conn, source_table: str, source_column: str, app_range: Tuple[int, int],
+                   chunk_size: int):
+    """Yield lists of (app_id, xml) for source app_ids in app_range, in keyset order.
+
+    source_table is used as given (resolve it with _resolve_source_table).
+    """
+    cursor = conn.cursor()
+    last_app_id = app_range[0] - 1
+    while True:
+        cursor.execute(
+            f"SELECT TOP ({int(chunk_size)}) app_id, {source_column} FROM {source_table} WITH (NOLOCK) "
+            "WHERE app_id > ? AND app_id <= ? ORDER BY app_id",
+            last_app_id, app_range[1],
+        )
+        rows = [(int(r[0]), r[1]) for r in cursor.fetchall()]
+        if not rows:
+            return
+        yield rows
+        last_app_id = rows[-1][0]
+        if len(rows) < chunk_size:
+            return
+
+
+def run_range(conn_str: str, contract_path: Path, app_range: Tuple[int, int], apply: bool = False,
+              workers: Optional[int] = None, chunk_size: int = 2000) -> RangeBackfillResult:
+    """Reconcile (and with apply, backfill) the KV tables for every source app in app_range.
+
+    Chunks are read on a separate connection and mapped in a process pool (at most workers + 1 chunks
+    in flight); each mapped chunk is staged, diffed and, when applying, inserted and committed.
+    Mapped apps without an app_base row (not migrated yet) are skipped and counted.
+    """
+    contract_json = _load_contract_json(contract_path)
+    target_schema = contract_json.get("target_schema", "dbo") or "dbo"
+    source_table = contract_json.get("source_table", "app_xml_staging")
+    source_column = contract_json.get("source_column", "app_XML")
+    workers = workers or os.cpu_count() or 1
+
+    result = RangeBackfillResult(
+        app_range=app_range,
+        target_schema=target_schema,
+        xml_source=f"DB:{source_table}.{source_column}",
+        generated_at_utc=datetime.now(timezone.utc).isoformat(),
+        dry_run=not apply,
+    )
+    started = time.perf_counter()
+
+    def apply_chunk(mapped: Dict[str, Any]) -> None:
+        result.apps_scanned += mapped["apps"]
+        result.apps_mapped += len(mapped["mapped_apps"])
+        result.apps_failed += len(mapped["failed"])
+        result.failed_examples.extend(mapped["failed"][:MAX_EXAMPLES - len(result.failed_examples)])
+        if not mapped["mapped_apps"]:
+            return
+
+        cursor.execute("TRUNCATE TABLE #kv_apps")
+        cursor.executemany("INSERT INTO #kv_apps (app_id) VALUES (?)", [(a,) for a in mapped["mapped_apps"]])
+        skipped = _skip_unmigrated_apps(cursor, target_schema, apply)
+        result.apps_skipped += len(skipped)
+        result.skipped_examples.extend(skipped[:MAX_EXAMPLES - len(result.skipped_examples)])
+        skipped_apps = set(skipped)
+        for table in KV_TABLES:
+            rows = [row for row in mapped["staged"][table] if row[0] not in skipped_apps]
+            result.mapped_counts[table] += len(rows)
+            cursor.execute(f"TRUNCATE TABLE #kv_{table}")
+            if rows:
+                placeholders = ", ".join("?" for _ in _kv_columns(table))
+                cursor.executemany(f"INSERT INTO #kv_{table} VALUES ({placeholders})", rows)
+        try:
+            for table in KV_TABLES:
+                missing, mismatches, extras = _diff_kv_chunk(cursor, target_schema, table, apply)
+                result.missing_counts[table] += len(missing)
+                result.mismatch_counts[table] += mismatches
+                result.extra_counts[table] += extras
+                if apply:
+                    result.inserted_counts[table] += len(missing)
+                examples = result.missing_examples[table]
+                columns = ("app_id",) + KV_KEY_COLUMNS[table]
+                examples.extend(dict(zip(columns, row)) for row in missing[:MAX_EXAMPLES - len(examples)])
+            write_conn.commit()
+        except Exception:
+            write_conn.rollback()
+            raise
+
+        elapsed = time.perf_counter() - started
+        print(f"  ..{mapped['mapped_apps'][-1]}: {result.apps_scanned} apps ({result.apps_scanned / elapsed:.0f}/sec), "
+              f"missing {sum(result.missing_counts.values())}, inserted {sum(result.inserted_counts.values())}")
+
+    with pyodbc.connect(conn_str) as read_conn, pyodbc.connect(conn_str) as write_conn:
+        read_conn.autocommit = True
+        source_table = _resolve_source_table(read_conn, source_table, source_column)
+        result.xml_source = f"DB:{source_table}.{source_column}"
+        write_conn.autocommit = False
+        cursor = write_conn.cursor()
+        cursor.fast_executemany = True
+        _create_kv_staging(cursor)
+        write_conn.commit()
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for rows in _source_chunks(read_conn, source_table, source_column, app_range, chunk_size):
+                pending.add(pool.submit(map_kv_chunk, rows, str(contract_path)))
+                if len(pending) > workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        apply_chunk(future.result())
+            for future in pending:
+                apply_chunk(future.result())
+
+    result.elapsed_seconds = round(time.perf_counter() - started, 3)
+    return result
+
+
+def write_range_report(result: RangeBackfillResult, out_path: Path) -> None:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(result.__dict__, indent=2, default=str), encoding="utf-8")
+
+
+def print_range_summary(result: RangeBackfillResult, out_path: Path) -> None:
+    print("\nKV Range Summary")
+    print("-" * 80)
+    print(f"range:    {result.app_range[0]}..{result.app_range[1]}")
+    print(f"schema:   {result.target_schema}")
+    print(f"xml:      {result.xml_source}")
+    print(f"mode:     {'DRY-RUN' if result.dry_run else 'APPLY'}")
+    print(f"apps:     {result.apps_scanned} scanned, {result.apps_mapped} mapped, {result.apps_failed} failed, "
+          f"{result.apps_skipped} skipped (no app_base row) in {result.elapsed_seconds:.1f}s")
+    print(f"  {'table':28s} {'mapped':>10s} {'missing':>10s} {'inserted':>10s} {'mismatch':>10s} {'extra':>10s}")
+    for table in KV_TABLES:
+        print(f"  {table:28s} {result.mapped_counts[table]:10d} {result.missing_counts[table]:10d} "
+              f"{result.inserted_counts[table]:10d} {result.mismatch_counts[table]:10d} {result.extra_counts[table]:10d}")
+    for failure in result.failed_examples[:5]:
+        print(f"  failed app_id {failure['app_id']}: {failure['error']}")
+    if result.skipped_examples:
+        print(f"  skipped app_ids (not migrated): {result.skipped_examples}")
+    print(f"report:   {out_path}")
+
+
+def parse_app_range(value: str) -> Tuple[int, int]:
+    """Parse LOW:HIGH (inclusive) into a tuple."""
+    try:
+        low, high = (int(part) for part in value.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("range must be LOW:HIGH") from None
+    if low > high:
+        raise argparse.ArgumentTypeError("range LOW must not exceed HIGH")
+    return low, high
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Insert-only backfill for KV mapping tables")
     ap.add_argument("--app-id", type=int, default=None, help="app_id to backfill (fetches XML from DB)")
     ap.add_argument("--xml-file", type=str, default=None, help="Path to XML file to backfill")
+    ap.add_argument("--range", dest="app_range", type=parse_app_range, default=None, metavar="LOW:HIGH",
+                    help="Reconcile/backfill every source app_id in LOW..HIGH (parallel, set-based)")
+    ap.add_argument("--workers", type=int, default=None, help="Range mode mapping processes (default: all cores)")
+    ap.add_argument("--chunk-size", type=int, default=2000, help="Range mode apps per chunk (default: 2000)")
     ap.add_argument("--apply", action="store_true", help="Apply inserts (default is dry-run)")
     ap.add_argument(
         "--output-json",
@@ -213,6 +570,20 @@ def main() -> int:
     config = get_config_manager()
     conn_str = config.get_database_connection_string()
 
+    if args.app_range:
+        result = run_range(conn_str, contract_path, args.app_range, apply=args.apply,
+                           workers=args.workers, chunk_size=args.chunk_size)
+        if args.output_json:
+            out_path = Path(args.output_json)
+            if not out_path.is_absolute():
+                out_path = root_dir / out_path
+        else:
+            ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+            out_path = root_dir / "metrics" / f"kv_backfill_range_{args.app_range[0]}_{args.app_range[1]}_{ts}.json"
+        write_range_report(result, out_path)
+        print_range_summary(result, out_path)
+        return 0
+
     xml_content: Optional[str] = None
     xml_source = ""
 
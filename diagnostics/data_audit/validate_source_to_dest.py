@@ -7,9 +7,13 @@ mapping issues, missing data, and transformation errors.
 Usage:
     python diagnostics/validate_source_to_dest.py --server "localhost\\SQLEXPRESS" --database "XmlConversionDB" --app-id 12345
     python .\diagnostics\validate_source_to_dest.py --server "mbc-dev-npci-use1-db.cofvo8gypwe9.us-east-1.rds.amazonaws.com" --database "MACDEVOperational" --schema dbo --output ./diagnostics/validate_source_to_dest_results.json --sample 20
+    python diagnostics/data_audit/validate_source_to_dest.py --server "localhost\\SQLEXPRESS" --database "XmlConversionDB" --batch --sample 100000 --output audit.json
+    python diagnostics/data_audit/validate_source_to_dest.py --server "localhost\\SQLEXPRESS" --database "XmlConversionDB" --range 300000:400000 --workers 8
 
 Features:
 - Fetch source XML and destination data for a single app_id
+- Batch mode (--batch with --sample, or --range): per chunk of apps, one set-based query per
+  table; XML parsed and compared in a process pool; per-column NULL / smell / mismatch statistics
 - Compare key fields between source and destination
 - Detect enum mapping mismatches
 - Identify sparse rows (mostly NULL)
@@ -21,7 +25,11 @@ Related: docs/onboard_reclending/implementation-plan.md Phase 0.5
 import argparse
 import json
 import logging
+import os
 import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from decimal import Decimal
@@ -66,41 +74,50 @@ def fetch_source_xml(conn, app_id: int, table_name: str) -> Optional[str]:
     return row[0] if row else None
 
 
-def parse_xml_attributes(xml_content: str, xpath: str) -> Dict[str, str]:
-    """Extract attributes from XML element at given XPath."""
+def _xml_root(xml_content: Any) -> Optional[etree._Element]:
+    """Parse XML text/bytes to its root element (parsed elements pass through; None means unparseable)."""
+    if xml_content is None or isinstance(xml_content, etree._Element):
+        return xml_content
     try:
-        root = etree.fromstring(xml_content.encode('utf-8') if isinstance(xml_content, str) else xml_content)
-        elements = root.xpath(xpath)
-        if elements:
-            return dict(elements[0].attrib)
+        return etree.fromstring(xml_content.encode('utf-8') if isinstance(xml_content, str) else xml_content)
     except Exception as e:
-        logger.warning(f"XPath extraction failed for {xpath}: {e}")
-    return {}
+        logger.warning(f"XML parse failed: {e}")
+        return None
 
 
-def _get_xml_elements(xml_content: str, xpath: str) -> List[etree._Element]:
+def parse_xml_attributes(xml_content: Any, xpath: str) -> Dict[str, str]:
+    """Extract attributes from XML element at given XPath."""
+    elements = _get_xml_elements(xml_content, xpath)
+    return dict(elements[0].attrib) if elements else {}
+
+
+def _get_xml_elements(xml_content: Any, xpath: str) -> List[etree._Element]:
     """Return XML elements for the given XPath, or empty list on failure."""
+    root = _xml_root(xml_content)
+    if root is None:
+        return []
     try:
-        root = etree.fromstring(xml_content.encode('utf-8') if isinstance(xml_content, str) else xml_content)
         return root.xpath(xpath)
     except Exception as e:
         logger.warning(f"XPath extraction failed for {xpath}: {e}")
         return []
 
 
-def _add_smell_task(result: ValidationResult, title: str, reason: str, xpath: str) -> None:
+def _add_smell_task(result: ValidationResult, title: str, reason: str, xpath: str, column: str = '') -> None:
     result.smell_tasks.append({
         'title': title,
         'reason': reason,
-        'xpath': xpath
+        'xpath': xpath,
+        'column': column
     })
 
 
-def detect_smells(xml_content: str, result: ValidationResult) -> None:
+def detect_smells(xml_content: Any, result: ValidationResult) -> None:
     """Detect suspicious patterns: default/fallback values in destination that may indicate mapping issues.
     
     Check for values that look like defaults (BLANK, UNKNOWN, MISSING, 00000, etc.) and verify
     whether the source XML actually had those values or if they were injected as fallbacks.
+    xml_content may be the XML text or its parsed root (parse once when checking many smells).
     """
     
     dest = result.dest_fields
@@ -114,7 +131,8 @@ def detect_smells(xml_content: str, result: ValidationResult) -> None:
                 result,
                 "campaign_num = 'BLANK' (default)",
                 "Destination has default 'BLANK'; verify if source campaign_num was empty or missing.",
-                "/Provenir/Request/CustData/application/marketing_info/@campaign_num"
+                "/Provenir/Request/CustData/application/marketing_info/@campaign_num",
+                'app_pricing_cc.campaign_num'
             )
     
     # 2) app_pricing_cc: marketing_segment = 'UNKNOWN' (check source)
@@ -126,7 +144,8 @@ def detect_smells(xml_content: str, result: ValidationResult) -> None:
                 result,
                 "marketing_segment = 'UNKNOWN' (fallback)",
                 "Destination has fallback 'UNKNOWN'; verify if source had no matching segment enum.",
-                "/Provenir/Request/CustData/application/marketing_info/@marketing_segment"
+                "/Provenir/Request/CustData/application/marketing_info/@marketing_segment",
+                'app_pricing_cc.marketing_segment'
             )
     
     # 3) population_assignment_enum is NULL or 229 (default enum value for missing)
@@ -138,7 +157,8 @@ def detect_smells(xml_content: str, result: ValidationResult) -> None:
                 result,
                 "population_assignment_enum missing or default (229)",
                 "Enum is NULL or set to default 229; verify source had no population_assignment_code.",
-                "/Provenir/Request/CustData/application/@population_assignment_code"
+                "/Provenir/Request/CustData/application/@population_assignment_code",
+                'app_operational_cc.population_assignment_enum'
             )
     
     # 4) app_contact_base: first_name or last_name = 'UNKNOWN' (check source)
@@ -154,7 +174,8 @@ def detect_smells(xml_content: str, result: ValidationResult) -> None:
                 result,
                 "Contact name is 'UNKNOWN' (fallback)",
                 "Primary contact has default name; verify if source name fields were empty.",
-                "/Provenir/Request/CustData/application/contact[@ac_role_tp_c='PR']/@first_name | @last_name"
+                "/Provenir/Request/CustData/application/contact[@ac_role_tp_c='PR']/@first_name | @last_name",
+                'app_contact_base.first_name' if contact.get('first_name') == 'UNKNOWN' else 'app_contact_base.last_name'
             )
     
     # 5) app_contact_base: ssn = '000000000' (check source)
@@ -166,7 +187,8 @@ def detect_smells(xml_content: str, result: ValidationResult) -> None:
                 result,
                 "SSN = '000000000' (default/missing)",
                 "Contact SSN is all zeros (default); verify if source had no SSN or used zeros.",
-                "/Provenir/Request/CustData/application/contact[@ac_role_tp_c='PR']/@ssn"
+                "/Provenir/Request/CustData/application/contact[@ac_role_tp_c='PR']/@ssn",
+                'app_contact_base.ssn'
             )
     
     # 6) app_contact_base: birth_date = '1900-01-01' (check source)
@@ -178,7 +200,8 @@ def detect_smells(xml_content: str, result: ValidationResult) -> None:
                 result,
                 "birth_date = '1900-01-01' (default)",
                 "Birth date is default epoch; verify if source had no birth_date.",
-                "/Provenir/Request/CustData/application/contact[@ac_role_tp_c='PR']/@birth_date"
+                "/Provenir/Request/CustData/application/contact[@ac_role_tp_c='PR']/@birth_date",
+                'app_contact_base.birth_date'
             )
     
     # 7) app_contact_address: city = 'MISSING' or state = 'XX' or zip = '00000'
@@ -192,11 +215,14 @@ def detect_smells(xml_content: str, result: ValidationResult) -> None:
             for el in addr_els
         )
         if not has_full_addr:
+            defaulted = next(col for col, default in (('city', 'MISSING'), ('state', 'XX'), ('zip', '00000'))
+                             if address.get(col) == default)
             _add_smell_task(
                 result,
                 "Address has default/missing values (MISSING, XX, 00000)",
                 "Current address has defaults; verify source had incomplete address data.",
-                "/Provenir/Request/CustData/application/contact[@ac_role_tp_c='PR']/contact_address[@address_tp_c='CURR']/@city | @state | @zip"
+                "/Provenir/Request/CustData/application/contact[@ac_role_tp_c='PR']/contact_address[@address_tp_c='CURR']/@city | @state | @zip",
+                f"app_contact_address.{defaulted}"
             )
     
     # 8) priority_enum is NULL (should usually be populated)
@@ -208,7 +234,8 @@ def detect_smells(xml_content: str, result: ValidationResult) -> None:
                 result,
                 "priority_enum is NULL (but source has priority)",
                 "Request has priority attribute but destination enum is NULL; check enum mapping.",
-                "/Provenir/Request/@Priority"
+                "/Provenir/Request/@Priority",
+                'app_operational_cc.priority_enum'
             )
     
     # 9) ACH banking checks: sc_ach_amount > 0 but banking details are NULL
@@ -219,14 +246,16 @@ def detect_smells(xml_content: str, result: ValidationResult) -> None:
                 result,
                 "ACH amount present but sc_bank_aba is NULL",
                 "ACH amount has value but no routing number; verify source had bank routing data.",
-                "/Provenir/Request/CustData/application//savings_acct[@acct_type='ACH']/@bank_aba"
+                "/Provenir/Request/CustData/application//savings_acct[@acct_type='ACH']/@bank_aba",
+                'app_operational_cc.sc_bank_aba'
             )
         if ops.get('sc_bank_account_num') is None:
             _add_smell_task(
                 result,
                 "ACH amount present but sc_bank_account_num is NULL",
                 "ACH amount has value but no account number; verify source had account data.",
-                "/Provenir/Request/CustData/application//savings_acct[@acct_type='ACH']/@account_num"
+                "/Provenir/Request/CustData/application//savings_acct[@acct_type='ACH']/@account_num",
+                'app_operational_cc.sc_bank_account_num'
             )
 def scan_for_smells(conn, schema: str) -> List[int]:
     """
@@ -396,35 +425,47 @@ def _is_positive_amount(value: Any) -> bool:
         return False
 
 
+# Destination tables checked per app, with the key columns whose NULL rate is reported
+DEST_TABLES = [
+    ('app_base', ['decision_enum', 'app_source_enum', 'app_type_enum']),
+    ('app_operational_cc', ['status_enum', 'process_enum', 'priority_enum', 'sc_bank_account_type_enum']),
+    ('app_pricing_cc', ['credit_limit', 'annual_fee']),
+]
+
+
 def validate_app(conn, app_id: int, schema: str = 'dbo') -> ValidationResult:
     """Validate a single app_id by comparing source XML to destination data."""
-    result = ValidationResult(app_id=app_id, status='PASS')
-    
     # Fetch source XML
     xml_content = fetch_source_xml(conn, app_id, 'app_xml')
     if not xml_content:
-        result.status = 'FAIL'
+        result = ValidationResult(app_id=app_id, status='FAIL')
         result.issues.append("No source XML found")
         return result
     
+    # Fetch destination data
+    dest_rows = {table: fetch_dest_data(conn, table, schema, app_id) for table, _ in DEST_TABLES}
+    return validate_app_data(app_id, xml_content, dest_rows)
+
+
+def validate_app_data(app_id: int, xml_content: Any, dest_rows: Dict[str, Dict[str, Any]]) -> ValidationResult:
+    """Compare one app's source XML to its destination rows (already fetched; no database access).
+
+    dest_rows maps table name -> row dict ({} when the table has no row). The XML is parsed once.
+    """
+    result = ValidationResult(app_id=app_id, status='PASS')
+    root = _xml_root(xml_content)
+    
     # Extract key source attributes
-    request_attrs = parse_xml_attributes(xml_content, '/Provenir/Request')
-    app_attrs = parse_xml_attributes(xml_content, '/Provenir/Request/CustData/application')
+    request_attrs = parse_xml_attributes(root, '/Provenir/Request')
+    app_attrs = parse_xml_attributes(root, '/Provenir/Request/CustData/application')
     
     result.source_fields = {
         'request': request_attrs,
         'application': app_attrs
     }
     
-    # Fetch destination data
-    tables_to_check = [
-        ('app_base', ['decision_enum', 'app_source_enum', 'app_type_enum']),
-        ('app_operational_cc', ['status_enum', 'process_enum', 'priority_enum', 'sc_bank_account_type_enum']),
-        ('app_pricing_cc', ['credit_limit', 'annual_fee']),
-    ]
-    
-    for table, key_columns in tables_to_check:
-        dest_data = fetch_dest_data(conn, table, schema, app_id)
+    for table, key_columns in DEST_TABLES:
+        dest_data = dest_rows.get(table)
         if not dest_data:
             result.issues.append(f"No data in {table}")
             result.status = 'WARN' if result.status == 'PASS' else result.status
@@ -455,7 +496,7 @@ def validate_app(conn, app_id: int, schema: str = 'dbo') -> ValidationResult:
             result.status = 'WARN' if result.status == 'PASS' else result.status
 
     # Smell-based verification tasks
-    detect_smells(xml_content, result)
+    detect_smells(root, result)
     
     return result
 
@@ -475,6 +516,167 @@ def validate_sample(conn, sample_size: int, schema: str = 'dbo') -> List[Validat
     return results
 
 
+# ---------------------------------------------------------------------------
+# Batch mode: set-based fetches per chunk, XML parsed and compared in a process pool
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BatchSummary:
+    """Aggregated results of a batch audit (problem apps kept without their row payloads)."""
+    apps: int = 0
+    status_counts: Counter = field(default_factory=Counter)
+    issue_counts: Counter = field(default_factory=Counter)
+    # 'table.column' -> Counter of 'checked' / 'null' / 'smell' / 'mismatch'
+    column_stats: Dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    problems: List[ValidationResult] = field(default_factory=list)
+
+    def add(self, result: ValidationResult):
+        self.apps += 1
+        self.status_counts[result.status] += 1
+        for issue in result.issues:
+            self.issue_counts[issue.split(':')[0] if ':' in issue else issue[:50]] += 1
+        for table, key_columns in DEST_TABLES:
+            row = result.dest_fields.get(table)
+            if row is None:
+                continue
+            for column in key_columns:
+                stats = self.column_stats[f"{table}.{column}"]
+                stats['checked'] += 1
+                if row.get(column) is None:
+                    stats['null'] += 1
+        for smell in result.smell_tasks:
+            self.column_stats[smell.get('column') or smell['title']]['smell'] += 1
+        for mismatch in result.mismatches:
+            for key in ('field1', 'field2'):
+                self.column_stats[f"{mismatch['table']}.{mismatch[key]}"]['mismatch'] += 1
+        if result.status != 'PASS' or result.issues or result.mismatches or result.smell_tasks:
+            result.source_fields = {}
+            result.dest_fields = {}
+            self.problems.append(result)
+
+    def merge(self, other: 'BatchSummary'):
+        self.apps += other.apps
+        self.status_counts.update(other.status_counts)
+        self.issue_counts.update(other.issue_counts)
+        for column, stats in other.column_stats.items():
+            self.column_stats[column].update(stats)
+        self.problems.extend(other.problems)
+
+
+def select_batch_apps(conn, chunk_size: int, sample_size: Optional[int] = None,
+                      app_range: Optional[Tuple[int, int]] = None) -> Tuple[int, int]:
+    """Materialize the audited app_ids into #audit_apps, numbered into chunks of chunk_size.
+
+    Returns (app count, chunk count). The selection stays server-side: no app_id round trips.
+    """
+    cursor = conn.cursor()
+    cursor.execute("IF OBJECT_ID('tempdb..#audit_apps') IS NOT NULL DROP TABLE #audit_apps")
+    if sample_size:
+        selection, params = "SELECT TOP (?) app_id FROM app_xml ORDER BY NEWID()", [sample_size]
+    else:
+        selection, params = "SELECT app_id FROM app_xml WHERE app_id BETWEEN ? AND ?", list(app_range)
+    cursor.execute(f"""
+        SELECT s.app_id, (ROW_NUMBER() OVER (ORDER BY s.app_id) - 1) / ? AS chunk_no
+        INTO #audit_apps
+        FROM ({selection}) AS s
+    """, chunk_size, *params)
+    cursor.execute("CREATE CLUSTERED INDEX ix_audit_apps ON #audit_apps (chunk_no, app_id)")
+    cursor.execute("SELECT COUNT(*), COALESCE(MAX(chunk_no) + 1, 0) FROM #audit_apps")
+    apps, chunks = cursor.fetchone()
+    return apps, chunks
+
+
+def fetch_batch_chunk(conn, chunk_no: int, schema: str) -> List[Tuple[int, Any, Dict[str, Dict[str, Any]]]]:
+    """Fetch source XML and every destination table for one chunk: one set-based query per table.
+
+    Returns (app_id, xml, dest_rows) per app, in the shape validate_app_data takes.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT x.app_id, x.app_XML
+        FROM app_xml AS x
+        JOIN #audit_apps AS a ON a.app_id = x.app_id
+        WHERE a.chunk_no = ?
+    """, chunk_no)
+    sources = cursor.fetchall()
+    dest_rows: Dict[int, Dict[str, Dict[str, Any]]] = {row[0]: {} for row in sources}
+    for table, _ in DEST_TABLES:
+        try:
+            cursor.execute(f"""
+                SELECT t.*
+                FROM [{schema}].[{table}] AS t
+                JOIN #audit_apps AS a ON a.app_id = t.app_id
+                WHERE a.chunk_no = ?
+            """, chunk_no)
+            columns = [desc[0] for desc in cursor.description]
+            app_index = columns.index('app_id')
+            for row in cursor.fetchall():
+                # First row per app, as fetch_dest_data's fetchone
+                dest_rows.setdefault(row[app_index], {}).setdefault(table, dict(zip(columns, row)))
+        except pyodbc.Error as e:
+            logger.warning(f"Failed to fetch {schema}.{table} for chunk {chunk_no}: {e}")
+    return [(app_id, xml_content, dest_rows[app_id]) for app_id, xml_content in sources]
+
+
+def validate_chunk(items: List[Tuple[int, Any, Dict[str, Dict[str, Any]]]]) -> BatchSummary:
+    """Pool worker: validate a fetched chunk in memory and return its aggregated summary."""
+    summary = BatchSummary()
+    for app_id, xml_content, dest_rows in items:
+        if not xml_content:
+            result = ValidationResult(app_id=app_id, status='FAIL')
+            result.issues.append("No source XML found")
+        else:
+            result = validate_app_data(app_id, xml_content, dest_rows)
+        summary.add(result)
+    return summary
+
+
+def validate_batch(conn, schema: str = 'dbo', sample_size: Optional[int] = None,
+                   app_range: Optional[Tuple[int, int]] = None, chunk_size: int = 500,
+                   workers: Optional[int] = None) -> BatchSummary:
+    """Validate a sample or app_id range set-based: chunks are fetched on this connection while
+    earlier chunks are parsed and compared in a process pool (at most workers + 1 chunks held)."""
+    apps, chunks = select_batch_apps(conn, chunk_size, sample_size=sample_size, app_range=app_range)
+    workers = workers or os.cpu_count() or 1
+    print(f"Batch audit: {apps} apps in {chunks} chunks of {chunk_size}, {workers} worker(s)")
+
+    summary = BatchSummary()
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk_no in range(chunks):
+            pending.add(pool.submit(validate_chunk, fetch_batch_chunk(conn, chunk_no, schema)))
+            if len(pending) > workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    summary.merge(future.result())
+                elapsed = time.perf_counter() - started
+                print(f"  Progress: {summary.apps}/{apps} apps ({summary.apps / elapsed:.0f} apps/sec)")
+        for future in pending:
+            summary.merge(future.result())
+    elapsed = time.perf_counter() - started
+    print(f"  Done: {summary.apps} apps in {elapsed:.1f}s ({summary.apps / elapsed if elapsed else 0:.0f} apps/sec)")
+    return summary
+
+
+def print_batch_summary(summary: BatchSummary):
+    """Print batch totals, top issues and the per-column statistics."""
+    print("\n" + "=" * 60)
+    print("BATCH VALIDATION SUMMARY")
+    print("=" * 60)
+    print(f"Apps: {summary.apps}  " + "  ".join(f"{status}: {count}" for status, count in sorted(summary.status_counts.items())))
+    if summary.issue_counts:
+        print("\nTop Issues:")
+        for issue, count in summary.issue_counts.most_common(10):
+            print(f"  {count:6d} - {issue}")
+    if summary.column_stats:
+        print(f"\n  {'column':55s} {'checked':>8s} {'null':>8s} {'null%':>6s} {'smell':>7s} {'mismatch':>8s}")
+        for column, stats in sorted(summary.column_stats.items(), key=lambda item: (-(item[1]['smell'] + item[1]['mismatch']), item[0])):
+            null_pct = 100 * stats['null'] / stats['checked'] if stats['checked'] else 0.0
+            print(f"  {column:55s} {stats['checked']:8d} {stats['null']:8d} {null_pct:5.1f}% "
+                  f"{stats['smell']:7d} {stats['mismatch']:8d}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Validate source XML against destination database (CC)")
     parser.add_argument("--server", required=True, help="SQL Server instance")
@@ -482,6 +684,12 @@ def main():
     parser.add_argument("--app-id", type=str, help="Specific app_id to validate (comma separated)")
     parser.add_argument("--sample", type=int, help="Number of random app_ids to validate")
     parser.add_argument("--scan-failures", action="store_true", help="Scan entire DB for smells and validate only suspects")
+    parser.add_argument("--batch", action="store_true",
+                        help="Set-based mode for --sample / --range: chunked queries per table, XML compared in a process pool")
+    parser.add_argument("--range", dest="app_range", metavar="LOW:HIGH",
+                        help="Validate every app_id in app_xml between LOW and HIGH inclusive (batch mode)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Apps fetched per set-based query in batch mode (default: 500)")
+    parser.add_argument("--workers", type=int, help="Batch mode parse/compare processes (default: all cores)")
     parser.add_argument("--schema", default="dbo", help="Target schema (default: dbo)")
     parser.add_argument("--output", help="JSON output file path")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
@@ -491,8 +699,17 @@ def main():
     if args.verbose:
         logger.setLevel(logging.DEBUG)
     
-    if not any([args.app_id, args.sample, args.scan_failures]):
-        parser.error("Must specify --app-id, --sample, or --scan-failures")
+    if not any([args.app_id, args.sample, args.scan_failures, args.app_range]):
+        parser.error("Must specify --app-id, --sample, --range, or --scan-failures")
+    app_range = None
+    if args.app_range:
+        try:
+            low, high = (int(value) for value in args.app_range.split(':'))
+        except ValueError:
+            parser.error("--range must be LOW:HIGH")
+        app_range = (low, high)
+    if args.batch and not (args.sample or app_range):
+        parser.error("--batch requires --sample or --range")
     
     conn_str = build_connection_string(args.server, args.database)
     
@@ -500,6 +717,32 @@ def main():
         with pyodbc.connect(conn_str) as conn:
             results = []
             
+            if args.batch or app_range:
+                summary = validate_batch(conn, args.schema, sample_size=None if app_range else args.sample,
+                                         app_range=app_range, chunk_size=args.chunk_size, workers=args.workers)
+                print_batch_summary(summary)
+                if args.output:
+                    output_data = {
+                        'apps': summary.apps,
+                        'status_counts': dict(summary.status_counts),
+                        'issue_counts': dict(summary.issue_counts),
+                        'column_stats': {column: dict(stats) for column, stats in sorted(summary.column_stats.items())},
+                        'problems': [
+                            {
+                                'app_id': r.app_id,
+                                'status': r.status,
+                                'issues': r.issues,
+                                'mismatches': r.mismatches,
+                                'smell_tasks': r.smell_tasks
+                            }
+                            for r in summary.problems
+                        ]
+                    }
+                    with open(args.output, 'w') as f:
+                        json.dump(output_data, f, indent=2, default=str)
+                    print(f"\nBatch results written to {args.output}")
+                return
+
             if args.scan_failures:
                 # 1. Find suspects
                 suspect_ids = scan_for_smells(conn, args.schema)
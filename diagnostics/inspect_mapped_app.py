@@ -4,19 +4,36 @@ Diagnostic helper: fetch a single app XML, run parser+mapper, and check campaign
 Usage (PowerShell):
   python tools\inspect_mapped_app.py --server <server> --database <db> --app-id 311202
 
+  # Replay the slowest apps captured in a metrics file (or orchestrator run summary)
+  python diagnostics\inspect_mapped_app.py --server <server> --database <db> --metrics-file metrics\metrics_<session>.json
+  python diagnostics\inspect_mapped_app.py ... --metrics-file <file> --stage mapping --limit 3
+
 This script prints the mapped `app_pricing_cc` records for the app and queries
 the target `campaign_cc` table to see whether referenced `campaign_num` values
 exist in the target schema from the mapping contract (usually `sandbox`).
+
+With --metrics-file it instead re-runs validation, parsing and mapping locally for the
+apps in the file's 'slow_apps' section and prints each stage next to the production
+timing and facts (no database writes; insert stages are shown as recorded).
 """
 import argparse
 import json
 import sys
 import logging
-from typing import List
+import time
+from pathlib import Path
+from typing import Any, Dict, List
 
 import pyodbc
 
+# Ensure workspace root is importable when running as a script
+WORKSPACE_ROOT = Path(__file__).parent.parent
+if str(WORKSPACE_ROOT) not in sys.path:
+    sys.path.insert(0, str(WORKSPACE_ROOT))
+
 from xml_extractor.config.config_manager import get_config_manager
+from xml_extractor.validation.pre_processing_validator import PreProcessingValidator
+from xml_extractor.monitoring.slow_apps import SlowAppTracker
 from xml_extractor.parsing.xml_parser import XMLParser
 from xml_extractor.mapping.data_mapper import DataMapper
 from xml_extractor.database.migration_engine import MigrationEngine
@@ -58,17 +75,111 @@ def check_campaigns_exist(conn, target_schema: str, campaign_nums: List[str]) ->
     return [r[0] for r in rows]
 
 
+def load_slow_apps(metrics_file: str, stage: str, limit: int):
+    """(entries to replay, recorded mapping contract path) from a metrics file's 'slow_apps' section."""
+    with open(metrics_file) as f:
+        metrics = json.load(f)
+    slow_apps = metrics.get('slow_apps')
+    if not slow_apps:
+        return [], None
+    tracker = SlowAppTracker.from_dict(slow_apps)
+    entries = tracker.slowest(stage)
+    if not entries and stage == 'all':
+        by_id = {}
+        for name in slow_apps.get('by_stage', {}):
+            for entry in tracker.slowest(name):
+                by_id.setdefault(entry['app_id'], entry)
+        entries = [by_id[app_id] for app_id in tracker.app_ids()]
+    return entries[:limit], slow_apps.get('mapping_contract')
+
+
+def replay_app(conn, entry: Dict[str, Any], source_table: str, source_column: str,
+               validator: PreProcessingValidator, parser: XMLParser, mapper: DataMapper) -> None:
+    """Re-run validation/parsing/mapping for one captured app and print local vs recorded timings."""
+    app_id = entry['app_id']
+    recorded = entry.get('stage_ms', {})
+    xml_content = fetch_xml(conn, source_table, source_column, app_id)
+    if not xml_content:
+        print(f"\napp_id={app_id}: no XML found in [dbo].[{source_table}]")
+        return
+
+    local: Dict[str, float] = {}
+    start = time.perf_counter()
+    validation = validator.validate_xml_for_processing(xml_content, f"replay_{app_id}")
+    local['validation'] = time.perf_counter() - start
+    mapped = {}
+    element_count = 0
+    if validation.is_valid and validation.can_process:
+        start = time.perf_counter()
+        root = parser.parse_xml_stream(xml_content)
+        xml_data = parser.extract_elements(root)
+        local['parsing'] = time.perf_counter() - start
+        element_count = len(xml_data)
+        start = time.perf_counter()
+        mapped = mapper.map_xml_to_database(xml_data, validation.app_id, validation.valid_contacts, root) or {}
+        local['mapping'] = time.perf_counter() - start
+
+    status = 'ok' if entry.get('success') else f"failed ({entry.get('error_stage')})"
+    print(f"\napp_id={app_id}  production: {status}  xml_chars={len(xml_content)} (recorded {entry.get('xml_chars')})  "
+          f"elements={element_count} (recorded {entry.get('element_count')})  "
+          f"contacts={len(validation.valid_contacts or [])} (recorded {entry.get('contact_count')})")
+    print(f"  {'stage':26s} {'recorded ms':>12s} {'local ms':>10s}")
+    for stage in sorted(set(recorded) | set(local)):
+        local_ms = f"{local[stage] * 1000:10.1f}" if stage in local else f"{'-':>10s}"
+        print(f"  {stage:26s} {recorded.get(stage, 0.0):12.1f} {local_ms}")
+    rows_recorded = entry.get('rows_by_table') or {}
+    insert_paths = entry.get('insert_paths') or {}
+    print(f"  {'table':26s} {'inserted':>12s} {'mapped':>10s}  insert path")
+    for table in sorted(set(rows_recorded) | set(mapped)):
+        print(f"  {table:26s} {rows_recorded.get(table, 0):12d} {len(mapped.get(table, [])):10d}  {insert_paths.get(table, '-')}")
+
+
+def replay_slow_apps(args, cfg) -> None:
+    entries, recorded_contract = load_slow_apps(args.metrics_file, args.stage, args.limit)
+    if not entries:
+        print(f"No slow apps for stage '{args.stage}' in {args.metrics_file}")
+        return
+    contract_path = args.mapping_contract or recorded_contract
+    mapping_contract = cfg.load_mapping_contract(contract_path)
+    print(f"Replaying {len(entries)} slowest app(s) by '{args.stage}' from {args.metrics_file} "
+          f"(contract: {contract_path or 'default'})")
+
+    validator = PreProcessingValidator(mapping_contract_path=contract_path)
+    parser = XMLParser(config=cfg.get_processing_config())
+    mapper = DataMapper(mapping_contract_path=contract_path)
+    conn_str = build_conn_string(args.server, args.database, args.username, args.password, trusted=not args.username)
+    mig = MigrationEngine(conn_str, mapping_contract_path=contract_path)
+    with mig.get_connection() as conn:
+        for entry in entries:
+            try:
+                replay_app(conn, entry, mapping_contract.source_table, mapping_contract.source_column,
+                           validator, parser, mapper)
+            except Exception as e:
+                print(f"\napp_id={entry['app_id']}: replay failed: {e}")
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--server', required=True)
     parser.add_argument('--database', required=True)
-    parser.add_argument('--app-id', type=int, required=True)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--app-id', type=int)
+    target.add_argument('--metrics-file', help="Replay the apps in this metrics file's 'slow_apps' section")
+    parser.add_argument('--stage', default='total',
+                        help="Slow-app ranking to replay: total, validation, mapping, insert.<table>, ... or 'all'")
+    parser.add_argument('--limit', type=int, default=10, help='Maximum apps to replay (default: 10)')
+    parser.add_argument('--mapping-contract', help='Contract path (default: the one recorded in the metrics file)')
     parser.add_argument('--username')
     parser.add_argument('--password')
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.INFO)
 
+    if args.metrics_file:
+        logging.getLogger().setLevel(logging.WARNING)
+        replay_slow_apps(args, get_config_manager())
+        return
+
     cfg = get_config_manager()
     mapping_contract = cfg.load_mapping_contract()
     source_table = mapping_contract.source_table
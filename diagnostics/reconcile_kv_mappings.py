@@ -22,8 +22,14 @@ Usage examples
 - Override app_id (if the XML itself has a different Request/@ID):
   python diagnostics/reconcile_kv_mappings.py --xml-file <path> --app-id 123
 
+- Reconcile every source app_id in a range (after a contract change), in parallel and set-based:
+  python diagnostics/reconcile_kv_mappings.py --range 1:500000 --workers 8
+  Uses backfill_kv_rows.run_range in dry-run mode: per-table mapped / missing / value-mismatch /
+  extra counts for the whole range. Backfill the missing rows with backfill_kv_rows.py --range --apply.
+
 Outputs
 - Writes a JSON report to metrics/kv_reconcile_<app_id>_<timestamp>.json
+  (range mode: one aggregated metrics/kv_reconcile_range_<low>_<high>_<timestamp>.json)
 - Prints a concise console summary + top mismatches
 
 Notes
@@ -59,6 +65,11 @@ from xml_extractor.parsing.xml_parser import XMLParser
 from xml_extractor.utils import StringUtils
 from xml_extractor.validation.pre_processing_validator import PreProcessingValidator
 
+# Range mode shares the bulk engine with the backfill script (same directory)
+if str(Path(__file__).parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent))
+from backfill_kv_rows import parse_app_range, print_range_summary, run_range, write_range_report
+
 
 logger = logging.getLogger(__name__)
 
@@ -646,6 +657,10 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Reconcile KV (add_*) mappings end-to-end")
     parser.add_argument("--app-id", type=int, default=None, help="app_id to reconcile")
     parser.add_argument("--xml-file", type=str, default=None, help="Path to source XML file")
+    parser.add_argument("--range", dest="app_range", type=parse_app_range, default=None, metavar="LOW:HIGH",
+                        help="Reconcile every source app_id in LOW..HIGH (parallel, set-based, aggregated report)")
+    parser.add_argument("--workers", type=int, default=None, help="Range mode mapping processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Range mode apps per chunk (default: 2000)")
     parser.add_argument(
         "--output-json",
         type=str,
@@ -664,6 +679,20 @@ def main() -> int:
     config = get_config_manager()
     conn_str = config.get_database_connection_string()
 
+    if args.app_range:
+        result = run_range(conn_str, contract_path, args.app_range, apply=False,
+                           workers=args.workers, chunk_size=args.chunk_size)
+        if args.output_json:
+            out_path = Path(args.output_json)
+            if not out_path.is_absolute():
+                out_path = root_dir / out_path
+        else:
+            ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+            out_path = root_dir / "metrics" / f"kv_reconcile_range_{args.app_range[0]}_{args.app_range[1]}_{ts}.json"
+        write_range_report(result, out_path)
+        print_range_summary(result, out_path)
+        return 0
+
     xml_content: Optional[str] = None
     xml_source = ""
 
@@ -1,7 +1,8 @@
 """
 Summarize Failed Applications from Production Metrics
 
-Reads metrics JSON files and generates a consolidated failure report showing:
+Reads metrics JSON files (and the per-app results stream each one points to) and
+generates a consolidated failure report showing:
 - All failed app_ids with failure reasons
 - Failure breakdown by error stage
 - Optional CSV/JSON export for further analysis
@@ -21,6 +22,9 @@ USAGE:
     
     # Summarize all metrics from a session
     python diagnostics/summarize_failures.py --session 20260206_001448
+    
+    # Summarize a results stream directly (e.g. a run killed before writing its metrics file)
+    python diagnostics/summarize_failures.py --results-file metrics/results_20260206_001448.jsonl
 """
 
 import argparse
@@ -31,6 +35,13 @@ from datetime import datetime
 from collections import defaultdict
 from typing import List, Dict
 
+# Ensure workspace root is importable when running as a script
+WORKSPACE_ROOT = Path(__file__).parent.parent
+if str(WORKSPACE_ROOT) not in sys.path:
+    sys.path.insert(0, str(WORKSPACE_ROOT))
+
+from xml_extractor.monitoring.result_sink import read_results
+
 
 def find_latest_metrics_file() -> Path:
     """Find the most recent metrics file."""
@@ -121,9 +132,41 @@ def load_metrics(metrics_file: Path) -> dict:
         return json.load(f)
 
 
-def extract_failures(metrics: dict) -> List[Dict]:
-    """Extract failed apps from metrics structure."""
-    failed_apps = metrics.get('failed_apps', [])
+def read_stream_failures(results_file: Path) -> List[Dict]:
+    """Failed apps from a per-app results stream (JSONL written by production_processor)."""
+    return [
+        {
+            'app_id': record.get('app_id'),
+            'error_stage': record.get('error_stage') or 'unknown',
+            'error_message': record.get('error_message') or 'No error message available',
+            'processing_time': record.get('processing_time', 0),
+            'batch': record.get('batch')
+        }
+        for record in read_results(results_file)
+        if not record.get('success', True)
+    ]
+
+
+def extract_failures(metrics: dict, metrics_file: Path = None) -> List[Dict]:
+    """
+    Extract failed apps from metrics structure.
+    
+    Newer metrics files reference a results stream ('results_file'); older ones embed
+    a 'failed_apps' list.
+    """
+    results_file = metrics.get('results_file')
+    if results_file:
+        results_path = Path(results_file)
+        if not results_path.exists() and metrics_file is not None:
+            # Metrics copied elsewhere: look next to the metrics file
+            results_path = metrics_file.parent / results_path.name
+        if not results_path.exists():
+            print(f"WARNING: Results stream not found: {results_file}")
+            failed_apps = []
+        else:
+            failed_apps = read_stream_failures(results_path)
+    else:
+        failed_apps = metrics.get('failed_apps', [])
     
     # Enrich with metadata from metrics
     run_timestamp = metrics.get('run_timestamp', 'unknown')
@@ -147,7 +190,7 @@ def format_failure_summary(all_failures: List[Dict], metrics_files: List[Path])
     lines.append("=" * 100)
     lines.append(" FAILURE SUMMARY")
     lines.append("=" * 100)
-    lines.append(f" Metrics Files Analyzed: {len(metrics_files)}")
+    lines.append(f" Files Analyzed: {len(metrics_files)}")
     lines.append(f" Total Failed Applications: {len(all_failures)}")
     lines.append("")
     
@@ -250,6 +293,8 @@ def main():
                        help="Specific metrics JSON file to analyze")
     group.add_argument("--session", type=str,
                        help="Session ID to analyze all metrics files (e.g., '20260206_081615')")
+    group.add_argument("--results-file", type=Path,
+                       help="Per-app results stream (JSONL) to analyze directly")
     
     parser.add_argument("--csv", type=Path,
                        help="Export failures to CSV file")
@@ -262,7 +307,13 @@ def main():
     
     try:
         # Determine which metrics files to analyze
-        if args.metrics_file:
+        if args.results_file:
+            if not args.results_file.exists():
+                print(f"ERROR: Results file not found: {args.results_file}")
+                return 1
+            metrics_files = [args.results_file]
+            all_failures = read_stream_failures(args.results_file)
+        elif args.metrics_file:
             metrics_files = [args.metrics_file]
             if not metrics_files[0].exists():
                 print(f"ERROR: Metrics file not found: {metrics_files[0]}")
@@ -276,11 +327,12 @@ def main():
             print(f"Found {len(metrics_files)} metrics files from latest batch")
         
         # Load and extract failures from all files
-        all_failures = []
-        for metrics_file in metrics_files:
-            metrics = load_metrics(metrics_file)
-            failures = extract_failures(metrics)
-            all_failures.extend(failures)
+        if not args.results_file:
+            all_failures = []
+            for metrics_file in metrics_files:
+                metrics = load_metrics(metrics_file)
+                failures = extract_failures(metrics, metrics_file)
+                all_failures.extend(failures)
         
         # Print summary
         summary = format_failure_summary(all_failures, metrics_files)
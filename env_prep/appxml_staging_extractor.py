@@ -1,6 +1,14 @@
 """"
 Reconstruct and load minimal app_XML into staging table (namely avoids Reports, Journals, Audits, etc)
 This is much faster than letting SQL & Python handle large XML processing
+
+Default 'stream' mode:
+- source rows are streamed with fetchmany on a separate read connection (no TOP-n re-query per batch)
+- a target parser copies only the Provenir/Request attributes and the CustData subtree, and stops
+  feeding the document once CustData is closed (Reports/Journals/Audits are never built)
+- the minimal document is written as ASCII bytes (non-ASCII as character references) and passed
+  straight to executemany
+'--parser tree' keeps the original full-tree parse for comparison.
 """
 
 import argparse
@@ -11,6 +19,7 @@ import pyodbc
 
 from datetime import datetime, timezone
 from lxml import etree
+from xml.sax.saxutils import escape
 
 # Configuration paths - contract and staging table are product-line driven
 HERE = os.path.dirname(os.path.abspath(__file__))
@@ -112,35 +121,192 @@ def parse_request_and_custdata(xml_text):
     }
 
 
-def drop_staging_index(cursor, staging_table):
-    drop_idx_sql = f"""IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_app_xml_staging_app_id' AND object_id = OBJECT_ID(N'{staging_table}'))
-                        BEGIN
-                            DROP INDEX IX_app_xml_staging_app_id ON {staging_table};
-                        END
-                    """
-    cursor.execute(drop_idx_sql)
+# Attributes copied into the minimal document, in output order: (output name, source names)
+PROVENIR_ATTRIBUTES = (
+    ('appone_trans_id', ('appone_trans_id',)),
+    ('dt_app_id', ('dt_app_id',)),
+    ('dt_dealer_id', ('dt_dealer_id',)),
+)
+REQUEST_ATTRIBUTES = (
+    ('ID', ('ID', 'Id', 'id')),
+    ('Process', ('Process',)),
+    ('Status', ('Status',)),
+    ('Priority', ('Priority',)),
+    ('LastUpdatedBy', ('LastUpdatedBy',)),
+    ('LockedBy', ('LockedBy',)),
+    ('btcardtoken', ('btcardtoken',)),
+    ('btresponsecode', ('btresponsecode',)),
+    ('iovation_blackbox', ('iovation_blackbox',)),
+    ('useAlloyService', ('useAlloyService',)),
+    ('Trans', ('Trans',)),
+)
+
+# Source documents are fed to the parser in chunks so parsing can stop right after CustData
+FEED_CHUNK_BYTES = 64 * 1024
+
+
+class CustDataTarget:
+    """
+    lxml parser target: keeps the <Provenir> and first <Request> attributes, builds only the first
+    CustData that is a direct child of that Request (through a TreeBuilder) and ignores every other
+    element - the same nodes root.find('Request').find('CustData') picks on the tree path.
+    'done' turns True once CustData and its tail text are complete, or once the first Request
+    closes without one.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.root_attrib = None
+        self.request_attrib = None
+        self.cust = None
+        self.done = False
+        self._in_request = False
+        self._builder = None
+        self._tail = None
+
+    def _finish_tail(self):
+        if self._tail is not None:
+            self.cust.tail = ''.join(self._tail) or None
+            self._tail = None
+            self.done = True
+
+    def start(self, tag, attrib, nsmap=None):
+        self._finish_tail()
+        self.depth += 1
+        if self._builder is not None:
+            self._builder.start(tag, attrib, nsmap)
+        elif self.depth == 1:
+            self.root_attrib = dict(attrib)
+        elif self.depth == 2 and tag == 'Request' and self.request_attrib is None:
+            self.request_attrib = dict(attrib)
+            self._in_request = True
+        elif self.depth == 3 and tag == 'CustData' and self._in_request and self.cust is None:
+            self._builder = etree.TreeBuilder()
+            self._builder.start(tag, attrib, nsmap)
+
+    def end(self, tag):
+        self._finish_tail()
+        if self._builder is not None:
+            self._builder.end(tag)
+            if self.depth == 3:
+                self.cust = self._builder.close()
+                self._builder = None
+                self._tail = []
+        elif self.depth == 2 and self._in_request:
+            # First Request closed; a CustData anywhere later is not the one the tree path uses
+            self._in_request = False
+            if self.cust is None:
+                self.done = True
+        self.depth -= 1
+
+    def data(self, text):
+        if self._builder is not None:
+            self._builder.data(text)
+        elif self._tail is not None:
+            self._tail.append(text)
+
+    def comment(self, text):
+        self._finish_tail()
+        if self._builder is not None:
+            self._builder.comment(text)
+
+    def pi(self, target, data=None):
+        self._finish_tail()
+        if self._builder is not None:
+            self._builder.pi(target, data)
+
+    def close(self):
+        self._finish_tail()
+        return self
+
+
+def _attribute(attrib, names):
+    for name in names:
+        value = attrib.get(name)
+        if value:
+            return value
+    return ''
+
+
+def _attributes_xml(attrib, spec):
+    return ''.join(
+        f' {name}="{escape(_attribute(attrib, sources), {chr(34): "&quot;"})}"' for name, sources in spec
+    ).encode('ascii', 'xmlcharrefreplace')
+
+
+def stream_request_and_custdata(xml_bytes):
+    """
+    Build the minimal staging document from a source document without parsing all of it.
+
+    The document is fed to a CustDataTarget parser until CustData is complete; the rest (Reports,
+    Journals, Audits, ...) is never parsed, so trailing malformed content is not detected.
+
+    Returns:
+        (app_id, minimal_xml bytes) - app_id is the Request ID attribute (None if absent)
+        None if parsing fails or Request/CustData is missing.
+    """
+    if isinstance(xml_bytes, str):
+        xml_bytes = xml_bytes.encode('utf-8')
+    target = CustDataTarget()
+    parser = etree.XMLParser(target=target)
     try:
-        cursor.commit()
+        view = memoryview(xml_bytes)
+        for offset in range(0, len(view), FEED_CHUNK_BYTES):
+            parser.feed(view[offset:offset + FEED_CHUNK_BYTES].tobytes())
+            if target.done:
+                break
+        else:
+            parser.close()
     except Exception:
-        pass
+        return None
 
+    if target.cust is None:
+        return None
 
-def create_staging_index(cursor, staging_table):
-    create_idx_sql = f"CREATE INDEX IX_app_xml_staging_app_id ON {staging_table} (app_id) INCLUDE (app_xml);"
-    cursor.execute(create_idx_sql)
     try:
-        cursor.commit()
+        cust_xml = etree.tostring(target.cust, encoding='us-ascii')
     except Exception:
-        pass
+        return None
 
+    request = target.request_attrib
+    app_id = request.get('ID') or request.get('Id') or request.get('id')
+    minimal_xml = b''.join((
+        b'<Provenir', _attributes_xml(target.root_attrib, PROVENIR_ATTRIBUTES), b'>',
+        b'<Request', _attributes_xml(request, REQUEST_ATTRIBUTES), b'>',
+        cust_xml,
+        b'</Request></Provenir>'
+    ))
+    return app_id, minimal_xml
+
+
+def tree_request_and_custdata(xml_text):
+    """Original full-tree path: (app_id, minimal_xml str) or None."""
+    parsed = parse_request_and_custdata(xml_text)
+    if parsed is None:
+        return None
 
-def main(product_line, batch_size, limit, start_after, mod=None, rem=None, drop_index=False, recreate_index=False, metrics_path=None, source_table_override=None, source_column_override=None, force_source_ok=False):
-    """
-    Main staging extractor - product-line aware.
-    
-    Args:
-        product_line: 'CC' or 'RL' - determines contract, staging table, and source application table
-    """
+    # Extract values from dictionary
+    app_id_attr = str(parsed['app_id']) if parsed['app_id'] is not None else ''
+    appone_trans_id_attr = str(parsed['appone_trans_id'])
+    dt_app_id_attr = str(parsed['dt_app_id'])
+    dt_dealer_id_attr = str(parsed['dt_dealer_id'])
+    process_attr = str(parsed['process'])
+    status_attr = str(parsed['status'])
+    priority_attr = str(parsed['priority'])
+    last_updated_by_attr = str(parsed['last_updated_by'])
+    locked_by_attr = str(parsed['locked_by'])
+    btcardtoken_attr = str(parsed['btcardtoken'])
+    btresponsecode_attr = str(parsed['btresponsecode'])
+    iovation_blackbox_attr = str(parsed['iovation_blackbox'])
+    use_alloy_service_attr = str(parsed['use_alloy_service'])
+    trans_attr = str(parsed['trans'])
+
+    minimal_xml = f"<Provenir appone_trans_id=\"{appone_trans_id_attr}\" dt_app_id=\"{dt_app_id_attr}\" dt_dealer_id=\"{dt_dealer_id_attr}\"><Request ID=\"{app_id_attr}\" Process=\"{process_attr}\" Status=\"{status_attr}\" Priority=\"{priority_attr}\" LastUpdatedBy=\"{last_updated_by_attr}\" LockedBy=\"{locked_by_attr}\" btcardtoken=\"{btcardtoken_attr}\" btresponsecode=\"{btresponsecode_attr}\" iovation_blackbox=\"{iovation_blackbox_attr}\" useAlloyService=\"{use_alloy_service_attr}\" Trans=\"{trans_attr}\">{parsed['cust_xml']}</Request></Provenir>"
+    return parsed['app_id'], minimal_xml
+
+
+def load_staging_config(product_line, source_table_override=None, source_column_override=None, force_source_ok=False):
+    """Resolve contract-driven staging configuration and the connection string for a product line."""
     # Load product-line specific configuration
     db_config = load_json(DB_CONFIG_PATH)
     
@@ -160,9 +326,6 @@ def main(product_line, batch_size, limit, start_after, mod=None, rem=None, drop_
     if not source_application_table:
         raise RuntimeError(f"Contract {contract_filename} missing 'source_application_table' field")
     
-    # Build fully qualified staging table name from contract
-    staging_table = f'[{target_schema}].[{staging_table_name}]'
-    
     # Source XML always comes from dbo.app_xml (not the staging table)
     source_table = source_table_override or 'app_xml'
     source_column = source_column_override or 'app_XML'
@@ -172,8 +335,131 @@ def main(product_line, batch_size, limit, start_after, mod=None, rem=None, drop_
     if 'staging' in normalized_source and not force_source_ok:
         raise RuntimeError(f"Refusing to read from staging table '{source_table}'. Use --source-table to point to original source (e.g. app_xml) or pass --force-source-ok to override.")
 
-    conn_str = build_connection_string(db_config)
+    return {
+        'contract_filename': contract_filename,
+        'target_schema': target_schema,
+        # Build fully qualified staging table name from contract
+        'staging_table': f'[{target_schema}].[{staging_table_name}]',
+        'source_application_table': source_application_table,
+        'source_table': source_table,
+        'source_column': source_column,
+        'conn_str': build_connection_string(db_config)
+    }
+
+
+def build_source_query(config, after_app_id=0, mod=None, rem=None, top=None):
+    """Source SELECT in app_id order: (app_id, xml) rows after after_app_id, optionally partitioned / TOP-limited."""
+    where_parts = []
+    if after_app_id:
+        where_parts.append(f"s.app_id > {after_app_id}")
+
+    if mod is not None:
+        where_parts.append(f"(s.app_id % {mod}) = {rem}")
+
+    # Product-line specific: Only include records with corresponding application in the correct table
+    # CC uses [application], RL uses [IL_application] - this ensures distinct staging per product line
+    where_parts.append(f"EXISTS (SELECT 1 FROM [dbo].[{config['source_application_table']}] a WITH (NOLOCK) WHERE a.app_id = s.app_id)")
+
+    where_clause = ("WHERE " + " AND ".join(where_parts)) if where_parts else ""
+    select_clause = f"TOP ({top}) " if top else ""
+    return f"SELECT {select_clause}s.app_id, s.[{config['source_column']}] FROM [dbo].[{config['source_table']}] s {where_clause} ORDER BY s.app_id"
+
+
+def staging_insert_sql(staging_table, parser_mode='stream'):
+    if parser_mode == 'stream':
+        # Payloads are ASCII bytes (bound as varbinary); CONVERT keeps them text for varchar and nvarchar columns
+        return f"INSERT INTO {staging_table} (app_id, app_XML) VALUES (?, CONVERT(varchar(max), ?))"
+    return f"INSERT INTO {staging_table} (app_id, app_XML) VALUES (?, ?)"
+
+
+def stage_rows(rows, parser_mode='stream'):
+    """
+    Build minimal staging documents for a batch of (app_id, xml) source rows.
+
+    Rows that fail to parse or have no CustData are skipped.
+    Returns (staged_rows, source_app_ids, bytes_in, bytes_out) - staged_rows are (app_id, minimal_xml)
+    insert parameters (app_id from the XML Request ID); source_app_ids holds the source table
+    app_id of each staged row, for resume points.
+    """
+    extract = stream_request_and_custdata if parser_mode == 'stream' else tree_request_and_custdata
+    staged_rows = []
+    source_app_ids = []
+    bytes_in = 0
+    bytes_out = 0
+    for source_app_id, xml_text in rows:
+        if not xml_text:
+            continue
+        xml_bytes = xml_text.encode('utf-8') if isinstance(xml_text, str) else xml_text
+        bytes_in += len(xml_bytes)
+        staged = extract(xml_bytes)
+        if staged is None:
+            continue
+        minimal_xml = staged[1]
+        bytes_out += len(minimal_xml) if isinstance(minimal_xml, bytes) else len(minimal_xml.encode('utf-8'))
+        staged_rows.append(staged)
+        source_app_ids.append(source_app_id)
+    return staged_rows, source_app_ids, bytes_in, bytes_out
+
+
+def fetch_source_batches(conn_str, select_sql, batch_size):
+    """
+    Yield fetchmany(batch_size) batches from a single forward-only read of the source query.
+
+    The read runs on its own autocommit connection so the load connection is free for
+    executemany/commit between batches.
+    """
+    read_connection = pyodbc.connect(conn_str, autocommit=True)
+    try:
+        read_cursor = read_connection.cursor()
+        read_cursor.execute(select_sql)
+        while True:
+            rows = read_cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        read_connection.close()
+
+
+def drop_staging_index(cursor, staging_table):
+    drop_idx_sql = f"""IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_app_xml_staging_app_id' AND object_id = OBJECT_ID(N'{staging_table}'))
+                        BEGIN
+                            DROP INDEX IX_app_xml_staging_app_id ON {staging_table};
+                        END
+                    """
+    cursor.execute(drop_idx_sql)
+    try:
+        cursor.commit()
+    except Exception:
+        pass
+
+
+def create_staging_index(cursor, staging_table):
+    create_idx_sql = f"CREATE INDEX IX_app_xml_staging_app_id ON {staging_table} (app_id) INCLUDE (app_xml);"
+    cursor.execute(create_idx_sql)
+    try:
+        cursor.commit()
+    except Exception:
+        pass
+
+
+def main(product_line, batch_size, limit, start_after, mod=None, rem=None, drop_index=False, recreate_index=False, metrics_path=None, source_table_override=None, source_column_override=None, force_source_ok=False, parser_mode='stream'):
+    """
+    Main staging extractor - product-line aware.
     
+    Args:
+        product_line: 'CC' or 'RL' - determines contract, staging table, and source application table
+        parser_mode: 'stream' (CustData-only target parser, bytes payloads) or 'tree' (full lxml tree)
+    """
+    config = load_staging_config(product_line, source_table_override, source_column_override, force_source_ok)
+    contract_filename = config['contract_filename']
+    target_schema = config['target_schema']
+    staging_table = config['staging_table']
+    source_application_table = config['source_application_table']
+    source_table = config['source_table']
+    source_column = config['source_column']
+    conn_str = config['conn_str']
+
     print("="*80)
     print(f"XML STAGING EXTRACTOR - Product Line: {product_line}")
     print("="*80)
@@ -183,6 +469,7 @@ def main(product_line, batch_size, limit, start_after, mod=None, rem=None, drop_
     print(f"Source app table:      [dbo].[{source_application_table}]")
     print(f"Staging table:         {staging_table}")
     print(f"Target schema:         {target_schema}")
+    print(f"Parser:                {parser_mode}")
     print(f"Connection:            {conn_str.split(';')[1]} (server info hidden)")
     print("="*80)
 
@@ -201,93 +488,69 @@ def main(product_line, batch_size, limit, start_after, mod=None, rem=None, drop_
         drop_staging_index(cursor, staging_table)
 
     processed_count = 0
+    bytes_in_total = 0
+    bytes_out_total = 0
     last_app_id = start_after or 0
     start_time = time.time()
 
-    while True:
-        select_clause = f"TOP ({batch_size})"
-        where_parts = []
-        if last_app_id:
-            where_parts.append(f"s.app_id > {last_app_id}")
-
-        if mod is not None:
-            where_parts.append(f"(s.app_id % {mod}) = {rem}")
-
-        # Product-line specific: Only include records with corresponding application in the correct table
-        # CC uses [application], RL uses [IL_application] - this ensures distinct staging per product line
-        where_parts.append(f"EXISTS (SELECT 1 FROM [dbo].[{source_application_table}] a WITH (NOLOCK) WHERE a.app_id = s.app_id)")
-
-        where_clause = ("WHERE " + " AND ".join(where_parts)) if where_parts else ""
-        select_sql = f"SELECT {select_clause} s.app_id, s.[{source_column}] FROM [dbo].[{source_table}] s {where_clause} ORDER BY s.app_id"
+    select_sql = build_source_query(config, last_app_id, mod, rem)
+    insert_sql = staging_insert_sql(staging_table, parser_mode)
 
-        # print(f"SQL {select_sql}")
-
-        now = time.time()
-        cursor.execute(select_sql)
-        rows = cursor.fetchall()
-        if not rows:
-            print("No more rows to process; exiting")
-            break
+    batches = fetch_source_batches(conn_str, select_sql, batch_size)
+    try:
+        while True:
+            now = time.time()
+            rows = next(batches, None)
+            if not rows:
+                print("No more rows to process; exiting")
+                break
 
-        parsed_rows = []
-        for app_id, xml_text in rows:
-            parsed = parse_request_and_custdata(xml_text)
-            
             # Skip rows where parsing failed or CustData is missing
-            if parsed is None:
-                continue
-
-            # Extract values from dictionary
-            app_id_attr = str(parsed['app_id']) if parsed['app_id'] is not None else ''
-            appone_trans_id_attr = str(parsed['appone_trans_id'])
-            dt_app_id_attr = str(parsed['dt_app_id'])
-            dt_dealer_id_attr = str(parsed['dt_dealer_id'])
-            process_attr = str(parsed['process'])
-            status_attr = str(parsed['status'])
-            priority_attr = str(parsed['priority'])
-            last_updated_by_attr = str(parsed['last_updated_by'])
-            locked_by_attr = str(parsed['locked_by'])
-            btcardtoken_attr = str(parsed['btcardtoken'])
-            btresponsecode_attr = str(parsed['btresponsecode'])
-            iovation_blackbox_attr = str(parsed['iovation_blackbox'])
-            use_alloy_service_attr = str(parsed['use_alloy_service'])
-            trans_attr = str(parsed['trans'])
-
-            minimal_xml = f"<Provenir appone_trans_id=\"{appone_trans_id_attr}\" dt_app_id=\"{dt_app_id_attr}\" dt_dealer_id=\"{dt_dealer_id_attr}\"><Request ID=\"{app_id_attr}\" Process=\"{process_attr}\" Status=\"{status_attr}\" Priority=\"{priority_attr}\" LastUpdatedBy=\"{last_updated_by_attr}\" LockedBy=\"{locked_by_attr}\" btcardtoken=\"{btcardtoken_attr}\" btresponsecode=\"{btresponsecode_attr}\" iovation_blackbox=\"{iovation_blackbox_attr}\" useAlloyService=\"{use_alloy_service_attr}\" Trans=\"{trans_attr}\">{parsed['cust_xml']}</Request></Provenir>"
-            parsed_rows.append((parsed['app_id'], minimal_xml))
-            last_app_id = parsed['app_id']
-            processed_count += 1
+            staged_rows, source_app_ids, batch_bytes_in, batch_bytes_out = stage_rows(rows, parser_mode)
+            last_app_id = rows[-1][0]
+            if limit and processed_count + len(staged_rows) >= limit:
+                # Resume point is the source app_id of the last row kept, not its XML Request ID
+                staged_rows = staged_rows[:limit - processed_count]
+                last_app_id = source_app_ids[len(staged_rows) - 1] if staged_rows else last_app_id
+            processed_count += len(staged_rows)
+
+            if staged_rows:
+                try:
+                    cursor.executemany(insert_sql, staged_rows)
+                    connection.commit()
+                    print(f"Inserted {len(staged_rows)} rows into staging (last_app_id={last_app_id})")
+                except Exception as e:
+                    connection.rollback()
+                    print(f"Insert failed: {e}")
+                    raise
+
+            bytes_in_total += batch_bytes_in
+            bytes_out_total += batch_bytes_out
+            batch_time = time.time() - now
+            rate = len(staged_rows) / batch_time if batch_time > 0 else 0
+            reduction = (1 - batch_bytes_out / batch_bytes_in) if batch_bytes_in else 0
+            print(f"XML Staging batch: fetched={len(rows)} inserted={len(staged_rows)} batch_time={batch_time:.3f}s rate={rate:.1f} rows/sec "
+                  f"bytes_in={batch_bytes_in} bytes_out={batch_bytes_out} ({reduction:.0%} smaller)")
+
             if limit and processed_count >= limit:
+                print(f"Reached limit of {limit} processed rows; exiting")
                 break
-
-        if parsed_rows:
-            insert_sql = f"INSERT INTO {staging_table} (app_id, app_XML) VALUES (?, ?)"
-            
-            try:
-                cursor.executemany(insert_sql, parsed_rows)
-                connection.commit()
-                print(f"Inserted {len(parsed_rows)} rows into staging (last_app_id={last_app_id})")
-            except Exception as e:
-                connection.rollback()
-                print(f"Insert failed: {e}")
-                raise
-
-        batch_time = time.time() - now
-        rate = len(parsed_rows) / batch_time if batch_time > 0 else 0
-        print(f"XML Staging batch: fetched={len(rows)} inserted={len(parsed_rows)} batch_time={batch_time:.3f}s rate={rate:.1f} rows/sec")
-
-        if limit and processed_count >= limit:
-            print(f"Reached limit of {limit} processed rows; exiting")
-            break
+    finally:
+        batches.close()
 
     total_duration = time.time() - start_time
     summary = {
         'processed': processed_count,
         'duration_seconds': total_duration,
         'rows_per_second': (processed_count / total_duration) if total_duration > 0 else 0,
+        'bytes_in': bytes_in_total,
+        'bytes_out': bytes_out_total,
+        'parser': parser_mode,
+        'last_app_id': last_app_id,
         'finished_at': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
     }
-    print(f"Completed. Total # processed: {processed_count} rows in {total_duration:.1f}s ({summary['rows_per_second']:.1f} rows/sec)")
+    print(f"Completed. Total # processed: {processed_count} rows in {total_duration:.1f}s ({summary['rows_per_second']:.1f} rows/sec, "
+          f"{bytes_in_total / 1048576:.1f} MB in, {bytes_out_total / 1048576:.1f} MB out)")
 
     if metrics_path:
         try:
@@ -311,7 +574,7 @@ if __name__ == '__main__':
     parser.add_argument('--product-line', type=str, required=True,
                        choices=['CC', 'RL'],
                        help="Product line to process: 'CC' (Credit Card) or 'RL' (Rec Lending) - REQUIRED")
-    parser.add_argument('--batch', type=int, default=1000, help='batch size to fetch from source table')
+    parser.add_argument('--batch', type=int, default=1000, help='rows per fetchmany/executemany batch')
     parser.add_argument('--limit', type=int, default=0, help='maximum number of reduced rows to insert (0 = unlimited)')
     parser.add_argument('--start-after', type=int, default=0, help='start after this app_id (useful to resume)')
     parser.add_argument('--mod', type=int, default=0, help='partition modulus for worker (e.g., 8)')
@@ -322,6 +585,8 @@ if __name__ == '__main__':
     parser.add_argument('--source-table', type=str, default='', help='override source table (defaults to dbo.app_xml)')
     parser.add_argument('--source-column', type=str, default='', help='override source column (defaults to app_XML)')
     parser.add_argument('--force-source-ok', action='store_true', help='allow using the staging table as a source (dangerous)')
+    parser.add_argument('--parser', type=str, default='stream', choices=['stream', 'tree'],
+                       help="'stream' (default): CustData-only target parser with bytes output; 'tree': original full-tree parse")
 
     args = parser.parse_args()
     mod = args.mod if args.mod and args.mod > 0 else None
@@ -329,4 +594,4 @@ if __name__ == '__main__':
     metrics_path = args.metrics if args.metrics else None
     source_table = args.source_table if args.source_table else None
     source_column = args.source_column if args.source_column else None
-    main(product_line=args.product_line, batch_size=args.batch, limit=args.limit or None, start_after=(args.start_after or 0), mod=mod, rem=rem, drop_index=args.drop_index, recreate_index=args.recreate_index, metrics_path=metrics_path, source_table_override=source_table, source_column_override=source_column, force_source_ok=args.force_source_ok)
+    main(product_line=args.product_line, batch_size=args.batch, limit=args.limit or None, start_after=(args.start_after or 0), mod=mod, rem=rem, drop_index=args.drop_index, recreate_index=args.recreate_index, metrics_path=metrics_path, source_table_override=source_table, source_column_override=source_column, force_source_ok=args.force_source_ok, parser_mode=args.parser)
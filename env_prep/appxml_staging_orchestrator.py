@@ -1,25 +1,42 @@
 """Stage app_XML orchestrator
 
-Launches multiple `appxml_staging_extractor.py` workers, optionally drops the staging index once
-before the load, recreates the index after, and aggregates per-worker metrics into a single
-summary file.
+Two modes:
+- pool (default): a single process with one source reader (keyset ranges drained with fetchmany),
+  a process pool for the CPU-bound CustData extraction (one worker per core by default) and a few
+  writer threads, each with its own connection, bulk-inserting into staging. The source is
+  scanned once, and one metrics summary is written.
+- subprocess: launches multiple `appxml_staging_extractor.py` workers with --mod/--rem, each
+  scanning its own partition, and aggregates per-worker metrics afterwards.
+
+Both modes optionally drop the staging index once before the load and recreate it after.
 
 Usage (PowerShell):
 # For CC staging
-python env_prep\appxml_staging_orchestrator.py --product-line CC --workers 8 --batch 2000 --drop-index --recreate-index --metrics-dir metrics
+python env_prep\appxml_staging_orchestrator.py --product-line CC --batch 2000 --writers 2 --drop-index --recreate-index --metrics-dir metrics
 
 # For RL staging
-python env_prep\appxml_staging_orchestrator.py --product-line RL --workers 8 --batch 2000 --drop-index --recreate-index --metrics-dir metrics
+python env_prep\appxml_staging_orchestrator.py --product-line RL --batch 2000 --writers 2 --drop-index --recreate-index --metrics-dir metrics
+
+# Previous behaviour: 8 extractor subprocesses
+python env_prep\appxml_staging_orchestrator.py --product-line CC --mode subprocess --workers 8 --batch 2000 --drop-index --recreate-index
 """
 
 import argparse
 import json
 import os
+import queue
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+import pyodbc
+
+import appxml_staging_extractor as extractor
+
 HERE = os.path.dirname(os.path.abspath(__file__))
 ROOT = os.path.abspath(os.path.join(HERE, '..'))
 PILOT = os.path.join(HERE, 'appxml_staging_extractor.py')
@@ -91,6 +108,222 @@ def aggregate_metrics(metrics_dir, out_path):
     return agg
 
 
+def read_keyset_ranges(config, start_after, range_rows, batch):
+    """
+    Single source reader: TOP (range_rows) keyset ranges in app_id order, each drained with
+    fetchmany(batch). Yields lists of (app_id, xml) tuples.
+    """
+    last_app_id = start_after
+    while True:
+        fetched = 0
+        select_sql = extractor.build_source_query(config, last_app_id, top=range_rows)
+        for rows in extractor.fetch_source_batches(config['conn_str'], select_sql, batch):
+            fetched += len(rows)
+            last_app_id = rows[-1][0]
+            yield [(row[0], row[1]) for row in rows]
+        if fetched < range_rows:
+            return
+
+
+class CommitWatermark:
+    """
+    Commit progress across writers: rows inserted, and the highest source app_id below which every
+    dispatched batch is committed (safe --start-after for a resumed run).
+    """
+
+    def __init__(self, start_after):
+        self.app_id = start_after
+        self.inserted = 0
+        self._next_seq = 0
+        self._done = {}
+        self._lock = threading.Lock()
+
+    def committed(self, seq, last_app_id, rows):
+        with self._lock:
+            self.inserted += rows
+            self._done[seq] = last_app_id
+            while self._next_seq in self._done:
+                self.app_id = self._done.pop(self._next_seq)
+                self._next_seq += 1
+
+
+def truncate_to_limit(staged_rows, source_app_ids, last_app_id, staged_so_far, limit):
+    """
+    Cut a staged batch down to what is left of --limit.
+
+    Returns (staged_rows, last_app_id). When rows are dropped, last_app_id becomes the source
+    app_id of the last row kept (not its XML Request ID), so the watermark never passes a
+    row that was not written.
+    """
+    if not limit or staged_so_far + len(staged_rows) <= limit:
+        return staged_rows, last_app_id
+    staged_rows = staged_rows[:max(0, limit - staged_so_far)]
+    return staged_rows, source_app_ids[len(staged_rows) - 1] if staged_rows else last_app_id
+
+
+def write_batches(conn_str, insert_sql, work_queue, watermark, errors):
+    """
+    Writer thread: executemany + commit each staged batch on its own connection.
+
+    After any writer fails, batches are still taken off the queue (so the reader never blocks)
+    but no longer inserted; the watermark stops at the first failed batch.
+    """
+    connection = None
+    cursor = None
+    try:
+        connection = pyodbc.connect(conn_str, autocommit=False)
+        cursor = connection.cursor()
+        cursor.fast_executemany = True
+    except Exception as e:
+        print(f"Writer connection failed: {e}")
+        errors.append(e)
+    try:
+        while True:
+            item = work_queue.get()
+            if item is None:
+                return
+            seq, staged_rows, last_app_id = item
+            if errors:
+                continue
+            if staged_rows:
+                try:
+                    cursor.executemany(insert_sql, staged_rows)
+                    connection.commit()
+                except Exception as e:
+                    connection.rollback()
+                    print(f"Insert failed (batch {seq}, last_app_id={last_app_id}): {e}")
+                    errors.append(e)
+                    continue
+            watermark.committed(seq, last_app_id, len(staged_rows))
+    finally:
+        if connection is not None:
+            connection.close()
+
+
+def _put(work_queue, item, errors):
+    # Bounded queue: wait for writers, but don't block forever if they've failed
+    while True:
+        try:
+            work_queue.put(item, timeout=1)
+            return
+        except queue.Full:
+            if errors:
+                raise errors[0]
+
+
+def run_pool(product_line, workers, writers, batch, range_rows, limit, start_after, parser_mode, drop_index, recreate_index, metrics_dir):
+    config = extractor.load_staging_config(product_line)
+    staging_table = config['staging_table']
+    os.makedirs(metrics_dir, exist_ok=True)
+
+    print("="*80)
+    print(f"XML STAGING ORCHESTRATOR (in-process) - Product Line: {product_line}")
+    print("="*80)
+    print(f"Source table:      [dbo].[{config['source_table']}] (single keyset scan, {range_rows} rows per range)")
+    print(f"Staging table:     {staging_table}")
+    print(f"Extract workers:   {workers} processes ({parser_mode} parser)")
+    print(f"Writers:           {writers} connections")
+    print(f"Batch size:        {batch}")
+    print(f"Drop index:        {drop_index}")
+    print(f"Recreate index:    {recreate_index}")
+    print(f"Metrics dir:       {metrics_dir}")
+    print("="*80)
+
+    admin_connection = pyodbc.connect(config['conn_str'], autocommit=False)
+    try:
+        admin_cursor = admin_connection.cursor()
+        if drop_index:
+            print("Dropping staging nonclustered index before load (if present)")
+            extractor.drop_staging_index(admin_cursor, staging_table)
+
+        insert_sql = extractor.staging_insert_sql(staging_table, parser_mode)
+        watermark = CommitWatermark(start_after)
+        totals = {'fetched': 0, 'staged': 0, 'bytes_in': 0, 'bytes_out': 0, 'batches': 0}
+        errors = []
+        work_queue = queue.Queue(maxsize=writers * 2)
+        writer_threads = [
+            threading.Thread(target=write_batches, args=(config['conn_str'], insert_sql, work_queue, watermark, errors),
+                             name=f'staging-writer-{i}', daemon=True)
+            for i in range(writers)
+        ]
+        for thread in writer_threads:
+            thread.start()
+
+        start_time = time.time()
+        pending = deque()
+        reader = read_keyset_ranges(config, start_after, range_rows, batch)
+
+        def drain_one():
+            seq, last_app_id, fetched, future = pending.popleft()
+            if limit and totals['staged'] >= limit:
+                future.cancel()  # Dispatched before the limit was reached; never written
+                return
+            staged_rows, source_app_ids, bytes_in, bytes_out = future.result()
+            staged_rows, last_app_id = truncate_to_limit(staged_rows, source_app_ids, last_app_id, totals['staged'], limit)
+            totals['fetched'] += fetched
+            totals['staged'] += len(staged_rows)
+            totals['bytes_in'] += bytes_in
+            totals['bytes_out'] += bytes_out
+            totals['batches'] += 1
+            _put(work_queue, (seq, staged_rows, last_app_id), errors)
+            elapsed = time.time() - start_time
+            rate = totals['staged'] / elapsed if elapsed > 0 else 0
+            print(f"XML Staging batch {seq}: fetched={fetched} staged={len(staged_rows)} bytes_in={bytes_in} bytes_out={bytes_out} "
+                  f"| total staged={totals['staged']} inserted={watermark.inserted} rate={rate:.1f} rows/sec committed_through={watermark.app_id}")
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for seq, rows in enumerate(reader):
+                    if errors or (limit and totals['staged'] >= limit):
+                        break
+                    pending.append((seq, rows[-1][0], len(rows), pool.submit(extractor.stage_rows, rows, parser_mode)))
+                    # Bounded in-flight work: results are drained in dispatch order
+                    while len(pending) >= workers * 2:
+                        drain_one()
+                while pending:
+                    drain_one()
+        finally:
+            reader.close()
+            for _ in writer_threads:
+                work_queue.put(None)
+            for thread in writer_threads:
+                thread.join()
+        if errors:
+            raise errors[0]
+
+        duration = time.time() - start_time
+        summary = {
+            'mode': 'pool',
+            'workers': workers,
+            'writers': writers,
+            'parser': parser_mode,
+            'total_fetched': totals['fetched'],
+            'total_processed': watermark.inserted,
+            'total_duration_seconds': duration,
+            'average_rows_per_second': watermark.inserted / duration if duration > 0 else 0.0,
+            'bytes_in': totals['bytes_in'],
+            'bytes_out': totals['bytes_out'],
+            'last_app_id': watermark.app_id,
+            'collected_at': datetime.utcnow().isoformat() + 'Z'
+        }
+        out_path = os.path.join(metrics_dir, 'appxml_aggregate.json')
+        with open(out_path, 'w', encoding='utf-8') as of:
+            json.dump(summary, of, indent=2)
+        print(f"Completed. Total # processed: {watermark.inserted} rows in {duration:.1f}s ({summary['average_rows_per_second']:.1f} rows/sec, "
+              f"{totals['bytes_in'] / 1048576:.1f} MB in, {totals['bytes_out'] / 1048576:.1f} MB out); committed through app_id {watermark.app_id}")
+        print(f"Wrote metrics to {out_path}")
+
+        if recreate_index:
+            print("Recreating staging index after load")
+            try:
+                extractor.create_staging_index(admin_cursor, staging_table)
+            except Exception as e:
+                print(f"Failed to recreate index: {e}")
+    finally:
+        admin_connection.close()
+    return summary
+
+
 def main(product_line, workers, batch, drop_index, recreate_index, metrics_dir, log_dir, extra_args):
     ensure_dirs(log_dir, metrics_dir)
 
@@ -142,18 +375,30 @@ def main(product_line, workers, batch, drop_index, recreate_index, metrics_dir,
 
 
 if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description='Orchestrate multiple appxml_staging_extractor.py workers - product-line aware')
+    parser = argparse.ArgumentParser(description='Orchestrate app_XML staging (in-process pool or appxml_staging_extractor.py workers) - product-line aware')
     parser.add_argument('--product-line', type=str, required=True,
                        choices=['CC', 'RL'],
                        help="Product line to process: 'CC' (Credit Card) or 'RL' (Rec Lending) - REQUIRED")
-    parser.add_argument('--workers', type=int, default=8, help='number of worker processes to launch')
-    parser.add_argument('--batch', type=int, default=2000, help='batch size passed to worker')
-    parser.add_argument('--drop-index', action='store_true', help='drop staging index before load (worker 0 will drop it)')
+    parser.add_argument('--mode', type=str, default='pool', choices=['pool', 'subprocess'],
+                       help="'pool' (default): one reader, extraction process pool, writer connections; 'subprocess': --mod/--rem extractor processes")
+    parser.add_argument('--workers', type=int, default=0, help='extraction processes (pool default: all cores) or worker subprocesses (subprocess default: 8)')
+    parser.add_argument('--writers', type=int, default=2, help='pool mode: writer connections inserting into staging')
+    parser.add_argument('--range-rows', type=int, default=50000, help='pool mode: source rows per keyset range query')
+    parser.add_argument('--limit', type=int, default=0, help='pool mode: maximum number of rows to stage (0 = unlimited)')
+    parser.add_argument('--start-after', type=int, default=0, help='pool mode: start after this app_id (resume from last_app_id)')
+    parser.add_argument('--parser', type=str, default='stream', choices=['stream', 'tree'], help='pool mode: CustData extraction parser')
+    parser.add_argument('--batch', type=int, default=2000, help='rows per fetch / extraction / insert batch')
+    parser.add_argument('--drop-index', action='store_true', help='drop staging index before load (subprocess mode: worker 0 will drop it)')
     parser.add_argument('--recreate-index', action='store_true', help='recreate staging index after load')
     parser.add_argument('--metrics-dir', type=str, default=os.path.join(ROOT, 'metrics'), help='directory to store per-worker metrics')
     parser.add_argument('--log-dir', type=str, default=os.path.join(ROOT, 'logs'), help='directory to store per-worker stdout/stderr')
-    parser.add_argument('--extra', nargs=argparse.REMAINDER, help='extra args to forward to workers')
+    parser.add_argument('--extra', nargs=argparse.REMAINDER, help='subprocess mode: extra args to forward to workers')
 
     args = parser.parse_args()
+    if args.mode == 'pool':
+        run_pool(product_line=args.product_line, workers=args.workers or os.cpu_count() or 1, writers=max(1, args.writers),
+                 batch=args.batch, range_rows=args.range_rows, limit=args.limit or None, start_after=args.start_after,
+                 parser_mode=args.parser, drop_index=args.drop_index, recreate_index=args.recreate_index, metrics_dir=args.metrics_dir)
+        sys.exit(0)
     extra = args.extra or []
-    main(product_line=args.product_line, workers=args.workers, batch=args.batch, drop_index=args.drop_index, recreate_index=args.recreate_index, metrics_dir=args.metrics_dir, log_dir=args.log_dir, extra_args=extra)
+    main(product_line=args.product_line, workers=args.workers or 8, batch=args.batch, drop_index=args.drop_index, recreate_index=args.recreate_index, metrics_dir=args.metrics_dir, log_dir=args.log_dir, extra_args=extra)
@@ -1,14 +1,49 @@
-import os
-import pyodbc
+"""
+Load sample XML files into app_xml (and mirror their app_ids into the application table).
+
+Builds load-test datasets from config/samples/xml_files:
+- each file is read once through mmap and turned into a template with slots for the
+  /Provenir/Request/@ID value and every con_id value (no XML parse)
+- templates are replicated N times with remapped, collision-free app_id / con_id values
+- rows are inserted with fast_executemany in byte-bounded batches, spread over several connections
+
+Usage:
+    # Each sample once, app_ids after the current MAX(app_id)
+    python env_prep/load_xml_to_db.py
+
+    # ~1.6M rows over 4 connections
+    python env_prep/load_xml_to_db.py --replicas 10000 --connections 4 --first-app-id 1000000
+
+    # Original IDs, one copy (previous behaviour)
+    python env_prep/load_xml_to_db.py --keep-ids
+
+    # Offline stand-in backend (counts inserts, stores nothing)
+    python env_prep/load_xml_to_db.py --replicas 100 --connect-factory standin_odbc:connect   # benchmarks dir on PYTHONPATH
+"""
+
+import argparse
+import codecs
 import logging
-import xml.etree.ElementTree as ET
+import mmap
+import os
+import re
+import sys
+import threading
+import time
 
 from pathlib import Path
 
+import pyodbc
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from xml_extractor.database.migration_engine import CONNECT_FACTORY_ENV, resolve_connect_function
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
 
-SAMPLES_DIR = str(Path(__file__).parent.parent / "config" / "samples" / "xml_files")
+SAMPLES_DIR = str(project_root / "config" / "samples" / "xml_files")
 CONN_STR = (
     "DRIVER={ODBC Driver 17 for SQL Server};"
     "SERVER=localhost\\SQLEXPRESS;"
@@ -17,75 +52,283 @@ CONN_STR = (
     "PWD=express"
 )
 
+# Replica con_ids are allocated from here so they cannot collide with real (6-7 digit) con_ids
+DEFAULT_FIRST_CON_ID = 100_000_000
+
+_REQUEST_ID_RE = re.compile(rb'<Request\b[^>]*?\sID="(\d*)"')
+_CON_ID_RE = re.compile(rb'\scon_id="(\d+)"')
+
+
+def get_xml_files(directory, recursive=False):
+    pattern = "**/*.xml" if recursive else "*.xml"
+    return sorted(str(path) for path in Path(directory).glob(pattern))
+
+
+class SampleTemplate:
+    """
+    One sample file as text segments around its Request ID and con_id values.
+
+    render() fills the slots, so replicas cost one string join each instead of a parse.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = len(codecs.BOM_UTF8) if data[:3] == codecs.BOM_UTF8 else 0
+            slots = []  # (start, end, original con_id or None for the Request ID)
+            request = _REQUEST_ID_RE.search(data, start)
+            if request:
+                slots.append((request.start(1), request.end(1), None))
+            for match in _CON_ID_RE.finditer(data, start):
+                slots.append((match.start(1), match.end(1), int(match.group(1))))
+            slots.sort()
+
+            self.parts = []
+            self.keys = []
+            position = start
+            for slot_start, slot_end, key in slots:
+                self.parts.append(data[position:slot_start].decode("utf-8"))
+                self.keys.append(key)
+                position = slot_end
+            self.parts.append(data[position:].decode("utf-8"))
+            self.size_bytes = len(data) - start
+            request_id = request.group(1) if request else b""
+
+        self.original_app_id = int(request_id) if request_id else None
+        self.con_ids = sorted({key for key in self.keys if key is not None})
+
+    def render(self, app_id, con_id_map):
+        values = [str(app_id) if key is None else str(con_id_map[key]) for key in self.keys]
+        pieces = [self.parts[0]]
+        for value, part in zip(values, self.parts[1:]):
+            pieces.append(value)
+            pieces.append(part)
+        return "".join(pieces)
 
-def get_xml_files(directory):
-    return [os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".xml")]
 
+def load_templates(files):
+    templates = []
+    for file_path in files:
+        try:
+            templates.append(SampleTemplate(file_path))
+        except (ValueError, UnicodeDecodeError) as e:  # Empty file (mmap) or not UTF-8
+            logging.warning(f"Skipping {file_path}: {e}")
+    return templates
 
-def load_files_to_db():
+
+class LoadPlan:
+    """
+    Deterministic (app_id, con_id) assignment for row n = replica * len(templates) + file index,
+    so any connection can render any row without coordination.
+    """
+
+    def __init__(self, templates, replicas, first_app_id, first_con_id, keep_ids=False):
+        self.templates = templates
+        self.replicas = replicas
+        self.first_app_id = first_app_id
+        self.first_con_id = first_con_id
+        self.keep_ids = keep_ids
+        self.con_id_bases = []
+        total = 0
+        for template in templates:
+            self.con_id_bases.append(total)
+            total += len(template.con_ids)
+        self.con_ids_per_replica = total
+
+    def __len__(self):
+        return self.replicas * len(self.templates)
+
+    def row(self, n):
+        """(app_id, xml) for row n; app_id None if --keep-ids and the file has no Request ID."""
+        replica, index = divmod(n, len(self.templates))
+        template = self.templates[index]
+        if self.keep_ids:
+            if template.original_app_id is None:
+                return None, None
+            return template.original_app_id, template.render(template.original_app_id, {c: c for c in template.con_ids})
+        app_id = self.first_app_id + n
+        base = self.first_con_id + replica * self.con_ids_per_replica + self.con_id_bases[index]
+        con_id_map = {original: base + offset for offset, original in enumerate(template.con_ids)}
+        return app_id, template.render(app_id, con_id_map)
+
+    def row_bytes(self, n):
+        return self.templates[n % len(self.templates)].size_bytes
+
+
+class LoadProgress:
+    def __init__(self):
+        self.rows = 0
+        self.bytes = 0
+        self.batches = 0
+        self.skipped = 0
+        self.errors = []
+        self._lock = threading.Lock()
+
+    def add(self, rows, size, skipped=0):
+        with self._lock:
+            self.rows += rows
+            self.bytes += size
+            self.batches += 1
+            self.skipped += skipped
+
+
+def _is_identity(cursor, table):
+    cursor.execute(f"SELECT COLUMNPROPERTY(OBJECT_ID('{table}'), 'app_id', 'IsIdentity')")
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def load_rows(connect, conn_str, plan, worker, connections, table, application_table, batch_bytes, batch_rows, progress):
+    """Connection `worker`: rows n where n % connections == worker, in byte-bounded executemany batches."""
     try:
-        conn = pyodbc.connect(CONN_STR)
-        logging.info("Database connection established.")
+        conn = connect(conn_str, autocommit=False)
     except Exception as e:
-        logging.error(f"Database connection failed: {e}")
+        logging.error(f"Connection {worker}: connect failed: {e}")
+        progress.errors.append(e)
         return
-
-    xml_files = get_xml_files(SAMPLES_DIR)
-    logging.info(f"Found {len(xml_files)} XML files to load.")
-    loaded = 0
     try:
-        with conn.cursor() as cursor:
-            cursor.execute("SET IDENTITY_INSERT app_xml ON;")
-            for file_path in xml_files:
-                with open(file_path, "r", encoding="utf-8-sig") as f:
-                    xml_content = f.read()
-                # Parse XML to extract app_id
-                try:
-                    root = ET.fromstring(xml_content)
-                    request = root.find("Request")
-                    app_id = request.get("ID") if request is not None else None
-                except ET.ParseError as e:
-                    logging.warning(f"Failed to parse XML in {file_path}: {e}")
-                    app_id = None
-                # If app_id is missing, derive a new one based on MAX(app_id)+1 to ensure uniqueness
-                if app_id is None:
-                    try:
-                        cursor.execute("SELECT MAX(app_id) FROM app_xml")
-                        max_row = cursor.fetchone()
-                        max_id = max_row[0] if max_row and max_row[0] is not None else 0
-                        app_id = int(max_id) + 1
-                        logging.info(f"Derived app_id {app_id} for file {file_path} (no ID in XML)")
-                    except Exception as e:
-                        logging.warning(f"Failed to derive app_id for {file_path}: {e}")
-                        logging.warning(f"Skipping {file_path}: No app_id found and could not derive one.")
-                        continue
-
-                # Insert using the contract column name `app_XML` and capture the inserted app_id
-                try:
-                    insert_sql = "INSERT INTO app_xml (app_id, app_XML) OUTPUT inserted.app_id VALUES (?, ?)"
-                    cursor.execute(insert_sql, app_id, xml_content)
-                    row = cursor.fetchone()
-                    returned_app_id = int(row[0]) if row and row[0] is not None else int(app_id)
-                except Exception:
-                    # Fallback: if OUTPUT isn't supported for some reason, use provided app_id
-                    returned_app_id = int(app_id)
-
-                # Ensure the application table has this app_id (insert if missing)
-                try:
-                    # Use dbo.application as the canonical source_application_table
-                    cursor.execute("IF NOT EXISTS (SELECT 1 FROM [dbo].[application] WHERE app_id = ?) INSERT INTO [dbo].[application] (app_id) VALUES (?)", returned_app_id, returned_app_id)
-                except Exception as e:
-                    logging.warning(f"Failed to mirror app_id {returned_app_id} into [dbo].[application]: {e}")
-                loaded += 1
-            cursor.execute("SET IDENTITY_INSERT app_xml OFF;")
+        cursor = conn.cursor()
+        cursor.fast_executemany = True
+        # (max) columns: stream the XML instead of sizing a per-row buffer for the largest value
+        cursor.setinputsizes([(pyodbc.SQL_INTEGER, 0, 0), (pyodbc.SQL_WVARCHAR, 0, 0)])
+        if _is_identity(cursor, table):
+            cursor.execute(f"SET IDENTITY_INSERT {table} ON;")
+        insert_sql = f"INSERT INTO {table} (app_id, app_XML) VALUES (?, ?)"
+        mirror_sql = (
+            f"INSERT INTO {application_table} (app_id) SELECT ? WHERE NOT EXISTS "
+            f"(SELECT 1 FROM {application_table} WHERE app_id = ?)"
+        ) if application_table else None
+
+        def flush(params, size, skipped):
+            cursor.executemany(insert_sql, params)
+            if mirror_sql:
+                cursor.executemany(mirror_sql, [(app_id, app_id) for app_id, _ in params])
             conn.commit()
-        logging.info(f"Loaded {loaded} XML files into app_xml table.")
+            progress.add(len(params), size, skipped)
+
+        params = []
+        size = 0
+        skipped = 0
+        for n in range(worker, len(plan), connections):
+            if progress.errors:
+                return
+            app_id, xml = plan.row(n)
+            if app_id is None:
+                skipped += 1
+                continue
+            params.append((app_id, xml))
+            size += plan.row_bytes(n)
+            if size >= batch_bytes or len(params) >= batch_rows:
+                flush(params, size, skipped)
+                params, size, skipped = [], 0, 0
+        if params:
+            flush(params, size, skipped)
+        elif skipped:
+            progress.add(0, 0, skipped)
     except Exception as e:
-        logging.error(f"Failed to load XML files: {e}")
+        logging.error(f"Connection {worker}: load failed: {e}")
+        progress.errors.append(e)
+        try:
+            conn.rollback()
+        except Exception:
+            pass
     finally:
         conn.close()
-        logging.info("Database connection closed.")
+
+
+def load_files_to_db(samples_dir=SAMPLES_DIR, recursive=False, replicas=1, first_app_id=None, first_con_id=DEFAULT_FIRST_CON_ID,
+                     keep_ids=False, connections=1, table="[dbo].[app_xml]", application_table="[dbo].[application]",
+                     batch_mb=16.0, batch_rows=1000, conn_str=CONN_STR, connect_factory=None):
+    connect = resolve_connect_function(connect_factory)
+    templates = load_templates(get_xml_files(samples_dir, recursive))
+    if not templates:
+        logging.error(f"No XML files found in {samples_dir}")
+        return None
+    logging.info(f"Loaded {len(templates)} sample templates ({sum(t.size_bytes for t in templates) / 1048576:.1f} MB) from {samples_dir}")
+
+    if not keep_ids and first_app_id is None:
+        try:
+            conn = connect(conn_str, autocommit=True)
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT MAX(app_id) FROM {table}")
+            row = cursor.fetchone()
+            first_app_id = int(row[0]) + 1 if row and row[0] is not None else 1
+            conn.close()
+        except Exception as e:
+            logging.error(f"Database connection failed: {e}")
+            return None
+
+    plan = LoadPlan(templates, replicas, first_app_id, first_con_id, keep_ids)
+    if keep_ids:
+        logging.info(f"Loading {len(plan)} rows with original IDs over {connections} connection(s)")
+    else:
+        logging.info(f"Loading {len(plan)} rows ({replicas} replicas): app_id {first_app_id}..{first_app_id + len(plan) - 1}, "
+                     f"con_id {first_con_id}..{first_con_id + replicas * plan.con_ids_per_replica - 1}, {connections} connection(s)")
+
+    progress = LoadProgress()
+    threads = [
+        threading.Thread(
+            target=load_rows,
+            args=(connect, conn_str, plan, worker, connections, table, application_table,
+                  int(batch_mb * 1048576), batch_rows, progress),
+            name=f"loader-{worker}", daemon=True
+        )
+        for worker in range(connections)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        next(thread for thread in threads if thread.is_alive()).join(timeout=5)
+        elapsed = time.perf_counter() - started
+        logging.info(f"Progress: {progress.rows}/{len(plan)} rows, {progress.bytes / 1048576:.0f} MB "
+                     f"({progress.rows / elapsed:.0f} rows/s, {progress.bytes / 1048576 / elapsed:.1f} MB/s)")
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "rows": progress.rows,
+        "skipped": progress.skipped,
+        "megabytes": round(progress.bytes / 1048576, 1),
+        "batches": progress.batches,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(progress.rows / elapsed, 1) if elapsed > 0 else 0.0,
+        "megabytes_per_second": round(progress.bytes / 1048576 / elapsed, 2) if elapsed > 0 else 0.0,
+        "errors": [str(e) for e in progress.errors]
+    }
+    if progress.errors:
+        logging.error(f"Load stopped after {progress.rows} rows: {progress.errors[0]}")
+    else:
+        logging.info(f"Loaded {summary['rows']} rows ({summary['megabytes']} MB) in {summary['seconds']}s: "
+                     f"{summary['rows_per_second']} rows/s, {summary['megabytes_per_second']} MB/s"
+                     + (f"; skipped {summary['skipped']} without a Request ID" if summary['skipped'] else ""))
+    return summary
 
 
 if __name__ == "__main__":
-    load_files_to_db()
+    parser = argparse.ArgumentParser(description="Bulk-load (replicated) sample XML files into app_xml")
+    parser.add_argument("--samples-dir", default=SAMPLES_DIR, help="Directory of sample XML files")
+    parser.add_argument("--recursive", action="store_true", help="Include XML files in subdirectories (e.g. reclending/)")
+    parser.add_argument("--replicas", type=int, default=1, help="Copies of each sample, each with new app_id/con_id values")
+    parser.add_argument("--first-app-id", type=int, default=None, help="First app_id to assign (default: MAX(app_id)+1)")
+    parser.add_argument("--first-con-id", type=int, default=DEFAULT_FIRST_CON_ID, help="First con_id to assign")
+    parser.add_argument("--keep-ids", action="store_true", help="Keep the files' own app_id/con_id values (one copy only)")
+    parser.add_argument("--connections", type=int, default=1, help="Parallel insert connections")
+    parser.add_argument("--batch-mb", type=float, default=16.0, help="Flush an executemany batch at this many MB of XML")
+    parser.add_argument("--batch-rows", type=int, default=1000, help="... or at this many rows")
+    parser.add_argument("--table", default="[dbo].[app_xml]", help="Source XML table")
+    parser.add_argument("--application-table", default="[dbo].[application]",
+                        help="Table that gets a row per app_id ([dbo].[IL_application] for RL); '' to skip")
+    parser.add_argument("--connection-string", default=CONN_STR, help="ODBC connection string (default: local SQLEXPRESS)")
+    parser.add_argument("--connect-factory", default=os.environ.get(CONNECT_FACTORY_ENV),
+                        help=f"'module:callable' used instead of pyodbc.connect (default: ${CONNECT_FACTORY_ENV})")
+    args = parser.parse_args()
+    if args.keep_ids and args.replicas != 1:
+        parser.error("--keep-ids loads one copy only (use --replicas 1)")
+
+    result = load_files_to_db(
+        samples_dir=args.samples_dir, recursive=args.recursive, replicas=args.replicas, first_app_id=args.first_app_id,
+        first_con_id=args.first_con_id, keep_ids=args.keep_ids, connections=max(1, args.connections), table=args.table,
+        application_table=args.application_table or None, batch_mb=args.batch_mb, batch_rows=args.batch_rows,
+        conn_str=args.connection_string, connect_factory=args.connect_factory
+    )
+    sys.exit(0 if result and not result["errors"] else 1)
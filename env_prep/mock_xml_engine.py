@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""
+Seedable mock Provenir XML engine for scaling tests (CC and RL), no database needed to start.
+
+- Deterministic: each document has its own RNG seeded from (--seed, app_id), so any app_id
+  renders the same document regardless of worker count, shard size or run
+- Parallel: app_id ranges are split into shards and generated across a process pool
+- Production-like shape: per-document contacts, addresses, employments, RL collateral slots and
+  report payload size are drawn from a configurable weighted distribution; extra contacts,
+  addresses and employments use roles/types the contract filters out, as in production data
+- Sinks: sharded gzip JSONL files ({"app_id": ..., "xml": ...} per line, read back with
+  read_shard) or bulk DB inserts (fast_executemany, byte-bounded batches, one connection per worker)
+
+Weights are 'value:weight,...'; report sizes are KB buckets, jittered +/-50% per document.
+Contacts, addresses, employments and collateral slots go up to 4 (SIZE_LIMITS); larger values
+are rejected rather than capped.
+
+Usage:
+    # 1M RL documents into 100 compressed shards
+    python env_prep/mock_xml_engine.py --product-line RL --count 1000000 --start-app-id 5000000 --out-dir mock_data/rl
+
+    # 200k CC documents straight into app_xml, 8 processes / connections
+    python env_prep/mock_xml_engine.py --product-line CC --count 200000 --sink db --workers 8 --application-table [dbo].[application]
+
+    # Heavier documents, then print one to check
+    python env_prep/mock_xml_engine.py --product-line CC --contacts 1:30,2:50,3:20 --report-kb 250:50,1500:50 --count 1000
+    python env_prep/mock_xml_engine.py --product-line CC --show 700123
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+DEFAULT_SEED = 20250101
+BASE_DATE = datetime(2025, 1, 1)
+
+# con_id = app_id * CON_IDS_PER_APP + contact index, so contacts never collide across documents
+CON_IDS_PER_APP = 8
+
+DEFAULT_CONTACTS = {1: 55, 2: 40, 3: 5}
+DEFAULT_ADDRESSES = {1: 45, 2: 45, 3: 10}
+DEFAULT_EMPLOYMENTS = {1: 70, 2: 25, 3: 5}
+DEFAULT_COLLATERAL = {1: 45, 2: 40, 3: 10, 4: 5}
+DEFAULT_REPORT_KB = {5: 20, 50: 40, 250: 30, 1500: 10}
+
+DEFAULT_TABLES = {'CC': '[dbo].[app_xml]', 'RL': '[dbo].[app_xml_staging_rl]'}
+
+# Contact roles / address and employment types in contract filter order; anything past the
+# mapped ones is filtered out by the pipeline (noise, as in production documents)
+CC_CONTACT_ROLES = ('PR', 'AUTHU', 'AUTHU', 'AUTHU')
+RL_CONTACT_ROLES = ('PR', 'SEC', 'GUAR', 'GUAR')
+CC_ADDRESS_TYPES = ('CURR', 'PREV', 'MAIL', 'BILL')
+RL_ADDRESS_TYPES = ('CURR', 'PREV', 'MAIL', 'BILL')
+EMPLOYMENT_TYPES = ('CURR', 'PREV', 'OTHR', 'OTHR')
+RL_COLLATERAL_SLOTS = 4
+
+# Largest value each size knob can render (one document / contact per role, type or slot above)
+SIZE_LIMITS = {
+    'contacts': min(len(CC_CONTACT_ROLES), len(RL_CONTACT_ROLES)),
+    'addresses': min(len(CC_ADDRESS_TYPES), len(RL_ADDRESS_TYPES)),
+    'employments': len(EMPLOYMENT_TYPES),
+    'collateral': RL_COLLATERAL_SLOTS,
+}
+
+STATES = ('FL', 'TX', 'AZ', 'CA', 'NY', 'KY', 'WA', 'CO', 'NV', 'UT')
+FIRST_NAMES = ('TOMMY', 'RHONDA', 'JAMES', 'SARAH', 'ALEX', 'CARLA', 'WARD', 'DREW', 'LEE', 'MEGAN')
+LAST_NAMES = ('BARKER', 'WONG', 'SMITH', 'JOHNSON', 'MORGAN', 'DIAZ', 'GILLIAN', 'POPE', 'CHEN', 'REED')
+EMPLOYERS = ('THE BIRD CAGE', 'ACME LOGISTICS', 'BLUE WAVE TECH', 'SUMMIT SERVICES', 'GREEN VALLEY CO')
+STREETS = ('MAIN ST', 'OAK AVE', 'JACKSON HWY', 'PINE RD', 'LAKE DR')
+CC_DECISIONS = ('APPRV', 'DECLN', 'PENDING')
+RL_APP_TYPES = ('MARINE', 'RV', 'MC', 'HT', 'OR', 'UT')
+RL_DECISIONS = ('APPRV', 'DECLN', 'PENDING', 'WITHD')
+DEALERS = ('All Island Marine Corp', 'Sunshine RV Sales', 'Peak Motorsports', 'Liberty Trailer Co', 'Blue Ridge Outdoors')
+WARRANTY_COMPANIES = (
+    ('gap', 'Old Navy', 'ON'),
+    ('service_contract', 'GOOD SAM SERVICE', 'GSS'),
+    ('ext_warranty', 'EXPRESS SERVICE', 'ES'),
+    ('road_side', 'Karls Towing', 'KT'),
+    ('credit_life', 'Life Game and Insurance', 'LGI'),
+    ('credit_disability', 'Disability Insurance', 'DI'),
+    ('other', 'Other Insurance Thing', 'OIT'),
+)
+JOURNAL_IDS = ('MSADD', 'MSCSZ', 'MSDOB', 'MSNAM', 'MSSSN', 'SAUMA', 'SSNIV', 'ZIPIV', 'CAGTM', 'LRGTM',
+               'PAOSA', 'EMPLOY', 'CRFRZ', 'CBERR', 'SCOREBLK', 'MINTRADE', 'DELINQ', 'OFACL', 'THINF', 'DTITH')
+CARRIERS = ('BRIGHTSPEED OF EASTERN TEXAS INC', 'CELLCO PARTNERSHIP DBA VERIZON WIRELESS', 'T-MOBILE USA INC',
+            'NEW CINGULAR WIRELESS PCS LLC', 'FRONTIER COMMUNICATIONS')
+
+
+def parse_weights(text: str, value_type=int) -> Dict:
+    """'1:60,2:35,3:5' -> {1: 60.0, 2: 35.0, 3: 5.0}"""
+    weights = {}
+    for item in text.split(','):
+        value, _, weight = item.strip().partition(':')
+        weights[value_type(value)] = float(weight or 1)
+    if not weights or any(weight < 0 for weight in weights.values()) or not sum(weights.values()):
+        raise ValueError(f"Invalid weights: {text!r}")
+    return weights
+
+
+@dataclass
+class SizeDistribution:
+    """Weighted per-document size knobs ({value: weight})."""
+    contacts: Dict[int, float] = field(default_factory=lambda: dict(DEFAULT_CONTACTS))
+    addresses: Dict[int, float] = field(default_factory=lambda: dict(DEFAULT_ADDRESSES))
+    employments: Dict[int, float] = field(default_factory=lambda: dict(DEFAULT_EMPLOYMENTS))
+    collateral: Dict[int, float] = field(default_factory=lambda: dict(DEFAULT_COLLATERAL))
+    report_kb: Dict[int, float] = field(default_factory=lambda: dict(DEFAULT_REPORT_KB))
+
+    def __post_init__(self):
+        # Builders slice the fixed role / type tuples, so a larger value would silently render fewer
+        for name, limit in SIZE_LIMITS.items():
+            out_of_range = sorted(value for value in getattr(self, name) if not 0 <= value <= limit)
+            if out_of_range:
+                raise ValueError(f"{name} must be between 0 and {limit}, got {out_of_range}")
+        if any(kb < 0 for kb in self.report_kb):
+            raise ValueError(f"report_kb buckets must be non-negative, got {sorted(self.report_kb)}")
+
+    @staticmethod
+    def pick(rng: random.Random, weights: Dict[int, float]) -> int:
+        return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def document_rng(seed: int, app_id: int) -> random.Random:
+    return random.Random(seed * 1_000_003 + app_id)
+
+
+def _date(rng: random.Random, max_days: int = 365, fmt: str = '%Y-%m-%d %H:%M:%S') -> str:
+    return (BASE_DATE - timedelta(days=rng.randint(0, max_days), seconds=rng.randint(0, 86399))).strftime(fmt)
+
+
+def _phone(rng: random.Random) -> str:
+    return f"801{rng.randint(1000000, 9999999)}"
+
+
+_report_lines = None
+
+
+def _report_line_pool():
+    """Fixed pool of Journal / phone-listing report lines (built once per process, same in every process)."""
+    global _report_lines
+    if _report_lines is None:
+        rng = random.Random(0)
+        _report_lines = []
+        for _ in range(4096):
+            if rng.random() < 0.7:
+                _report_lines.append(
+                    f'<Journal Type="Rule" ID="{rng.choice(JOURNAL_IDS)}" Timestamp="{_date(rng, 30)}.'
+                    f'{rng.randint(0, 999):03d}" Status="{rng.choice(("true", "false"))}" />')
+            else:
+                _report_lines.append(
+                    f'<BasicPhoneListing ListingName="{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" '
+                    f'PhoneType="LandLine" Carrier="{rng.choice(CARRIERS)}" State="{rng.choice(STATES)}" '
+                    f'Score="{rng.randint(1, 99)}" Phone="{_phone(rng)}" />')
+    return _report_lines
+
+
+def _report_payload(rng: random.Random, kb: int) -> str:
+    """~kb KB of report lines drawn from the pool (the bulk the pipeline parses and drops)."""
+    pool = _report_line_pool()
+    average_line = 105  # Pool average including the newline
+    return "\n".join(rng.choices(pool, k=kb * 1024 // average_line))
+
+
+def _report_kb(rng: random.Random, sizes: SizeDistribution) -> int:
+    bucket = sizes.pick(rng, sizes.report_kb)
+    return int(bucket * rng.uniform(0.5, 1.5))
+
+
+# ── CC ────────────────────────────────────────────────────────────────
+
+def _cc_contact(rng: random.Random, con_id: int, role: str, sizes: SizeDistribution) -> str:
+    first, last, state = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(STATES)
+    addresses = "\n".join(
+        f'<contact_address address_tp_c="{address_type}" residence_monthly_pymnt="{rng.randint(200, 2500)}.00" '
+        f'city="MOCK CITY {rng.randint(1, 500)}" state="{rng.choice(STATES)}" street_name="{rng.choice(STREETS)}" '
+        f'street_number="{rng.randint(1, 9999)}" unit="{rng.randint(1, 40)}" home_phone="{_phone(rng)}" '
+        f'cell_phone="{_phone(rng)}" zip="{rng.randint(10000, 99999)}" months_at_residence="{rng.randint(0, 11)}" '
+        f'years_at_residence="{rng.randint(0, 20)}" ownership_tp_c="{rng.choice(("O", "R"))}" />'
+        for address_type in CC_ADDRESS_TYPES[:sizes.pick(rng, sizes.addresses)]
+    )
+    employments = "\n".join(
+        f'<contact_employment employment_tp_c="{employment_type}" b_phone_no="{_phone(rng)}" '
+        f'b_zip="{rng.randint(10000, 99999)}" b_state="{rng.choice(STATES)}" b_city="THE BIG CITY" '
+        f'b_name="{rng.choice(EMPLOYERS)}" b_job_title_tp_c="ANALYST" b_self_employed_ind="{rng.choice(("Y", "N"))}" '
+        f'b_months_at_job="{rng.randint(0, 11)}" b_years_at_job="{rng.randint(0, 25)}" '
+        f'b_primary_income_source_tp_c="INVEST" b_salary="{rng.randint(20000, 180000)}" b_salary_basis_tp_c="ANNUM" '
+        f'b_other_income_amt="{rng.randint(0, 500)}" b_othr_inc_basis_tp_c="WEEK" b_other_income_source_tp_c="BONUS" />'
+        for employment_type in EMPLOYMENT_TYPES[:sizes.pick(rng, sizes.employments)]
+    )
+    return f'''<contact con_id="{con_id}" ac_role_tp_c="{role}" sms_consent_flag="{rng.choice(("true", "false"))}" first_name="{first}" initials="G" last_name="{last}" suffix="" ssn="{rng.randint(100000000, 999999999)}" email="{first.lower()}-{con_id}@mock.com" birth_date="{_date(rng, 20000, '%m/%d/%Y')}" mother_maiden_name="DAVIS" fraud_ind="S" banking_aba="{rng.randint(100000000, 999999999)}" banking_account_number="{rng.randint(10000000, 99999999)}" banking_account_type="C">
+<app_prod_bcard card_decision_tp_c="{rng.choice(CC_DECISIONS)}" pd_tp_c="X4J" requested_credit_line="{rng.randint(5, 100) * 100}" allocated_credit_line="{rng.randint(3, 80) * 100}" account_number="{con_id}" multran_account_number="{con_id}" min_pay_due="{rng.randint(25, 300)}.00" credit_line2="{rng.randint(3, 80) * 100}" max_line="{rng.randint(5, 100) * 100}" />
+{addresses}
+{employments}
+</contact>'''
+
+
+def build_cc_document(app_id: int, rng: random.Random, sizes: SizeDistribution) -> str:
+    contacts = "\n".join(
+        _cc_contact(rng, app_id * CON_IDS_PER_APP + index, role, sizes)
+        for index, role in enumerate(CC_CONTACT_ROLES[:sizes.pick(rng, sizes.contacts)])
+    )
+    received = _date(rng)
+    score = rng.randint(550, 850)
+    return f'''<Provenir TestType="MOCK_APP_{app_id}">
+<Request ID="{app_id}" Process="20000" Priority="" Status="B" LastUpdatedBy="mock-{app_id}" LockedBy="" Trans="">
+<CustData>
+<application app_type_code="PRODB" app_receive_date="{received}" last_update_time="{_date(rng, 30)}" signature_ind="{rng.choice(("Y", "N"))}" name_match_flag="Y" address_match_flag="N" ssn_match_flag="R" pricing_tier="{rng.randint(1, 99)}" solicitation_num="MOCK_{app_id}T" pymnt_prot_plan_ind="Y" credit_life_ind="N" campaign_num="T{app_id}" app_source_ind="I" special_offer="3" population_assignment="CM" verification_source="TLO" IP_address="10.20.{rng.randint(1, 254)}.{rng.randint(1, 254)}" esign_consent_flag="false" paperless_flag="true" secure_ach_sent_flag="N">
+<app_product decision_tp_c="{rng.choice(CC_DECISIONS)}" duplicate_app_ind="N" decision_date="{_date(rng, 30)}" debt_to_income_ratio="{rng.uniform(1, 60):.2f}" booked_date="{_date(rng, 30, '%m/%d/%Y')}" supervisor_rev_ind="N" analyst_rev_ind="Y" monthly_debt="{rng.uniform(100, 4000):.2f}" monthly_income="{rng.uniform(2000, 15000):.2f}" precision_score="0" experian_fico_score="{score}" prescreen_fico_score="{score}" prescreen_risk_score="{rng.randint(1, 999)}" prescreen_risk_grade="E" prescreen_fico_grade="D" backend_risk_grade="U" backend_fico_grade="F" InstantID_Score="{rng.randint(0, 50)}" disclosures="N" EX_FICO_08_score="{score}" fraud_rev_ind="N" booking_paused="N" decision_model="EX FICO 08" decision_score="{score}" />
+<rmts_info campaign_number="X4J" name_match_flag="N" ssn_match_flag="N" address_match_flag="Y" primary_first_name="{rng.choice(FIRST_NAMES)}" primary_last_name="{rng.choice(LAST_NAMES)}" primary_ssn="{rng.randint(100000000, 999999999)}" pri_cur_street_num="{rng.randint(1, 9999)}" pri_cur_street_name="{rng.choice(STREETS)}" pri_city="MOCK CITY" pri_state="{rng.choice(STATES)}" pri_zip_code="{rng.randint(10000, 99999)}" apr="{rng.uniform(0.1, 0.36):.4f}" annual_fee="{rng.randint(0, 99)}" cash_advance_apr="{rng.uniform(0.2, 0.36):.4f}" min_payment_percent="{rng.randint(1, 5)}" seg_plan_version="{rng.randint(1, 9)}" />
+{contacts}
+</application>
+</CustData>
+<Journals>
+{_report_payload(rng, _report_kb(rng, sizes))}
+</Journals>
+</Request>
+</Provenir>'''
+
+
+# ── RL ────────────────────────────────────────────────────────────────
+
+def _rl_contact(rng: random.Random, con_id: int, role: str, app_id: int, sizes: SizeDistribution) -> str:
+    first, last, state = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(STATES)
+    addresses = "\n".join(
+        f'<IL_contact_address address_seq_no="{seq}" address_type_code="{address_type}" years_at_residence="{rng.randint(0, 15)}" '
+        f'months_at_residence="{rng.randint(0, 11)}" residence_monthly_pymnt="{rng.randint(200, 2000)}" city="MOCK CITY" '
+        f'state="{rng.choice(STATES)}" zip_code="{rng.randint(10000, 99999)}" street_number="{rng.randint(100, 9999)}" '
+        f'street_name="{rng.choice(STREETS)}" apartment_unit_number="" po_box="" rural_route="" ownership_type_code="{rng.choice(("330", "332"))}" />'
+        for seq, address_type in enumerate(RL_ADDRESS_TYPES[:sizes.pick(rng, sizes.addresses)], 1)
+    )
+    employments = "\n".join(
+        f'<IL_contact_employment employment_seq_no="{seq}" employment_type_code="{employment_type}" salary="{rng.uniform(2000, 150000):.2f}" '
+        f'salary_basis_type_code="{rng.choice(("MONTH", "ANNUM"))}" business_name="{rng.choice(EMPLOYERS)}" business_phone="{_phone(rng)}" '
+        f'years_at_job="{rng.randint(0, 10)}" months_at_job="{rng.randint(0, 11)}" address_line1="" city="" state="" zip_code="" '
+        f'other_income_source_type_code="" self_employed_ind="{rng.choice(("Y", "N"))}" other_income_basis_type_code="" other_income_amt="0" />'
+        for seq, employment_type in enumerate(EMPLOYMENT_TYPES[:sizes.pick(rng, sizes.employments)], 1)
+    )
+    return f'''<IL_contact loanpro_customer_id="{con_id}" ac_role_tp_c="{role}" con_id="{con_id}" email="{first.lower()}-{app_id}@mock.com" first_name="{first}" middle_initial="M" last_name="{last}" ssn="{rng.randint(100000000, 999999999)}" cell_phone="{_phone(rng)}" home_phone="{_phone(rng)}" drivers_license="DL{con_id}" drivers_license_state="{state}" birth_date="{_date(rng, 20000, '%m/%d/%Y')}" suffix="">
+{addresses}
+{employments}
+</IL_contact>'''
+
+
+def _rl_collateral(rng: random.Random, app_id: int, slots: int) -> str:
+    attributes = []
+    for slot in range(1, RL_COLLATERAL_SLOTS + 1):
+        if slot <= slots:
+            attributes.append(
+                f'coll{slot}_year="{rng.randint(2005, 2025)}" coll{slot}_make="MOCK MAKE {slot}" coll{slot}_model="MODEL-{app_id}-{slot}" '
+                f'coll{slot}_VIN="VIN{app_id:09d}{slot}" coll{slot}_value="{rng.uniform(500, 60000):.2f}"'
+            )
+        else:
+            attributes.append(f'coll{slot}_year="" coll{slot}_make="" coll{slot}_model="" coll{slot}_VIN="" coll{slot}_value=""')
+    return (f'<IL_collateral {" ".join(attributes)} coll1_mileage="{rng.randint(0, 5000)}" coll1_new_used_demo="{rng.choice(("N", "U"))}" '
+            f'coll_is_motorhome="" net_invoice="0" coll_option_total_value="{rng.uniform(0, 2000):.2f}" engine_size_CC="{rng.randint(100, 1500)}" />')
+
+
+def build_rl_document(app_id: int, rng: random.Random, sizes: SizeDistribution) -> str:
+    roles = RL_CONTACT_ROLES[:sizes.pick(rng, sizes.contacts)]
+    contacts = "\n".join(
+        _rl_contact(rng, app_id * CON_IDS_PER_APP + index, role, app_id, sizes) for index, role in enumerate(roles)
+    )
+    warranty = " ".join(
+        f'{key}_company="{company}" {key}_amount="{rng.randint(20, 200)}" {key}_term="{rng.choice((36, 48, 60, 72, 84, 120))}" '
+        f'{key}_policy="{prefix}-{rng.randint(10000, 99999)}"' + (f' {key}_lien="Y"' if key == 'gap' else '')
+        for key, company, prefix in WARRANTY_COMPANIES
+    )
+    loan_amount = rng.randint(8000, 80000)
+    sale_price = loan_amount + rng.randint(500, 5000)
+    monthly_income = rng.uniform(3000, 15000)
+    dti = rng.uniform(5, 50)
+    state = rng.choice(STATES)
+    dealer = rng.choice(DEALERS)
+    entry_date = _date(rng, fmt='%Y-%m-%d %H:%M:%S.000')
+    return f'''<Provenir product="rl" app_source="API" Org="MBC" shred_version="MOCK" appone_trans_id="{rng.randint(10**8, 10**9)}" dt_app_id="{rng.randint(10**8, 10**9)}" dt_dealer_id="{rng.randint(10**5, 10**6)}">
+<Request ID="{app_id}" orgID="MBC-MOCK" Process="20800" LockedBy="" Priority="" Status="" Workflow="RecLending" Trans="" LastUpdatedBy="MOCK-{app_id}">
+<CustData>
+<IL_application loanpro_loan_id="{app_id + 1000000}" individual_joint_app_ind="{"J" if len(roles) > 1 else "I"}" app_receive_date="{entry_date}" app_source_ind="D" app_type_code="{rng.choice(RL_APP_TYPES)}" dlr_name="{dealer}" dealer_number="{rng.randint(100000, 999999)}" dlr_city="MOCK CITY" dlr_state="{state}" dlr_zipcode="{rng.randint(10000, 99999)}" dlr_email="dealer-{app_id}@mock.com" dlr_phone="{_phone(rng)}" requested_term_months="{rng.choice((36, 48, 60, 72, 84, 96, 120, 144, 180))}" app_cash_down_payment="{rng.randint(500, 10000)}" app_sale_price="{sale_price}" trade_net_tradein_amount="0" loan_amount_requested="{loan_amount}" client_id="{app_id}" app_entry_date="{entry_date}" campaign_num="MOCK-{app_id}" opt_out_ind="N" duplicate_app_ind="N" last_update_time="{_date(rng, 30)}" supervisor_rev_ind="C" trade_allowance="{rng.uniform(0, 5000):.2f}">
+<IL_fund_dlr_ach dlr_name="{dealer}" dlr_num="{rng.randint(100000, 999999)}" dlr_ach_ind="N" dlr_fsp_yn="N" />
+<IL_app_decision_info experian_fico_score_10t="0{rng.randint(550, 850)}" experian_vantage4_score="0{rng.randint(550, 850)}" vantage_score_used="{rng.randint(550, 850)}" MRV_lead_indicator_p="{rng.choice(("MRV", "Vantage", ""))}" MRV_score_p="{rng.uniform(500, 800):.1f}" CRI_score_p="{rng.uniform(500, 800):.1f}" monthly_income="{monthly_income:.2f}" monthly_debt="{monthly_income * dti / 100:.2f}" debt_to_income_ratio="{dti:.2f}" decision_type_code="{rng.choice(RL_DECISIONS)}" decision_date="{_date(rng, 30, '%Y-%m-%d %H:%M:%S.000')}" regb_closed_days_num="30" max_DTI="{dti + 5:.2f}" />
+{_rl_collateral(rng, app_id, sizes.pick(rng, sizes.collateral))}
+<IL_fund_checklist ct_sale_price="{sale_price}" total_amount_financed="{loan_amount}" total_of_payments="{loan_amount * 1.5:.2f}" finance_charge="{loan_amount * 0.5:.2f}" ct_loan_to_value_percentage="{loan_amount / sale_price * 100:.2f}" ct_note_date="{_date(rng, 30, '%m/%d/%Y')}" ct_contract_state="{state}" ct_titled_in_state="{state}" funding_contact_code="6029" chk_requested_by="6010" motor_ucc_vin_confirmed="Y" title_transfer_received="N" insurance_confirmed="Y" ins_company_name="MOCK INS" ins_policy_number="POL-{app_id}" />
+<IL_backend_policies {warranty} />
+{contacts}
+<IL_ITI_control funding_date="" account_number="" boarding_date="" boarding_datetime="" />
+<IL_ITI_note payment_date="" product_number="" />
+</IL_application>
+</CustData>
+<Reports>
+{_report_payload(rng, _report_kb(rng, sizes))}
+</Reports>
+<Documents />
+<Audits />
+</Request>
+<queues>
+<queue name="T All Applications" id="45" />
+</queues>
+</Provenir>'''
+
+
+BUILDERS = {'CC': build_cc_document, 'RL': build_rl_document}
+
+
+def generate_document(product_line: str, app_id: int, seed: int = DEFAULT_SEED,
+                      sizes: Optional[SizeDistribution] = None) -> str:
+    """The (deterministic) mock document for one app_id."""
+    return BUILDERS[product_line](app_id, document_rng(seed, app_id), sizes or SizeDistribution())
+
+
+# ── Sinks ─────────────────────────────────────────────────────────────
+
+class FileShardSink:
+    """One gzip JSONL file per shard: {"app_id": ..., "xml": ...} per line."""
+
+    def __init__(self, out_dir: str, product_line: str, shard: int, compresslevel: int = 6):
+        os.makedirs(out_dir, exist_ok=True)
+        self.path = os.path.join(out_dir, f"mock_{product_line.lower()}_{shard:05d}.jsonl.gz")
+        self._file = gzip.open(self.path + '.partial', 'wt', encoding='utf-8', compresslevel=compresslevel)
+
+    def write(self, app_id: int, xml: str):
+        self._file.write(json.dumps({'app_id': app_id, 'xml': xml}))
+        self._file.write('\n')
+
+    def close(self):
+        self._file.close()
+        os.replace(self.path + '.partial', self.path)  # Complete shards only
+
+
+class DbSink:
+    """fast_executemany inserts into app_XML tables in byte-bounded batches."""
+
+    def __init__(self, conn_str: str, table: str, application_table: Optional[str] = None,
+                 connect_factory: Optional[str] = None, batch_mb: float = 16.0, batch_rows: int = 1000):
+        from xml_extractor.database.migration_engine import resolve_connect_function
+
+        self._connection = resolve_connect_function(connect_factory)(conn_str, autocommit=False)
+        self._cursor = self._connection.cursor()
+        self._cursor.fast_executemany = True
+        self._insert_sql = f"INSERT INTO {table} (app_id, app_XML) VALUES (?, ?)"
+        self._mirror_sql = (
+            f"INSERT INTO {application_table} (app_id) SELECT ? WHERE NOT EXISTS "
+            f"(SELECT 1 FROM {application_table} WHERE app_id = ?)"
+        ) if application_table else None
+        self._batch_bytes = int(batch_mb * 1048576)
+        self._batch_rows = batch_rows
+        self._rows = []
+        self._size = 0
+
+    def write(self, app_id: int, xml: str):
+        self._rows.append((app_id, xml))
+        self._size += len(xml)
+        if self._size >= self._batch_bytes or len(self._rows) >= self._batch_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        self._cursor.executemany(self._insert_sql, self._rows)
+        if self._mirror_sql:
+            self._cursor.executemany(self._mirror_sql, [(app_id, app_id) for app_id, _ in self._rows])
+        self._connection.commit()
+        self._rows = []
+        self._size = 0
+
+    def close(self):
+        try:
+            self._flush()
+        finally:
+            self._connection.close()
+
+
+def read_shard(path: str) -> Iterator[Tuple[int, str]]:
+    """(app_id, xml) rows from a FileShardSink shard."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            row = json.loads(line)
+            yield row['app_id'], row['xml']
+
+
+# ── Shards ────────────────────────────────────────────────────────────
+
+@dataclass
+class ShardJob:
+    product_line: str
+    shard: int
+    first_app_id: int
+    count: int
+    seed: int
+    sizes: SizeDistribution
+    sink: str  # 'files' | 'db' | 'none'
+    sink_options: Dict = field(default_factory=dict)
+
+
+def _open_sink(job: ShardJob):
+    if job.sink == 'files':
+        return FileShardSink(job.sink_options['out_dir'], job.product_line, job.shard,
+                             job.sink_options.get('compresslevel', 6))
+    if job.sink == 'db':
+        return DbSink(**job.sink_options)
+    return None
+
+
+def generate_shard(job: ShardJob) -> Dict:
+    """Generate one shard's documents into its sink; returns counts and timings."""
+    started = time.perf_counter()
+    builder = BUILDERS[job.product_line]
+    sink = _open_sink(job)
+    xml_bytes = 0
+    try:
+        for app_id in range(job.first_app_id, job.first_app_id + job.count):
+            xml = builder(app_id, document_rng(job.seed, app_id), job.sizes)
+            xml_bytes += len(xml)
+            if sink is not None:
+                sink.write(app_id, xml)
+    finally:
+        if sink is not None:
+            sink.close()
+    return {'shard': job.shard, 'documents': job.count, 'xml_bytes': xml_bytes,
+            'seconds': time.perf_counter() - started, 'path': getattr(sink, 'path', None)}
+
+
+def plan_shards(product_line: str, count: int, start_app_id: int, seed: int, sizes: SizeDistribution,
+                shard_size: int, sink: str, sink_options: Dict) -> List[ShardJob]:
+    """Contiguous app_id ranges of shard_size documents (the last one takes the remainder)."""
+    if shard_size < 1:
+        raise ValueError(f"shard_size must be positive: {shard_size}")
+    return [
+        ShardJob(product_line, shard, start_app_id + offset, min(shard_size, count - offset), seed, sizes, sink, sink_options)
+        for shard, offset in enumerate(range(0, count, shard_size))
+    ]
+
+
+def run(product_line: str, count: int, start_app_id: int, seed: int, sizes: SizeDistribution, workers: int,
+        shard_size: int, sink: str, sink_options: Dict) -> Dict:
+    jobs = plan_shards(product_line, count, start_app_id, seed, sizes, shard_size, sink, sink_options)
+    started = time.perf_counter()
+    documents = 0
+    xml_bytes = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for future in as_completed([pool.submit(generate_shard, job) for job in jobs]):
+            result = future.result()
+            documents += result['documents']
+            xml_bytes += result['xml_bytes']
+            elapsed = time.perf_counter() - started
+            print(f"  shard {result['shard']:5d}: {result['documents']} docs in {result['seconds']:.1f}s "
+                  f"| {documents}/{count} docs, {documents / elapsed:.0f} docs/s, {xml_bytes / 1048576 / elapsed:.1f} MB/s")
+    elapsed = time.perf_counter() - started
+    return {
+        'documents': documents,
+        'xml_megabytes': round(xml_bytes / 1048576, 1),
+        'average_kb': round(xml_bytes / 1024 / documents, 1) if documents else 0.0,
+        'seconds': round(elapsed, 2),
+        'documents_per_second': round(documents / elapsed, 1) if elapsed > 0 else 0.0,
+        'shards': len(jobs)
+    }
+
+
+def main() -> int:
+    from xml_extractor.database.migration_engine import CONNECT_FACTORY_ENV
+
+    parser = argparse.ArgumentParser(description="Seedable, parallel mock Provenir XML generator (CC / RL)")
+    parser.add_argument("--product-line", required=True, choices=sorted(BUILDERS))
+    parser.add_argument("--count", type=int, default=1000, help="Documents to generate")
+    parser.add_argument("--start-app-id", type=int, default=700000, help="First app_id")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Same seed + app_id = same document")
+    parser.add_argument("--workers", type=int, default=0, help="Generator processes (default: all cores)")
+    parser.add_argument("--shard-size", type=int, default=10000, help="Documents per shard (file / DB transaction unit)")
+    parser.add_argument("--contacts", default=None, help=f"Contacts per document (0-{SIZE_LIMITS['contacts']}) weights, e.g. 1:55,2:40,3:5")
+    parser.add_argument("--addresses", default=None, help=f"Addresses per contact (0-{SIZE_LIMITS['addresses']}) weights")
+    parser.add_argument("--employments", default=None, help=f"Employments per contact (0-{SIZE_LIMITS['employments']}) weights")
+    parser.add_argument("--collateral", default=None, help=f"RL collateral slots (0-{SIZE_LIMITS['collateral']}) weights")
+    parser.add_argument("--report-kb", default=None, help="Report payload KB bucket weights, e.g. 5:20,50:40,250:30,1500:10")
+    parser.add_argument("--sink", default="files", choices=["files", "db", "none"], help="'none' measures generation only")
+    parser.add_argument("--out-dir", default="mock_data", help="files sink: shard directory")
+    parser.add_argument("--compresslevel", type=int, default=6, help="files sink: gzip level (1 = fastest)")
+    parser.add_argument("--table", default=None, help="db sink: target table (default: [dbo].[app_xml] CC, [dbo].[app_xml_staging_rl] RL)")
+    parser.add_argument("--application-table", default=None, help="db sink: also add each app_id to this table")
+    parser.add_argument("--connection-string", default=None, help="db sink: ODBC connection string (default: load_xml_to_db.CONN_STR)")
+    parser.add_argument("--connect-factory", default=os.environ.get(CONNECT_FACTORY_ENV),
+                        help="db sink: 'module:callable' used instead of pyodbc.connect")
+    parser.add_argument("--batch-mb", type=float, default=16.0, help="db sink: flush at this many MB of XML")
+    parser.add_argument("--show", type=int, default=None, metavar="APP_ID", help="Print the document for one app_id and exit")
+    args = parser.parse_args()
+
+    try:
+        sizes = SizeDistribution(**{
+            name: parse_weights(value) for name, value in (
+                ('contacts', args.contacts), ('addresses', args.addresses), ('employments', args.employments),
+                ('collateral', args.collateral), ('report_kb', args.report_kb)
+            ) if value
+        })
+    except ValueError as e:
+        parser.error(str(e))
+    if args.shard_size < 1:
+        parser.error("--shard-size must be positive")
+
+    if args.show is not None:
+        print(generate_document(args.product_line, args.show, args.seed, sizes))
+        return 0
+
+    if args.sink == 'files':
+        sink_options = {'out_dir': args.out_dir, 'compresslevel': args.compresslevel}
+    elif args.sink == 'db':
+        from load_xml_to_db import CONN_STR
+        sink_options = {
+            'conn_str': args.connection_string or CONN_STR,
+            'table': args.table or DEFAULT_TABLES[args.product_line],
+            'application_table': args.application_table,
+            'connect_factory': args.connect_factory,
+            'batch_mb': args.batch_mb
+        }
+    else:
+        sink_options = {}
+
+    workers = args.workers or os.cpu_count() or 1
+    print(f"Generating {args.count} {args.product_line} documents (app_id {args.start_app_id}..{args.start_app_id + args.count - 1}, "
+          f"seed {args.seed}) on {workers} process(es) -> {args.sink}")
+    summary = run(args.product_line, args.count, args.start_app_id, args.seed, sizes, workers, args.shard_size,
+                  args.sink, sink_options)
+    print(f"Done: {summary['documents']} documents, {summary['xml_megabytes']} MB XML (avg {summary['average_kb']} KB) "
+          f"in {summary['seconds']}s ({summary['documents_per_second']} docs/s, {summary['shards']} shards)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
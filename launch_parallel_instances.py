@@ -1,20 +1,28 @@
 """
-Multi-Instance Parallel Launcher - Modulo Sharding
+Multi-Instance Parallel Launcher - Modulo Sharding or Lease-Based Distribution
 
 Launches multiple production_processor instances in parallel, each processing
-a subset of applications based on modulo sharding (app_id % num_instances).
+a subset of applications based on modulo sharding (app_id % num_instances), or
+claiming fixed-size app_id blocks from a shared lease table (--sharding lease).
 
 This avoids gaps in processing and ensures even distribution across instances.
+With modulo sharding the split is static, so one slow shard (e.g. many large RL apps)
+sets the wall-clock time; with leases, fast instances simply claim more blocks and a
+crashed instance's block is re-claimed once its lease expires.
 
 USAGE:
     python launch_parallel_instances.py --instances 10 --limit 10000
+    python launch_parallel_instances.py --instances 10 --sharding lease --app-id-start 1 --app-id-end 500000
 
 FEATURES:
     - Modulo sharding: Instance N processes apps where app_id % num_instances == N
+    - Lease sharding: Instances claim --block-size app_id blocks from [target_schema].[work_lease]
+      (or a local SQLite file via --lease-db)
     - Automatic window launching (PowerShell windows for each instance)
     - Configurable workers per instance
     - Real-time progress monitoring
     - Graceful shutdown on Ctrl+C
+    - Aggregate report with per-instance share of work and idle time
 
 PERFORMANCE:
     With 10 instances × 550 apps/min = 5,500 apps/min total throughput
@@ -29,7 +37,7 @@ import json
 import signal
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 # Add project root to path
 project_root = Path(__file__).parent
@@ -43,7 +51,9 @@ class ParallelInstanceLauncher:
                  workers_per_instance: int = 4, 
                  batch_size: int = 500, limit: Optional[int] = None,
                  server: str = None, database: str = None,
-                 log_level: str = "WARNING"):
+                 log_level: str = "WARNING", sharding: str = "modulo",
+                 app_id_start: Optional[int] = None, app_id_end: Optional[int] = None,
+                 block_size: int = 1000, lease_db: Optional[str] = None):
         """
         Initialize multi-instance launcher.
         
@@ -56,7 +66,15 @@ class ParallelInstanceLauncher:
             server: SQL Server instance (uses config default if None)
             database: Database name (uses config default if None)
             log_level: Logging level for instances
+            sharding: 'modulo' (static app_id % N) or 'lease' (dynamic block claiming)
+            app_id_start: Start of the app_id range (required for lease sharding)
+            app_id_end: End of the app_id range (required for lease sharding)
+            block_size: App_ids per lease block (lease sharding)
+            lease_db: SQLite lease file instead of the SQL Server lease table (lease sharding)
         """
+        if sharding == "lease" and (app_id_start is None or app_id_end is None):
+            raise ValueError("Lease sharding requires app_id_start and app_id_end")
+
         self.num_instances = num_instances
         self.product_line = product_line
         self.workers_per_instance = workers_per_instance
@@ -65,6 +83,11 @@ class ParallelInstanceLauncher:
         self.server = server
         self.database = database
         self.log_level = log_level
+        self.sharding = sharding
+        self.app_id_start = app_id_start
+        self.app_id_end = app_id_end
+        self.block_size = block_size
+        self.lease_db = lease_db
         
         self.processes: List[subprocess.Popen] = []
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -90,22 +113,32 @@ class ParallelInstanceLauncher:
         print(f"  Workers per instance: {self.workers_per_instance}")
         print(f"  Total workers:       {self.num_instances * self.workers_per_instance}")
         print(f"  Batch size:          {self.batch_size}")
-        print(f"  Limit per instance:  {self.limit // self.num_instances if self.limit else 'UNLIMITED'}")
-        print(f"  Total limit:         {self.limit if self.limit else 'UNLIMITED'}")
+        if self.sharding == "lease":
+            print(f"  App Id Range:        {self.app_id_start:,} - {self.app_id_end:,}")
+        else:
+            print(f"  Limit per instance:  {self.limit // self.num_instances if self.limit else 'UNLIMITED'}")
+            print(f"  Total limit:         {self.limit if self.limit else 'UNLIMITED'}")
         print(f"  Server:              {self.server or '(from config)'}")
         print(f"  Database:            {self.database or '(from config)'}")
         print(f"  Session ID:          {self.session_id}")
         print()
-        print("Sharding Strategy: Modulo")
-        print(f"  Instance 0 processes: app_id % {self.num_instances} == 0")
-        print(f"  Instance 1 processes: app_id % {self.num_instances} == 1")
-        print(f"  ...")
-        print(f"  Instance {self.num_instances-1} processes: app_id % {self.num_instances} == {self.num_instances-1}")
+        if self.sharding == "lease":
+            num_blocks = (self.app_id_end - self.app_id_start) // self.block_size + 1
+            print("Sharding Strategy: Lease")
+            print(f"  {num_blocks:,} blocks of {self.block_size:,} app_ids, claimed on demand (run id {self.session_id})")
+            print(f"  Lease table: {self.lease_db or '[target_schema].[work_lease]'}")
+            limit_per_instance = None
+        else:
+            print("Sharding Strategy: Modulo")
+            print(f"  Instance 0 processes: app_id % {self.num_instances} == 0")
+            print(f"  Instance 1 processes: app_id % {self.num_instances} == 1")
+            print(f"  ...")
+            print(f"  Instance {self.num_instances-1} processes: app_id % {self.num_instances} == {self.num_instances-1}")
+            
+            # Calculate limit per instance (evenly distributed)
+            limit_per_instance = self.limit // self.num_instances if self.limit else None
         print()
         
-        # Calculate limit per instance (evenly distributed)
-        limit_per_instance = self.limit // self.num_instances if self.limit else None
-        
         print(f"Launching {self.num_instances} instances in separate PowerShell windows...")
         print()
         
@@ -147,19 +180,17 @@ class ParallelInstanceLauncher:
         if limit_per_instance:
             cmd_parts.extend(["--limit", str(limit_per_instance)])
         
-        # CRITICAL: Add modulo sharding parameters
-        # This tells production_processor to only process apps where app_id % num_instances == instance_id
-        cmd_parts.extend(["--modulo-shard", str(self.num_instances)])
-        cmd_parts.extend(["--modulo-instance", str(instance_id)])
+        cmd_parts.extend(self._sharding_args(instance_id))
         
         cmd_string = " ".join(cmd_parts)
         
         # Launch in new PowerShell window
+        title = f"Instance {instance_id} (lease)" if self.sharding == "lease" else f"Instance {instance_id} (mod {self.num_instances})"
         ps_cmd = [
             "powershell.exe",
             "-NoExit",  # Keep window open after completion
             "-Command",
-            f"$Host.UI.RawUI.WindowTitle = 'Instance {instance_id} (mod {self.num_instances})'; {cmd_string}"
+            f"$Host.UI.RawUI.WindowTitle = '{title}'; {cmd_string}"
         ]
         
         try:
@@ -169,10 +200,32 @@ class ParallelInstanceLauncher:
                 cwd=str(project_root)
             )
             self.processes.append(process)
-            print(f"  ✅ Instance {instance_id}: PID {process.pid} (processing app_id % {self.num_instances} == {instance_id})")
+            if self.sharding == "lease":
+                print(f"  ✅ Instance {instance_id}: PID {process.pid} (claiming leased blocks)")
+            else:
+                print(f"  ✅ Instance {instance_id}: PID {process.pid} (processing app_id % {self.num_instances} == {instance_id})")
         except Exception as e:
             print(f"  ❌ Instance {instance_id}: Failed to launch - {e}")
     
+    def _sharding_args(self, instance_id: int) -> List[str]:
+        """production_processor.py arguments that select this instance's share of the work."""
+        if self.sharding == "lease":
+            # All instances share one run id (the session) and claim blocks from the same table
+            args = [
+                "--app-id-start", str(self.app_id_start),
+                "--app-id-end", str(self.app_id_end),
+                "--lease-run-id", self.session_id,
+                "--lease-instance", str(instance_id),
+                "--lease-block-size", str(self.block_size),
+            ]
+            if self.lease_db:
+                args.extend(["--lease-db", f'"{self.lease_db}"'])
+            return args
+        
+        # CRITICAL: Add modulo sharding parameters
+        # This tells production_processor to only process apps where app_id % num_instances == instance_id
+        return ["--modulo-shard", str(self.num_instances), "--modulo-instance", str(instance_id)]
+    
     def _monitor_instances(self):
         """Monitor running instances and wait for completion."""
         print("\n" + "="*80)
@@ -250,6 +303,7 @@ class ParallelInstanceLauncher:
         total_failed = 0
         total_duration = 0
         total_inserts = 0
+        instance_records = []
         
         for metrics_file in metrics_files:
             try:
@@ -260,6 +314,7 @@ class ParallelInstanceLauncher:
                     total_failed += data.get('total_applications_failed', 0)
                     total_duration = max(total_duration, data.get('total_duration_seconds', 0))
                     total_inserts += data.get('total_database_inserts', 0)
+                    instance_records.append(self._instance_record(metrics_file, data))
             except Exception as e:
                 print(f"⚠️  Error reading {metrics_file.name}: {e}")
         
@@ -278,6 +333,66 @@ class ParallelInstanceLauncher:
         print(f"  Total Duration:               {total_duration:.1f} seconds")
         print(f"  Aggregate Throughput:         {apps_per_minute:.1f} apps/min")
         print("="*80)
+        
+        breakdown = self.instance_breakdown(instance_records)
+        if breakdown:
+            print("\nPER-INSTANCE BALANCE")
+            print(f"  {'Instance':<12} {'Apps':>10} {'Share':>8} {'Blocks':>8} {'Busy (s)':>10} {'Idle (s)':>10}")
+            print("  " + "-"*62)
+            for entry in breakdown:
+                blocks = entry['blocks'] if entry['blocks'] is not None else '-'
+                print(f"  {entry['instance']:<12} {entry['apps_processed']:>10,} {entry['share_pct']:>7.1f}% "
+                      f"{blocks:>8} {entry['busy_seconds']:>10.1f} {entry['idle_seconds']:>10.1f}")
+            print("="*80)
+    
+    @staticmethod
+    def _instance_record(metrics_file: Path, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-instance timing/volume from one metrics file (lease section when present)."""
+        lease = data.get('lease')
+        if lease:
+            return {
+                'instance': str(lease.get('instance_id')),
+                'apps_processed': data.get('total_applications_processed', 0),
+                'blocks': lease.get('blocks_completed', 0),
+                'busy_seconds': lease.get('busy_seconds', 0.0),
+                'started_at': lease.get('started_at'),
+                'finished_at': lease.get('finished_at'),
+            }
+        # Modulo/range instances: the whole run counts as busy time
+        duration = data.get('total_duration_seconds', 0) or 0
+        finished_at = datetime.fromisoformat(data['run_timestamp']).timestamp() if data.get('run_timestamp') else metrics_file.stat().st_mtime
+        stem = metrics_file.stem
+        return {
+            'instance': stem.split('_instance_')[1].split('_of_')[0] if '_instance_' in stem else stem,
+            'apps_processed': data.get('total_applications_processed', 0),
+            'blocks': None,
+            'busy_seconds': duration,
+            'started_at': finished_at - duration,
+            'finished_at': finished_at,
+        }
+    
+    @staticmethod
+    def instance_breakdown(instance_records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Share of work and idle time per instance.
+        
+        Idle time is the session's wall-clock window (first instance start to last instance
+        finish) minus the time the instance spent working, i.e. how long it sat waiting on
+        the slowest instance.
+        """
+        records = [r for r in instance_records if r.get('started_at') is not None and r.get('finished_at') is not None]
+        if not records:
+            return []
+        window = max(r['finished_at'] for r in records) - min(r['started_at'] for r in records)
+        total_apps = sum(r['apps_processed'] for r in records)
+        breakdown = []
+        for record in sorted(records, key=lambda r: r['instance']):
+            breakdown.append({
+                **record,
+                'share_pct': (record['apps_processed'] / total_apps * 100) if total_apps else 0.0,
+                'idle_seconds': max(0.0, window - record['busy_seconds']),
+            })
+        return breakdown
 
 
 def main():
@@ -294,6 +409,9 @@ Examples:
   
   # Specify server and database explicitly
   python launch_parallel_instances.py --instances 10 --server "myserver" --database "mydb"
+  
+  # Lease-based distribution: instances claim 1,000-app_id blocks until the range is done
+  python launch_parallel_instances.py --instances 8 --sharding lease --app-id-start 1 --app-id-end 500000
         """
     )
     
@@ -315,6 +433,16 @@ Examples:
     parser.add_argument("--log-level", type=str, default="WARNING",
                        choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"],
                        help="Logging level for instances (default: WARNING)")
+    parser.add_argument("--sharding", type=str, default="modulo", choices=["modulo", "lease"],
+                       help="Work distribution: static modulo shards or dynamic leased blocks (default: modulo)")
+    parser.add_argument("--app-id-start", type=int, default=None,
+                       help="Start of the app_id range (required with --sharding lease)")
+    parser.add_argument("--app-id-end", type=int, default=None,
+                       help="End of the app_id range (required with --sharding lease)")
+    parser.add_argument("--block-size", type=int, default=1000,
+                       help="App_ids per leased block (default: 1000)")
+    parser.add_argument("--lease-db", type=str, default=None,
+                       help="SQLite lease file (local stand-in for the [target_schema].[work_lease] table)")
     
     args = parser.parse_args()
     
@@ -323,6 +451,10 @@ Examples:
         print("❌ Error: --instances must be >= 1")
         return 1
     
+    if args.sharding == "lease" and (args.app_id_start is None or args.app_id_end is None):
+        print("❌ Error: --sharding lease requires --app-id-start and --app-id-end")
+        return 1
+    
     if args.instances > 20:
         print("⚠️  Warning: Launching >20 instances may overwhelm your system")
         confirm = input("Continue? (y/n): ")
@@ -337,7 +469,12 @@ Examples:
         server=args.server,
         database=args.database,
         log_level=args.log_level,
-        product_line=args.product_line
+        product_line=args.product_line,
+        sharding=args.sharding,
+        app_id_start=args.app_id_start,
+        app_id_end=args.app_id_end,
+        block_size=args.block_size,
+        lease_db=args.lease_db
     )
     
     # Launch all instances
@@ -34,9 +34,22 @@ for f in files:
     mapping = []
     db = []
     total_individuals = 0
-    # Try new top-level 'individual_results' first (produced when --enable-instrumentation is set)
-    if data.get('individual_results'):
-        for r in data.get('individual_results', []):
+    # Per-app results stream (JSONL) referenced by newer metrics files
+    individual_results = []
+    results_file = data.get('results_file')
+    if results_file and Path(results_file).exists():
+        with open(results_file, encoding="utf-8") as rf:
+            for line in rf:
+                try:
+                    r = json.loads(line)
+                except ValueError:
+                    continue  # Truncated last line of an interrupted run
+                if r.get("type") == "app":
+                    individual_results.append(r)
+    # Then top-level 'individual_results' (produced when --enable-instrumentation is set)
+    individual_results = individual_results or data.get('individual_results')
+    if individual_results:
+        for r in individual_results:
             total_individuals += 1
             if r is None:
                 continue
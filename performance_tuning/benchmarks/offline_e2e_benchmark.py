@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end throughput benchmark (no SQL Server required).
+
+Runs the real ProductionProcessor -> ParallelCoordinator -> MigrationEngine path, with every
+database connection (coordinator and workers) served by the in-process stand-in backend in
+standin_odbc.py. Source rows come from sample XML files; inserts are counted, not stored.
+Optional latencies per call / row / commit / connect model the database side, so the same
+run shows both the pipeline's CPU ceiling (all latencies 0) and its sensitivity to latency.
+
+For each worker count it reports apps/min, speedup and efficiency against the first worker
+count, and per-stage latency percentiles; the full results go to a JSON file.
+
+pyodbc must still be importable (the pipeline imports it); no ODBC driver or server is used.
+
+USAGE:
+    # CPU ceiling, scaling over 1..4 workers, 600 apps each
+    python performance_tuning/benchmarks/offline_e2e_benchmark.py --max-workers 4 --apps 600
+
+    # Latency sensitivity: 1ms per round trip, 5ms per commit
+    python performance_tuning/benchmarks/offline_e2e_benchmark.py --workers 4,8 --call-latency-ms 1 --commit-latency-ms 5
+
+    # RL contract and samples
+    python performance_tuning/benchmarks/offline_e2e_benchmark.py --product-line RL --xml-dir config/samples/xml_files/reclending
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from datetime import datetime
+from pathlib import Path
+
+# Ensure repo root (pipeline) and this directory (stand-in backend) are importable; worker
+# processes inherit sys.path, so they resolve the connect factory the same way
+BENCHMARK_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCHMARK_DIR.parents[1]
+for path in (str(REPO_ROOT), str(BENCHMARK_DIR)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from xml_extractor.database.migration_engine import CONNECT_FACTORY_ENV
+from xml_extractor.monitoring.latency_histogram import StageHistograms
+
+import standin_odbc
+
+
+REPORTED_STAGES = ('total', 'validation', 'parsing', 'mapping', 'db_insert', 'commit', 'source_fetch')
+
+
+def run_once(workers: int, args) -> dict:
+    """One full ProductionProcessor run against the stand-in backend."""
+    from production_processor import ProductionProcessor
+
+    processor = ProductionProcessor(
+        server='standin',
+        database='offline_benchmark',
+        workers=workers,
+        batch_size=args.batch_size,
+        log_level=args.log_level,
+        product_line=args.product_line,
+        worker_max_tasks=None,
+        worker_max_rss_growth_mb=None
+    )
+    started = time.perf_counter()
+    metrics = processor.run_full_processing(limit=args.apps)
+    elapsed = time.perf_counter() - started
+    histograms = StageHistograms.from_dict(metrics.get('stage_latency_histograms') or {})
+    return {
+        'workers': workers,
+        'apps': metrics.get('total_processed', 0),
+        'successful': metrics.get('total_successful', 0),
+        'failed': metrics.get('total_failed', 0),
+        'rows_inserted': metrics.get('total_database_inserts', 0),
+        'elapsed_seconds': round(elapsed, 3),
+        'apps_per_minute': round(metrics.get('total_processed', 0) / elapsed * 60, 1) if elapsed > 0 else 0.0,
+        'stage_latency': histograms.summary(),
+        'stage_latency_histograms': histograms.to_dict()
+    }
+
+
+def format_report(results: list) -> str:
+    baseline = results[0]
+    lines = [
+        f"  {'workers':>7s} {'apps/min':>10s} {'speedup':>8s} {'effic.':>7s} {'failed':>7s}   "
+        + " ".join(f"{stage + ' p95':>15s}" for stage in REPORTED_STAGES[:5])
+    ]
+    for result in results:
+        speedup = result['apps_per_minute'] / baseline['apps_per_minute'] if baseline['apps_per_minute'] else 0.0
+        efficiency = speedup / (result['workers'] / baseline['workers'])
+        p95 = [result['stage_latency'].get(stage, {}).get('p95_ms', 0.0) for stage in REPORTED_STAGES[:5]]
+        lines.append(
+            f"  {result['workers']:7d} {result['apps_per_minute']:10.1f} {speedup:7.2f}x {efficiency:6.0%} "
+            f"{result['failed']:7d}   " + " ".join(f"{value:12.1f} ms" for value in p95)
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark with a stand-in ODBC backend")
+    scaling = parser.add_mutually_exclusive_group()
+    scaling.add_argument("--max-workers", type=int, help="Run 1..N workers (default: 1..4)")
+    scaling.add_argument("--workers", help="Comma-separated worker counts, e.g. 2,4,8")
+    parser.add_argument("--apps", type=int, default=500, help="Applications per run (default: 500)")
+    parser.add_argument("--batch-size", type=int, default=100, help="Source fetch / dispatch batch size (default: 100)")
+    parser.add_argument("--product-line", default="CC", choices=["CC", "RL"])
+    parser.add_argument("--xml-dir", default=str(REPO_ROOT / "config" / "samples" / "xml_files"),
+                        help="Source XML files, cycled to --apps rows")
+    parser.add_argument("--recursive", action="store_true", help="Include XML files in subdirectories of --xml-dir")
+    parser.add_argument("--call-latency-ms", type=float, default=0.0, help="Simulated latency per execute/executemany")
+    parser.add_argument("--row-latency-us", type=float, default=0.0, help="Simulated latency per inserted row")
+    parser.add_argument("--commit-latency-ms", type=float, default=0.0, help="Simulated latency per commit")
+    parser.add_argument("--connect-latency-ms", type=float, default=0.0, help="Simulated latency per connect")
+    parser.add_argument("--log-level", default="ERROR", choices=["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"])
+    parser.add_argument("--output-dir", default="benchmark_output/offline_e2e",
+                        help="Working directory for run logs/metrics and the results JSON")
+    args = parser.parse_args()
+
+    if args.workers:
+        worker_counts = [int(value) for value in args.workers.split(',') if value.strip()]
+    else:
+        worker_counts = list(range(1, (args.max_workers or 4) + 1))
+
+    backend = {
+        'xml_dir': str(Path(args.xml_dir).resolve()),
+        'recursive': args.recursive,
+        'apps': args.apps,
+        'call_latency_ms': args.call_latency_ms,
+        'row_latency_us': args.row_latency_us,
+        'commit_latency_ms': args.commit_latency_ms,
+        'connect_latency_ms': args.connect_latency_ms
+    }
+    os.environ[CONNECT_FACTORY_ENV] = f"{standin_odbc.__name__}:connect"
+    os.environ[standin_odbc.CONFIG_ENV] = json.dumps(backend)
+
+    # ProductionProcessor writes logs/ and metrics/ relative to the working directory
+    output_dir = Path(args.output_dir).resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    os.chdir(output_dir)
+
+    print(f"Offline E2E benchmark: {args.apps} apps per run, workers {worker_counts}, "
+          f"product line {args.product_line}, source {backend['xml_dir']}")
+    print(f"Simulated latency: call {args.call_latency_ms}ms, row {args.row_latency_us}us, "
+          f"commit {args.commit_latency_ms}ms, connect {args.connect_latency_ms}ms")
+
+    results = []
+    for workers in worker_counts:
+        result = run_once(workers, args)
+        results.append(result)
+        print(f"  {workers} worker(s): {result['apps_per_minute']:.1f} apps/min "
+              f"({result['successful']}/{result['apps']} ok, {result['elapsed_seconds']:.1f}s)")
+
+    print("\nSCALING\n" + format_report(results))
+    best = max(results, key=lambda r: r['apps_per_minute'])
+    print(f"\nSTAGE LATENCY at {best['workers']} worker(s) (best throughput)")
+    print(StageHistograms.from_dict(best['stage_latency_histograms']).format_table())
+
+    results_file = output_dir / f"offline_e2e_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(results_file, 'w') as f:
+        json.dump({'backend': backend, 'batch_size': args.batch_size, 'product_line': args.product_line,
+                   'runs': results}, f, indent=2)
+    print(f"\nResults: {results_file}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
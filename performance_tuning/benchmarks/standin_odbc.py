@@ -0,0 +1,194 @@
+"""
+In-process stand-in for a pyodbc SQL Server connection, for offline benchmarks.
+
+Installed through MigrationEngine's connect hook, so the real ProductionProcessor ->
+ParallelCoordinator -> MigrationEngine path runs unchanged (workers included):
+
+    XML_EXTRACTOR_DB_CONNECT_FACTORY=standin_odbc:connect       (module importable on sys.path)
+    STANDIN_ODBC_CONFIG={"xml_dir": "config/samples/xml_files", "apps": 1000,
+                         "call_latency_ms": 0.5, "commit_latency_ms": 2.0}
+
+Only the statements the pipeline issues are understood:
+- SELECT @@VERSION, the source COUNT(*) and the paged source query (TOP (n), app_id > / >= / <=
+  and modulo filters): served from the XML files, cycled to 'apps' rows numbered from first_app_id
+- INSERT INTO [schema].[table] through execute/executemany: rows are counted per table
+- SET IDENTITY_INSERT, duplicate-detection lookups and any other statement: no-op, empty result
+
+Latency knobs (all optional, default 0): connect_latency_ms per connect, call_latency_ms per
+execute/executemany round trip, row_latency_us per inserted row, commit_latency_ms per commit.
+Each process (coordinator and every worker) has its own counters; nothing is stored.
+"""
+
+import json
+import os
+import re
+import time
+
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+CONFIG_ENV = 'STANDIN_ODBC_CONFIG'
+
+# Per-process counters: 'connects', 'calls', 'commits', 'rollbacks', 'rows.<table>'
+STATS: Counter = Counter()
+
+_INSERT_RE = re.compile(r"INSERT\s+INTO\s+(?:\[[^\]]+\]\.)?\[([^\]]+)\]", re.IGNORECASE)
+_TOP_RE = re.compile(r"\bTOP\s*\(?\s*(\d+)\s*\)?", re.IGNORECASE)
+_AFTER_RE = re.compile(r"ax\.app_id\s*>\s*(\d+)")
+_START_RE = re.compile(r"ax\.app_id\s*>=\s*(\d+)")
+_END_RE = re.compile(r"ax\.app_id\s*<=\s*(\d+)")
+_MODULO_RE = re.compile(r"\(\s*ax\.app_id\s*%\s*(\d+)\s*\)\s*=\s*(\d+)")
+
+_config: Optional[Dict[str, Any]] = None
+_documents: Optional[List[str]] = None
+
+
+def _settings() -> Dict[str, Any]:
+    global _config
+    if _config is None:
+        _config = json.loads(os.environ.get(CONFIG_ENV) or '{}')
+    return _config
+
+
+def _sleep_ms(milliseconds: float):
+    if milliseconds > 0:
+        time.sleep(milliseconds / 1000)
+
+
+def _source_documents() -> List[str]:
+    """XML documents backing the source table (loaded on first source query only)."""
+    global _documents
+    if _documents is None:
+        xml_dir = Path(_settings().get('xml_dir', 'config/samples/xml_files'))
+        pattern = '**/*.xml' if _settings().get('recursive') else '*.xml'
+        _documents = [path.read_text(encoding='utf-8', errors='replace') for path in sorted(xml_dir.glob(pattern))]
+        if not _documents:
+            raise RuntimeError(f"stand-in backend: no XML files in {xml_dir}")
+    return _documents
+
+
+def _source_rows(sql: str) -> List[Tuple[int, str]]:
+    settings = _settings()
+    first = settings.get('first_app_id', 1)
+    last = first + settings.get('apps', 1000) - 1
+    low = first
+    for pattern, offset in ((_AFTER_RE, 1), (_START_RE, 0)):
+        match = pattern.search(sql)
+        if match:
+            low = max(low, int(match.group(1)) + offset)
+    end = _END_RE.search(sql)
+    high = min(last, int(end.group(1))) if end else last
+    top = _TOP_RE.search(sql)
+    limit = int(top.group(1)) if top else None
+    modulo = _MODULO_RE.search(sql)
+
+    documents = _source_documents()
+    rows = []
+    for app_id in range(low, high + 1):
+        if modulo and app_id % int(modulo.group(1)) != int(modulo.group(2)):
+            continue
+        rows.append((app_id, documents[(app_id - first) % len(documents)]))
+        if limit is not None and len(rows) >= limit:
+            break
+    return rows
+
+
+class StandInCursor:
+    """Just enough of pyodbc.Cursor for the pipeline."""
+
+    def __init__(self):
+        self.fast_executemany = False
+        self.rowcount = -1
+        self.description = None
+        self._rows: List[Tuple] = []
+
+    def execute(self, sql: str, *params):
+        _sleep_ms(_settings().get('call_latency_ms', 0))
+        STATS['calls'] += 1
+        self._rows = []
+        self.rowcount = -1
+        statement = sql.lstrip().upper()
+        if statement.startswith('INSERT'):
+            self._insert(sql, 1)
+        elif statement.startswith('SELECT'):
+            self._select(sql)
+        return self
+
+    def executemany(self, sql: str, seq_of_params):
+        _sleep_ms(_settings().get('call_latency_ms', 0))
+        STATS['calls'] += 1
+        self._rows = []
+        self._insert(sql, len(seq_of_params))
+
+    def _insert(self, sql: str, rows: int):
+        match = _INSERT_RE.search(sql)
+        STATS[f"rows.{match.group(1) if match else 'unknown'}"] += rows
+        self.rowcount = rows
+        _sleep_ms(rows * _settings().get('row_latency_us', 0) / 1000)
+
+    def _select(self, sql: str):
+        if '@@VERSION' in sql.upper():
+            self._rows = [('Stand-in ODBC backend (offline benchmark)',)]
+        elif 'COUNT(*)' in sql.upper() and ' ax' not in sql:
+            self._rows = [(_settings().get('apps', 1000),)]
+        elif 'ax.app_id' in sql and ' AS ax' in sql:
+            self._rows = _source_rows(sql)
+        self.rowcount = len(self._rows)
+
+    def setinputsizes(self, sizes):
+        pass
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchval(self):
+        row = self.fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        self._rows = []
+
+
+class StandInConnection:
+    """Just enough of pyodbc.Connection for the pipeline."""
+
+    def __init__(self):
+        self.autocommit = False
+        self.closed = False
+
+    def cursor(self) -> StandInCursor:
+        return StandInCursor()
+
+    def execute(self, sql: str, *params) -> StandInCursor:
+        return self.cursor().execute(sql, *params)
+
+    def commit(self):
+        _sleep_ms(_settings().get('commit_latency_ms', 0))
+        STATS['commits'] += 1
+
+    def rollback(self):
+        STATS['rollbacks'] += 1
+
+    def close(self):
+        self.closed = True
+
+    def setencoding(self, *args, **kwargs):
+        pass
+
+    def setdecoding(self, *args, **kwargs):
+        pass
+
+
+def connect(connection_string: str = '', autocommit: bool = False, timeout: int = 0, **kwargs) -> StandInConnection:
+    """pyodbc.connect replacement (the connection string is ignored)."""
+    _sleep_ms(_settings().get('connect_latency_ms', 0))
+    STATS['connects'] += 1
+    connection = StandInConnection()
+    connection.autocommit = autocommit
+    return connection
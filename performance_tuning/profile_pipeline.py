@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Offline pipeline profiler (no database required).
+
+Runs the real worker pipeline (_init_worker + _process_work_item: validation, parsing,
+mapping, MigrationEngine inserts) in-process over sample XML files, with pyodbc replaced by
+the stand-in backend of the offline benchmarks (benchmarks/standin_odbc.py), which counts
+every insert. Every Nth app is stack-sampled by stage and the
+merged output is written as collapsed stacks (flamegraph input) plus a top-functions table,
+the same files production_processor.py --profile-every N writes.
+
+USAGE:
+    # Profile every app of the CC samples, 5 passes
+    python performance_tuning/profile_pipeline.py --repeat 5
+
+    # RL contract and samples, every 2nd app, finer sampling
+    python performance_tuning/profile_pipeline.py --contract config/mapping_contract_rl.json \\
+        --xml-dir config/samples/xml_files/reclending --every 2 --interval-ms 1
+
+    # Render a flamegraph (https://github.com/brendangregg/FlameGraph)
+    flamegraph.pl metrics/profile_offline/profile.mapping.collapsed > mapping.svg
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from pathlib import Path
+
+# Ensure repo root (pipeline) and benchmarks/ (stand-in backend) are importable when running as a script
+repo_root = Path(__file__).resolve().parents[1]
+for path in (str(repo_root), str(repo_root / 'performance_tuning' / 'benchmarks')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from xml_extractor.database.migration_engine import CONNECT_FACTORY_ENV
+from xml_extractor.processing.parallel_coordinator import WorkItem, _init_worker, _process_work_item
+from xml_extractor.monitoring.latency_histogram import StageHistograms
+from xml_extractor.monitoring.stage_profiler import ProfileAggregate
+
+import standin_odbc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the XML pipeline offline with a stand-in database")
+    parser.add_argument("--contract", default="config/mapping_contract.json", help="Mapping contract path")
+    parser.add_argument("--xml-dir", default="config/samples/xml_files", help="Directory of sample XML files (not recursive)")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the sample files (default: 3)")
+    parser.add_argument("--every", type=int, default=1, help="Profile every Nth app (default: 1)")
+    parser.add_argument("--interval-ms", type=float, default=2.0, help="Sampling interval in ms (default: 2.0)")
+    parser.add_argument("--output-dir", default="metrics/profile_offline", help="Where to write profile files")
+    args = parser.parse_args()
+
+    xml_files = sorted(Path(args.xml_dir).glob("*.xml"))
+    if not xml_files:
+        print(f"ERROR: No XML files in {args.xml_dir}")
+        return 1
+    documents = [f.read_text(encoding="utf-8", errors="replace") for f in xml_files]
+
+    # Inserts go through the real MigrationEngine into the stand-in backend (no latency configured)
+    os.environ[CONNECT_FACTORY_ENV] = f"{standin_odbc.__name__}:connect"
+    _init_worker('', args.contract, {'worker_stats': {}}, 'CRITICAL', 'profile_offline',
+                 profile_every=args.every, profile_interval_seconds=args.interval_ms / 1000)
+
+    profile = ProfileAggregate(args.interval_ms / 1000)
+    latency = StageHistograms()
+    outcomes = {'success': 0, 'failed': 0}
+    start = time.perf_counter()
+    sequence = 0
+    for _ in range(args.repeat):
+        for document in documents:
+            sequence += 1
+            result = _process_work_item(WorkItem(sequence=sequence, app_id=sequence, xml_content=document,
+                                                 record_id=f"offline_{sequence}"))
+            outcomes['success' if result.success else 'failed'] += 1
+            latency.record_all(result.stage_times)
+            profile.merge(result.profile_samples)
+    elapsed = time.perf_counter() - start
+
+    print(f"Processed {sequence} apps in {elapsed:.1f}s ({sequence / elapsed * 60:.0f} apps/min, single process) "
+          f"- {outcomes['success']} ok, {outcomes['failed']} failed")
+    print("\nStage latency:\n" + latency.format_table())
+    print("\n" + profile.format_top_functions(25))
+    for path in profile.write(args.output_dir):
+        print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
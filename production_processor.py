@@ -16,6 +16,8 @@ USAGE MODES:
     Defaults:  batch-size=500, limit=10000, workers=4, log-level=WARNING
     Range:     --app-id-start N --app-id-end M (concurrent-safe, recommended)
     Limit:     --limit N (process up to N records, testing/safety)
+    Leased:    --app-id-start N --app-id-end M --lease-run-id R --lease-instance K
+               (claims app_id blocks from a shared lease table; see launch_parallel_instances.py)
 
 KEY FEATURES:
     • Atomic transactions: zero orphaned records, +14% throughput
@@ -38,10 +40,15 @@ from typing import List, Tuple, Optional
 
 from xml_extractor.config.processing_defaults import ProcessingDefaults
 from xml_extractor.processing.parallel_coordinator import ParallelCoordinator
+from xml_extractor.processing.work_leases import (WorkLeaseStore, SqliteLeaseStore, SqlServerLeaseStore,
+                                                  LeaseBlock, DEFAULT_BLOCK_SIZE, DEFAULT_LEASE_SECONDS)
 from xml_extractor.database.migration_engine import MigrationEngine
+from xml_extractor.monitoring.result_sink import AppResultSink
+from xml_extractor.monitoring.latency_histogram import StageHistograms
+from xml_extractor.monitoring.openmetrics_exporter import OpenMetricsExporter, DEFAULT_EXPORT_INTERVAL_SECONDS
+from xml_extractor.monitoring.slow_apps import DEFAULT_SLOW_APP_TOP_N
 from xml_extractor.config.config_manager import get_config_manager
 from xml_extractor.interfaces import MappingContract, BatchProcessorInterface
-from xml_extractor.validation.mapping_contract_validator import MappingContractValidator
 
 
 # Add project root to path
@@ -112,7 +119,16 @@ class ProductionProcessor:
                  batch_processor: BatchProcessorInterface = None,
                  enable_instrumentation: bool = False,
                  modulo_shard: int = None, modulo_instance: int = None,
-                 product_line: str = "CC"):
+                 product_line: str = "CC",
+                 lease_store: WorkLeaseStore = None, lease_run_id: str = None, lease_instance_id: str = None,
+                 lease_block_size: int = DEFAULT_BLOCK_SIZE, lease_seconds: int = DEFAULT_LEASE_SECONDS,
+                 worker_max_tasks: Optional[int] = ProcessingDefaults.WORKER_MAX_TASKS,
+                 worker_max_rss_growth_mb: Optional[float] = ProcessingDefaults.WORKER_MAX_RSS_GROWTH_MB,
+                 metrics_textfile: str = None, metrics_port: int = None,
+                 metrics_interval: float = DEFAULT_EXPORT_INTERVAL_SECONDS,
+                 profile_every: int = 0, profile_interval_ms: float = 2.0,
+                 slow_app_top_n: int = DEFAULT_SLOW_APP_TOP_N, memory_track_every: int = 0,
+                 validation_sample_rate: float = 0.0, validate_quality_warnings: bool = False):
         """
         Initialize production processor.
         
@@ -137,6 +153,33 @@ class ProductionProcessor:
             modulo_shard: Total number of shards (instances) for modulo-based sharding.
             modulo_instance: Current shard index for modulo-based sharding.
             product_line: Product Code (CC or RL) to determine mapping contract.
+            lease_store: WorkLeaseStore for lease-based distribution (optional). When set, the
+                        app_id range is split into blocks and this instance claims blocks one
+                        at a time instead of processing the whole range.
+            lease_run_id: Identifier shared by all instances of a leased run
+            lease_instance_id: This instance's name in the lease table
+            lease_block_size: App_ids per lease block
+            lease_seconds: Lease duration; renewed after every batch, reclaimable once expired
+            worker_max_tasks: Recycle a worker process after this many apps (None/0 disables)
+            worker_max_rss_growth_mb: Recycle a worker once its RSS grows this much past its
+                        post-initialization baseline (None/0 disables)
+            metrics_textfile: Write live OpenMetrics to this file every metrics_interval seconds
+                        (node_exporter textfile collector); None disables
+            metrics_port: Serve live OpenMetrics on http://127.0.0.1:<port>/metrics; None disables
+            metrics_interval: Seconds between textfile writes
+            profile_every: Stack-sample every Nth app in workers (0 disables); collapsed stacks
+                        and a top-functions table are written to metrics/profile_<session>/
+            profile_interval_ms: Sampling interval while a profiled app runs
+            slow_app_top_n: Slowest apps kept by total time and per stage, written to metrics
+                        under 'slow_apps' (0 disables)
+            memory_track_every: Diagnostic mode: workers diff tracemalloc snapshots every N apps;
+                        top growing allocation sites, RSS trends and gc counts go to metrics
+                        under 'memory_growth' (0 disables; slows workers while on)
+            validation_sample_rate: Fraction of inserted apps (stable by app_id) validated with
+                        ValidationOrchestrator in a separate process fed by the workers; findings are
+                        streamed to the results file as 'validation' lines and summarized in
+                        metrics under 'inline_validation' (0 disables)
+            validate_quality_warnings: Also validate every inserted app with data quality warnings
         """
         self.server = server
         self.database = database
@@ -156,6 +199,33 @@ class ProductionProcessor:
         self.modulo_shard = modulo_shard
         self.modulo_instance = modulo_instance
         self.product_line = product_line.upper()
+        self.lease_store = lease_store
+        self.lease_run_id = lease_run_id
+        self.lease_instance_id = lease_instance_id
+        self.lease_block_size = lease_block_size
+        self.lease_seconds = lease_seconds
+        self.worker_max_tasks = worker_max_tasks
+        self.worker_max_rss_growth_mb = worker_max_rss_growth_mb
+        self.metrics_textfile = metrics_textfile
+        self.metrics_port = metrics_port
+        self.metrics_interval = metrics_interval
+        self.profile_every = profile_every
+        self.profile_interval_ms = profile_interval_ms
+        self.slow_app_top_n = slow_app_top_n
+        self.memory_track_every = memory_track_every
+        self.validation_sample_rate = validation_sample_rate
+        self.validate_quality_warnings = validate_quality_warnings
+        self._lease_block: Optional[LeaseBlock] = None
+        self.lease_history: List[dict] = []
+        
+        # Validate lease configuration (the store itself may be attached after construction)
+        if self.lease_store is not None or self.lease_run_id:
+            if self.modulo_shard is not None:
+                raise ValueError("Lease-based distribution cannot be combined with modulo sharding")
+            if self.app_id_start is None or self.app_id_end is None:
+                raise ValueError("Lease-based distribution requires app_id_start and app_id_end")
+            if not self.lease_run_id or not self.lease_instance_id:
+                raise ValueError("Lease-based distribution requires lease_run_id and lease_instance_id")
         
         # Validate modulo sharding configuration
         if (self.modulo_shard is None) != (self.modulo_instance is None):
@@ -210,6 +280,9 @@ class ProductionProcessor:
         self.logger.info(f"  Processing Batch Size: {batch_size}")
         if self.modulo_shard is not None:
             self.logger.info(f"  Modulo Sharding: Instance {self.modulo_instance} of {self.modulo_shard} (app_id % {self.modulo_shard} == {self.modulo_instance})")
+        elif self.lease_run_id:
+            self.logger.info(f"  Lease Distribution: run {self.lease_run_id}, instance {self.lease_instance_id}, "
+                             f"blocks of {self.lease_block_size} in {self.app_id_start} to {self.app_id_end}")
         elif self.app_id_start is not None and self.app_id_end is not None:
             self.logger.info(f"  App ID Range: {self.app_id_start} to {self.app_id_end} (range-based processing)")
         else:
@@ -288,9 +361,8 @@ class ProductionProcessor:
             SystemExit: If contract validation fails (exit code 1)
         """
         
-        # Validate contract structure (validator handles dataclass directly)
-        validator = MappingContractValidator(self.mapping_contract)
-        result = validator.validate_contract()
+        # Validate contract structure (result is cached per contract content, see contract_cache.py)
+        result = self.config_manager.validate_mapping_contract_structure(self.mapping_contract_path)
         
         if not result.is_valid:
             # Print validation errors to console
@@ -393,8 +465,9 @@ class ProductionProcessor:
             List of (app_id, xml_content) tuples, ordered by app_id
         """
         self.logger.info(f"Extracting XML records (limit={limit}, last_app_id={last_app_id}, exclude_failed={exclude_failed})")
-        if self.app_id_start is not None and self.app_id_end is not None:
-            self.logger.info(f"  Range Filter: app_id {self.app_id_start} to {self.app_id_end}")
+        range_start, range_end = self._active_app_id_range()
+        if range_start is not None and range_end is not None:
+            self.logger.info(f"  Range Filter: app_id {range_start} to {range_end}")
         else:
             self.logger.info(f"  Range Filter: ALL applications")
         
@@ -427,11 +500,11 @@ class ProductionProcessor:
                 if self.modulo_shard is not None:
                     where_conditions.append(f"(ax.app_id % {self.modulo_shard}) = {self.modulo_instance}")
                 # Add app_id range filtering (optional, for non-overlapping instances)
-                elif self.app_id_start is not None or self.app_id_end is not None:
-                    if self.app_id_start is not None:
-                        where_conditions.append(f"ax.app_id >= {self.app_id_start}")
-                    if self.app_id_end is not None:
-                        where_conditions.append(f"ax.app_id <= {self.app_id_end}")
+                elif range_start is not None or range_end is not None:
+                    if range_start is not None:
+                        where_conditions.append(f"ax.app_id >= {range_start}")
+                    if range_end is not None:
+                        where_conditions.append(f"ax.app_id <= {range_end}")
                 
                 # Exclude already-processed records using NOT EXISTS
                 if exclude_failed:
@@ -520,6 +593,177 @@ class ProductionProcessor:
         
         return xml_records
     
+    def _active_app_id_range(self) -> Tuple[Optional[int], Optional[int]]:
+        """App_id range for the next fetch: the held lease block in leased mode, else the configured range."""
+        if self.lease_store is not None:
+            if self._lease_block is None:
+                return None, None
+            return self._lease_block.start_id, self._lease_block.end_id
+        return self.app_id_start, self.app_id_end
+    
+    def _claim_next_lease(self) -> Optional[LeaseBlock]:
+        """Claim the next free app_id block (None when the run has no work left)."""
+        claim_start = time.time()
+        self._lease_block = self.lease_store.claim_next(self.lease_run_id, self.lease_instance_id, self.lease_seconds)
+        if self._lease_block is not None:
+            block = self._lease_block
+            self.lease_history.append({
+                'block_id': block.block_id,
+                'start_id': block.start_id,
+                'end_id': block.end_id,
+                'attempts': block.attempts,
+                'claimed_at': time.time(),
+                'claim_seconds': time.time() - claim_start,
+                'completed_at': None,
+                'processed_count': 0
+            })
+            self.logger.info(f"Leased block {block.block_id}: app_id {block.start_id} to {block.end_id} (attempt {block.attempts})")
+        return self._lease_block
+    
+    def _complete_lease(self, processed_count: int):
+        """Mark the held block done and record it for the metrics file."""
+        block = self._lease_block
+        if not self.lease_store.complete(block, processed_count):
+            self.logger.warning(f"Lease on block {block.block_id} expired and was re-claimed by another instance")
+        entry = self.lease_history[-1]
+        entry['completed_at'] = time.time()
+        entry['processed_count'] = processed_count
+        self._lease_block = None
+    
+    def _release_lease(self, processed_count: int):
+        """Hand an unfinished block back (stopping early) so another instance can claim it now."""
+        block = self._lease_block
+        try:
+            if self.lease_store.release(block):
+                self.logger.info(f"Released unfinished block {block.block_id} (app_id {block.start_id} to {block.end_id})")
+            else:
+                self.logger.warning(f"Lease on block {block.block_id} expired and was re-claimed by another instance")
+        except Exception as e:
+            # The lease still expires after lease_seconds
+            self.logger.warning(f"Could not release block {block.block_id}: {e}")
+        entry = self.lease_history[-1]
+        entry['released_at'] = time.time()
+        entry['processed_count'] = processed_count
+        self._lease_block = None
+    
+    def _lease_summary(self, run_start: float, run_end: float) -> dict:
+        """Per-instance lease figures saved to metrics (launcher derives share and idle time)."""
+        completed = [b for b in self.lease_history if b['completed_at'] is not None]
+        released = [b for b in self.lease_history if b.get('released_at') is not None]
+        busy_seconds = (sum(b['completed_at'] - b['claimed_at'] for b in completed)
+                        + sum(b['released_at'] - b['claimed_at'] for b in released))
+        return {
+            'run_id': self.lease_run_id,
+            'instance_id': self.lease_instance_id,
+            'block_size': self.lease_block_size,
+            'blocks_completed': len(completed),
+            'blocks_released': len(released),
+            'apps_processed': sum(b['processed_count'] for b in completed + released),
+            'started_at': run_start,
+            'finished_at': run_end,
+            'busy_seconds': busy_seconds,
+            'idle_seconds': max(0.0, (run_end - run_start) - busy_seconds),
+            'blocks': self.lease_history
+        }
+    
+    def _ensure_batch_processor(self):
+        """Use injected batch processor, or create ParallelCoordinator for production."""
+        if self.batch_processor is None:
+            self.batch_processor = ParallelCoordinator(
+                connection_string=self.connection_string,
+                mapping_contract_path=self.mapping_contract_path,
+                num_workers=self.workers,
+                batch_size=self.batch_size,
+                session_id=self.session_id,
+                app_id_start=self.app_id_start,
+                app_id_end=self.app_id_end,
+                enable_instrumentation=self.enable_instrumentation,
+                worker_max_tasks=self.worker_max_tasks,
+                worker_max_rss_growth_mb=self.worker_max_rss_growth_mb,
+                profile_every=self.profile_every,
+                profile_interval_seconds=self.profile_interval_ms / 1000,
+                slow_app_top_n=self.slow_app_top_n,
+                memory_track_every=self.memory_track_every,
+                validation_sample_rate=self.validation_sample_rate,
+                validate_quality_warnings=self.validate_quality_warnings
+            )
+    
+    def _write_profile(self) -> Optional[dict]:
+        """Write merged profiler output (collapsed stacks, top functions) if any apps were sampled."""
+        profile = getattr(self.batch_processor, 'profile', None)
+        if not self.profile_every or profile is None or not profile.apps_profiled:
+            return None
+        output_dir = Path("metrics") / f"profile_{self.session_id}{self._output_suffix()}"
+        files = profile.write(output_dir)
+        self.logger.info(f"Profile of {profile.apps_profiled} apps written to {output_dir}\n" + profile.format_top_functions(15))
+        return {
+            'every_n_apps': self.profile_every,
+            'interval_ms': self.profile_interval_ms,
+            'apps_profiled': profile.apps_profiled,
+            'total_samples': profile.total_samples,
+            'samples_by_stage': profile.samples_by_stage(),
+            'top_functions': profile.top_functions(20),
+            'files': [str(f) for f in files]
+        }
+    
+    def _slow_apps_summary(self) -> Optional[dict]:
+        """Slowest apps by total time and per stage, with the contract needed to replay them."""
+        tracker = getattr(self.batch_processor, 'slow_apps', None)
+        if tracker is None or not tracker:
+            return None
+        self.logger.info("Slowest applications (total):\n" + tracker.format_table('total', limit=5))
+        return {'mapping_contract': self.mapping_contract_path, **tracker.to_dict()}
+    
+    def _memory_growth_summary(self) -> Optional[dict]:
+        """Worker memory growth (tracemalloc sites, RSS trends, gc counts) when tracking was on."""
+        memory = getattr(self.batch_processor, 'memory', None)
+        if not self.memory_track_every or memory is None or not memory:
+            return None
+        self.logger.info("Top growing allocation sites (since worker start):\n" + memory.format_top_sites())
+        return {'every_n_apps': self.memory_track_every, **memory.summary()}
+    
+    def _inline_validation_summary(self) -> Optional[dict]:
+        """Findings, drops and hot-path overhead of sampled inline validation, when it was on."""
+        aggregate = getattr(self.batch_processor, 'inline_validation', None)
+        if not (self.validation_sample_rate or self.validate_quality_warnings) or aggregate is None:
+            return None
+        self.logger.info("Inline validation:\n" + aggregate.format_summary())
+        return {
+            'sample_rate': self.validation_sample_rate,
+            'quality_warnings': self.validate_quality_warnings,
+            **aggregate.summary()
+        }
+    
+    def _finish_inline_validation(self, result_sink: AppResultSink, batch_number: int):
+        """Drain the validation processes at shutdown and stream the remaining findings (no-op once done)."""
+        finish = getattr(self.batch_processor, 'finish_inline_validation', None)
+        if not (self.validation_sample_rate or self.validate_quality_warnings) or finish is None:
+            return
+        try:
+            result_sink.write_records(batch_number, 'validation', finish())
+        except Exception as e:
+            self.logger.warning(f"Could not drain inline validation findings: {e}")
+    
+    def _start_metrics_exporter(self) -> Optional[OpenMetricsExporter]:
+        """Publish the coordinator's live state as OpenMetrics, if requested and supported."""
+        if not self.metrics_textfile and self.metrics_port is None:
+            return None
+        self._ensure_batch_processor()
+        live_state = getattr(self.batch_processor, 'live_state', None)
+        if live_state is None:
+            self.logger.warning("Batch processor exposes no live state; OpenMetrics export disabled")
+            return None
+        exporter = OpenMetricsExporter(
+            live_state,
+            textfile_path=self.metrics_textfile,
+            http_port=self.metrics_port,
+            interval_seconds=self.metrics_interval,
+            const_labels={'session': self.session_id, 'instance': self._output_suffix().lstrip('_') or 'all'}
+        ).start()
+        if self.metrics_textfile:
+            self.logger.info(f"Writing OpenMetrics textfile every {self.metrics_interval:g}s: {self.metrics_textfile}")
+        return exporter
+    
     def process_batch(self, xml_records: List[Tuple[int, str]], batch_number: int = 1) -> dict:
         """
         Process a batch of XML applications with full monitoring.
@@ -544,18 +788,7 @@ class ProductionProcessor:
         
         self.logger.info(f"Starting batch processing of {len(xml_records)} records")
         
-        # Use injected batch processor, or create ParallelCoordinator for production
-        if self.batch_processor is None:
-            self.batch_processor = ParallelCoordinator(
-                connection_string=self.connection_string,
-                mapping_contract_path=self.mapping_contract_path,
-                num_workers=self.workers,
-                batch_size=self.batch_size,
-                session_id=self.session_id,
-                app_id_start=self.app_id_start,
-                app_id_end=self.app_id_end,
-                enable_instrumentation=self.enable_instrumentation
-            )
+        self._ensure_batch_processor()
         
         # Process batch
         start_time = time.time()
@@ -568,6 +801,7 @@ class ProductionProcessor:
         individual_results = processing_result.performance_metrics.get('individual_results', [])
         failed_apps = []
         quality_issue_apps = []  # Apps that succeeded but had data quality warnings
+        app_results = []  # Per-app outcomes (after the PK rule below) for the result stream
         for result in individual_results:
             success = result.get('success', True)
             app_id = result.get('app_id')
@@ -583,6 +817,8 @@ class ProductionProcessor:
                 # No need to log - already logged atomically with data insertion
                 success = True
             
+            app_results.append({**result, 'success': success})
+            
             if not success:
                 # Only track failures for reporting
                 failure_reason = f"{error_stage}: {error_message}"
@@ -635,7 +871,10 @@ class ProductionProcessor:
             'failed_apps': failed_apps,
             'failure_summary': failure_summary,
             'quality_issue_apps': quality_issue_apps,
-            'quality_issue_count': len(quality_issue_apps)
+            'quality_issue_count': len(quality_issue_apps),
+            'app_results': app_results,
+            'validation_findings': processing_result.performance_metrics.get('validation_findings', []),
+            'stage_latency': processing_result.performance_metrics.get('stage_latency')
         }
         
         # Log summary
@@ -701,6 +940,16 @@ class ProductionProcessor:
         
         return metrics
     
+    def _output_suffix(self) -> str:
+        """Modulo instance suffix for multi-instance runs, or range suffix for range-based processing."""
+        if self.modulo_shard is not None:
+            return f"_instance_{self.modulo_instance}_of_{self.modulo_shard}"
+        if self.lease_store is not None:
+            return f"_lease_{self.lease_run_id}_instance_{self.lease_instance_id}"
+        if self.app_id_start is not None and self.app_id_end is not None:
+            return f"_range_{self.app_id_start}_{self.app_id_end}"
+        return ""
+    
     def _save_metrics(self, metrics: dict):
         """
         Save consolidated performance metrics to JSON file.
@@ -708,20 +957,12 @@ class ProductionProcessor:
         Includes:
         - Connection/processing configuration
         - Overall run statistics
-        - Failure analysis
+        - Failure analysis (totals; per-app failures are in the results stream)
         - Per-batch detailed breakdown
         """
         metrics_dir = Path("metrics")
         metrics_dir.mkdir(exist_ok=True)
-        
-        # Add modulo instance suffix for multi-instance runs, or range suffix for range-based processing
-        if self.modulo_shard is not None:
-            instance_suffix = f"_instance_{self.modulo_instance}_of_{self.modulo_shard}"
-        elif self.app_id_start is not None and self.app_id_end is not None:
-            instance_suffix = f"_range_{self.app_id_start}_{self.app_id_end}"
-        else:
-            instance_suffix = ""
-        metrics_file = metrics_dir / f"metrics_{self.session_id}{instance_suffix}.json"
+        metrics_file = metrics_dir / f"metrics_{self.session_id}{self._output_suffix()}.json"
         
         try:
             # Build consolidated metrics structure
@@ -745,11 +986,29 @@ class ProductionProcessor:
                 'total_database_inserts': metrics.get('total_database_inserts', 0),
                 'parallel_efficiency': metrics.get('parallel_efficiency', 0),
                 'failure_summary': metrics.get('failure_summary', {}),
-                'failed_apps': metrics.get('failed_apps', []),
-                'quality_issue_apps': metrics.get('quality_issue_apps', []),
+                'failures_by_stage': metrics.get('failures_by_stage', {}),
+                'failed_app_ids_sample': metrics.get('failed_app_ids_sample', []),
                 'quality_issue_count': metrics.get('quality_issue_count', 0),
+                'results_file': metrics.get('results_file'),
+                'result_aggregates': metrics.get('result_aggregates', {}),
                 'batch_details': metrics.get('batch_details', [])
             }
+            if metrics.get('lease') is not None:
+                consolidated_metrics['lease'] = metrics['lease']
+            if metrics.get('stage_latency'):
+                # Summary for reading, bucket counts for merging across instances/chunks
+                consolidated_metrics['stage_latency'] = metrics['stage_latency']
+                consolidated_metrics['stage_latency_histograms'] = metrics.get('stage_latency_histograms', {})
+            if metrics.get('profile') is not None:
+                consolidated_metrics['profile'] = metrics['profile']
+            if metrics.get('slow_apps') is not None:
+                consolidated_metrics['slow_apps'] = metrics['slow_apps']
+            if metrics.get('memory_growth') is not None:
+                consolidated_metrics['memory_growth'] = metrics['memory_growth']
+            if metrics.get('inline_validation') is not None:
+                consolidated_metrics['inline_validation'] = metrics['inline_validation']
+            if metrics.get('worker_recycling') is not None:
+                consolidated_metrics['worker_recycling'] = metrics['worker_recycling']
             
             # JSON serializer helper to handle Decimal and datetime objects gracefully
             from decimal import Decimal
@@ -777,6 +1036,15 @@ class ProductionProcessor:
             # Re-raise to make failure visible in console
             raise
     
+    def _worker_recycling_summary(self) -> Optional[dict]:
+        """Worker recycle events and pool counters from the batch processor, if it recycles workers."""
+        if not hasattr(self.batch_processor, 'get_recycle_events'):
+            return None
+        return {
+            'events': self.batch_processor.get_recycle_events(),
+            'pool': self.batch_processor.get_pool_stats()
+        }
+
     def run_full_processing(self, limit: Optional[int] = None):
         """
         Run full processing with batching and monitoring.
@@ -791,7 +1059,9 @@ class ProductionProcessor:
         
         # Display processing scope in console
         print("\n" + "=" * 82)
-        if self.app_id_start is not None and self.app_id_end is not None:
+        if self.lease_store is not None:
+           print(f" PROCESSING LEASED BLOCKS OF [app_id] RANGE: {self.app_id_start} - {self.app_id_end} (instance {self.lease_instance_id})")
+        elif self.app_id_start is not None and self.app_id_end is not None:
            print(f" PROCESSING [app_id] RANGE: {self.app_id_start} - {self.app_id_end}")
         elif limit:
             print(f" PROCESSING UP TO {limit:,} APPLICATIONS")
@@ -830,8 +1100,6 @@ class ProductionProcessor:
         total_processed = 0
         total_successful = 0
         total_failed = 0
-        all_failed_apps = []
-        all_quality_issue_apps = []  # Collect quality warnings across batches
         total_database_inserts = 0  # Track total inserts regardless of instrumentation
         batch_details = [] if self.enable_instrumentation else None  # Collect per-batch metrics only when instrumented
         batch_count = 0  # Track batch number independently of batch_details
@@ -847,138 +1115,201 @@ class ProductionProcessor:
         }
         overall_start = time.time()
         
-        while True:
-            # Calculate remaining records to fetch based on total limit
-            remaining_limit = None
-            if limit:
-                remaining_limit = limit - total_processed
-                if remaining_limit <= 0:
-                    break
-            
-            # Get next batch using cursor-based pagination (app_id > last_app_id)
-            # Fetch min(batch_size, remaining_limit) records
-            fetch_limit = self.batch_size
-            if remaining_limit:
-                fetch_limit = min(self.batch_size, remaining_limit)
-            
-            batch_records = self.get_xml_records(limit=fetch_limit, last_app_id=last_app_id)
-            
-            if not batch_records:
-                break
+        # Per-app results are streamed to disk; only running aggregates stay in memory
+        result_sink = AppResultSink(Path("metrics") / f"results_{self.session_id}{self._output_suffix()}.jsonl").open()
+        self.logger.info(f"Streaming per-app results to: {result_sink.path}")
+        run_latency = StageHistograms()
+        metrics_exporter = None
+        block_processed_start = 0
+        try:
+            metrics_exporter = self._start_metrics_exporter()
             
-            # Process batch
-            batch_count += 1
-            batch_number = batch_count
-            app_ids = [rec[0] for rec in batch_records]
-            self.logger.info(f"Processing batch {batch_number}: app_ids {min(app_ids)}-{max(app_ids)}" if app_ids else f"Processing batch {batch_number}: empty batch")
-            batch_start_time = time.time()
-            metrics = self.process_batch(batch_records, batch_number=batch_number)
-            batch_duration = time.time() - batch_start_time
+            # Leased mode: work through claimed blocks until the lease table is drained
+            if self.lease_store is not None:
+                self.lease_store.initialize(self.lease_run_id, self.app_id_start, self.app_id_end, self.lease_block_size)
+                self._claim_next_lease()
             
-            # Collect batch metrics for later reporting (only if instrumentation enabled)
-            if self.enable_instrumentation:
-                batch_detail = {
-                    'batch_number': batch_number,
+            while True:
+                if self.lease_store is not None and self._lease_block is None:
+                    break
+                
+                # Calculate remaining records to fetch based on total limit
+                remaining_limit = None
+                if limit:
+                    remaining_limit = limit - total_processed
+                    if remaining_limit <= 0:
+                        break
+                
+                # Get next batch using cursor-based pagination (app_id > last_app_id)
+                # Fetch min(batch_size, remaining_limit) records
+                fetch_limit = self.batch_size
+                if remaining_limit:
+                    fetch_limit = min(self.batch_size, remaining_limit)
+                
+                fetch_start = time.perf_counter()
+                batch_records = self.get_xml_records(limit=fetch_limit, last_app_id=last_app_id)
+                fetch_seconds = time.perf_counter() - fetch_start
+                
+                if not batch_records:
+                    if self.lease_store is not None:
+                        # Block exhausted: hand it back as done and move on to the next one
+                        self._complete_lease(total_processed - block_processed_start)
+                        block_processed_start = total_processed
+                        last_app_id = 0
+                        if self._claim_next_lease() is not None:
+                            continue
+                    break
+                
+                # Process batch
+                batch_count += 1
+                batch_number = batch_count
+                app_ids = [rec[0] for rec in batch_records]
+                self.logger.info(f"Processing batch {batch_number}: app_ids {min(app_ids)}-{max(app_ids)}" if app_ids else f"Processing batch {batch_number}: empty batch")
+                batch_start_time = time.time()
+                metrics = self.process_batch(batch_records, batch_number=batch_number)
+                batch_duration = time.time() - batch_start_time
+                
+                # Per-stage latency: this batch's histograms (plus its source fetch) fold into the run totals
+                batch_latency = metrics.get('stage_latency') or StageHistograms()
+                batch_latency.record('source_fetch', fetch_seconds)
+                run_latency.merge(batch_latency)
+                
+                batch_summary = {
                     'total_applications_processed': metrics.get('records_processed', 0),
                     'duration_seconds': float(batch_duration),
                     'applications_per_minute': float((metrics.get('records_processed', 0) / batch_duration * 60) if batch_duration > 0 else 0),
                     'database_inserts': metrics.get('total_records_inserted', 0),
                     'application_failures': metrics.get('records_failed', 0),
-                    'individual_results': metrics.get('individual_results', [])
+                    'stage_latency': batch_latency.summary()
                 }
-                batch_details.append(batch_detail)
+                result_sink.write_batch(batch_number, metrics.get('app_results', []), batch_summary)
+                result_sink.write_records(batch_number, 'validation', metrics.get('validation_findings', []))
+                
+                # Keep per-batch figures for later reporting (only if instrumentation enabled)
+                if self.enable_instrumentation:
+                    batch_details.append({'batch_number': batch_number, **batch_summary})
+                
+                # Update totals
+                total_processed += metrics.get('records_processed', 0)
+                total_successful += metrics.get('records_successful', 0)
+                total_failed += metrics.get('records_failed', 0)
+                total_database_inserts += metrics.get('total_records_inserted', 0)
+                
+                # Accumulate failure summary (failed apps themselves are in the result stream)
+                batch_failure_summary = metrics.get('failure_summary', {})
+                for key in overall_failure_summary:
+                    overall_failure_summary[key] += batch_failure_summary.get(key, 0)
+                
+                # Update cursor to last app_id in batch for next iteration
+                if batch_records:
+                    last_app_id = max(rec[0] for rec in batch_records)
+                
+                # Keep the held block leased while it is being worked on
+                if self._lease_block is not None:
+                    self.lease_store.renew(self._lease_block, self.lease_seconds)
+                
+                # Check if we've reached the limit
+                if limit and total_processed >= limit:
+                    break
             
-            # Update totals
-            total_processed += metrics.get('records_processed', 0)
-            total_successful += metrics.get('records_successful', 0)
-            total_failed += metrics.get('records_failed', 0)
-            total_database_inserts += metrics.get('total_records_inserted', 0)
+            # Stopped before the held block was drained (--limit): hand the rest of it back
+            if self._lease_block is not None:
+                self._release_lease(total_processed - block_processed_start)
             
-            # Accumulate failed apps and failure summary
-            all_failed_apps.extend(metrics.get('failed_apps', []))
-            batch_failure_summary = metrics.get('failure_summary', {})
-            for key in overall_failure_summary:
-                overall_failure_summary[key] += batch_failure_summary.get(key, 0)
+            # Findings validated after the last batch result, before the summary is built
+            self._finish_inline_validation(result_sink, batch_count)
             
-            # Accumulate quality issue apps
-            all_quality_issue_apps.extend(metrics.get('quality_issue_apps', []))
+            # Final summary
+            overall_time = time.time() - overall_start
+            overall_rate = total_processed / (overall_time / 60) if overall_time > 0 else 0
+            overall_success_rate = (total_successful/total_processed*100) if total_processed > 0 else 0
             
-            # Update cursor to last app_id in batch for next iteration
-            if batch_records:
-                last_app_id = max(rec[0] for rec in batch_records)
+            self.logger.info("="*82)
+            self.logger.info(" FULL PROCESSING COMPLETE")
+            self.logger.info("="*82)
+            self.logger.info(f"  Total Applications Processed: {total_processed}")
+            self.logger.info(f"  Total Successful: {total_successful}")
+            self.logger.info(f"  Total Failed: {total_failed}")
+            self.logger.info(f"  Overall Success Rate: {overall_success_rate:.1f}%")
+            self.logger.info(f"  Overall Time: {overall_time/60:.1f} minutes")
+            self.logger.info(f"  Overall Rate: {overall_rate:.1f} applications/minute")
+            if run_latency:
+                self.logger.info("  Stage latency (per app; source_fetch per batch):\n" + run_latency.format_table())
+            if self.enable_instrumentation and batch_details:
+                self.logger.info(f"  Total Database Records Inserted: {sum(b.get('database_inserts', 0) for b in batch_details)}")
             
-            # Check if we've reached the limit
-            if limit and total_processed >= limit:
-                break
-        
-        # Final summary
-        overall_time = time.time() - overall_start
-        overall_rate = total_processed / (overall_time / 60) if overall_time > 0 else 0
-        overall_success_rate = (total_successful/total_processed*100) if total_processed > 0 else 0
-        
-        self.logger.info("="*82)
-        self.logger.info(" FULL PROCESSING COMPLETE")
-        self.logger.info("="*82)
-        self.logger.info(f"  Total Applications Processed: {total_processed}")
-        self.logger.info(f"  Total Successful: {total_successful}")
-        self.logger.info(f"  Total Failed: {total_failed}")
-        self.logger.info(f"  Overall Success Rate: {overall_success_rate:.1f}%")
-        self.logger.info(f"  Overall Time: {overall_time/60:.1f} minutes")
-        self.logger.info(f"  Overall Rate: {overall_rate:.1f} applications/minute")
-        if self.enable_instrumentation and batch_details:
-            self.logger.info(f"  Total Database Records Inserted: {sum(b.get('database_inserts', 0) for b in batch_details)}")
-        
-        # Log overall failure summary if there were failures
-        if total_failed > 0:
-            self.logger.warning("="*82)
-            self.logger.warning(" FAILURE ANALYSIS")
-            self.logger.warning("="*82)
+            # Log overall failure summary if there were failures
+            if total_failed > 0:
+                self.logger.warning("="*82)
+                self.logger.warning(" FAILURE ANALYSIS")
+                self.logger.warning("="*82)
 
-            if overall_failure_summary.get('validation_failures', 0) > 0:
-                self.logger.warning(f" Validation Failures: {overall_failure_summary['validation_failures']} (XML validation issues)")
-            if overall_failure_summary['parsing_failures'] > 0:
-                self.logger.warning(f" Parsing Failures: {overall_failure_summary['parsing_failures']} (XML structure/format issues)")
-            if overall_failure_summary['mapping_failures'] > 0:
-                self.logger.warning(f" Mapping Failures: {overall_failure_summary['mapping_failures']} (Data transformation issues)")
-            if overall_failure_summary['insertion_failures'] > 0:
-                self.logger.warning(f" Insertion Failures: {overall_failure_summary['insertion_failures']} (General database insertion issues)")
-            if overall_failure_summary['constraint_violations'] > 0:
-                self.logger.warning(f" Constraint Violations: {overall_failure_summary['constraint_violations']} (Primary key, foreign key, null constraints)")
-            if overall_failure_summary['database_errors'] > 0:
-                self.logger.warning(f" Database Errors: {overall_failure_summary['database_errors']} (Connection, timeout, SQL errors)")
-            if overall_failure_summary['system_errors'] > 0:
-                self.logger.warning(f" System Errors: {overall_failure_summary['system_errors']} (Unexpected system issues)")
-            if overall_failure_summary['unknown_failures'] > 0:
-                self.logger.warning(f" Unknown Failures: {overall_failure_summary['unknown_failures']} (Unclassified errors)")
+                if overall_failure_summary.get('validation_failures', 0) > 0:
+                    self.logger.warning(f" Validation Failures: {overall_failure_summary['validation_failures']} (XML validation issues)")
+                if overall_failure_summary['parsing_failures'] > 0:
+                    self.logger.warning(f" Parsing Failures: {overall_failure_summary['parsing_failures']} (XML structure/format issues)")
+                if overall_failure_summary['mapping_failures'] > 0:
+                    self.logger.warning(f" Mapping Failures: {overall_failure_summary['mapping_failures']} (Data transformation issues)")
+                if overall_failure_summary['insertion_failures'] > 0:
+                    self.logger.warning(f" Insertion Failures: {overall_failure_summary['insertion_failures']} (General database insertion issues)")
+                if overall_failure_summary['constraint_violations'] > 0:
+                    self.logger.warning(f" Constraint Violations: {overall_failure_summary['constraint_violations']} (Primary key, foreign key, null constraints)")
+                if overall_failure_summary['database_errors'] > 0:
+                    self.logger.warning(f" Database Errors: {overall_failure_summary['database_errors']} (Connection, timeout, SQL errors)")
+                if overall_failure_summary['system_errors'] > 0:
+                    self.logger.warning(f" System Errors: {overall_failure_summary['system_errors']} (Unexpected system issues)")
+                if overall_failure_summary['unknown_failures'] > 0:
+                    self.logger.warning(f" Unknown Failures: {overall_failure_summary['unknown_failures']} (Unclassified errors)")
 
-            # Log sample of failed app_ids for investigation
-            failed_app_ids = [str(f['app_id']) for f in all_failed_apps if f.get('app_id') is not None]
-            unique_failed_ids = list(dict.fromkeys(failed_app_ids))  # Remove duplicates while preserving order
+                # Log sample of failed app_ids for investigation (full list: results stream)
+                failed_app_ids = [str(app_id) for app_id in result_sink.aggregates.failed_app_ids_sample]
+                
+                if result_sink.aggregates.failed <= len(failed_app_ids):
+                    self.logger.warning(f" Failed App IDs: {', '.join(failed_app_ids)}")
+                else:
+                    self.logger.warning(f" Failed App IDs (first {len(failed_app_ids)}): {', '.join(failed_app_ids)}")
+                    self.logger.warning(f" Total failed apps: {result_sink.aggregates.failed} (see {result_sink.path})")
             
-            if len(unique_failed_ids) <= 20:
-                self.logger.warning(f" Failed App IDs: {', '.join(unique_failed_ids)}")
-            else:
-                self.logger.warning(f" Failed App IDs (first 20): {', '.join(unique_failed_ids[:20])}")
-                self.logger.warning(f" Total unique failed apps: {len(unique_failed_ids)}")
-        
-        final_metrics = {
-            'app_id_start': self.app_id_start,
-            'app_id_end': self.app_id_end,
-            'total_processed': total_processed,
-            'total_successful': total_successful,
-            'total_failed': total_failed,
-            'overall_success_rate': overall_success_rate,
-            'overall_time_minutes': overall_time / 60,
-            'overall_rate_per_minute': overall_rate,
-            'failed_apps': all_failed_apps,
-            'failure_summary': overall_failure_summary,
-            'quality_issue_apps': all_quality_issue_apps,
-            'quality_issue_count': len(all_quality_issue_apps),
-            'batch_details': batch_details if self.enable_instrumentation else [],
-            'limit': limit,
-            'total_database_inserts': total_database_inserts,
-            'parallel_efficiency': statistics.mean([b.get('applications_per_minute', 0) / overall_rate for b in batch_details]) if self.enable_instrumentation and batch_details and overall_rate > 0 else 0
-        }
+            final_metrics = {
+                'app_id_start': self.app_id_start,
+                'app_id_end': self.app_id_end,
+                'total_processed': total_processed,
+                'total_successful': total_successful,
+                'total_failed': total_failed,
+                'overall_success_rate': overall_success_rate,
+                'overall_time_minutes': overall_time / 60,
+                'overall_rate_per_minute': overall_rate,
+                'failure_summary': overall_failure_summary,
+                'failures_by_stage': dict(result_sink.aggregates.failures_by_stage),
+                'failed_app_ids_sample': list(result_sink.aggregates.failed_app_ids_sample),
+                'quality_issue_count': result_sink.aggregates.quality_issue_count,
+                'results_file': str(result_sink.path),
+                'result_aggregates': result_sink.aggregates.to_dict(),
+                'batch_details': batch_details if self.enable_instrumentation else [],
+                'limit': limit,
+                'total_database_inserts': total_database_inserts,
+                'parallel_efficiency': statistics.mean([b.get('applications_per_minute', 0) / overall_rate for b in batch_details]) if self.enable_instrumentation and batch_details and overall_rate > 0 else 0,
+                'lease': self._lease_summary(overall_start, time.time()) if self.lease_store is not None else None,
+                'worker_recycling': self._worker_recycling_summary(),
+                'stage_latency': run_latency.summary(),
+                'stage_latency_histograms': run_latency.to_dict(),
+                'profile': self._write_profile(),
+                'slow_apps': self._slow_apps_summary(),
+                'memory_growth': self._memory_growth_summary(),
+                'inline_validation': self._inline_validation_summary()
+            }
+        finally:
+            # Also on errors: hand back a held block, flush the result stream, stop exporter and workers
+            if self._lease_block is not None:
+                self._release_lease(total_processed - block_processed_start)
+            self._finish_inline_validation(result_sink, batch_count)
+            result_sink.close()
+            if metrics_exporter is not None:
+                metrics_exporter.stop()
+            
+            # Release worker processes (injected processors may not own any)
+            if hasattr(self.batch_processor, 'close'):
+                self.batch_processor.close()
         
         # Save consolidated metrics file once at end of run
         self._save_metrics(final_metrics)
@@ -1033,6 +1364,48 @@ def main():
     parser.add_argument("--modulo-instance", type=int, default=None,
                        help="Instance ID (0 to N-1) for modulo sharding (processes app_id %% N == instance_id)")
     
+    # Lease-based distribution (dynamic alternative to modulo sharding)
+    parser.add_argument("--lease-run-id", default=None,
+                       help="Claim app_id blocks of --app-id-start..--app-id-end from the shared lease table for this run id")
+    parser.add_argument("--lease-instance", default=None,
+                       help="This instance's name in the lease table (required with --lease-run-id)")
+    parser.add_argument("--lease-block-size", type=int, default=DEFAULT_BLOCK_SIZE,
+                       help=f"App_ids per lease block (default: {DEFAULT_BLOCK_SIZE})")
+    parser.add_argument("--lease-seconds", type=int, default=DEFAULT_LEASE_SECONDS,
+                       help=f"Lease duration before a block can be re-claimed (default: {DEFAULT_LEASE_SECONDS})")
+    parser.add_argument("--lease-db", default=None,
+                       help="SQLite file to use as the lease table (local stand-in; default: [target_schema].[work_lease])")
+    
+    # Worker recycling (replaces individual workers instead of restarting the process)
+    parser.add_argument("--worker-max-tasks", type=int, default=ProcessingDefaults.WORKER_MAX_TASKS,
+                       help=f"Recycle a worker after this many applications, 0 to disable (default: {ProcessingDefaults.WORKER_MAX_TASKS})")
+    parser.add_argument("--worker-max-rss-mb", type=float, default=ProcessingDefaults.WORKER_MAX_RSS_GROWTH_MB,
+                       help=f"Recycle a worker once its memory grows this many MB past startup, 0 to disable (default: {ProcessingDefaults.WORKER_MAX_RSS_GROWTH_MB})")
+    
+    # Live OpenMetrics export (Prometheus node_exporter textfile collector or local scrape endpoint)
+    parser.add_argument("--metrics-textfile", default=None,
+                       help="Rewrite this .prom file with live OpenMetrics every --metrics-interval seconds")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                       help="Serve live OpenMetrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-interval", type=float, default=DEFAULT_EXPORT_INTERVAL_SECONDS,
+                       help=f"Seconds between textfile writes (default: {DEFAULT_EXPORT_INTERVAL_SECONDS:g})")
+    
+    # Sampling profiler (collapsed stacks per stage + top functions, written at run end)
+    parser.add_argument("--profile-every", type=int, default=0,
+                       help="Stack-sample every Nth application inside workers (default: 0 = off)")
+    parser.add_argument("--profile-interval-ms", type=float, default=2.0,
+                       help="Sampling interval while a profiled application runs (default: 2.0)")
+    parser.add_argument("--slow-apps", type=int, default=DEFAULT_SLOW_APP_TOP_N,
+                       help=f"Slowest applications kept per stage in metrics for replay (default: {DEFAULT_SLOW_APP_TOP_N}, 0 = off)")
+    parser.add_argument("--memory-track-every", type=int, default=0,
+                       help="Diagnostic: diff tracemalloc snapshots in each worker every N applications (default: 0 = off)")
+    
+    # Sampled inline post-extraction validation (workers hand samples to a separate InlineValidationService process over a bounded queue; findings in the results stream)
+    parser.add_argument("--validate-sample", type=float, default=0.0,
+                       help="Fraction of inserted applications to validate off the hot path, e.g. 0.01 (default: 0 = off)")
+    parser.add_argument("--validate-quality-warnings", action="store_true",
+                       help="Also validate every inserted application that had data quality warnings")
+    
     # Product line selection
     parser.add_argument("--product-line", default="CC",
                        choices=["CC", "RL"],
@@ -1046,6 +1419,10 @@ def main():
     # When NOT in range mode and no --limit provided, apply safety default
     in_range_mode = args.app_id_start is not None and args.app_id_end is not None
     
+    if args.lease_run_id and (not in_range_mode or not args.lease_instance):
+        print(" ERROR: --lease-run-id requires --app-id-start, --app-id-end and --lease-instance")
+        return 1
+    
     if in_range_mode:
         # Range mode: process entire range, ignore limit
         processing_limit = None
@@ -1079,8 +1456,29 @@ def main():
             enable_instrumentation=args.enable_instrumentation,
             modulo_shard=args.modulo_shard,
             modulo_instance=args.modulo_instance,
-            product_line=args.product_line
+            product_line=args.product_line,
+            lease_run_id=args.lease_run_id,
+            lease_instance_id=args.lease_instance,
+            lease_block_size=args.lease_block_size,
+            lease_seconds=args.lease_seconds,
+            worker_max_tasks=args.worker_max_tasks or None,
+            worker_max_rss_growth_mb=args.worker_max_rss_mb or None,
+            metrics_textfile=args.metrics_textfile,
+            metrics_port=args.metrics_port,
+            metrics_interval=args.metrics_interval,
+            profile_every=args.profile_every,
+            profile_interval_ms=args.profile_interval_ms,
+            slow_app_top_n=args.slow_apps,
+            memory_track_every=args.memory_track_every,
+            validation_sample_rate=args.validate_sample,
+            validate_quality_warnings=args.validate_quality_warnings
         )
+        if args.lease_run_id:
+            if args.lease_db:
+                processor.lease_store = SqliteLeaseStore(args.lease_db)
+            else:
+                engine = MigrationEngine(processor.connection_string, mapping_contract_path=processor.mapping_contract_path)
+                processor.lease_store = SqlServerLeaseStore(engine.get_connection, processor.target_schema)
         # Run processing with calculated limit
         results = processor.run_full_processing(limit=processing_limit)
         
@@ -1,9 +1,10 @@
 """
-Sequential Chunked Processor Orchestrator
+Chunked Processor Orchestrator
 
-Manages sequential execution of production_processor.py with automatic process lifecycle
+Manages execution of production_processor.py with automatic process lifecycle
 management. Breaks large datasets into manageable chunks, each running as a fresh process
-to prevent memory degradation and performance issues over long runs.
+to prevent memory degradation and performance issues over long runs. Chunks run one at a
+time by default, or K at a time within a global worker budget (K x workers <= CPU cores).
 
 Specifically this addresses Python internal state accumulation: lxml caches, pyodbc metadata, type system caches
 
@@ -22,6 +23,9 @@ Limit Mode (for testing):
 Custom Chunk Size:
     python run_production_processor.py --app-id-start 1 --app-id-end 60000 --chunk-size 5000
 
+Concurrent Chunks (unattended):
+    python run_production_processor.py --app-id-start 1 --app-id-end 600000 --concurrent-chunks 0
+
 =============================================================================
 WHY USE THIS INSTEAD OF production_processor.py?
 =============================================================================
@@ -41,7 +45,7 @@ Use Direct Processor When:
 HOW IT WORKS
 =============================================================================
 
-Chunking = Process Lifecycle Management (NOT Concurrency)
+Chunking = Process Lifecycle Management (concurrency is optional)
 
 For: --app-id-start 1 --app-id-end 60000 --chunk-size 10000
 
@@ -58,6 +62,12 @@ Each chunk:
   - Independent log file
   - Resume-safe (skips already-processed records)
 
+With --concurrent-chunks K, up to K chunk processes run at once (lowest app_ids first).
+K is clamped so that K x --workers never exceeds the CPU core count; 0 means "as many as
+fit". Console output of concurrent chunks goes to logs/chunk_<start>_<end>.console.log so
+it does not interleave. A failed chunk is retried automatically with exponential backoff
+(resume-safe, so a retry only picks up what is left); the orchestrator never prompts.
+
 Benefits:
   - Prevents memory leaks over long runs
   - Natural checkpoints every chunk
@@ -76,6 +86,10 @@ Processing Mode (choose one):
 Chunking:
     --chunk-size          App IDs per chunk - each chunk runs as separate process (default: 10000)
                          Prevents performance degradation on long production runs (>100k applications)
+    --concurrent-chunks   Chunks running at once (default: 1, 0 = as many as the core budget allows)
+                         Clamped so concurrent-chunks x workers <= CPU cores
+    --max-retries         Automatic retries per failed chunk (default: 2)
+    --retry-backoff       Seconds before the first retry, doubled on each further retry (default: 30)
 
 Pass-Through Parameters (same as production_processor.py):
     --server              SQL Server instance (default: localhost\\SQLEXPRESS)
@@ -115,8 +129,8 @@ TROUBLESHOOTING
 =============================================================================
 
 Chunk Fails:
-  - Orchestrator prompts: "Continue with next chunk? (y/n)"
-  - Choose 'n' to stop and investigate
+  - Orchestrator retries it automatically (--max-retries, --retry-backoff) and moves on
+  - Chunks still failing after all retries are listed in the summary; exit code is 1
   - Fix issue, re-run same command (resume-safe)
 
 Already-Processed Records:
@@ -125,6 +139,8 @@ Already-Processed Records:
   - Re-running is safe and efficient
 
 Memory Issues:
+  - Workers are already recycled individually inside each chunk (--worker-max-tasks,
+    --worker-max-rss-mb on production_processor.py); recycle events are in the metrics file
   - Reduce --chunk-size (more frequent process restarts)
   - Reduce --batch-size (less memory per batch)
   - Reduce --workers (less parallelism)
@@ -133,21 +149,52 @@ Memory Issues:
 """
 
 import argparse
+import os
 import subprocess
 import sys
 import json
+import time
 
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+
+import psutil
 
 from xml_extractor.config.processing_defaults import ProcessingDefaults
+from xml_extractor.monitoring.latency_histogram import StageHistograms
+from xml_extractor.monitoring.slow_apps import SlowAppTracker
+
+
+def resolve_concurrent_chunks(requested: int, workers_per_chunk: int, cpu_count: Optional[int] = None) -> int:
+    """
+    Number of chunks that may run at once within the global worker budget.
+    
+    Args:
+        requested: Desired concurrent chunks (0 = as many as the budget allows)
+        workers_per_chunk: --workers passed to each production_processor.py
+        cpu_count: Core budget (defaults to os.cpu_count())
+        
+    Returns:
+        K >= 1 with K x workers_per_chunk <= cpu_count (a single chunk always runs,
+        even when its workers alone exceed the core count)
+    """
+    cores = cpu_count or os.cpu_count() or 1
+    budget = max(1, cores // max(1, workers_per_chunk))
+    if requested <= 0:
+        return budget
+    return min(requested, budget)
 
 
 class ChunkedProcessorOrchestrator:
-    """Orchestrates sequential execution of production_processor.py in chunks."""
+    """Orchestrates execution of production_processor.py in chunks (sequential or K at a time)."""
+    
+    # Seconds between polls of running chunk processes
+    POLL_INTERVAL_SECONDS = 0.5
     
-    def __init__(self, chunk_size: int, app_id_start: int, app_id_end: int, **processor_kwargs):
+    def __init__(self, chunk_size: int, app_id_start: int, app_id_end: int,
+                 concurrent_chunks: int = 1, max_retries: int = 2, retry_backoff_seconds: float = 30.0,
+                 **processor_kwargs):
         """
         Initialize chunked processing orchestrator.
         
@@ -161,6 +208,10 @@ class ChunkedProcessorOrchestrator:
                        Recommended: 5,000-15,000 per chunk.
             app_id_start: Starting app_id for processing range (inclusive, required)
             app_id_end: Ending app_id for processing range (inclusive, required)
+            concurrent_chunks: Chunks to run at once (0 = as many as fit in the core budget).
+                       Clamped so concurrent_chunks x workers <= CPU cores.
+            max_retries: Automatic retries for a failed chunk before it is reported as failed
+            retry_backoff_seconds: Delay before the first retry; doubled for each further retry
             **processor_kwargs: Pass-through arguments for production_processor.py
                                (server, database, workers, batch_size, log_level, etc.)
         
@@ -185,97 +236,202 @@ class ChunkedProcessorOrchestrator:
         self.processor_kwargs = processor_kwargs
         self.num_chunks = (self.total_records + chunk_size - 1) // chunk_size  # Ceiling division
         self.chunk_results: List[Dict] = []
+        
+        workers = processor_kwargs.get('workers') or ProcessingDefaults.WORKERS
+        self.requested_concurrent_chunks = concurrent_chunks
+        self.concurrent_chunks = min(resolve_concurrent_chunks(concurrent_chunks, workers), self.num_chunks)
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff_seconds = max(0.0, retry_backoff_seconds)
+        self.run_start_time: Optional[datetime] = None
     
     def run(self) -> int:
         """
-        Execute chunked processing sequentially.
+        Execute chunked processing.
         
         Breaks the app_id range into chunks and processes each chunk in a fresh
         Python process to prevent memory degradation on very long production runs.
+        Up to `concurrent_chunks` chunk processes run at once; failed chunks are retried
+        with exponential backoff and never block on operator input.
         
         Returns:
-            0 on success, 1 on failure
+            0 when every chunk succeeded, 1 otherwise
         """
+        workers = self.processor_kwargs.get('workers') or ProcessingDefaults.WORKERS
+        
         print("=" * 82)
         print(" CHUNKED PROCESSING ORCHESTRATOR")
         print("=" * 82)
         print(f"  App Id Range:   {self.app_id_start:,} - {self.app_id_end:,} ({self.total_records:,} applications)")
         print(f"  Chunk Size:     {self.chunk_size:,}")
         print(f"  Total Chunks:   {self.num_chunks}")
+        print(f"  Concurrency:    {self.concurrent_chunks} chunk(s) x {workers} workers (cores: {os.cpu_count() or 1})")
+        if self.requested_concurrent_chunks > self.concurrent_chunks:
+            print(f"                  (requested {self.requested_concurrent_chunks}, clamped to the worker budget)")
+        print(f"  Retries:        {self.max_retries} per chunk (backoff from {self.retry_backoff_seconds:.0f}s)")
         print(f"  Start Time:     {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 82)
         print()
         
         start_time = datetime.now()
+        self.run_start_time = start_time
+        self.chunk_results = []
+        
+        pending = self._plan_chunks()
+        running: List[Dict[str, Any]] = []
         
         try:
-            # Execute each chunk sequentially
-            for chunk_num in range(1, self.num_chunks + 1):
-                # Calculate app_id range for this chunk
-                chunk_start_id = self.app_id_start + (chunk_num - 1) * self.chunk_size
-                chunk_end_id = min(self.app_id_start + chunk_num * self.chunk_size - 1, self.app_id_end)
-                
-                print("\n" + "=" * 82)
-                print(f" CHUNK {chunk_num}/{self.num_chunks}: [app_id] RANGE: {chunk_start_id:,} - {chunk_end_id:,}")
-                print("=" * 82)
-                
-                chunk_start_time = datetime.now()
-                
-                # Build command for production_processor.py
-                cmd = self._build_processor_command(chunk_start_id, chunk_end_id)
-                
-                # Execute chunk (blocks until completion)
-                result = subprocess.run(cmd, shell=True)
-                
-                chunk_end_time = datetime.now()
-                chunk_duration = (chunk_end_time - chunk_start_time).total_seconds()
+            while pending or running:
+                # Fill free slots with the lowest-numbered chunks whose backoff has elapsed
+                now = time.monotonic()
+                for task in [t for t in pending if t['not_before'] <= now]:
+                    if len(running) >= self.concurrent_chunks:
+                        break
+                    pending.remove(task)
+                    running.append(self._launch_chunk(task))
                 
-                # Track chunk result
-                chunk_info = {
-                    'chunk_num': chunk_num,
-                    'start_id': chunk_start_id,
-                    'end_id': chunk_end_id,
-                    'duration_seconds': chunk_duration,
-                    'exit_code': result.returncode,
-                    'success': result.returncode == 0,
-                    'throughput': None  # Will be populated from metrics file
-                }
+                # Reap finished chunks
+                for entry in list(running):
+                    exit_code = entry['process'].poll()
+                    if exit_code is None:
+                        continue
+                    running.remove(entry)
+                    self._finish_chunk(entry, exit_code, pending)
                 
-                # Try to load throughput from metrics file
-                chunk_info['throughput'] = self._extract_throughput_from_metrics(chunk_start_id, chunk_end_id)
-                
-                self.chunk_results.append(chunk_info)
-                
-                # Show chunk summary with context
-                status = " SUCCESS" if result.returncode == 0 else " FAILED"
-                if chunk_duration < 30:
-                    print(f"\n Chunk {chunk_num} {status} - Duration: {chunk_duration:.1f}s (fast - likely already processed)")
-                else:
-                    print(f"\n Chunk {chunk_num} {status} - Duration: {chunk_duration:.1f}s")
-                
-                if result.returncode != 0:
-                    print(f"\n  Chunk {chunk_num} FAILED with exit code {result.returncode}")
-                    if chunk_num < self.num_chunks:
-                        response = input(" Continue with next chunk? (y/n): ")
-                        if response.lower() != 'y':
-                            print(" Orchestration aborted by user")
-                            return 1
+                if pending or running:
+                    time.sleep(self.POLL_INTERVAL_SECONDS)
             
             # Print final summary
             self._print_summary(start_time)
             
-            return 0
+            return 0 if all(c['success'] for c in self.chunk_results) else 1
             
         except KeyboardInterrupt:
             print("\n\n  Orchestration interrupted by user")
+            self._terminate_running(running)
             self._print_summary(start_time)
             return 1
         except Exception as e:
             print(f"\n  ERROR: Orchestration failed: {e}")
+            self._terminate_running(running)
             self._print_summary(start_time)
             return 1
     
-    def _build_processor_command(self, start_id: int, end_id: int) -> str:
+    def _plan_chunks(self) -> List[Dict[str, Any]]:
+        """Split the app_id range into chunk tasks (in app_id order)."""
+        tasks = []
+        for chunk_num in range(1, self.num_chunks + 1):
+            tasks.append({
+                'chunk_num': chunk_num,
+                'start_id': self.app_id_start + (chunk_num - 1) * self.chunk_size,
+                'end_id': min(self.app_id_start + chunk_num * self.chunk_size - 1, self.app_id_end),
+                'attempt': 0,
+                'not_before': 0.0
+            })
+        return tasks
+    
+    def _launch_chunk(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Start the production_processor.py process for a chunk task.
+        
+        With a single concurrent chunk the process shares this console (as before); with
+        several, each chunk's console output goes to its own file to avoid interleaving.
+        """
+        task['attempt'] += 1
+        attempt_str = f" (retry {task['attempt'] - 1}/{self.max_retries})" if task['attempt'] > 1 else ""
+        
+        print("\n" + "=" * 82)
+        print(f" CHUNK {task['chunk_num']}/{self.num_chunks}: [app_id] RANGE: {task['start_id']:,} - {task['end_id']:,}{attempt_str}")
+        print("=" * 82)
+        
+        # Build command for production_processor.py
+        cmd = self._build_processor_command(task['start_id'], task['end_id'])
+        
+        console_file = None
+        if self.concurrent_chunks > 1:
+            logs_dir = Path("logs")
+            logs_dir.mkdir(exist_ok=True)
+            console_path = logs_dir / f"chunk_{task['start_id']}_{task['end_id']}.console.log"
+            console_file = open(console_path, 'a')
+            print(f"  Console output: {console_path}")
+            process = subprocess.Popen(cmd, stdout=console_file, stderr=subprocess.STDOUT)
+        else:
+            process = subprocess.Popen(cmd)
+        
+        return {'task': task, 'process': process, 'console_file': console_file, 'started': datetime.now()}
+    
+    def _finish_chunk(self, entry: Dict[str, Any], exit_code: int, pending: List[Dict[str, Any]]):
+        """Record a finished chunk, or schedule a retry with backoff if it failed and retries remain."""
+        task = entry['task']
+        if entry['console_file'] is not None:
+            entry['console_file'].close()
+        
+        chunk_duration = (datetime.now() - entry['started']).total_seconds()
+        success = exit_code == 0
+        
+        if not success and task['attempt'] <= self.max_retries:
+            backoff = self.retry_backoff_seconds * (2 ** (task['attempt'] - 1))
+            print(f"\n  Chunk {task['chunk_num']} FAILED with exit code {exit_code} - retrying in {backoff:.0f}s")
+            task['not_before'] = time.monotonic() + backoff
+            pending.append(task)
+            pending.sort(key=lambda t: t['chunk_num'])
+            return
+        
+        # Track chunk result
+        chunk_info = {
+            'chunk_num': task['chunk_num'],
+            'start_id': task['start_id'],
+            'end_id': task['end_id'],
+            'duration_seconds': chunk_duration,
+            'exit_code': exit_code,
+            'success': success,
+            'attempts': task['attempt'],
+            'throughput': self._extract_throughput_from_metrics(task['start_id'], task['end_id'])
+        }
+        self.chunk_results.append(chunk_info)
+        self.chunk_results.sort(key=lambda c: c['chunk_num'])
+        
+        # Show chunk summary with context
+        status = " SUCCESS" if success else " FAILED"
+        if chunk_duration < 30:
+            print(f"\n Chunk {task['chunk_num']} {status} - Duration: {chunk_duration:.1f}s (fast - likely already processed)")
+        else:
+            print(f"\n Chunk {task['chunk_num']} {status} - Duration: {chunk_duration:.1f}s")
+        
+        if not success:
+            print(f"\n  Chunk {task['chunk_num']} FAILED with exit code {exit_code} after {task['attempt']} attempt(s) - continuing")
+    
+    def _terminate_running(self, running: List[Dict[str, Any]]):
+        """
+        Stop chunk processes still running (interrupt/abort).
+        
+        Each chunk's whole process tree is stopped - the processor's worker processes would
+        otherwise outlive it and keep writing to the database.
+        """
+        for entry in running:
+            process = entry['process']
+            if process.poll() is None:
+                try:
+                    tree = [psutil.Process(process.pid)]
+                    tree.extend(tree[0].children(recursive=True))
+                except psutil.NoSuchProcess:
+                    tree = []
+                for member in tree:
+                    try:
+                        member.terminate()
+                    except psutil.NoSuchProcess:
+                        pass
+                _, alive = psutil.wait_procs(tree, timeout=10)
+                for member in alive:
+                    try:
+                        member.kill()
+                    except psutil.NoSuchProcess:
+                        pass
+                psutil.wait_procs(alive, timeout=5)
+                process.poll()
+            if entry['console_file'] is not None:
+                entry['console_file'].close()
+    
+    def _build_processor_command(self, start_id: int, end_id: int) -> List[str]:
         """
         Build command line for production_processor.py.
         
@@ -284,7 +440,8 @@ class ChunkedProcessorOrchestrator:
             end_id: Ending app_id for this chunk
             
         Returns:
-            Command string ready for subprocess.run()
+            Argument list for subprocess.Popen (run without a shell, so terminating the
+            chunk process reaches production_processor.py itself)
             
         Note:
             The orchestrator defines exact ranges for each chunk (--app-id-start/--app-id-end).
@@ -294,10 +451,10 @@ class ChunkedProcessorOrchestrator:
             - The processor would stop early when reaching the limit
         """
         cmd_parts = [
-            "python",
+            sys.executable,
             "production_processor.py",
-            f"--app-id-start {start_id}",
-            f"--app-id-end {end_id}"
+            "--app-id-start", str(start_id),
+            "--app-id-end", str(end_id)
         ]
         
         # Add pass-through parameters (excluding 'limit' which conflicts with range mode)
@@ -315,9 +472,9 @@ class ChunkedProcessorOrchestrator:
                     if value:
                         cmd_parts.append(f"--{cli_key}")
                 else:
-                    cmd_parts.append(f"--{cli_key} {value}")
+                    cmd_parts.extend([f"--{cli_key}", str(value)])
         
-        return " ".join(cmd_parts)
+        return cmd_parts
     
     def _extract_throughput_from_metrics(self, start_id: int, end_id: int) -> Optional[float]:
         """
@@ -332,12 +489,7 @@ class ChunkedProcessorOrchestrator:
         """
         try:
             # Look for most recent metrics file matching this range
-            metrics_dir = Path("metrics")
-            pattern = f"metrics_*_range_{start_id}_{end_id}.json"
-            
-            matching_files = sorted(metrics_dir.glob(pattern), 
-                                   key=lambda x: x.stat().st_mtime, 
-                                   reverse=True)
+            matching_files = self._find_chunk_metrics_files(start_id, end_id)
             
             if matching_files:
                 metrics_file = matching_files[0]
@@ -349,6 +501,91 @@ class ChunkedProcessorOrchestrator:
         
         return None
     
+    def _find_chunk_metrics_files(self, start_id: int, end_id: int, since: Optional[datetime] = None) -> List[Path]:
+        """Metrics files written for a chunk range, newest first (optionally only those since a time)."""
+        metrics_dir = Path("metrics")
+        pattern = f"metrics_*_range_{start_id}_{end_id}.json"
+        
+        matching_files = sorted(metrics_dir.glob(pattern),
+                               key=lambda x: x.stat().st_mtime,
+                               reverse=True)
+        if since is not None:
+            matching_files = [f for f in matching_files if datetime.fromtimestamp(f.stat().st_mtime) >= since]
+        return matching_files
+    
+    def _aggregate_chunk_metrics(self) -> Dict[str, Any]:
+        """
+        Sum the per-chunk metrics files written during this run.
+        
+        Every attempt of a chunk writes its own metrics file; because the processor is
+        resume-safe each attempt only counts what it processed, so all of them are summed.
+        Stage latency histograms are merged the same way into run-wide percentiles, and the
+        per-chunk slowest apps into a run-wide top N.
+        """
+        totals = {
+            'metrics_files': 0,
+            'total_applications_processed': 0,
+            'total_applications_successful': 0,
+            'total_applications_failed': 0,
+            'total_database_inserts': 0
+        }
+        stage_latency = StageHistograms()
+        slow_apps = None
+        for chunk in self.chunk_results:
+            try:
+                files = self._find_chunk_metrics_files(chunk['start_id'], chunk['end_id'], since=self.run_start_time)
+            except Exception:
+                continue
+            for metrics_file in files:
+                try:
+                    with open(metrics_file) as f:
+                        data = json.load(f)
+                except Exception:
+                    continue  # Skip unreadable metrics files
+                totals['metrics_files'] += 1
+                for key in ('total_applications_processed', 'total_applications_successful',
+                            'total_applications_failed', 'total_database_inserts'):
+                    totals[key] += data.get(key, 0) or 0
+                stage_latency.merge(StageHistograms.from_dict(data.get('stage_latency_histograms') or {}))
+                if data.get('slow_apps'):
+                    chunk_slow_apps = SlowAppTracker.from_dict(data['slow_apps'])
+                    slow_apps = chunk_slow_apps if slow_apps is None else slow_apps.merge(chunk_slow_apps)
+                    mapping_contract = data['slow_apps'].get('mapping_contract')
+        totals['stage_latency'] = stage_latency.summary()
+        if slow_apps:
+            totals['slow_apps'] = {'mapping_contract': mapping_contract, **slow_apps.to_dict()}
+        return totals
+    
+    def _save_run_summary(self, start_time: datetime, end_time: datetime, totals: Dict[str, Any]) -> Optional[Path]:
+        """Write the aggregated run summary next to the per-chunk metrics files."""
+        total_duration = (end_time - start_time).total_seconds()
+        summary = {
+            'run_start': start_time.isoformat(),
+            'run_end': end_time.isoformat(),
+            'app_id_start': self.app_id_start,
+            'app_id_end': self.app_id_end,
+            'chunk_size': self.chunk_size,
+            'concurrent_chunks': self.concurrent_chunks,
+            'workers_per_chunk': self.processor_kwargs.get('workers') or ProcessingDefaults.WORKERS,
+            'total_chunks': self.num_chunks,
+            'successful_chunks': sum(1 for c in self.chunk_results if c['success']),
+            'failed_chunks': [c['chunk_num'] for c in self.chunk_results if not c['success']],
+            'total_duration_seconds': total_duration,
+            'applications_per_minute': (totals['total_applications_processed'] / total_duration * 60) if total_duration > 0 else 0,
+            **totals,
+            'chunks': self.chunk_results
+        }
+        try:
+            metrics_dir = Path("metrics")
+            metrics_dir.mkdir(exist_ok=True)
+            summary_file = metrics_dir / f"orchestrator_{start_time.strftime('%Y%m%d_%H%M%S')}_range_{self.app_id_start}_{self.app_id_end}.json"
+            with open(summary_file, 'w') as f:
+                json.dump(summary, f, indent=2)
+            return summary_file
+        except Exception as e:
+            print(f"  WARNING: Could not write run summary: {e}")
+            return None
+    
     
     def _print_summary(self, start_time: datetime):
         """Print summary of all chunks processed."""
@@ -377,6 +614,24 @@ class ChunkedProcessorOrchestrator:
         
         print(f"  End Time:          {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
         
+        # Run totals across all chunk metrics files (wall-clock throughput reflects concurrency)
+        totals = self._aggregate_chunk_metrics()
+        if totals['metrics_files']:
+            run_throughput = (totals['total_applications_processed'] / total_duration * 60) if total_duration > 0 else 0
+            print(f"\n TOTALS")
+            print(f"  Processed:         {totals['total_applications_processed']:,}")
+            print(f"  Successful:        {totals['total_applications_successful']:,}")
+            print(f"  Failed:            {totals['total_applications_failed']:,}")
+            print(f"  Database Inserts:  {totals['total_database_inserts']:,}")
+            print(f"  Run Throughput:    {run_throughput:.1f} apps/min")
+            if totals.get('stage_latency'):
+                print(f"\n STAGE LATENCY (ms)     {'p50':>9s} {'p95':>9s} {'p99':>9s} {'max':>9s}")
+                for stage, stats in totals['stage_latency'].items():
+                    print(f"  {stage:22s} {stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} {stats['p99_ms']:9.1f} {stats['max_ms']:9.1f}")
+            if totals.get('slow_apps'):
+                print(f"\n SLOWEST APPS (replay: diagnostics/inspect_mapped_app.py --metrics-file <run summary>)")
+                print(SlowAppTracker.from_dict(totals['slow_apps']).format_table('total', limit=5))
+        
         # Throughput analysis (if metrics are available)
         throughputs = [c['throughput'] for c in self.chunk_results if c['throughput'] is not None]
         if throughputs:
@@ -384,7 +639,7 @@ class ChunkedProcessorOrchestrator:
             min_throughput = min(throughputs)
             max_throughput = max(throughputs)
             
-            print(f"\n THROUGHPUT")
+            print(f"\n THROUGHPUT (per chunk)")
             print(f"  Average:           {avg_throughput:.1f} apps/min")
             print(f"  Peak:              {max_throughput:.1f} apps/min")
             print(f"  Minimum:           {min_throughput:.1f} apps/min")
@@ -424,13 +679,24 @@ class ChunkedProcessorOrchestrator:
                     print(f" {chunk['chunk_num']:<10} {range_str:<20} {duration_str:<12} {status_str:<10}")
 
         print("-" * 82)
+        
+        failed = [c for c in self.chunk_results if not c['success']]
+        if failed:
+            print("\n FAILED CHUNKS (re-run the same command to resume):")
+            for chunk in failed:
+                print(f"  Chunk {chunk['chunk_num']}: {chunk['start_id']:,}-{chunk['end_id']:,} "
+                      f"(exit code {chunk['exit_code']}, {chunk['attempts']} attempt(s))")
+        
+        summary_file = self._save_run_summary(start_time, end_time, totals)
+        if summary_file:
+            print(f"\n Run summary: {summary_file}")
         print("\n FINISHED!\n")
 
 
 def main():
     """Parse arguments and run chunked orchestrator."""
     parser = argparse.ArgumentParser(
-        description="Chunked Processing Orchestrator - Break large app_id ranges into chunks for sequential processing",
+        description="Chunked Processing Orchestrator - Break large app_id ranges into chunks, processed sequentially or concurrently",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
     Examples:
@@ -443,6 +709,9 @@ def main():
     # Tune performance per chunk
         python run_production_processor.py --app-id-start 1 --app-id-end 60000 --workers 6 --batch-size 1000
 
+    # Run chunks concurrently, as many as the cores allow (K x workers <= cores), unattended
+        python run_production_processor.py --app-id-start 1 --app-id-end 600000 --concurrent-chunks 0
+
     # Concurrent orchestrators (non-overlapping ranges)
         # Terminal 1: python run_production_processor.py --app-id-start 1 --app-id-end 1000000
         # Terminal 2: python run_production_processor.py --app-id-start 1000001 --app-id-end 2000000
@@ -461,6 +730,12 @@ def main():
                        help="Ending app_id for processing range (inclusive, REQUIRED)")
     parser.add_argument("--chunk-size", type=int, default=ProcessingDefaults.CHUNK_SIZE,
                        help=f"Number of app_ids per chunk (default: {ProcessingDefaults.CHUNK_SIZE})")
+    parser.add_argument("--concurrent-chunks", type=int, default=1,
+                       help="Chunks to run at once (default: 1, 0 = as many as fit; clamped so chunks x workers <= CPU cores)")
+    parser.add_argument("--max-retries", type=int, default=2,
+                       help="Automatic retries for a failed chunk (default: 2)")
+    parser.add_argument("--retry-backoff", type=float, default=30.0,
+                       help="Seconds before the first retry of a failed chunk, doubled per retry (default: 30)")
     
     # Database connection (pass-through to production_processor.py)
     parser.add_argument("--server", default="localhost\\SQLEXPRESS",
@@ -510,6 +785,14 @@ def main():
         print(" ERROR: --chunk-size must be positive")
         return 1
     
+    if args.concurrent_chunks < 0:
+        print(" ERROR: --concurrent-chunks must be >= 0")
+        return 1
+    
+    if args.max_retries < 0 or args.retry_backoff < 0:
+        print(" ERROR: --max-retries and --retry-backoff must be >= 0")
+        return 1
+    
     # Build pass-through kwargs
     processor_kwargs = {
         'server': args.server,
@@ -532,6 +815,9 @@ def main():
         chunk_size=args.chunk_size,
         app_id_start=args.app_id_start,
         app_id_end=args.app_id_end,
+        concurrent_chunks=args.concurrent_chunks,
+        max_retries=args.max_retries,
+        retry_backoff_seconds=args.retry_backoff,
         **processor_kwargs
     )
     
@@ -1,7 +1,33 @@
 # Ensure project root is in sys.path for all tests
+import os
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 
 project_root = Path(__file__).resolve().parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
+
+from xml_extractor.config.contract_cache import CONTRACT_CACHE_DIR_ENV
+
+
+_contract_cache_dir = None
+_previous_contract_cache_dir = None
+
+
+def pytest_configure(config):
+    """Keep contract cache entries from tests that load the real contracts out of config/.contract_cache/."""
+    global _contract_cache_dir, _previous_contract_cache_dir
+    _previous_contract_cache_dir = os.environ.get(CONTRACT_CACHE_DIR_ENV)
+    _contract_cache_dir = tempfile.mkdtemp(prefix='contract_cache_')
+    os.environ[CONTRACT_CACHE_DIR_ENV] = _contract_cache_dir  # Inherited by worker processes
+
+
+def pytest_unconfigure(config):
+    if _previous_contract_cache_dir is None:
+        os.environ.pop(CONTRACT_CACHE_DIR_ENV, None)
+    else:
+        os.environ[CONTRACT_CACHE_DIR_ENV] = _previous_contract_cache_dir
+    if _contract_cache_dir:
+        shutil.rmtree(_contract_cache_dir, ignore_errors=True)
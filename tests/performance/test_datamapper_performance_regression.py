@@ -13,13 +13,15 @@ import time
 import psutil
 import os
 import statistics
+import tracemalloc
 import xml.etree.ElementTree as ET
 
 from typing import List, Dict, Any, Tuple
 from contextlib import contextmanager
 
 from xml_extractor.mapping.data_mapper import DataMapper
-from xml_extractor.models import FieldMapping, MappingContract
+from xml_extractor.models import FieldMapping, MappingContract, ProcessingConfig
+from xml_extractor.parsing.xml_parser import XMLParser
 from xml_extractor.config.config_manager import get_config_manager
 
 
@@ -517,6 +519,88 @@ class TestDataMapperPerformanceRegression:
         print("Run with: pytest -m slow to execute full performance suite")
 
 
+def measure_allocations(func, *args) -> Tuple[Any, int, int, int]:
+    """
+    Run func under tracemalloc and report what it allocated.
+    
+    Returns:
+        (result, retained_bytes, peak_bytes, allocated_blocks) where retained_bytes is
+        what is still held while the result is alive
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = func(*args)
+        retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    
+    allocated_blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0)
+    return result, retained_bytes, peak_bytes, allocated_blocks
+
+
+class TestFlattenedElementMemory:
+    """Memory/allocation comparison of legacy flattened dicts vs compact element records."""
+    
+    LARGE_SAMPLE = 'config/samples/xml_files/sample-source-xml-large--325620.xml'
+    MIN_RETAINED_REDUCTION_PERCENT = 30
+    
+    @pytest.fixture(scope="class")
+    def parsed_large_sample(self):
+        """Full-tree parse of the large sample (streaming disabled so every element is extracted)."""
+        with open(self.LARGE_SAMPLE, 'r', encoding='utf-8', errors='replace') as f:
+            xml_content = f.read()
+        parser = XMLParser(config=ProcessingConfig(streaming_threshold_bytes=0))
+        root = parser.parse_xml_stream(xml_content)
+        # Warm the interned path table so both measurements see steady-state behaviour
+        parser.extract_elements_compact(root)
+        return parser, root
+    
+    def test_compact_representation_reduces_memory(self, parsed_large_sample):
+        """
+        Report memory/alloc reduction of extract_elements_compact() over extract_elements().
+        """
+        parser, root = parsed_large_sample
+        
+        print(f"\n{'='*60}")
+        print("FLATTENED ELEMENT MEMORY COMPARISON")
+        print(f"{'='*60}")
+        
+        legacy, legacy_retained, legacy_peak, legacy_blocks = measure_allocations(parser.extract_elements, root)
+        del legacy
+        compact, compact_retained, compact_peak, compact_blocks = measure_allocations(parser.extract_elements_compact, root)
+        
+        retained_reduction = (1 - compact_retained / legacy_retained) * 100
+        block_reduction = (1 - compact_blocks / legacy_blocks) * 100
+        
+        print(f"Elements: {len(compact)}")
+        print(f"Legacy dicts:    retained={legacy_retained / 1024:.0f}KB peak={legacy_peak / 1024:.0f}KB "
+              f"blocks={legacy_blocks}")
+        print(f"Compact records: retained={compact_retained / 1024:.0f}KB peak={compact_peak / 1024:.0f}KB "
+              f"blocks={compact_blocks}")
+        print(f"Reduction: retained {retained_reduction:.1f}%, allocations {block_reduction:.1f}%")
+        
+        assert compact_retained < legacy_retained
+        assert compact_blocks < legacy_blocks
+        assert retained_reduction >= self.MIN_RETAINED_REDUCTION_PERCENT, \
+            f"Compact representation only saved {retained_reduction:.1f}% retained memory"
+        
+        print("✅ Compact element memory test PASSED")
+    
+    def test_compatibility_view_matches_legacy(self, parsed_large_sample):
+        """The compact Mapping view and to_dict() must reproduce the legacy structure exactly."""
+        parser, root = parsed_large_sample
+        
+        legacy = parser.extract_elements(root)
+        compact = parser.extract_elements_compact(root)
+        
+        assert list(compact) == list(legacy)
+        assert compact.to_dict() == legacy
+        request_path = '/Provenir/Request'
+        assert compact[request_path] == legacy[request_path]
+
+
 if __name__ == "__main__":
     # Run performance tests directly
     pytest.main([__file__, "-v", "-s"])
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Tests for the staging extractor's CustData extraction.
+
+The streaming target parser must pick the same Request/CustData as the full-tree path
+(root.find('Request').find('CustData')) for every input, and stage_rows must carry the source
+table app_id of each staged row (not the XML Request ID) for resume points.
+"""
+
+import unittest
+
+from pathlib import Path
+
+from lxml import etree
+
+from env_prep.appxml_staging_extractor import (
+    FEED_CHUNK_BYTES, stage_rows, stream_request_and_custdata, tree_request_and_custdata
+)
+
+
+SAMPLES_DIR = Path(__file__).resolve().parents[2] / 'config' / 'samples' / 'xml_files'
+
+CASES = {
+    'simple': '<Provenir dt_app_id="9"><Request ID="1" Process="p"><CustData><application a="1"/></CustData>'
+              '<Reports><r/></Reports></Request></Provenir>',
+    'custdata_tail_and_comment': '<Provenir><Request ID="1"><!-- c --><CustData x="1">text<a>1</a><!-- inner -->'
+                                 '</CustData>tail<Other/></Request></Provenir>',
+    'custdata_under_other_depth2': '<Provenir><Request ID="1"/><Other><CustData x="1"/></Other></Provenir>',
+    'custdata_under_second_request': '<Provenir><Request ID="1"><Journal/></Request>'
+                                     '<Request ID="2"><CustData x="2"/></Request></Provenir>',
+    'duplicate_request': '<Provenir><Request ID="1"><CustData x="1"/></Request>'
+                         '<Request ID="2"><CustData x="2"/></Request></Provenir>',
+    'duplicate_custdata': '<Provenir><Request ID="1"><CustData x="1"/><CustData x="2"/></Request></Provenir>',
+    'nested_custdata': '<Provenir><Request ID="1"><Audit><CustData x="0"/></Audit><CustData x="1">'
+                       '<CustData x="inner"/></CustData></Request></Provenir>',
+    'nested_request': '<Provenir><Wrapper><Request ID="9"><CustData x="9"/></Request></Wrapper></Provenir>',
+    'request_nested_in_request': '<Provenir><Request ID="1"><Request ID="2"><CustData x="2"/></Request>'
+                                 '</Request></Provenir>',
+    'missing_request': '<Provenir><CustData x="1"/></Provenir>',
+    'missing_custdata': '<Provenir><Request ID="1"><Reports/></Request></Provenir>',
+    'no_request_id': '<Provenir><Request Process="p"><CustData x="1"/></Request></Provenir>',
+    'lowercase_id': '<Provenir><Request id="7"><CustData x="1"/></Request></Provenir>',
+    'non_ascii': '<Provenir><Request ID="1"><CustData name="José">ü</CustData></Request></Provenir>',
+}
+
+
+def _canonical(result):
+    """(app_id, canonical XML) so the stream (bytes) and tree (str) outputs compare equal."""
+    if result is None:
+        return None
+    app_id, minimal_xml = result
+    if isinstance(minimal_xml, str):
+        minimal_xml = minimal_xml.encode('utf-8')
+    return app_id, etree.tostring(etree.fromstring(minimal_xml), method='c14n')
+
+
+class TestCustDataExtraction(unittest.TestCase):
+
+    def assertSameAsTree(self, xml_text, name):
+        xml_bytes = xml_text.encode('utf-8')
+        self.assertEqual(_canonical(stream_request_and_custdata(xml_bytes)),
+                         _canonical(tree_request_and_custdata(xml_bytes)), name)
+
+    def test_stream_matches_tree_on_edge_cases(self):
+        for name, xml_text in CASES.items():
+            self.assertSameAsTree(xml_text, name)
+
+    def test_only_first_request_direct_custdata(self):
+        self.assertIsNone(stream_request_and_custdata(CASES['custdata_under_other_depth2']))
+        self.assertIsNone(stream_request_and_custdata(CASES['custdata_under_second_request']))
+        self.assertIsNone(stream_request_and_custdata(CASES['nested_request']))
+        app_id, minimal_xml = stream_request_and_custdata(CASES['nested_custdata'])
+        self.assertEqual(app_id, '1')
+        self.assertEqual(etree.fromstring(minimal_xml).find('Request/CustData').get('x'), '1')
+
+    def test_custdata_split_across_feed_chunks(self):
+        padding = '<Note>' + 'x' * FEED_CHUNK_BYTES + '</Note>'
+        xml_text = f'<Provenir><Request ID="3">{padding}<CustData x="1">{padding}</CustData></Request>{padding}</Provenir>'
+        self.assertSameAsTree(xml_text, 'split')
+
+    def test_stream_matches_tree_on_samples(self):
+        samples = sorted(SAMPLES_DIR.glob('*.xml'))[:25]
+        self.assertTrue(samples)
+        for path in samples:
+            self.assertSameAsTree(path.read_text(encoding='utf-8', errors='replace'), path.name)
+
+
+class TestStageRows(unittest.TestCase):
+
+    def test_source_app_ids_follow_staged_rows(self):
+        rows = [
+            (101, CASES['simple']),
+            (102, CASES['missing_custdata']),  # skipped
+            (103, ''),                         # skipped
+            (104, CASES['lowercase_id']),
+        ]
+        for parser_mode in ('stream', 'tree'):
+            staged_rows, source_app_ids, bytes_in, bytes_out = stage_rows(rows, parser_mode)
+            self.assertEqual([app_id for app_id, _ in staged_rows], ['1', '7'], parser_mode)
+            self.assertEqual(source_app_ids, [101, 104], parser_mode)
+            self.assertEqual(bytes_in, sum(len(xml_text.encode('utf-8')) for _, xml_text in rows))
+            self.assertGreater(bytes_out, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
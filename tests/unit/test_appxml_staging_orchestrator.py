@@ -0,0 +1,59 @@
+"""
+Tests for the staging orchestrator's resume point.
+
+The commit watermark only advances through a contiguous run of committed batches (writers
+commit out of order, and a failed batch stops it), and --limit truncation reports the source
+app_id of the last row kept.
+"""
+
+import os
+import sys
+import unittest
+
+env_prep_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'env_prep')
+if env_prep_dir not in sys.path:
+    sys.path.insert(0, env_prep_dir)
+
+from env_prep.appxml_staging_orchestrator import CommitWatermark, truncate_to_limit
+
+
+class TestCommitWatermark(unittest.TestCase):
+
+    def test_out_of_order_commits(self):
+        watermark = CommitWatermark(start_after=100)
+        watermark.committed(1, 300, 10)
+        self.assertEqual(watermark.app_id, 100)
+        watermark.committed(2, 400, 10)
+        self.assertEqual(watermark.app_id, 100)
+        watermark.committed(0, 200, 10)
+        self.assertEqual(watermark.app_id, 400)
+        self.assertEqual(watermark.inserted, 30)
+
+    def test_missing_sequence_stops_watermark(self):
+        watermark = CommitWatermark(start_after=0)
+        watermark.committed(0, 200, 5)
+        watermark.committed(2, 400, 5)
+        watermark.committed(3, 500, 5)
+        # Batch 1 failed: nothing past batch 0 is a safe resume point
+        self.assertEqual(watermark.app_id, 200)
+        self.assertEqual(watermark.inserted, 15)
+
+
+class TestTruncateToLimit(unittest.TestCase):
+
+    # Staged rows carry the XML Request ID, which differs from the source table app_id
+    ROWS = [('req-11',), ('req-12',), ('req-13',)]
+    SOURCE_APP_IDS = [101, 102, 103]
+
+    def test_truncation_reports_source_app_id(self):
+        rows, last_app_id = truncate_to_limit(self.ROWS, self.SOURCE_APP_IDS, 103, staged_so_far=8, limit=10)
+        self.assertEqual(rows, self.ROWS[:2])
+        self.assertEqual(last_app_id, 102)
+
+    def test_within_limit_unchanged(self):
+        self.assertEqual(truncate_to_limit(self.ROWS, self.SOURCE_APP_IDS, 103, 0, 10), (self.ROWS, 103))
+        self.assertEqual(truncate_to_limit(self.ROWS, self.SOURCE_APP_IDS, 103, 50, None), (self.ROWS, 103))
+
+
+if __name__ == '__main__':
+    unittest.main()
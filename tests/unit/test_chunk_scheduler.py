@@ -0,0 +1,147 @@
+"""
+Tests for the concurrent, non-interactive chunk scheduler in run_production_processor.py.
+
+Chunk processes are replaced with tiny Python commands that write a metrics file (and fail
+on their first attempt where requested), so no database is needed. Terminating a chunk stops
+its whole process tree.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+from pathlib import Path
+
+import psutil
+
+from run_production_processor import ChunkedProcessorOrchestrator, resolve_concurrent_chunks
+
+
+class FakeChunkOrchestrator(ChunkedProcessorOrchestrator):
+    """Runs a stand-in command per chunk instead of production_processor.py."""
+
+    POLL_INTERVAL_SECONDS = 0.01
+
+    def __init__(self, *args, flaky_chunks=(), always_fail=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.flaky_chunks = set(flaky_chunks)
+        self.always_fail = set(always_fail)
+
+    def _build_processor_command(self, start_id, end_id):
+        script = (
+            "import json, os, sys, time\n"
+            f"start, end = {start_id}, {end_id}\n"
+            "marker = f'attempted_{start}'\n"
+            f"fail = start in {sorted(self.always_fail)} or (start in {sorted(self.flaky_chunks)} and not os.path.exists(marker))\n"
+            "open(marker, 'a').close()\n"
+            "os.makedirs('metrics', exist_ok=True)\n"
+            "name = f'metrics/metrics_{time.time_ns()}_range_{start}_{end}.json'\n"
+            "json.dump({'total_applications_processed': end - start + 1, 'total_applications_successful': end - start + 1,"
+            " 'applications_per_minute': 100.0}, open(name, 'w'))\n"
+            "sys.exit(3 if fail else 0)\n"
+        )
+        script_path = Path(f"chunk_{start_id}.py")
+        script_path.write_text(script)
+        return [sys.executable, str(script_path)]
+
+
+class HangingChunkOrchestrator(ChunkedProcessorOrchestrator):
+    """Each chunk starts a long-running child (like the processor's workers) and waits."""
+
+    def _build_processor_command(self, start_id, end_id):
+        script = (
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+            f"open('child_{start_id}.pid', 'w').write(str(child.pid))\n"
+            "time.sleep(60)\n"
+        )
+        script_path = Path(f"chunk_{start_id}.py")
+        script_path.write_text(script)
+        return [sys.executable, str(script_path)]
+
+
+class TestResolveConcurrentChunks(unittest.TestCase):
+
+    def test_worker_budget(self):
+        self.assertEqual(resolve_concurrent_chunks(4, workers_per_chunk=4, cpu_count=16), 4)
+        self.assertEqual(resolve_concurrent_chunks(8, workers_per_chunk=4, cpu_count=16), 4)
+        self.assertEqual(resolve_concurrent_chunks(0, workers_per_chunk=4, cpu_count=18), 4)
+        self.assertEqual(resolve_concurrent_chunks(3, workers_per_chunk=8, cpu_count=4), 1)
+
+
+class TestChunkScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _orchestrator(self, **kwargs):
+        orchestrator = FakeChunkOrchestrator(chunk_size=10, app_id_start=1, app_id_end=40,
+                                             retry_backoff_seconds=0.01, workers=1, **kwargs)
+        orchestrator.concurrent_chunks = 2  # Independent of the test machine's core count
+        return orchestrator
+
+    def test_retries_failed_chunk_and_aggregates(self):
+        orchestrator = self._orchestrator(flaky_chunks=[11], max_retries=1)
+        self.assertEqual(orchestrator.run(), 0)
+
+        results = {c['chunk_num']: c for c in orchestrator.chunk_results}
+        self.assertEqual(sorted(results), [1, 2, 3, 4])
+        self.assertEqual(results[2]['attempts'], 2)
+        self.assertTrue(all(c['success'] for c in results.values()))
+        self.assertEqual(results[1]['throughput'], 100.0)
+
+        summary_files = list(Path('metrics').glob('orchestrator_*_range_1_40.json'))
+        self.assertEqual(len(summary_files), 1)
+        summary = json.loads(summary_files[0].read_text())
+        # Both attempts of the retried chunk wrote metrics
+        self.assertEqual(summary['metrics_files'], 5)
+        self.assertEqual(summary['total_applications_processed'], 50)
+        self.assertEqual(summary['failed_chunks'], [])
+
+    def test_exhausted_retries_reported_without_prompt(self):
+        orchestrator = self._orchestrator(always_fail=[21], max_retries=1)
+        self.assertEqual(orchestrator.run(), 1)
+
+        failed = [c for c in orchestrator.chunk_results if not c['success']]
+        self.assertEqual([(c['chunk_num'], c['attempts'], c['exit_code']) for c in failed], [(3, 2, 3)])
+        self.assertEqual(len(orchestrator.chunk_results), 4)
+
+    def test_processor_command_is_argv(self):
+        orchestrator = ChunkedProcessorOrchestrator(chunk_size=10, app_id_start=1, app_id_end=40,
+                                                    workers=2, server='my server', limit=5, enable_pooling=True)
+        cmd = orchestrator._build_processor_command(11, 20)
+        self.assertEqual(cmd[:6], [sys.executable, 'production_processor.py', '--app-id-start', '11', '--app-id-end', '20'])
+        self.assertIn('my server', cmd)
+        self.assertIn('--enable-pooling', cmd)
+        self.assertNotIn('--limit', cmd)
+
+    def test_terminate_leaves_no_live_child(self):
+        orchestrator = HangingChunkOrchestrator(chunk_size=10, app_id_start=1, app_id_end=10, workers=1)
+        entry = orchestrator._launch_chunk(orchestrator._plan_chunks()[0])
+        pid_file = Path('child_1.pid')
+        deadline = time.monotonic() + 30
+        while not (pid_file.exists() and pid_file.read_text()) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        child = psutil.Process(int(pid_file.read_text()))
+
+        orchestrator._terminate_running([entry])
+
+        self.assertIsNotNone(entry['process'].poll())
+        try:
+            # Reparented children may linger as zombies until init reaps them
+            self.assertEqual(child.status(), psutil.STATUS_ZOMBIE)
+        except psutil.NoSuchProcess:
+            pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for the compact flattened-element representation (PathTable, ElementRecord, CompactElements).
+"""
+
+import unittest
+
+from xml_extractor.parsing.compact_elements import CompactElements, ElementRecord, PathTable
+from xml_extractor.parsing.xml_parser import XMLParser
+from xml_extractor.validation.pre_processing_validator import PreProcessingValidator
+
+
+SAMPLE_XML = """
+<Provenir>
+    <Request ID="154284">
+        <CustData>
+            <application app_receive_date="2023-10-03" note=" A &amp;amp; B ">
+                <contact con_id="1" ac_role_tp_c="PR" first_name="JOHN"/>
+                <contact con_id="2" ac_role_tp_c="AUTHU" first_name="JANE">SECOND</contact>
+            </application>
+        </CustData>
+    </Request>
+</Provenir>
+"""
+
+
+class TestPathTable(unittest.TestCase):
+
+    def test_child_paths_are_interned_and_stable(self):
+        table = PathTable()
+        provenir = table.child_id(PathTable.ROOT_ID, 'Provenir', str)
+        request = table.child_id(provenir, 'Request', str)
+
+        self.assertEqual(table.paths[request], '/Provenir/Request')
+        self.assertEqual(table.tags[request], 'Request')
+        self.assertEqual(table.child_id(provenir, 'Request', str), request)
+        self.assertEqual(table.intern('/Provenir/Request'), request)
+        self.assertIsNone(table.get_id('/Provenir/Missing'))
+
+    def test_namespaced_tags_share_clean_path(self):
+        parser = XMLParser()
+        table = PathTable()
+        plain = table.child_id(PathTable.ROOT_ID, 'Provenir', parser._clean_tag_name)
+        namespaced = table.child_id(PathTable.ROOT_ID, '{urn:x}Provenir', parser._clean_tag_name)
+        self.assertEqual(plain, namespaced)
+
+
+class TestCompactElements(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = XMLParser()
+        self.root = self.parser.parse_xml_stream(SAMPLE_XML)
+
+    def test_compat_view_matches_legacy_dict(self):
+        legacy = self.parser.extract_elements(self.root)
+        compact = self.parser.extract_elements_compact(self.root)
+
+        self.assertIsInstance(compact, CompactElements)
+        self.assertEqual(list(compact), list(legacy))
+        self.assertEqual(dict(compact.items()), legacy)
+        self.assertIn('/Provenir/Request', compact)
+        self.assertNotIn('/Provenir/Missing', compact)
+        with self.assertRaises(KeyError):
+            compact['/Provenir/Missing']
+
+    def test_records_keep_lxml_attrib_and_process_on_view(self):
+        compact = self.parser.extract_elements_compact(self.root)
+        app_path = '/Provenir/Request/CustData/application'
+        record = compact.records[compact.path_table.get_id(app_path)]
+
+        self.assertIsInstance(record, ElementRecord)
+        self.assertNotIsInstance(record.attrib, dict)  # lxml attrib proxy, not a copy
+        self.assertEqual(record.attrib['note'], ' A &amp; B ')
+        self.assertEqual(compact[app_path]['attributes']['note'], 'A & B')
+
+    def test_repeated_path_keeps_last_element(self):
+        compact = self.parser.extract_elements_compact(self.root)
+        contact = compact['/Provenir/Request/CustData/application/contact']
+
+        self.assertEqual(contact['attributes']['con_id'], '2')
+        self.assertEqual(contact['text'], 'SECOND')
+
+    def test_validator_nested_structure_same_for_both_forms(self):
+        validator = PreProcessingValidator()
+        from_legacy = validator._convert_elements_to_data_structure(self.parser.extract_elements(self.root))
+        from_compact = validator._convert_elements_to_data_structure(self.parser.extract_elements_compact(self.root))
+
+        self.assertEqual(from_compact, from_legacy)
+        self.assertEqual(from_compact['Provenir']['Request']['ID'], '154284')
+
+
+if __name__ == '__main__':
+    unittest.main()
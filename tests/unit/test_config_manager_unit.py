@@ -20,6 +20,7 @@ from xml_extractor.config.config_manager import (
     ProcessingParameters,
     ConfigPaths
 )
+from xml_extractor.config.contract_cache import CONTRACT_CACHE_DIR_ENV
 from xml_extractor.exceptions import ConfigurationError
 
 
@@ -135,6 +136,12 @@ class TestConfigManager(unittest.TestCase):
         # Reset global config manager
         reset_config_manager()
         
+        # Contract cache entries go next to the test contract (not the suite-wide cache directory)
+        environment = patch.dict(os.environ)
+        environment.start()
+        self.addCleanup(environment.stop)
+        os.environ.pop(CONTRACT_CACHE_DIR_ENV, None)
+        
         # Create temporary directory for test configuration
         self.temp_dir = tempfile.mkdtemp()
         self.temp_path = Path(self.temp_dir)
@@ -271,6 +278,50 @@ class TestConfigManager(unittest.TestCase):
         self.assertEqual(len(config_manager._table_structure_cache), 0)
         self.assertEqual(len(config_manager._sample_xml_cache), 0)
 
+    def test_contract_cache_shared_across_managers(self):
+        """Test a second process (new ConfigManager) loads the parsed contract and validation from the on-disk cache."""
+        contract_name = self.mapping_contract_path.name
+        first = ConfigManager(self.temp_path)
+        contract = first.load_mapping_contract(contract_name)
+        result = first.validate_mapping_contract_structure(contract_name)
+        self.assertEqual(first._contract_cache.hits, 0)
+        self.assertEqual(len(list((self.temp_path / '.contract_cache').glob('*.pickle'))), 1)
+
+        second = ConfigManager(self.temp_path)
+        with patch.object(ConfigManager, '_parse_mapping_contract') as parse, \
+             patch('xml_extractor.validation.mapping_contract_validator.MappingContractValidator') as validator:
+            cached = second.load_mapping_contract(contract_name)
+            cached_result = second.validate_mapping_contract_structure(contract_name)
+        parse.assert_not_called()
+        validator.assert_not_called()
+        self.assertEqual(cached, contract)
+        self.assertEqual(cached._raw_data, contract._raw_data)
+        self.assertEqual((cached_result.is_valid, cached_result.errors), (result.is_valid, result.errors))
+
+    def test_contract_cache_invalidated_by_content_change(self):
+        """Test editing the contract misses the cache, and corrupt entries are ignored."""
+        import json
+        contract_name = self.mapping_contract_path.name
+        ConfigManager(self.temp_path).load_mapping_contract(contract_name)
+
+        data = json.loads(self.mapping_contract_path.read_text())
+        data['target_schema'] = 'sandbox'
+        self.mapping_contract_path.write_text(json.dumps(data))
+        edited = ConfigManager(self.temp_path)
+        self.assertEqual(edited.load_mapping_contract(contract_name).target_schema, 'sandbox')
+        self.assertEqual(edited._contract_cache.hits, 0)
+
+        for entry in (self.temp_path / '.contract_cache').glob('*.pickle'):
+            entry.write_bytes(b'not a pickle')
+        corrupt = ConfigManager(self.temp_path)
+        self.assertEqual(corrupt.load_mapping_contract(contract_name).target_schema, 'sandbox')
+        self.assertEqual(corrupt._contract_cache.hits, 0)
+
+        with patch.dict(os.environ, {'XML_EXTRACTOR_CONTRACT_CACHE': '0'}):
+            disabled = ConfigManager(self.temp_path)
+        self.assertFalse(disabled._contract_cache.enabled)
+        self.assertEqual(disabled.load_mapping_contract(contract_name).target_schema, 'sandbox')
+
 
 class TestGlobalConfigManager(unittest.TestCase):
     """Test global config manager functions."""
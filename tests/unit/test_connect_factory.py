@@ -0,0 +1,65 @@
+"""
+Unit tests for MigrationEngine's pluggable connect function (XML_EXTRACTOR_DB_CONNECT_FACTORY).
+
+- Unset: connections come from pyodbc.connect
+- Set to 'module:callable': that callable receives the connection string and options
+- resolve_connect_function(spec): an explicit spec (env_prep loaders' --connect-factory) wins
+"""
+
+import os
+import sqlite3
+import unittest
+
+from unittest.mock import patch
+
+from xml_extractor.database import migration_engine
+from xml_extractor.database.migration_engine import MigrationEngine, CONNECT_FACTORY_ENV, resolve_connect_function
+
+
+class FakeConnection:
+    def __init__(self, connection_string, **options):
+        self.connection_string = connection_string
+        self.options = options
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def fake_connect(connection_string, **options):
+    return FakeConnection(connection_string, **options)
+
+
+class TestConnectFactory(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = os.environ.pop(CONNECT_FACTORY_ENV, None)
+        self.engine = MigrationEngine('DRIVER={x};SERVER=offline')
+
+    def tearDown(self):
+        os.environ.pop(CONNECT_FACTORY_ENV, None)
+        if self._saved is not None:
+            os.environ[CONNECT_FACTORY_ENV] = self._saved
+
+    def test_factory_from_environment(self):
+        os.environ[CONNECT_FACTORY_ENV] = f"{__name__}:fake_connect"
+        with self.engine.get_connection() as conn:
+            self.assertIsInstance(conn, FakeConnection)
+            self.assertEqual(conn.connection_string, 'DRIVER={x};SERVER=offline')
+            self.assertEqual(conn.options['autocommit'], False)
+        self.assertTrue(conn.closed)
+
+    def test_defaults_to_pyodbc(self):
+        with patch.object(migration_engine.pyodbc, 'connect', side_effect=fake_connect) as connect:
+            with self.engine.get_connection() as conn:
+                self.assertIsInstance(conn, FakeConnection)
+        connect.assert_called_once()
+
+    def test_explicit_spec_overrides_environment(self):
+        os.environ[CONNECT_FACTORY_ENV] = 'sqlite3:connect'
+        self.assertIs(resolve_connect_function(f"{__name__}:fake_connect"), fake_connect)
+        self.assertIs(resolve_connect_function(), sqlite3.connect)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Unit tests for DataIntegrityValidator.validate_extraction_batch (columnar batch validation).
+
+- Per-app results match validate_extraction_results (errors, counts, pass/fail, checks, metrics)
+- Column rules are resolved once per contract and mirror the per-field lookups
+"""
+
+import unittest
+
+from xml_extractor.models import FieldMapping, MappingContract
+from xml_extractor.validation.data_integrity_validator import DataIntegrityValidator
+from xml_extractor.validation.validation_models import ValidationConfig
+
+
+def _contract() -> MappingContract:
+    return MappingContract(
+        source_table='app_xml',
+        source_column='app_XML',
+        xml_root_element='Provenir',
+        mappings=[
+            FieldMapping(xml_path='/Provenir/Request', xml_attribute='ID', target_table='app_base',
+                         target_column='app_id', data_type='int'),
+            FieldMapping(xml_path='/Provenir/Request/CustData/application/contact', xml_attribute='con_id',
+                         target_table='app_contact_base', target_column='con_id', data_type='int'),
+            FieldMapping(xml_path='/Provenir/Request/CustData/application/contact', xml_attribute='first_name',
+                         target_table='app_contact_base', target_column='first_name', data_type='varchar(10)'),
+            FieldMapping(xml_path='/Provenir/Request/CustData/application/contact', xml_attribute='ssn',
+                         target_table='app_contact_base', target_column='ssn', data_type='varchar(9)'),
+            FieldMapping(xml_path='/Provenir/Request/CustData/application/contact', xml_attribute='birth_date',
+                         target_table='app_contact_base', target_column='birth_date', data_type='datetime'),
+            FieldMapping(xml_path='/Provenir/Request/CustData/application', xml_attribute='credit_limit',
+                         target_table='app_operational_cc', target_column='credit_limit', data_type='decimal(12,2)'),
+            FieldMapping(xml_path='/Provenir/Request/CustData/application', xml_attribute='status',
+                         target_table='app_operational_cc', target_column='status', data_type='string'),
+        ]
+    )
+
+
+def _app(app_id: int, con_ids, first_name='Ann', ssn='123456789', birth_date='1980-01-01',
+         credit_limit='1500.00', drop_app_base=False):
+    contacts = [{'con_id': str(con_id), 'first_name': first_name, 'ssn': ssn} for con_id in con_ids]
+    source = {'Provenir': {'Request': {'ID': str(app_id), 'CustData': {'application': {
+        'credit_limit': credit_limit, 'contact': contacts}}}}}
+    tables = {
+        'app_base': [] if drop_app_base else [{'app_id': app_id}],
+        'app_contact_base': [
+            {'con_id': con_id, 'app_id': app_id, 'first_name': first_name, 'ssn': ssn, 'birth_date': birth_date}
+            for con_id in con_ids
+        ],
+        'app_operational_cc': [{'app_id': app_id, 'credit_limit': credit_limit, 'status': None}],
+    }
+    return source, tables, str(app_id)
+
+
+def _error_keys(result):
+    return sorted(
+        (e.error_type.value, e.severity.value, e.message, e.table_name or '', -1 if e.record_index is None else e.record_index,
+         e.field_name or '')
+        for e in result.errors
+    )
+
+
+class TestDataIntegrityBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.contract = _contract()
+        self.batch = [
+            _app(1, [10, 11]),
+            _app(2, [20], first_name='Bartholomew-Long', ssn='000000000'),
+            _app(3, [30], birth_date='1850-06-01', credit_limit='lots'),
+            _app(4, [40], drop_app_base=True),
+            _app(5, [], ssn=''),
+            ({}, {'app_base': [{'app_id': None}]}, '6'),
+        ]
+
+    def assert_matches_per_app(self, config=None):
+        batch_results = DataIntegrityValidator(config).validate_extraction_batch(self.batch, self.contract)
+        self.assertEqual(len(batch_results), len(self.batch))
+        for item, batch_result in zip(self.batch, batch_results):
+            single = DataIntegrityValidator(config).validate_extraction_results(
+                item[0], item[1], self.contract, source_record_id=item[2])
+            with self.subTest(app=item[2]):
+                self.assertEqual(batch_result.source_record_id, item[2])
+                self.assertEqual(_error_keys(batch_result), _error_keys(single))
+                self.assertEqual(batch_result.total_errors, single.total_errors)
+                self.assertEqual(batch_result.total_warnings, single.total_warnings)
+                self.assertEqual(batch_result.validation_passed, single.validation_passed)
+                self.assertEqual(batch_result.total_records_validated, single.total_records_validated)
+                self.assertEqual(batch_result.data_quality_metrics, single.data_quality_metrics)
+                self.assertEqual(
+                    [(c.check_name, c.passed, c.errors_found, c.warnings_found, c.records_checked)
+                     for c in batch_result.integrity_checks],
+                    [(c.check_name, c.passed, c.errors_found, c.warnings_found, c.records_checked)
+                     for c in single.integrity_checks])
+        return batch_results
+
+    def test_batch_matches_per_app_validation(self):
+        results = self.assert_matches_per_app()
+        messages = {e.message for r in results for e in r.errors}
+        # The batch exercises every constraint rule
+        self.assertIn("Field length exceeds maximum: 16 > 10", messages)
+        self.assertIn("Invalid SSN format: 000000000", messages)
+        self.assertIn("Suspicious birth date: 1850-06-01", messages)
+        self.assertIn("Data type mismatch: expected decimal(12,2), got str", messages)
+        self.assertIn("Required field 'app_id' is null or empty", messages)
+
+    def test_batch_matches_per_app_validation_strict_and_partial_config(self):
+        self.assert_matches_per_app(ValidationConfig(strict_mode=True))
+        self.assert_matches_per_app(ValidationConfig(enable_end_to_end_validation=False,
+                                                     enable_data_quality_checks=False))
+
+    def test_column_rules_mirror_field_lookups(self):
+        validator = DataIntegrityValidator()
+        rules = validator.rules_for(self.contract)
+        self.assertIs(validator.rules_for(self.contract), rules)
+        for mapping in self.contract.mappings:
+            column = mapping.target_column
+            rule = rules.columns.get(column)
+            self.assertEqual(rule.max_length if rule else None,
+                             validator._get_max_length_for_field(column, self.contract))
+        # 'string' is not a type the validator checks, and has no length: no rule at all
+        self.assertNotIn('status', rules.columns)
+        self.assertEqual(rules.columns['credit_limit'].expected_type, 'decimal(12,2)')
+
+    def test_empty_batch(self):
+        self.assertEqual(DataIntegrityValidator().validate_extraction_batch([], self.contract), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Unit tests for sampled inline post-extraction validation.
+
+- Sampling is stable per app_id, close to the configured rate, and always includes quality-warning apps
+- XML is converted to the nested source structure the validator walks
+- A full queue drops samples (counted) instead of blocking the caller
+- Validation runs in a separate process; close() drains the queued samples and returns their
+  findings, counting samples it never validated
+- Findings and worker counters merge into the aggregate
+- write_records appends 'validation' lines without touching per-app aggregates
+"""
+
+import multiprocessing as mp
+import os
+import tempfile
+import time
+import unittest
+import xml.etree.ElementTree as ET
+
+from pathlib import Path
+
+from xml_extractor.models import FieldMapping, MappingContract
+from xml_extractor.monitoring.result_sink import AppResultSink, read_results
+from xml_extractor.validation.inline_validation import (
+    InlineValidationAggregate, InlineValidationSampler, InlineValidationService, InlineValidator,
+    element_to_source_data, sample_fraction
+)
+
+
+XML = """<Provenir><Request ID="7"><CustData><application credit_limit="1500.00">
+<contact con_id="70" first_name="Ann"/><contact con_id="71" first_name="Bob"/>
+</application></CustData></Request></Provenir>"""
+
+
+def _contract() -> MappingContract:
+    return MappingContract(
+        source_table='app_xml',
+        source_column='app_XML',
+        xml_root_element='Provenir',
+        mappings=[
+            FieldMapping(xml_path='/Provenir/Request', xml_attribute='ID', target_table='app_base',
+                         target_column='app_id', data_type='int'),
+            FieldMapping(xml_path='/Provenir/Request/CustData/application/contact', xml_attribute='con_id',
+                         target_table='app_contact_base', target_column='con_id', data_type='int'),
+            FieldMapping(xml_path='/Provenir/Request/CustData/application/contact', xml_attribute='first_name',
+                         target_table='app_contact_base', target_column='first_name', data_type='varchar(10)'),
+        ]
+    )
+
+
+def _mapped(first_name='Ann'):
+    return {
+        'app_base': [{'app_id': 7}],
+        'app_contact_base': [{'con_id': 70, 'app_id': 7, 'first_name': first_name},
+                             {'con_id': 71, 'app_id': 7, 'first_name': 'Bob'}],
+        'processing_log': [{'app_id': 7, 'status': 'success'}],
+    }
+
+
+def _tables(first_name='Ann'):
+    """Mapped rows as queued by submit (bookkeeping tables removed)."""
+    return {table: rows for table, rows in _mapped(first_name).items() if table != 'processing_log'}
+
+
+class TestInlineValidation(unittest.TestCase):
+
+    def test_sampling_is_stable_and_near_rate(self):
+        sampler = InlineValidationSampler(None, sample_rate=0.01)
+        picked = [app_id for app_id in range(1, 100001) if sampler.sample_reasons(app_id)]
+        self.assertAlmostEqual(len(picked) / 100000, 0.01, delta=0.002)
+        self.assertEqual(picked, [app_id for app_id in range(1, 100001) if sampler.sample_reasons(app_id)])
+        self.assertTrue(all(0.0 <= sample_fraction(app_id) < 1.0 for app_id in range(1000)))
+
+    def test_quality_warnings_always_sampled(self):
+        sampler = InlineValidationSampler(None, sample_rate=0.0, include_quality_warnings=True)
+        self.assertEqual(sampler.sample_reasons(5, ['truncated first_name']), ['quality_warnings'])
+        self.assertEqual(sampler.sample_reasons(5, []), [])
+        everything = InlineValidationSampler(None, sample_rate=1.0, include_quality_warnings=True)
+        self.assertEqual(everything.sample_reasons(5, ['x']), ['sampled', 'quality_warnings'])
+
+    def test_element_to_source_data(self):
+        data = element_to_source_data(ET.fromstring(XML))
+        request = data['Provenir']['Request']
+        self.assertEqual(request['ID'], '7')
+        contacts = request['CustData']['application']['contact']
+        self.assertEqual([c['con_id'] for c in contacts], ['70', '71'])
+        self.assertEqual(element_to_source_data(None), {})
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        sampler = InlineValidationSampler(mp.Queue(maxsize=1), sample_rate=1.0)  # nothing consuming
+        self.assertTrue(sampler.submit(7, XML, _mapped(), ['sampled']))
+        self.assertFalse(sampler.submit(8, XML, _mapped(), ['sampled']))
+        report = sampler.report()
+        self.assertEqual((report['submitted'], report['dropped']), (1, 1))
+        self.assertIsNone(sampler.report())
+
+    def test_validator_findings_merge_into_aggregate(self):
+        validator = InlineValidator(_contract())
+        findings = [
+            validator.validate_task((7, XML, _tables(), ['sampled'], time.time())),
+            validator.validate_task((8, XML, _tables(first_name='Bartholomew'), ['quality_warnings'], time.time())),
+        ]
+        clean, long_name = findings
+        self.assertTrue(clean['passed'])
+        self.assertEqual(clean['errors'], 0)
+        self.assertEqual(clean['records_validated'], 3)
+        self.assertIn('Field length exceeds maximum: 11 > 10', [issue['message'] for issue in long_name['issues']])
+
+        aggregate = InlineValidationAggregate()
+        self.assertEqual(aggregate.add_findings(findings), findings)
+        summary = aggregate.summary()
+        self.assertEqual(summary['apps_validated'], 2)
+        self.assertEqual(summary['by_reason'], {'sampled': 1, 'quality_warnings': 1})
+        self.assertIn('error constraint_compliance app_contact_base.first_name', summary['top_issues'])
+        self.assertEqual(summary['off_path_latency']['validate']['count'], 2)
+
+    def test_service_validates_in_separate_process_and_drains_on_close(self):
+        service = InlineValidationService(_contract(), queue_size=8).start()
+        self.assertTrue(service.pids)
+        self.assertNotIn(os.getpid(), service.pids)
+        sampler = InlineValidationSampler(service.tasks, sample_rate=1.0)
+        sampler.submit(7, XML, _mapped(), ['sampled'])
+        sampler.submit(8, XML, _mapped(first_name='Bartholomew'), ['quality_warnings'])
+
+        # Nothing collected before shutdown: close() still returns every finding
+        findings = service.close(timeout=60)
+        self.assertEqual(sorted(f['app_id'] for f in findings), [7, 8])
+        self.assertEqual(service.abandoned, 0)
+        self.assertEqual(service.close(), [])
+
+        aggregate = InlineValidationAggregate()
+        aggregate.merge(sampler.report())
+        aggregate.add_findings(findings)
+        aggregate.record_shutdown(service.abandoned)
+        summary = aggregate.summary()
+        self.assertEqual((summary['submitted'], summary['dropped'], summary['dropped_at_shutdown'], summary['pending']),
+                         (2, 0, 0, 0))
+        # processing_log rows are bookkeeping, not validated
+        self.assertEqual(next(f for f in findings if f['app_id'] == 7)['records_validated'], 3)
+
+    def test_unvalidated_samples_counted_at_shutdown(self):
+        service = InlineValidationService(_contract(), queue_size=8)  # validation process never started
+        sampler = InlineValidationSampler(service.tasks, sample_rate=1.0)
+        for app_id in (7, 8, 9):
+            sampler.submit(app_id, XML, _mapped(), ['sampled'])
+        self.assertEqual(service.close(timeout=0), [])
+        self.assertEqual(service.abandoned, 3)
+
+        aggregate = InlineValidationAggregate()
+        aggregate.merge(sampler.report())
+        aggregate.record_shutdown(service.abandoned)
+        summary = aggregate.summary()
+        self.assertEqual((summary['submitted'], summary['dropped_at_shutdown'], summary['pending']), (3, 3, 0))
+        self.assertIn('+3 at shutdown', aggregate.format_summary())
+
+    def test_findings_streamed_to_result_sink(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'results_test.jsonl'
+            with AppResultSink(path) as sink:
+                sink.write_batch(1, [{'app_id': 7, 'success': True}])
+                sink.write_records(1, 'validation', [{'app_id': 7, 'passed': True, 'errors': 0}])
+                sink.write_records(1, 'validation', [])
+            self.assertEqual(sink.aggregates.apps_written, 1)
+            self.assertEqual([r['app_id'] for r in read_results(path)], [7])
+            self.assertEqual(list(read_results(path, 'validation')),
+                             [{'type': 'validation', 'batch': 1, 'app_id': 7, 'passed': True, 'errors': 0}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Tests for fixed-bucket per-stage latency histograms.
+
+- Bucket boundaries are contiguous and every value lands in a bucket that contains it
+- Percentiles stay within the bucket precision (~1.6%) of exact percentiles
+- Merging histograms equals recording everything into one
+- The lossless dict form round-trips (used to merge across chunks/instances)
+"""
+
+import random
+import unittest
+
+from xml_extractor.monitoring.latency_histogram import (
+    LatencyHistogram, StageHistograms, _bucket_index, _bucket_upper_micros
+)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_bucket_boundaries_are_contiguous(self):
+        previous = -1
+        for micros in list(range(0, 5000)) + list(range(5000, 5_000_000, 997)):
+            index = _bucket_index(micros)
+            self.assertGreaterEqual(index, previous)
+            self.assertLessEqual(micros, _bucket_upper_micros(index))
+            if index:
+                self.assertGreater(micros, _bucket_upper_micros(index - 1))
+            previous = index
+
+    def test_percentiles_within_bucket_precision(self):
+        rng = random.Random(35)
+        values = [rng.lognormvariate(-3, 1.2) for _ in range(20000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        values.sort()
+        for percent in (50, 95, 99):
+            exact = values[-(-len(values) * percent // 100) - 1]
+            self.assertAlmostEqual(histogram.percentile(percent), exact, delta=exact * 0.02)
+        self.assertEqual(histogram.percentile(100), values[-1])
+        self.assertEqual(histogram.summary()['max_ms'], round(values[-1] * 1000, 3))
+
+    def test_empty_histogram(self):
+        summary = LatencyHistogram().summary()
+        self.assertEqual(summary['count'], 0)
+        self.assertEqual(summary['p99_ms'], 0.0)
+
+    def test_merge_matches_single_histogram(self):
+        rng = random.Random(7)
+        values = [rng.uniform(0, 2) for _ in range(3000)]
+        single = LatencyHistogram()
+        parts = [LatencyHistogram() for _ in range(4)]
+        for i, value in enumerate(values):
+            single.record(value)
+            parts[i % 4].record(value)
+        merged = LatencyHistogram()
+        for part in parts:
+            merged.merge(part)
+        self.assertEqual(merged.counts, single.counts)
+        self.assertEqual(merged.summary(), single.summary())
+
+
+class TestStageHistograms(unittest.TestCase):
+
+    def test_record_all_and_round_trip(self):
+        batch_a, batch_b = StageHistograms(), StageHistograms()
+        batch_a.record_all({'parsing': 0.010, 'mapping': 0.050, 'insert.app_base': 0.004})
+        batch_b.record_all({'parsing': 0.020, 'commit': 0.002})
+        batch_b.record_all(None)
+
+        run = StageHistograms().merge(batch_a).merge(StageHistograms.from_dict(batch_b.to_dict()))
+        summary = run.summary()
+        self.assertEqual(list(summary), ['commit', 'insert.app_base', 'mapping', 'parsing'])
+        self.assertEqual(summary['parsing']['count'], 2)
+        self.assertEqual(summary['parsing']['max_ms'], 20.0)
+        self.assertIn('p95 ms', run.format_table())
+
+    def test_time_context_manager(self):
+        stages = StageHistograms()
+        with stages.time('source_fetch'):
+            pass
+        self.assertEqual(stages.summary()['source_fetch']['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
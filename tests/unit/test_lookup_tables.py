@@ -0,0 +1,93 @@
+"""
+Tests for precomputed case-folded enum / bit-conversion lookup tables.
+
+Each table must return exactly what the original per-value resolution returned:
+- enum: exact key, then first key equal ignoring case, then '' default
+- char_to_bit: exact key, then upper-cased value, then 0
+- boolean_to_bit: lower-cased value, then 0
+"""
+
+import unittest
+
+from xml_extractor.mapping.data_mapper import DataMapper
+from xml_extractor.mapping.lookup_tables import (
+    MISSING, build_enum_lookup, build_char_to_bit_lookup, build_boolean_to_bit_lookup
+)
+from xml_extractor.models import FieldMapping
+
+
+def _reference_enum(enum_map, str_value):
+    if str_value in enum_map:
+        return enum_map[str_value]
+    for key, enum_value in enum_map.items():
+        if key.upper() == str_value.upper():
+            return enum_value
+    return MISSING
+
+
+def _reference_char_to_bit(bit_map, str_value):
+    if str_value in bit_map:
+        return bit_map[str_value]
+    return bit_map.get(str_value.upper(), MISSING)
+
+
+def _case_variants(values):
+    for value in values:
+        yield value
+        yield value.upper()
+        yield value.lower()
+        yield value.swapcase()
+        yield value.title()
+
+
+class TestLookupTables(unittest.TestCase):
+
+    ENUM_MAP = {'Ind': 1, 'JOINT': 2, 'joint': 3, 'y': 4, 'Y': 4, 'Other': 5, '': 9}
+    CHAR_MAP = {'Y': 1, 'N': 0, 'y': 0, 'null': 0, 'maybe': 1, '': 0}
+    PROBES = ['Ind', 'IND', 'JOINT', 'joint', 'Joint', 'y', 'other', '', 'unknown', 'null', 'NULL', 'maybe', 'N']
+
+    def test_enum_lookup_matches_reference_resolution(self):
+        lookup = build_enum_lookup(self.ENUM_MAP)
+        for probe in _case_variants(self.PROBES):
+            self.assertEqual(lookup.get(probe), _reference_enum(self.ENUM_MAP, probe), probe)
+        self.assertTrue(lookup.has_default)
+        self.assertEqual(lookup.default, 9)
+
+    def test_char_to_bit_lookup_matches_reference_resolution(self):
+        lookup = build_char_to_bit_lookup(self.CHAR_MAP)
+        for probe in _case_variants(self.PROBES):
+            self.assertEqual(lookup.get(probe), _reference_char_to_bit(self.CHAR_MAP, probe), probe)
+
+    def test_boolean_to_bit_lookup_is_lowercase_keyed(self):
+        bit_map = {'true': 1, 'false': 0, 'Yes': 1, '': 0}
+        lookup = build_boolean_to_bit_lookup(bit_map)
+        for probe, expected in [('TRUE', 1), ('False', 0), ('yes', MISSING), ('', 0)]:
+            self.assertEqual(lookup.get(probe), expected, probe)
+
+    def test_empty_maps_have_no_lookup(self):
+        self.assertIsNone(build_enum_lookup({}))
+        self.assertIsNone(build_char_to_bit_lookup(None))
+
+
+class TestDataMapperLookupIntegration(unittest.TestCase):
+
+    def test_contract_enum_mappings_pre_resolved(self):
+        mapper = DataMapper(mapping_contract_path='config/mapping_contract_rl.json')
+        self.assertTrue(mapper._enum_lookup_by_name)
+
+    def test_reassigning_maps_rebuilds_lookups(self):
+        mapper = DataMapper()
+        mapper._enum_mappings = {'test_enum': {'abc': 7}}
+        mapping = FieldMapping(xml_path='/Provenir/Request', target_table='t', target_column='test_enum',
+                               data_type='int', mapping_type=['enum'], nullable=True)
+        self.assertEqual(mapper._apply_enum_mapping(' ABC ', mapping), 7)
+        self.assertIsNone(mapper._apply_enum_mapping('zzz', mapping))
+
+        mapper._bit_conversions = {'char_to_bit': {'Y': 1, 'N': 0}}
+        for raw in ['y', 'Y', ' y ']:
+            self.assertEqual(mapper._apply_bit_conversion(raw), 1)
+        self.assertEqual(mapper._apply_bit_conversion('Q'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
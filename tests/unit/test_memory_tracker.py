@@ -0,0 +1,86 @@
+"""
+Tests for the tracemalloc-based memory growth tracker.
+
+- Reports only every N apps, with RSS, traced memory and gc counts
+- A site that keeps allocating shows up in interval and since-baseline growth
+- The coordinator aggregate sums growth across workers and thins long trends
+"""
+
+import tracemalloc
+import unittest
+
+from xml_extractor.monitoring.memory_tracker import MemoryGrowthTracker, MemoryGrowthAggregate
+
+
+_retained = []
+
+
+def _leak(count):
+    _retained.extend(bytearray(512) for _ in range(count))
+
+
+_LEAK_SITE = f"test_memory_tracker.py:{_leak.__code__.co_firstlineno + 1}"
+
+
+class TestMemoryGrowthTracker(unittest.TestCase):
+
+    def tearDown(self):
+        _retained.clear()
+        tracemalloc.stop()
+
+    def test_reports_growth_every_n_apps(self):
+        tracker = MemoryGrowthTracker(every_n_apps=3).start()
+        reports = []
+        for _ in range(6):
+            _leak(200)
+            reports.append(tracker.after_app())
+
+        self.assertEqual([r is not None for r in reports], [False, False, True, False, False, True])
+        report = reports[-1]
+        self.assertEqual(report['apps_processed'], 6)
+        self.assertEqual(len(report['gc_counts']), 3)
+        self.assertGreater(report['rss_mb'], 0)
+        self.assertGreater(report['traced_growth_mb'], 0.4)  # ~1200 x 512 bytes retained
+
+        leak_site = [s for s in report['total_growth'] if s['site'].endswith(_LEAK_SITE)]
+        self.assertTrue(leak_site, report['total_growth'])
+        self.assertGreaterEqual(leak_site[0]['count_diff'], 1200)
+        self.assertTrue(any(s['site'].endswith(_LEAK_SITE) for s in report['interval_growth']))
+
+
+class TestMemoryGrowthAggregate(unittest.TestCase):
+
+    def _report(self, pid, apps, sites):
+        return {
+            'pid': pid, 'apps_processed': apps, 'rss_mb': 100.0 + apps, 'rss_growth_mb': apps / 10,
+            'traced_mb': 10.0, 'traced_growth_mb': 1.0, 'untraced_growth_mb': 2.0, 'traced_peak_mb': 12.0,
+            'gc_counts': [1, 2, 3], 'gc_collections': [10, 1, 0], 'gc_objects': 5000,
+            'interval_growth': [], 'total_growth': [{'site': site, 'size_diff_kb': kb, 'count_diff': 10, 'size_kb': kb}
+                                                    for site, kb in sites]
+        }
+
+    def test_top_sites_and_trends(self):
+        aggregate = MemoryGrowthAggregate(top_n=2)
+        aggregate.merge(None)
+        self.assertFalse(aggregate)
+        aggregate.merge(self._report(1, 100, [('mapper.py:10', 50.0)]))
+        aggregate.merge(self._report(1, 200, [('mapper.py:10', 80.0), ('parser.py:5', 5.0)]))  # Replaces pid 1's view
+        aggregate.merge(self._report(2, 100, [('mapper.py:10', 20.0), ('cursor.py:7', 30.0)]))
+
+        top = aggregate.top_sites()
+        self.assertEqual(top[0], {'site': 'mapper.py:10', 'size_diff_kb': 100.0, 'count_diff': 20, 'workers': 2})
+        self.assertEqual(top[1]['site'], 'cursor.py:7')
+
+        summary = aggregate.summary()
+        self.assertEqual(summary['workers_reporting'], 2)
+        self.assertEqual([p['apps_processed'] for p in summary['workers']['1']['trend']], [100, 200])
+
+        for apps in range(300, 30000, 100):
+            aggregate.merge(self._report(3, apps, []))
+        trend = aggregate.summary()['workers']['3']['trend']
+        self.assertLessEqual(len(trend), 101)
+        self.assertEqual(trend[0]['apps_processed'], 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Tests for the mock XML engine's shard planning and size distribution.
+
+Shards cover the requested app_id range exactly (the last one takes the remainder) and the
+output does not depend on shard size; every value a SizeDistribution accepts is rendered in
+full, and values the fixed role / type tuples cannot render are rejected.
+"""
+
+import random
+import unittest
+
+from collections import Counter
+
+from lxml import etree
+
+from env_prep.mock_xml_engine import (
+    SIZE_LIMITS, SizeDistribution, generate_document, generate_shard, parse_weights, plan_shards
+)
+
+
+SMALL_REPORTS = {1: 1}
+
+
+def _sizes(**weights) -> SizeDistribution:
+    return SizeDistribution(report_kb=dict(SMALL_REPORTS), **weights)
+
+
+class TestPlanShards(unittest.TestCase):
+
+    def test_shards_cover_range_with_remainder_last(self):
+        jobs = plan_shards('CC', 25, 1000, 7, _sizes(), 10, 'none', {})
+        self.assertEqual([job.shard for job in jobs], [0, 1, 2])
+        self.assertEqual([job.first_app_id for job in jobs], [1000, 1010, 1020])
+        self.assertEqual([job.count for job in jobs], [10, 10, 5])
+
+    def test_exact_multiple_and_empty(self):
+        self.assertEqual([job.count for job in plan_shards('RL', 20, 1, 7, _sizes(), 10, 'none', {})], [10, 10])
+        self.assertEqual([job.count for job in plan_shards('RL', 3, 1, 7, _sizes(), 10, 'none', {})], [3])
+        self.assertEqual(plan_shards('RL', 0, 1, 7, _sizes(), 10, 'none', {}), [])
+
+    def test_non_positive_shard_size_rejected(self):
+        with self.assertRaises(ValueError):
+            plan_shards('CC', 10, 1, 7, _sizes(), 0, 'none', {})
+
+    def test_output_independent_of_shard_size(self):
+        totals = {}
+        for shard_size in (4, 7, 30):
+            results = [generate_shard(job) for job in plan_shards('CC', 30, 500, 7, _sizes(), shard_size, 'none', {})]
+            self.assertEqual(sum(result['documents'] for result in results), 30)
+            totals[shard_size] = sum(result['xml_bytes'] for result in results)
+        self.assertEqual(len(set(totals.values())), 1, totals)
+
+
+class TestSizeDistribution(unittest.TestCase):
+
+    def test_out_of_range_values_rejected(self):
+        for name, limit in SIZE_LIMITS.items():
+            with self.assertRaises(ValueError, msg=name):
+                _sizes(**{name: {1: 50, limit + 1: 50}})
+            with self.assertRaises(ValueError, msg=name):
+                _sizes(**{name: {-1: 1}})
+        with self.assertRaises(ValueError):
+            SizeDistribution(report_kb={-5: 1})
+
+    def test_parsed_weights_at_limits_accepted(self):
+        sizes = SizeDistribution(contacts=parse_weights('1:60,4:40'), collateral=parse_weights('0:1,4:1'))
+        self.assertEqual(sizes.contacts, {1: 60.0, 4: 40.0})
+
+    def test_maximum_sizes_rendered_in_full(self):
+        sizes = _sizes(**{name: {limit: 1} for name, limit in SIZE_LIMITS.items()})
+        cc = etree.fromstring(generate_document('CC', 42, 7, sizes).encode('utf-8'))
+        contacts = cc.findall('Request/CustData/application/contact')
+        self.assertEqual(len(contacts), SIZE_LIMITS['contacts'])
+        for contact in contacts:
+            self.assertEqual(len(contact.findall('contact_address')), SIZE_LIMITS['addresses'])
+            self.assertEqual(len(contact.findall('contact_employment')), SIZE_LIMITS['employments'])
+
+        rl = etree.fromstring(generate_document('RL', 42, 7, sizes).encode('utf-8'))
+        application = rl.find('Request/CustData/IL_application')
+        self.assertEqual(len(application.findall('IL_contact')), SIZE_LIMITS['contacts'])
+        collateral = application.find('IL_collateral')
+        self.assertTrue(all(collateral.get(f'coll{slot}_VIN') for slot in range(1, SIZE_LIMITS['collateral'] + 1)))
+
+    def test_contacts_follow_weights(self):
+        sizes = _sizes(contacts={1: 70, 3: 30})
+        counts = Counter(
+            len(etree.fromstring(generate_document('CC', app_id, 7, sizes).encode('utf-8'))
+                .findall('Request/CustData/application/contact'))
+            for app_id in range(300)
+        )
+        self.assertEqual(set(counts), {1, 3})
+        self.assertAlmostEqual(counts[1] / 300, 0.7, delta=0.1)
+
+    def test_pick_frequencies(self):
+        rng = random.Random(1)
+        weights = {1: 50, 2: 30, 3: 20}
+        counts = Counter(SizeDistribution.pick(rng, weights) for _ in range(5000))
+        for value, weight in weights.items():
+            self.assertAlmostEqual(counts[value] / 5000, weight / 100, delta=0.03)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Tests for the live OpenMetrics exporter.
+
+- LiveRunState totals (outcomes, failures by stage, rows per table, stage histograms)
+- Rendered text: counters, rates from consecutive snapshots, cumulative histogram buckets, # EOF
+- Textfile is written atomically (Prometheus text naming) and the HTTP endpoint serves /metrics
+- Each output computes rates from its own previous render
+"""
+
+import tempfile
+import unittest
+import urllib.request
+
+from pathlib import Path
+
+from xml_extractor.monitoring.openmetrics_exporter import (
+    LiveRunState, OpenMetricsExporter, render_openmetrics, LATENCY_BUCKETS_SECONDS
+)
+
+
+def _samples(text):
+    """{'name{labels}': value} for every sample line."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            key, value = line.rsplit(' ', 1)
+            samples[key] = float(value)
+    return samples
+
+
+class TestLiveRunState(unittest.TestCase):
+
+    def _state(self):
+        state = LiveRunState()
+        state.record_result(True, rows_by_table={'app_base': 1, 'app_contact_base': 2},
+                            stage_times={'mapping': 0.040, 'parsing': 0.004})
+        state.record_result(True, rows_by_table={'app_base': 1}, stage_times={'mapping': 0.300})
+        state.record_result(False, 'validation', stage_times={'validation': 0.002})
+        state.record_result(False, None)
+        state.load_provider = lambda: {'queued': 7, 'in_flight': 4, 'worker_pids': []}
+        state.recycle_reasons_provider = lambda: {'task_count': 2}
+        return state
+
+    def test_render_totals_and_histograms(self):
+        snapshot = self._state().snapshot()
+        text = render_openmetrics(snapshot, const_labels={'session': 's1'})
+        samples = _samples(text)
+
+        self.assertTrue(text.endswith('# EOF\n'))
+        self.assertEqual(samples['xml_extractor_apps_total{session="s1",outcome="success"}'], 2)
+        self.assertEqual(samples['xml_extractor_apps_total{session="s1",outcome="failed"}'], 2)
+        self.assertEqual(samples['xml_extractor_app_failures_total{session="s1",error_stage="validation"}'], 1)
+        self.assertEqual(samples['xml_extractor_app_failures_total{session="s1",error_stage="unknown"}'], 1)
+        self.assertEqual(samples['xml_extractor_rows_inserted_total{session="s1",table="app_base"}'], 2)
+        self.assertEqual(samples['xml_extractor_queued_apps{session="s1"}'], 7)
+        self.assertEqual(samples['xml_extractor_in_flight_apps{session="s1"}'], 4)
+        self.assertEqual(samples['xml_extractor_worker_recycles_total{session="s1",reason="task_count"}'], 2)
+        self.assertNotIn('xml_extractor_apps_per_second{session="s1"}', samples)  # No previous snapshot yet
+
+        # Buckets are cumulative and end with +Inf == count
+        mapping = [samples[f'xml_extractor_stage_latency_seconds_bucket{{session="s1",stage="mapping",le="{b}"}}']
+                   for b in LATENCY_BUCKETS_SECONDS]
+        self.assertEqual(mapping, sorted(mapping))
+        self.assertEqual(samples['xml_extractor_stage_latency_seconds_bucket{session="s1",stage="mapping",le="0.05"}'], 1)
+        self.assertEqual(samples['xml_extractor_stage_latency_seconds_bucket{session="s1",stage="mapping",le="+Inf"}'], 2)
+        self.assertAlmostEqual(samples['xml_extractor_stage_latency_seconds_sum{session="s1",stage="mapping"}'], 0.34)
+
+    def test_rates_from_previous_snapshot(self):
+        state = self._state()
+        previous = state.snapshot()
+        previous['timestamp'] -= 2.0
+        state.record_result(True, rows_by_table={'app_base': 1})
+        state.record_result(True, rows_by_table={'app_base': 1})
+        samples = _samples(render_openmetrics(state.snapshot(), previous))
+        self.assertAlmostEqual(samples['xml_extractor_apps_per_second'], 1.0, places=2)
+        self.assertAlmostEqual(samples['xml_extractor_rows_per_second{table="app_base"}'], 1.0, places=2)
+        self.assertEqual(samples['xml_extractor_rows_per_second{table="app_contact_base"}'], 0.0)
+
+
+class TestOpenMetricsExporter(unittest.TestCase):
+
+    def test_textfile_written_atomically(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'node' / 'xml_extractor.prom'
+            state = LiveRunState()
+            exporter = OpenMetricsExporter(state, textfile_path=str(path), interval_seconds=60)
+            exporter.start()
+            state.record_result(True)
+            exporter.stop()  # Writes final values
+
+            text = path.read_text()
+            samples = _samples(text)
+            self.assertEqual(samples['xml_extractor_apps_total{outcome="success"}'], 1)
+            self.assertEqual(list(path.parent.iterdir()), [path])  # No temp file left behind
+            # Classic text format: counter families carry the _total name, no OpenMetrics # EOF
+            self.assertIn('# TYPE xml_extractor_apps_total counter', text)
+            self.assertIn('# TYPE xml_extractor_stage_latency_seconds histogram', text)
+            self.assertNotIn('# TYPE xml_extractor_apps counter', text)
+            self.assertNotIn('# EOF', text)
+
+    def test_rate_windows_are_per_output(self):
+        state = LiveRunState()
+        exporter = OpenMetricsExporter(state)
+        exporter.render('textfile')
+        exporter._previous['textfile']['timestamp'] -= 10.0
+        state.record_result(True)
+        exporter.render('http')  # A scrape in between must not reset the textfile window
+        state.record_result(True)
+        samples = _samples(exporter.render('textfile'))
+        self.assertAlmostEqual(samples['xml_extractor_apps_per_second'], 0.2, places=2)
+        self.assertIn('# TYPE xml_extractor_apps counter', exporter.render('http'))
+
+    def test_http_endpoint(self):
+        state = LiveRunState()
+        state.record_result(False, 'mapping')
+        exporter = OpenMetricsExporter(state, http_port=0).start()
+        try:
+            base = f'http://127.0.0.1:{exporter.http_port}'
+            with urllib.request.urlopen(f'{base}/metrics', timeout=5) as response:
+                self.assertIn('openmetrics-text', response.headers['Content-Type'])
+                body = response.read().decode('utf-8')
+            self.assertIn('xml_extractor_app_failures_total{error_stage="mapping"} 1', body)
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f'{base}/other', timeout=5)
+        finally:
+            exporter.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -43,5 +43,23 @@ class TestPreProcessingValidator(unittest.TestCase):
         # import pprint
         # pprint.pprint(xml_data)
 
+    def test_parallel_batch_matches_serial(self):
+        records = [(f"cc_{i}", self.credit_card_xml) for i in range(5)] + [("rl", self.rec_lending_xml), ("empty", "")]
+        serial = self.validator.validate_batch(records)
+        parallel = self.validator.validate_batch(iter(records), workers=2, chunk_size=2)
+        self.assertEqual(parallel['summary'], serial['summary'])
+        self.assertEqual(serial['summary']['total_records'], 7)
+        self.assertEqual([record_id for record_id, _ in parallel['results']], [record_id for record_id, _ in records])
+        for (_, expected), (_, actual) in zip(serial['results'], parallel['results']):
+            self.assertEqual((actual.is_valid, actual.app_id, actual.validation_errors, actual.valid_contacts),
+                             (expected.is_valid, expected.app_id, expected.validation_errors, expected.valid_contacts))
+
+    def test_batch_summary_only(self):
+        streamed = list(self.validator.iter_batch([("a", self.credit_card_xml), ("b", self.rec_lending_xml)]))
+        self.assertEqual([(record_id, result.is_valid) for record_id, result in streamed], [("a", True), ("b", False)])
+        batch = self.validator.validate_batch([("a", self.credit_card_xml), ("b", self.rec_lending_xml)], keep_results=False)
+        self.assertEqual(batch['results'], [])
+        self.assertEqual((batch['summary']['valid_records'], batch['summary']['invalid_records']), (1, 1))
+
 if __name__ == '__main__':
     unittest.main()
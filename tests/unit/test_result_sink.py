@@ -0,0 +1,93 @@
+"""
+Tests for the streaming per-app result sink.
+
+- Records are appended per batch and readable before the sink is closed
+- Running aggregates match the streamed records
+- A truncated last line (killed run) is skipped when reading back
+- summarize_failures reads failures from the stream a metrics file points to
+"""
+
+import importlib.util
+import json
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from xml_extractor.monitoring.result_sink import AppResultSink, FAILED_ID_SAMPLE_SIZE, read_results
+
+
+def _load_summarize_failures():
+    path = Path(__file__).resolve().parents[2] / 'diagnostics' / 'summarize_failures.py'
+    spec = importlib.util.spec_from_file_location('summarize_failures', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _app(app_id, success=True, stage=None, quality=None, inserted=3):
+    return {'app_id': app_id, 'success': success, 'error_stage': stage, 'error_message': f'err {app_id}' if stage else None,
+            'processing_time': 0.1, 'records_inserted': inserted if success else 0, 'quality_issues': quality or []}
+
+
+class TestAppResultSink(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'results_test.jsonl'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batches_streamed_with_running_aggregates(self):
+        sink = AppResultSink(self.path)
+        sink.write_batch(1, [_app(1), _app(2, False, 'mapping'), _app(3, quality=['missing ssn'])],
+                         {'duration_seconds': 1.5})
+        # Visible on disk before close (crash-safe per batch)
+        self.assertEqual([r['app_id'] for r in read_results(self.path)], [1, 2, 3])
+
+        sink.write_batch(2, [_app(4, False, 'parsing'), _app(5, False, 'mapping')])
+        sink.close()
+
+        totals = sink.aggregates.to_dict()
+        self.assertEqual(totals['apps_written'], 5)
+        self.assertEqual(totals['successful'], 2)
+        self.assertEqual(totals['failed'], 3)
+        self.assertEqual(totals['quality_issue_count'], 1)
+        self.assertEqual(totals['records_inserted'], 6)
+        self.assertEqual(totals['failures_by_stage'], {'mapping': 2, 'parsing': 1})
+        self.assertEqual(totals['failed_app_ids_sample'], [2, 4, 5])
+        self.assertEqual([r['batch'] for r in read_results(self.path, 'batch')], [1])
+
+    def test_failed_id_sample_is_bounded(self):
+        with AppResultSink(self.path) as sink:
+            sink.write_batch(1, [_app(i, False, 'validation') for i in range(FAILED_ID_SAMPLE_SIZE * 3)])
+        self.assertEqual(len(sink.aggregates.failed_app_ids_sample), FAILED_ID_SAMPLE_SIZE)
+        self.assertEqual(sum(1 for _ in read_results(self.path)), FAILED_ID_SAMPLE_SIZE * 3)
+
+    def test_truncated_last_line_is_skipped(self):
+        with AppResultSink(self.path) as sink:
+            sink.write_batch(1, [_app(1), _app(2)])
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"type":"app","batch":2,"app_id":3,"succ')
+        self.assertEqual([r['app_id'] for r in read_results(self.path)], [1, 2])
+
+    def test_summarize_failures_reads_stream_from_metrics(self):
+        with AppResultSink(self.path) as sink:
+            sink.write_batch(1, [_app(10), _app(11, False, 'database_error'), _app(12, False, None)])
+        metrics_file = Path(self.tmp.name) / 'metrics_test.json'
+        metrics_file.write_text(json.dumps({'run_timestamp': 't', 'app_id_start': 10, 'app_id_end': 12,
+                                            'results_file': 'elsewhere/results_test.jsonl'}))
+
+        summarize = _load_summarize_failures()
+        failures = summarize.extract_failures(summarize.load_metrics(metrics_file), metrics_file)
+        self.assertEqual([(f['app_id'], f['error_stage']) for f in failures], [(11, 'database_error'), (12, 'unknown')])
+        self.assertEqual(failures[0]['app_id_start'], 10)
+
+        # Legacy metrics files embed the list
+        legacy = summarize.extract_failures({'failed_apps': [{'app_id': 7, 'error_stage': 'parsing'}]})
+        self.assertEqual(legacy[0]['app_id'], 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Tests for SlowAppTracker (bounded top-N slowest apps by total time and by stage).
+
+- Each ranking keeps only the N slowest apps, slowest first, with the full breakdown and facts
+- Trackers merge and survive a to_dict/from_dict round trip (chunk metrics files)
+- app_ids() lists replay candidates without duplicates
+"""
+
+import json
+import unittest
+
+from xml_extractor.monitoring.slow_apps import SlowAppTracker
+
+
+def _record(tracker, app_id, total, mapping, **details):
+    tracker.record(app_id, {'validation': 0.001, 'mapping': mapping, 'total': total}, details)
+
+
+class TestSlowAppTracker(unittest.TestCase):
+
+    def test_keeps_slowest_per_stage(self):
+        tracker = SlowAppTracker(top_n=3)
+        for app_id in range(1, 21):
+            # Total ranks by app_id, mapping ranks in reverse
+            _record(tracker, app_id, total=app_id / 10, mapping=(21 - app_id) / 100, xml_chars=app_id * 1000)
+
+        self.assertEqual(tracker.apps_seen, 20)
+        self.assertEqual([e['app_id'] for e in tracker.slowest('total')], [20, 19, 18])
+        self.assertEqual([e['app_id'] for e in tracker.slowest('mapping')], [1, 2, 3])
+
+        entry = tracker.slowest('total')[0]
+        self.assertEqual(entry['stage_ms'], {'validation': 1.0, 'mapping': 10.0, 'total': 2000.0})
+        self.assertEqual(entry['xml_chars'], 20000)
+        self.assertEqual(tracker.app_ids(), [20, 19, 18, 1, 2, 3])
+
+    def test_disabled_and_missing_timings(self):
+        tracker = SlowAppTracker(top_n=0)
+        _record(tracker, 1, 1.0, 0.5)
+        self.assertFalse(tracker)
+        tracker = SlowAppTracker()
+        tracker.record(2, None)  # Worker process crash: no timings
+        self.assertEqual(tracker.apps_seen, 0)
+
+    def test_merge_and_round_trip(self):
+        first, second = SlowAppTracker(top_n=2), SlowAppTracker(top_n=2)
+        _record(first, 1, 1.0, 0.1)
+        _record(first, 2, 3.0, 0.2)
+        _record(second, 3, 2.0, 0.9, insert_paths={'app_base': 'fallback'})
+        _record(second, 4, 0.5, 0.05)
+
+        restored = SlowAppTracker.from_dict(json.loads(json.dumps(second.to_dict())))
+        merged = first.merge(restored)
+        self.assertEqual(merged.apps_seen, 4)
+        self.assertEqual([e['app_id'] for e in merged.slowest('total')], [2, 3])
+        self.assertEqual([e['app_id'] for e in merged.slowest('mapping')], [3, 2])
+        self.assertEqual(merged.slowest('mapping')[0]['insert_paths'], {'app_base': 'fallback'})
+
+        table = merged.format_table('total')
+        self.assertIn('app_base', table.splitlines()[2])  # App 3 ran its insert on the fallback path
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for the stage-tagged sampling profiler.
+
+- collapse_stack roots stacks at _process_work_item and tags the innermost known stage
+- StackSampler captures a busy function on the target thread only between begin/end
+- ProfileAggregate merges samples and writes collapsed stacks per stage plus top functions
+"""
+
+import sys
+import tempfile
+import time
+import unittest
+
+from pathlib import Path
+
+from xml_extractor.monitoring.stage_profiler import StackSampler, ProfileAggregate, collapse_stack
+
+
+def _busy_inner(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+def map_xml_to_database(seconds):
+    return _busy_inner(seconds)
+
+
+def _process_work_item(seconds):
+    return map_xml_to_database(seconds)
+
+
+class TestCollapseStack(unittest.TestCase):
+
+    def test_rooted_and_tagged(self):
+        def map_xml_to_database():
+            def filter_duplicates():
+                return collapse_stack(sys._getframe())
+            return filter_duplicates()
+
+        def _process_work_item():
+            return map_xml_to_database()
+
+        stack = _process_work_item()
+        frames = stack.split(';')
+        self.assertEqual(frames[0], 'duplicate_detection')  # Innermost marker wins
+        self.assertTrue(frames[1].startswith('_process_work_item ('))
+        self.assertTrue(frames[-1].startswith('filter_duplicates ('))
+
+    def test_untagged_stack(self):
+        self.assertTrue(collapse_stack(sys._getframe()).startswith('other;'))
+
+
+class TestStackSampler(unittest.TestCase):
+
+    def test_captures_busy_function(self):
+        sampler = StackSampler(interval_seconds=0.001)
+        sampler.begin()
+        _process_work_item(0.2)
+        samples = sampler.end()
+
+        self.assertGreater(sum(samples.values()), 10)
+        mapping = sum(count for stack, count in samples.items() if stack.startswith('mapping;_process_work_item'))
+        self.assertGreater(mapping, sum(samples.values()) * 0.8)
+
+        time.sleep(0.05)
+        self.assertEqual(sampler.end(), {})  # Idle between apps
+
+
+class TestProfileAggregate(unittest.TestCase):
+
+    def test_merge_top_functions_and_write(self):
+        profile = ProfileAggregate(0.002)
+        profile.merge({'mapping;root (a.py:1);inner (a.py:9)': 6, 'parsing;root (a.py:1)': 2})
+        profile.merge({'mapping;root (a.py:1);inner (a.py:9)': 2})
+        profile.merge(None)  # Unsampled app
+
+        self.assertEqual(profile.apps_profiled, 2)
+        self.assertEqual(profile.samples_by_stage(), {'mapping': 8, 'parsing': 2})
+        top = profile.top_functions()
+        self.assertEqual(top[0]['function'], 'inner (a.py:9)')
+        self.assertEqual(top[0]['self_pct'], 80.0)
+        root = next(row for row in top if row['function'] == 'root (a.py:1)')
+        self.assertEqual(root['total_samples'], 10)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            names = sorted(path.name for path in profile.write(tmp))
+            self.assertEqual(names, ['profile.collapsed', 'profile.mapping.collapsed',
+                                     'profile.parsing.collapsed', 'profile_top_functions.txt'])
+            self.assertEqual((Path(tmp) / 'profile.mapping.collapsed').read_text(),
+                             'root (a.py:1);inner (a.py:9) 8\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for the memoized type-conversion kernels used by DataMapper.
+
+parse_datetime must agree with the legacy datetime.strptime loop (same formats, same order,
+ISO fallback); quantizers round half-up; convert_column matches per-value conversion.
+"""
+
+import unittest
+
+from datetime import datetime, timezone
+
+from xml_extractor.mapping import type_kernels
+from xml_extractor.mapping.data_mapper import DataMapper
+
+
+def _reference_parse(value):
+    cleaned = type_kernels.clean_datetime_string(value)
+    for fmt in type_kernels.DATETIME_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt)
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+class TestParseDatetime(unittest.TestCase):
+
+    def test_known_formats(self):
+        cases = {
+            '2023-10-3 16:26:23.886': datetime(2023, 10, 3, 16, 26, 23, 886000),
+            '2023-10-3 16:26:23': datetime(2023, 10, 3, 16, 26, 23),
+            '2023-10-03': datetime(2023, 10, 3),
+            '10/3/2023': datetime(2023, 10, 3),
+            '4/2/2020 5:53:20 PM': datetime(2020, 4, 2, 17, 53, 20),
+            '4/2/2020 12:05:00 am': datetime(2020, 4, 2, 0, 5),
+            '14/12/1988': datetime(1988, 12, 14),
+            '2024-8-8 8:08:88': datetime(2024, 8, 8, 8, 8, 59),
+            '2023-10-03T16:26:23Z': datetime(2023, 10, 3, 16, 26, 23, tzinfo=timezone.utc),
+        }
+        for value, expected in cases.items():
+            self.assertEqual(type_kernels.parse_datetime(value), expected, value)
+
+    def test_matches_strptime_reference(self):
+        probes = ['2023-13-01', '31/02/2020', '2/30/2020', '2023-1-1 24:00:00', '1/1/2020 13:00:00 PM',
+                  ' 3/ 4/2020', '2023-10-03 16:26:23.1234567', 'garbage', '', '2023-10-03  16:26:23']
+        for value in probes:
+            self.assertEqual(type_kernels.parse_datetime(value), _reference_parse(value), value)
+
+    def test_repeated_values_hit_cache(self):
+        type_kernels.clear_kernel_caches()
+        for _ in range(5):
+            type_kernels.parse_datetime('2023-10-3 16:26:23')
+        stats = type_kernels.get_kernel_cache_stats()['parse_datetime']
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 4)
+
+
+class TestNumericKernels(unittest.TestCase):
+
+    def test_quantize_half_up(self):
+        self.assertEqual(type_kernels.quantize_decimal('2.345', 2), 2.35)
+        self.assertEqual(type_kernels.quantize_decimal('-2.345', 2), -2.35)
+        self.assertEqual(type_kernels.quantize_integer('2.5'), 3)
+        self.assertEqual(type_kernels.quantize_integer('1e2'), 100)
+
+    def test_extract_numeric_only_caches_strings(self):
+        type_kernels.clear_kernel_caches()
+        self.assertEqual(type_kernels.extract_numeric('Up to $40'), 40)
+        self.assertEqual(type_kernels.extract_numeric(40), 40)
+        self.assertEqual(type_kernels.get_kernel_cache_stats()['extract_numeric']['size'], 1)
+
+
+class TestConvertColumn(unittest.TestCase):
+
+    def setUp(self):
+        self.mapper = DataMapper()
+
+    def test_matches_per_value_conversion(self):
+        columns = {
+            'datetime': ['2023-10-3 16:26:23', '10/3/2023', '2023-10-3 16:26:23', 'bad', None],
+            'int': ['1', '2.5', True, 1, '1', '', None],
+            'decimal': ['1.005', '$1,234.50', '1.005', 7],
+            'bit': ['Y', 'N', 'true', 1, 0],
+        }
+        for target_type, values in columns.items():
+            expected = [self.mapper.transform_data_types(value, target_type) for value in values]
+            self.assertEqual(type_kernels.convert_column(values, target_type, mapper=self.mapper), expected, target_type)
+            self.assertEqual(type_kernels.convert_column(values, target_type), expected, target_type)
+
+    def test_precision_column(self):
+        values = ['1.005', '2.5', '1.005']
+        expected = [self.mapper._transform_to_decimal_with_precision(value, 2) for value in values]
+        self.assertEqual(type_kernels.convert_column(values, 'decimal', precision=2, mapper=self.mapper), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Tests for lease-based app_id block distribution (SQLite stand-in for the shared lease table).
+
+The SQL Server store never creates its table; a missing table is a ConfigurationError.
+"""
+
+import multiprocessing as mp
+import os
+import tempfile
+import unittest
+
+from contextlib import contextmanager
+
+from launch_parallel_instances import ParallelInstanceLauncher
+from xml_extractor.exceptions import ConfigurationError
+from xml_extractor.processing.work_leases import SqliteLeaseStore, SqlServerLeaseStore, plan_blocks
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _drain(db_path, run_id, instance_id, queue):
+    store = SqliteLeaseStore(db_path)
+    claimed = []
+    while True:
+        block = store.claim_next(run_id, instance_id, lease_seconds=60)
+        if block is None:
+            break
+        claimed.append(block.block_id)
+        store.complete(block, processed_count=block.end_id - block.start_id + 1)
+    queue.put(claimed)
+
+
+class TestWorkLeases(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self._tmp.name, 'leases.db')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_plan_blocks(self):
+        self.assertEqual(plan_blocks(1, 25, 10), [(0, 1, 10), (1, 11, 20), (2, 21, 25)])
+        with self.assertRaises(ConfigurationError):
+            plan_blocks(1, 25, 0)
+
+    def test_claims_in_order_and_initialize_is_idempotent(self):
+        store = SqliteLeaseStore(self.db_path)
+        self.assertEqual(store.initialize('run', 1, 25, 10), 3)
+        self.assertEqual(store.initialize('run', 1, 25, 10), 3)
+
+        first = store.claim_next('run', 'a', lease_seconds=60)
+        second = store.claim_next('run', 'b', lease_seconds=60)
+        self.assertEqual((first.start_id, first.end_id), (1, 10))
+        self.assertEqual((second.start_id, second.end_id), (11, 20))
+        self.assertTrue(store.complete(first, 10))
+
+        rows = {r['block_id']: r for r in store.get_lease_rows('run')}
+        self.assertEqual([rows[i]['status'] for i in range(3)], ['done', 'leased', 'pending'])
+
+    def test_expired_lease_is_reclaimed(self):
+        clock = FakeClock()
+        store = SqliteLeaseStore(self.db_path, clock=clock)
+        store.initialize('run', 1, 10, 10)
+
+        crashed = store.claim_next('run', 'crashed', lease_seconds=60)
+        self.assertIsNone(store.claim_next('run', 'other', lease_seconds=60))
+
+        clock.now += 61
+        reclaimed = store.claim_next('run', 'other', lease_seconds=60)
+        self.assertEqual(reclaimed.block_id, crashed.block_id)
+        self.assertEqual(reclaimed.attempts, 2)
+        # The original holder can no longer renew or complete it
+        self.assertFalse(store.renew(crashed, 60))
+        self.assertFalse(store.complete(crashed, 10))
+        self.assertTrue(store.complete(reclaimed, 10))
+
+    def test_released_block_is_claimable_immediately(self):
+        store = SqliteLeaseStore(self.db_path, clock=FakeClock())
+        store.initialize('run', 1, 10, 10)
+        stopped_early = store.claim_next('run', 'a', lease_seconds=60)
+        self.assertTrue(store.release(stopped_early))
+        self.assertFalse(store.release(stopped_early))
+        self.assertFalse(store.complete(stopped_early, 5))
+
+        reclaimed = store.claim_next('run', 'b', lease_seconds=60)
+        self.assertEqual((reclaimed.block_id, reclaimed.attempts), (stopped_early.block_id, 2))
+        self.assertTrue(store.complete(reclaimed, 10))
+
+    def test_concurrent_instances_claim_each_block_once(self):
+        SqliteLeaseStore(self.db_path).initialize('run', 1, 2000, 50)
+        queue = mp.Queue()
+        workers = [mp.Process(target=_drain, args=(self.db_path, 'run', str(i), queue)) for i in range(4)]
+        for worker in workers:
+            worker.start()
+        claimed = [block for _ in workers for block in queue.get(timeout=60)]
+        for worker in workers:
+            worker.join(timeout=60)
+
+        self.assertEqual(sorted(claimed), list(range(40)))
+        rows = SqliteLeaseStore(self.db_path).get_lease_rows('run')
+        self.assertTrue(all(r['status'] == 'done' for r in rows))
+        self.assertEqual(sum(r['processed_count'] for r in rows), 2000)
+
+
+class RecordingConnection:
+    """Answers the lease table existence check and records every statement."""
+
+    def __init__(self, object_id):
+        self.object_id = object_id
+        self.statements = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, *params):
+        self.statements.append(sql)
+
+    def fetchone(self):
+        return (self.object_id,)
+
+    def commit(self):
+        pass
+
+
+class TestSqlServerLeaseStore(unittest.TestCase):
+
+    def _store(self, conn):
+        @contextmanager
+        def connect():
+            yield conn
+        return SqlServerLeaseStore(connect, target_schema='sandbox')
+
+    def test_missing_table_raises_without_ddl(self):
+        conn = RecordingConnection(object_id=None)
+        with self.assertRaises(ConfigurationError) as ctx:
+            self._store(conn)
+        self.assertIn('create_work_lease_table.sql', str(ctx.exception))
+        self.assertFalse(any('CREATE' in sql.upper() for sql in conn.statements))
+
+    def test_existing_table_accepted(self):
+        store = self._store(RecordingConnection(object_id=12345))
+        self.assertEqual(store.table, '[sandbox].[work_lease]')
+
+
+class TestLauncherInstanceBreakdown(unittest.TestCase):
+
+    def test_share_and_idle_per_instance(self):
+        records = [
+            {'instance': '0', 'apps_processed': 300, 'blocks': 3, 'busy_seconds': 60.0, 'started_at': 0.0, 'finished_at': 60.0},
+            {'instance': '1', 'apps_processed': 100, 'blocks': 1, 'busy_seconds': 20.0, 'started_at': 5.0, 'finished_at': 25.0},
+        ]
+        breakdown = {e['instance']: e for e in ParallelInstanceLauncher.instance_breakdown(records)}
+        self.assertEqual(breakdown['0']['share_pct'], 75.0)
+        self.assertEqual(breakdown['0']['idle_seconds'], 0.0)
+        self.assertEqual(breakdown['1']['idle_seconds'], 40.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests for the persistent, recycling worker pool used by ParallelCoordinator.
+"""
+
+import os
+import unittest
+
+from xml_extractor.processing.worker_pool import RecyclingWorkerPool, WorkerLostError
+
+
+_retained = []
+
+
+def _init_counter(tag):
+    global _tag
+    _tag = tag
+
+
+def _square(item):
+    return (_tag, os.getpid(), item * item)
+
+
+def _leak(item):
+    # Keep ~8 MB per item alive so RSS keeps growing
+    _retained.append(bytearray(8 * 1024 * 1024))
+    return os.getpid()
+
+
+def _crash_on_seven(item):
+    if item == 7:
+        os._exit(3)
+    return item
+
+
+class TestRecyclingWorkerPool(unittest.TestCase):
+
+    def test_results_in_order_and_workers_persist_across_batches(self):
+        with RecyclingWorkerPool(2, _square, initializer=_init_counter, initargs=('t',)) as pool:
+            first = pool.map(list(range(10)))
+            pids = set(pool.worker_pids)
+            second = pool.map(list(range(10, 20)))
+            self.assertEqual(set(pool.worker_pids), pids)
+
+        self.assertEqual([value[2] for ok, value in first + second], [i * i for i in range(20)])
+        self.assertTrue(all(ok and value[0] == 't' for ok, value in first))
+        self.assertEqual(pool.workers_spawned, 2)
+
+    def test_task_count_recycling(self):
+        seen = []
+        with RecyclingWorkerPool(2, _square, initializer=_init_counter, initargs=('t',),
+                                 max_tasks_per_worker=5) as pool:
+            results = pool.map(list(range(40)), on_result=lambda index, ok, value: seen.append(index))
+
+        self.assertTrue(all(ok for ok, _ in results))
+        self.assertEqual(sorted(seen), list(range(40)))
+        self.assertGreaterEqual(len(pool.recycle_events), 4)
+        self.assertTrue(all(e.reason == 'task_count' and e.replacement_pid for e in pool.recycle_events))
+        # No worker ran far past its budget (prefetched items are finished before exit)
+        per_pid = {}
+        for _, value in results:
+            per_pid[value[1]] = per_pid.get(value[1], 0) + 1
+        self.assertLessEqual(max(per_pid.values()), 5 + 2)
+        self.assertEqual(pool.get_stats()['recycle_reasons'], {'task_count': len(pool.recycle_events)})
+
+    def test_rss_growth_recycling(self):
+        with RecyclingWorkerPool(1, _leak, max_rss_growth_mb=30) as pool:
+            results = pool.map(list(range(12)))
+
+        self.assertTrue(all(ok for ok, _ in results))
+        self.assertGreaterEqual(len(pool.recycle_events), 2)
+        event = pool.recycle_events[0]
+        self.assertEqual(event.reason, 'rss_growth')
+        self.assertGreaterEqual(event.rss_growth_mb, 30)
+        self.assertGreater(len(set(pid for _, pid in results)), 1)
+
+    def test_crashed_worker_is_replaced_and_item_reported_lost(self):
+        with RecyclingWorkerPool(2, _crash_on_seven) as pool:
+            results = pool.map(list(range(20)))
+
+        failed = [i for i, (ok, _) in enumerate(results) if not ok]
+        self.assertEqual(failed, [7])
+        self.assertIsInstance(results[7][1], WorkerLostError)
+        self.assertEqual([value for ok, value in results if ok], [i for i in range(20) if i != 7])
+        self.assertEqual([e.reason for e in pool.recycle_events], ['crash'])
+
+
+if __name__ == '__main__':
+    unittest.main()
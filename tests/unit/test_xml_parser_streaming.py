@@ -0,0 +1,100 @@
+"""
+Tests for XMLParser streaming mode (iterparse with subtree clearing for oversized documents).
+
+Streaming mode must produce the same flattened CustData structure as a full-tree parse while
+dropping the Reports/Journals/Audits sections that make large Provenir payloads expensive.
+"""
+
+import pytest
+
+from xml_extractor.models import ProcessingConfig
+from xml_extractor.parsing.xml_parser import XMLParser
+
+
+LARGE_SAMPLE = 'config/samples/xml_files/sample-source-xml-large--325620.xml'
+
+SMALL_XML = """
+<Provenir>
+    <Request ID="154284" Status="A">
+        <CustData>
+            <application app_receive_date="2023-10-03">
+                <contact con_id="277449" ac_role_tp_c="PR" first_name="JOHN">
+                    <contact_address address_tp_c="CURR" city="FARGO"/>
+                </contact>
+            </application>
+        </CustData>
+        <Reports><TU><creditBureau score="700"/></TU></Reports>
+        <Journals><Journal id="1"/><Journal id="2"/></Journals>
+    </Request>
+</Provenir>
+"""
+
+
+def _load_large_sample() -> str:
+    with open(LARGE_SAMPLE, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+class TestXMLParserStreaming:
+    """Streaming parse behaviour and equivalence with the full-tree parse."""
+
+    def test_below_threshold_uses_full_parse(self):
+        parser = XMLParser(config=ProcessingConfig(streaming_threshold_bytes=10 * 1024 * 1024))
+        root = parser.parse_xml_stream(SMALL_XML)
+        elements = parser.extract_elements(root)
+
+        assert parser.streaming_parse_count == 0
+        assert '/Provenir/Request/Reports/TU/creditBureau' in elements
+
+    def test_zero_threshold_disables_streaming(self):
+        parser = XMLParser(config=ProcessingConfig(streaming_threshold_bytes=0))
+        parser.parse_xml_stream(SMALL_XML)
+        assert parser.streaming_parse_count == 0
+
+    def test_negative_threshold_rejected(self):
+        with pytest.raises(ValueError):
+            ProcessingConfig(streaming_threshold_bytes=-1)
+
+    def test_streaming_keeps_custdata_and_request_attributes(self):
+        parser = XMLParser(config=ProcessingConfig(streaming_threshold_bytes=1))
+        root = parser.parse_xml_stream(SMALL_XML)
+        elements = parser.extract_elements(root)
+
+        assert parser.streaming_parse_count == 1
+        assert elements['/Provenir/Request']['attributes']['ID'] == '154284'
+        contact = elements['/Provenir/Request/CustData/application/contact']
+        assert contact['attributes']['con_id'] == '277449'
+        assert '/Provenir/Request/CustData/application/contact/contact_address' in elements
+        assert not any('/Reports' in path or '/Journals' in path for path in elements)
+
+        # Pruned tree still supports the XPath lookups the mapper relies on
+        assert len(root.xpath('.//contact[@ac_role_tp_c]')) == 1
+        assert root.find('Request/Reports') is None
+        assert root.find('Request/Journals') is None
+
+    def test_streaming_matches_full_parse_for_retained_paths(self):
+        xml_content = _load_large_sample()
+
+        full_parser = XMLParser(config=ProcessingConfig(streaming_threshold_bytes=0))
+        full_elements = full_parser.extract_elements(full_parser.parse_xml_stream(xml_content))
+
+        streaming_parser = XMLParser()  # Default threshold (1 MB) triggers on the 2 MB sample
+        streamed_elements = streaming_parser.extract_elements(streaming_parser.parse_xml_stream(xml_content))
+
+        expected = {
+            path: data for path, data in full_elements.items()
+            if path in ('/Provenir', '/Provenir/Request') or path.startswith('/Provenir/Request/CustData')
+        }
+        assert streaming_parser.streaming_parse_count == 1
+        assert streamed_elements == expected
+        assert list(streamed_elements) == list(expected)
+        assert streaming_parser.elements_discarded > 0
+
+    def test_streamed_elements_handed_back_once(self):
+        parser = XMLParser(config=ProcessingConfig(streaming_threshold_bytes=1))
+        root = parser.parse_xml_stream(SMALL_XML)
+        first = parser.extract_elements(root)
+        second = parser.extract_elements(root)
+
+        # Second call walks the pruned tree and yields the same structure
+        assert first == second
@@ -0,0 +1,77 @@
+"""
+Tests for the raw-content pre-scan used by PreProcessingValidator to reject misrouted rows.
+"""
+
+import unittest
+
+from xml_extractor.validation.pre_processing_validator import PreProcessingValidator
+from xml_extractor.validation.xml_prescan import prescan_xml
+
+
+CC_XML = """<Provenir><Request ID="154284"><CustData>
+<application app_receive_date="2023-10-03"><contact con_id="1" ac_role_tp_c="PR"/></application>
+</CustData><Reports/></Request></Provenir>"""
+
+RL_XML = """<Provenir><Request ID="325725"><CustData>
+<IL_application app_receive_date="2023-10-03"><IL_contact con_id="1" ac_role_tp_c="PR"/></IL_application>
+</CustData></Request></Provenir>"""
+
+
+class TestPrescanXml(unittest.TestCase):
+
+    def test_detects_request_id_and_product_line(self):
+        cc = prescan_xml(CC_XML)
+        self.assertEqual(cc.app_id, '154284')
+        self.assertEqual(cc.product_line_element, 'application')
+        self.assertEqual(prescan_xml(RL_XML).product_line_element, 'IL_application')
+        self.assertEqual(prescan_xml(CC_XML.encode('utf-8')).app_elements, ('application',))
+
+    def test_wrong_product_line_rejected(self):
+        errors = prescan_xml(RL_XML).rejection_errors('application')
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].startswith('Wrong product line: Found Rec Lending XML'))
+        self.assertEqual(prescan_xml(CC_XML).rejection_errors('application'), [])
+
+    def test_missing_or_invalid_request_id_rejected(self):
+        missing = prescan_xml('<Provenir><Request Status="A"><CustData/></Request></Provenir>')
+        self.assertIn("CRITICAL: Missing app_id (/Provenir/Request/@ID)", missing.rejection_errors())
+        invalid = prescan_xml('<Provenir><Request ID="abc"><CustData/></Request></Provenir>')
+        self.assertIn("CRITICAL: Invalid app_id format: abc (must be integer)", invalid.rejection_errors())
+
+    def test_inconclusive_scan_defers_to_full_validation(self):
+        # CustData not closed within the window: nothing can be concluded about the app element
+        truncated = prescan_xml(CC_XML, max_scan_chars=40)
+        self.assertFalse(truncated.custdata_complete)
+        self.assertEqual(truncated.rejection_errors('IL_application'), [])
+        # Entity-encoded IDs need the real parser
+        encoded = prescan_xml('<Provenir><Request ID="&#49;"><CustData/></Request></Provenir>')
+        self.assertEqual(encoded.rejection_errors(), [])
+
+
+class TestValidatorPrescanIntegration(unittest.TestCase):
+
+    def test_prescan_rejects_before_parse_with_same_outcome(self):
+        with_scan = PreProcessingValidator(mapping_contract_path='config/mapping_contract.json')
+        without_scan = PreProcessingValidator(mapping_contract_path='config/mapping_contract.json', enable_prescan=False)
+
+        early = with_scan.validate_xml_for_processing(RL_XML)
+        full = without_scan.validate_xml_for_processing(RL_XML)
+
+        self.assertEqual(with_scan.prescan_rejections, 1)
+        self.assertEqual(with_scan.parser.validation_count, 0)  # lxml never invoked
+        self.assertFalse(early.is_valid)
+        self.assertEqual(early.is_valid, full.is_valid)
+        self.assertEqual(early.app_id, full.app_id)
+        self.assertTrue(set(early.validation_errors) <= set(full.validation_errors))
+
+    def test_passing_rows_get_full_validation(self):
+        validator = PreProcessingValidator(mapping_contract_path='config/mapping_contract.json')
+        result = validator.validate_xml_for_processing(CC_XML)
+
+        self.assertEqual(validator.prescan_rejections, 0)
+        self.assertEqual(validator.parser.validation_count, 1)
+        self.assertTrue(result.is_valid)
+
+
+if __name__ == '__main__':
+    unittest.main()
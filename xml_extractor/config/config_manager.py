@@ -18,6 +18,7 @@ from dataclasses import dataclass, field
 from ..interfaces import ConfigurationManagerInterface
 from ..models import MappingContract, FieldMapping, RelationshipMapping, ProcessingConfig
 from ..exceptions import ConfigurationError, ValidationError
+from .contract_cache import ContractCache
 
 
 @dataclass
@@ -129,6 +130,7 @@ class ProcessingParameters:
     checkpoint_interval: int = 50000
     max_retry_attempts: int = 3
     retry_delay_seconds: int = 5
+    streaming_threshold_bytes: int = 1048576
     
     @classmethod
     def from_environment(cls) -> 'ProcessingParameters':
@@ -141,7 +143,8 @@ class ProcessingParameters:
             enable_validation=os.environ.get('XML_EXTRACTOR_ENABLE_VALIDATION', 'true').lower() == 'true',
             checkpoint_interval=int(os.environ.get('XML_EXTRACTOR_CHECKPOINT_INTERVAL', cls.checkpoint_interval)),
             max_retry_attempts=int(os.environ.get('XML_EXTRACTOR_MAX_RETRY_ATTEMPTS', cls.max_retry_attempts)),
-            retry_delay_seconds=int(os.environ.get('XML_EXTRACTOR_RETRY_DELAY_SECONDS', cls.retry_delay_seconds))
+            retry_delay_seconds=int(os.environ.get('XML_EXTRACTOR_RETRY_DELAY_SECONDS', cls.retry_delay_seconds)),
+            streaming_threshold_bytes=int(os.environ.get('XML_EXTRACTOR_STREAMING_THRESHOLD_BYTES', cls.streaming_threshold_bytes))
         )
 
 
@@ -201,7 +204,11 @@ class ConfigManager(ConfigurationManagerInterface):
         self._mapping_contract_cache: Dict[str, MappingContract] = {}
         self._table_structure_cache: Dict[str, Dict[str, Dict[str, str]]] = {}
         self._sample_xml_cache: Dict[str, List[str]] = {}
-        
+
+        # Parsed/validated contracts shared across processes (see contract_cache.py)
+        self._contract_cache = ContractCache.from_environment()
+        self._contract_cache_entries: Dict[str, tuple] = {}
+
         self.logger.debug(f"ConfigManager initialized with base path: {self.paths.base_config_path}")
         self.logger.debug(f"Database server: {self.database_config.server}")
         self.logger.debug(f"Processing batch size: {self.processing_params.batch_size}")
@@ -244,7 +251,8 @@ class ConfigManager(ConfigurationManagerInterface):
             progress_reporting_interval=self.processing_params.progress_reporting_interval,
             sql_server_connection_string=self.database_config.connection_string,
             enable_validation=self.processing_params.enable_validation,
-            checkpoint_interval=self.processing_params.checkpoint_interval
+            checkpoint_interval=self.processing_params.checkpoint_interval,
+            streaming_threshold_bytes=self.processing_params.streaming_threshold_bytes
         )
     
     def load_mapping_contract(self, contract_path: Optional[str] = None) -> MappingContract:
@@ -269,31 +277,75 @@ class ConfigManager(ConfigurationManagerInterface):
         
         if not full_path.exists():
             raise ConfigurationError(f"Mapping contract file not found: {full_path}")
-        
+
         try:
-            with open(full_path, 'r', encoding='utf-8') as file:
-                if full_path.suffix.lower() in ['.yaml', '.yml']:
-                    import yaml
-                    contract_data = yaml.safe_load(file)
-                elif full_path.suffix.lower() == '.json':
-                    contract_data = json.load(file)
-                else:
-                    raise ConfigurationError(f"Unsupported file format: {full_path.suffix}")
-                    
+            contract_bytes = full_path.read_bytes()
+        except Exception as e:
+            raise ConfigurationError(f"Failed to read mapping contract file {full_path}: {e}")
+
+        # Another process already parsed and validated this exact contract content
+        cache_key = self._contract_cache.key_for(contract_bytes)
+        entry = self._contract_cache.load(full_path, cache_key)
+        if entry:
+            contract = entry['contract']
+            self._mapping_contract_cache[contract_path] = contract
+            self._contract_cache_entries[contract_path] = (full_path, cache_key, entry)
+            self.logger.debug(f"Loaded mapping contract from {contract_path} (contract cache hit)")
+            return contract
+
+        try:
+            contract_text = contract_bytes.decode('utf-8')
+            if full_path.suffix.lower() in ['.yaml', '.yml']:
+                import yaml
+                contract_data = yaml.safe_load(contract_text)
+            elif full_path.suffix.lower() == '.json':
+                contract_data = json.loads(contract_text)
+            else:
+                raise ConfigurationError(f"Unsupported file format: {full_path.suffix}")
+
         except (json.JSONDecodeError, ImportError) as e:
             raise ConfigurationError(f"Failed to parse mapping contract file {full_path}: {e}")
         except Exception as e:
             raise ConfigurationError(f"Failed to read mapping contract file {full_path}: {e}")
-        
+
         # Parse and validate the contract
         contract = self._parse_mapping_contract(contract_data, contract_path)
         self._validate_mapping_contract(contract)
-        
-        # Cache the result
+
+        # Cache the result (in memory and for later processes)
         self._mapping_contract_cache[contract_path] = contract
-        
+        entry = self._contract_cache.new_entry(full_path, cache_key, contract)
+        self._contract_cache_entries[contract_path] = (full_path, cache_key, entry)
+        self._contract_cache.store(full_path, cache_key, entry)
+
         self.logger.debug(f"Loaded mapping contract from {contract_path}")
         return contract
+
+    def validate_mapping_contract_structure(self, contract_path: Optional[str] = None):
+        """
+        Run MappingContractValidator on a mapping contract, reusing a cached result for the
+        same contract content.
+
+        Args:
+            contract_path: Optional path to mapping contract. If None, uses default from configuration.
+
+        Returns:
+            MappingContractValidationResult
+        """
+        from ..validation.mapping_contract_validator import MappingContractValidator
+
+        if contract_path is None:
+            contract_path = self.paths.mapping_contract_path
+
+        contract = self.load_mapping_contract(contract_path)
+        full_path, cache_key, entry = self._contract_cache_entries[contract_path]
+        if entry.get('contract_validation') is not None:
+            return entry['contract_validation']
+
+        result = MappingContractValidator(contract).validate_contract()
+        entry['contract_validation'] = result
+        self._contract_cache.store(full_path, cache_key, entry)
+        return result
     
     def load_table_structure(self, sql_script_path: Optional[str] = None, 
                            data_model_path: Optional[str] = None) -> Dict[str, Dict[str, str]]:
@@ -506,7 +558,8 @@ class ConfigManager(ConfigurationManagerInterface):
         self._mapping_contract_cache.clear()
         self._table_structure_cache.clear()
         self._sample_xml_cache.clear()
-        
+        self._contract_cache_entries.clear()
+
         self.logger.debug("Configuration cache cleared")
     
     def reload_configuration(self) -> None:
@@ -0,0 +1,139 @@
+"""
+On-disk cache of parsed and validated mapping contracts.
+
+Every production_processor.py process (each chunk of run_production_processor.py, each
+instance of launch_parallel_instances.py, and each spawned worker on Windows) used to parse
+the contract JSON, run ConfigManager's structural checks and MappingContractValidator before
+doing any work. The contract rarely changes between those processes, so the outcome is
+cached:
+
+- Key: sha256 of the contract file bytes plus a fingerprint of the code that parses and
+  validates it (config_manager.py, models.py, mapping_contract_validator.py) and the Python
+  version, so editing either the contract or the validator invalidates the entry
+- Entry: pickle of {'contract': MappingContract, 'contract_validation': MappingContractValidationResult}
+  (the validation result is added and the entry rewritten the first time a process runs
+  MappingContractValidator), read once per process
+- Location: a .contract_cache/ directory next to the contract file (override with
+  XML_EXTRACTOR_CONTRACT_CACHE_DIR, disable with XML_EXTRACTOR_CONTRACT_CACHE=0). Entries
+  are pickles, so the directory must be no more writable than the contract itself.
+
+Writes go to a temporary file and are renamed into place, so concurrent processes starting
+together at worst each write the same entry. Unreadable or stale entries are treated as misses.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+CONTRACT_CACHE_DIR_ENV = 'XML_EXTRACTOR_CONTRACT_CACHE_DIR'
+CONTRACT_CACHE_ENABLED_ENV = 'XML_EXTRACTOR_CONTRACT_CACHE'
+CACHE_DIR_NAME = '.contract_cache'
+
+# Bump when the entry layout changes
+CACHE_FORMAT_VERSION = 1
+
+# Modules whose code decides what a parsed / validated contract looks like
+_FINGERPRINT_SOURCES = ('config/config_manager.py', 'models.py', 'validation/mapping_contract_validator.py')
+
+_code_fingerprint: Optional[str] = None
+
+
+def validator_fingerprint() -> str:
+    """Hash of the parsing/validation code and Python version (computed once per process)."""
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        package_root = Path(__file__).resolve().parents[1]
+        digest = hashlib.sha256(f"{CACHE_FORMAT_VERSION}|{sys.version_info[0]}.{sys.version_info[1]}".encode())
+        for relative_path in _FINGERPRINT_SOURCES:
+            digest.update(relative_path.encode())
+            digest.update((package_root / relative_path).read_bytes())
+        _code_fingerprint = digest.hexdigest()
+    return _code_fingerprint
+
+
+class ContractCache:
+    """
+    Pickled contract entries keyed by contract content and validator fingerprint.
+
+    Usage:
+        cache = ContractCache.from_environment()
+        key = cache.key_for(contract_bytes)
+        entry = cache.load(contract_path, key)        # None on a miss
+        if entry is None:
+            entry = cache.new_entry(contract_path, key, parse_and_validate(contract_bytes))
+            cache.store(contract_path, key, entry)
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, enabled: bool = True):
+        """
+        Args:
+            cache_dir: Directory for all entries (default: .contract_cache/ next to each contract)
+            enabled: False turns load/store into no-ops
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_environment(cls) -> 'ContractCache':
+        enabled = os.environ.get(CONTRACT_CACHE_ENABLED_ENV, '1').strip().lower() not in ('0', 'false', 'off', 'no')
+        return cls(cache_dir=os.environ.get(CONTRACT_CACHE_DIR_ENV) or None, enabled=enabled)
+
+    def key_for(self, contract_bytes: bytes) -> str:
+        return hashlib.sha256(validator_fingerprint().encode() + b'|' + contract_bytes).hexdigest()
+
+    def entry_path(self, contract_path: Path, key: str) -> Path:
+        contract_path = Path(contract_path)
+        directory = self.cache_dir or contract_path.parent / CACHE_DIR_NAME
+        return directory / f"{contract_path.stem}-{key[:32]}.pickle"
+
+    def load(self, contract_path: Path, key: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for this contract content, or None (disabled, missing, unreadable or stale)."""
+        if not self.enabled:
+            return None
+        path = self.entry_path(contract_path, key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            entry = None
+        except Exception as e:
+            self.logger.debug(f"Ignoring unreadable contract cache entry {path}: {e}")
+            entry = None
+        if not isinstance(entry, dict) or entry.get('key') != key or entry.get('contract') is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def new_entry(self, contract_path: Path, key: str, contract: Any) -> Dict[str, Any]:
+        return {'key': key, 'contract_path': str(contract_path), 'contract': contract}
+
+    def store(self, contract_path: Path, key: str, entry: Dict[str, Any]) -> bool:
+        """Write the entry atomically; failures are logged and only cost the next process a miss."""
+        if not self.enabled:
+            return False
+        path = self.entry_path(contract_path, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(prefix=path.stem, suffix='.tmp', dir=path.parent)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except OSError as e:
+            self.logger.debug(f"Could not write contract cache entry {path}: {e}")
+            return False
+        return True
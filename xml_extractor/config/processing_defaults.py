@@ -27,6 +27,10 @@ class ProcessingDefaults:
     # Parallelization
     WORKERS = 4  # Number of parallel worker processes
     
+    # Worker recycling (replaces individual workers instead of restarting the whole process)
+    WORKER_MAX_TASKS = 2500  # Apps per worker before replacement (~one 10k chunk with 4 workers; 0 = never)
+    WORKER_MAX_RSS_GROWTH_MB = 256  # RSS growth since worker start that triggers replacement (0 = never)
+    
     # Processing limits
     LIMIT = 10000  # Maximum applications to process (0 = unlimited)
     
@@ -14,11 +14,13 @@ KEY FEATURES:
 For architecture details, see architecture-quickstart.md (schema isolation, atomicity, FK ordering)
 """
 
+import importlib
 import logging
+import os
 import time
 import pyodbc
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from contextlib import contextmanager
 
 from ..interfaces import MigrationEngineInterface
@@ -28,6 +30,26 @@ from .duplicate_contact_detector import DuplicateContactDetector
 from .bulk_insert_strategy import BulkInsertStrategy
 
 
+# Optional 'module:callable' used instead of pyodbc.connect (offline benchmarks run the full
+# pipeline against an in-process backend). Read from the environment so worker processes
+# pick it up however they are started.
+CONNECT_FACTORY_ENV = 'XML_EXTRACTOR_DB_CONNECT_FACTORY'
+
+_connect_factories: Dict[str, Callable] = {}
+
+
+def resolve_connect_function(spec: Optional[str] = None) -> Callable:
+    """pyodbc.connect, or the 'module:callable' named by spec (default: $XML_EXTRACTOR_DB_CONNECT_FACTORY)."""
+    spec = spec or os.environ.get(CONNECT_FACTORY_ENV)
+    if not spec:
+        return pyodbc.connect
+    factory = _connect_factories.get(spec)
+    if factory is None:
+        module_name, _, attribute = spec.partition(':')
+        factory = _connect_factories[spec] = getattr(importlib.import_module(module_name), attribute or 'connect')
+    return factory
+
+
 class MigrationEngine(MigrationEngineInterface):
     """
     High-Performance Database Migration Engine for Contract-Driven Data Pipeline.
@@ -142,6 +164,11 @@ class MigrationEngine(MigrationEngineInterface):
         self.duplicate_detector = DuplicateContactDetector(self.get_connection, self.logger)
         self.insert_strategy = BulkInsertStrategy(self.batch_size, self.logger)
         
+        # Optional {stage: seconds} accumulator for per-stage latency (set per app by workers)
+        self.stage_timings: Optional[Dict[str, float]] = None
+        # Optional {table: 'fast' | 'fallback' | 'mixed'} insert path record (set per app by workers)
+        self.insert_paths: Optional[Dict[str, str]] = None
+        
         # Progress tracking
         self._total_records = 0
         self._processed_records = 0
@@ -212,7 +239,7 @@ class MigrationEngine(MigrationEngineInterface):
         """
         connection = None
         try:
-            connection = pyodbc.connect(
+            connection = resolve_connect_function()(
                 self.connection_string,
                 autocommit=False,  # Explicit transaction control for atomic operations
                 timeout=30
@@ -342,6 +369,10 @@ class MigrationEngine(MigrationEngineInterface):
         # Get schema-qualified table name
         qualified_table_name = self._get_qualified_table_name(table_name)
         
+        timings = self.stage_timings
+        if timings is not None:
+            stage_start = time.perf_counter()
+        
         # Step 1: Filter duplicate records using injected detector
         # If caller provided a shared connection, prefer that to avoid extra connections/round-trips
         try:
@@ -349,6 +380,9 @@ class MigrationEngine(MigrationEngineInterface):
         except TypeError:
             # Backward compatibility: if detector doesn't accept connection arg, call old way
             records = self.duplicate_detector.filter_duplicates(records, table_name, qualified_table_name)
+        if timings is not None:
+            filtered_at = time.perf_counter()
+            timings['duplicate_detection'] = timings.get('duplicate_detection', 0.0) + (filtered_at - stage_start)
         if not records:
             self.logger.warning(f"No records remain for bulk insert into {table_name} after filtering.")
             return 0
@@ -357,9 +391,13 @@ class MigrationEngine(MigrationEngineInterface):
         if connection is not None:
             # Caller is managing the transaction - just do the insert
             cursor = connection.cursor()
-            return self.insert_strategy.insert(
+            result = self.insert_strategy.insert(
                 cursor, records, table_name, qualified_table_name, enable_identity_insert
             )
+            if timings is not None:
+                timings[f'insert.{table_name}'] = timings.get(f'insert.{table_name}', 0.0) + (time.perf_counter() - filtered_at)
+            self._record_insert_path(table_name)
+            return result
         else:
             # We manage the connection and transaction
             with self.get_connection() as conn:
@@ -368,8 +406,21 @@ class MigrationEngine(MigrationEngineInterface):
                     cursor, records, table_name, qualified_table_name, enable_identity_insert
                 )
                 conn.commit()  # Commit after successful insert
+                self._record_insert_path(table_name)
                 return result
     
+    def _record_insert_path(self, table_name: str) -> None:
+        """Note whether the last insert used fast_executemany, the row-by-row fallback, or both."""
+        if self.insert_paths is None:
+            return
+        batches = getattr(self.insert_strategy, '_last_batch_info_list', None) or []
+        if not batches:
+            return
+        fast_batches = sum(1 for batch in batches if batch.get('used_fast_path'))
+        path = 'fast' if fast_batches == len(batches) else ('fallback' if fast_batches == 0 else 'mixed')
+        previous = self.insert_paths.get(table_name)
+        self.insert_paths[table_name] = path if previous in (None, path) else 'mixed'
+    
     def track_progress(self, processed_count: int, total_count: int) -> None:
         """
         Track and report processing progress with performance metrics.
@@ -63,7 +63,7 @@ import logging
 import re
 from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
-from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+from decimal import InvalidOperation
 
 from ..interfaces import DataMapperInterface
 from ..models import MappingContract, FieldMapping
@@ -72,6 +72,8 @@ from ..validation.element_filter import ElementFilter
 from ..utils import StringUtils
 from ..config.config_manager import get_config_manager
 from .calculated_field_engine import CalculatedFieldEngine
+from .lookup_tables import MISSING, build_enum_lookup, build_char_to_bit_lookup, build_boolean_to_bit_lookup
+from . import type_kernels
 
 
 class DataMapper(DataMapperInterface):
@@ -125,6 +127,34 @@ class DataMapper(DataMapperInterface):
     - No default values are injected - only explicitly mapped data is processed
     """
     
+    @property
+    def _enum_mappings(self) -> Dict[str, Dict[str, int]]:
+        """Enum maps from the contract (enum_type -> value -> code)."""
+        return self._enum_mappings_source
+    
+    @_enum_mappings.setter
+    def _enum_mappings(self, enum_mappings: Dict[str, Dict[str, int]]) -> None:
+        # Rebuild the folded lookup tables whenever the maps are replaced
+        self._enum_mappings_source = enum_mappings
+        self._enum_lookup_tables = {
+            enum_type: build_enum_lookup(enum_map)
+            for enum_type, enum_map in (enum_mappings or {}).items()
+        }
+        self._enum_lookup_by_name = {}
+        self._enum_lookup_by_column = {}
+    
+    @property
+    def _bit_conversions(self) -> Dict[str, Dict[str, int]]:
+        """Bit conversion maps from the contract (char_to_bit / boolean_to_bit)."""
+        return self._bit_conversions_source
+    
+    @_bit_conversions.setter
+    def _bit_conversions(self, bit_conversions: Dict[str, Dict[str, int]]) -> None:
+        self._bit_conversions_source = bit_conversions
+        bit_conversions = bit_conversions or {}
+        self._char_to_bit_lookup = build_char_to_bit_lookup(bit_conversions.get('char_to_bit'))
+        self._boolean_to_bit_lookup = build_boolean_to_bit_lookup(bit_conversions.get('boolean_to_bit'))
+    
     def __init__(self, mapping_contract_path: Optional[str] = None, log_level: str = "ERROR"):
         """
         Initialize the DataMapper with centralized configuration and mapping contract loading.
@@ -188,15 +218,13 @@ class DataMapper(DataMapperInterface):
         
         self._validation_rules = {}
         
-        # Pre-compile regex for datetime correction
-        # Note: The 'numbers_only' regex is already cached in StringUtils._regex_cache,
-        # so we only need to cache the datetime pattern here
-        self._regex_invalid_datetime_seconds = re.compile(r'(\d{4}-\d{1,2}-\d{1,2} \d{1,2}:\d{1,2}:)(\d{2})(\.\d+)?')
-        
         # Build enum_type cache at initialization
         # Pre-compute all column name -> enum_type mappings to avoid repeated pattern matching
         self._enum_type_cache = self._build_enum_type_cache()
         
+        # Resolve enum type + folded lookup table once per contract enum mapping
+        self._resolve_contract_enum_lookups()
+        
         # Build contact type configuration cache at initialization
         # Extract valid contact type attribute name and values from contract
         self._valid_contact_type_config = self._get_element_type_filters('contact', return_mode='all')
@@ -271,6 +299,47 @@ class DataMapper(DataMapperInterface):
         self.logger.debug(f"Built enum_type cache with {len(cache)} entries")
         return cache
     
+    def _resolve_contract_enum_lookups(self) -> None:
+        """
+        Resolve enum_type and its lookup table for every enum mapping in the contract.
+        
+        PERFORMANCE TUNING:
+        _apply_enum_mapping then needs one dict probe to get (enum_type, lookup) for a mapping
+        instead of re-running enum_name/_determine_enum_type resolution per value. Mappings not
+        seen here (ad-hoc FieldMappings) are resolved on first use and cached the same way.
+        """
+        try:
+            contract = self._config_manager.load_mapping_contract(self._mapping_contract_path)
+        except Exception as e:
+            self.logger.debug(f"Enum lookups not pre-resolved (contract unavailable): {e}")
+            return
+        
+        resolved = 0
+        for mapping in getattr(contract, 'mappings', None) or []:
+            if mapping.mapping_type and 'enum' in mapping.mapping_type:
+                self._get_enum_lookup(mapping)
+                resolved += 1
+        self.logger.debug(f"Pre-resolved enum lookups for {resolved} mappings")
+    
+    def _get_enum_lookup(self, mapping: FieldMapping) -> Tuple[Optional[str], Any]:
+        """
+        Get (enum_type, CaseFoldedLookup or None) for a mapping, resolving it on first use.
+        
+        Explicit enum_name takes priority over the column name convention.
+        """
+        enum_name = getattr(mapping, 'enum_name', None)
+        if enum_name:
+            cache, key = self._enum_lookup_by_name, enum_name
+        else:
+            cache, key = self._enum_lookup_by_column, mapping.target_column
+        
+        entry = cache.get(key)
+        if entry is None:
+            enum_type = enum_name or self._determine_enum_type(mapping.target_column)
+            entry = (enum_type, self._enum_lookup_tables.get(enum_type) if enum_type else None)
+            cache[key] = entry
+        return entry
+    
     def _build_element_name_cache(self) -> Dict[str, str]:
         """
         Pre-build cache of child_table -> XML element name mappings from mapping contract.
@@ -1538,11 +1607,11 @@ class DataMapper(DataMapperInterface):
 
         The mapping process:
         1. Convert input value to string and strip whitespace
-        2. Determine enum_type from column name using pattern matching
-        3. Look up the enum_type in _enum_mappings (loaded from contract configuration)
-        4. Try exact match first, then case-insensitive match
-        5. Use default value from enum map if available (key='')
-        6. Return None if no valid mapping found (column excluded from INSERT)
+        2. Determine enum_type from enum_name or column name (resolved once per mapping)
+        3. Look up the value in the enum_type's precomputed lookup table, which resolves
+           exact match first, then case-insensitive match, in a single probe
+        4. Use default value from enum map if available (key='')
+        5. Return None if no valid mapping found (column excluded from INSERT)
 
         Args:
             value: Input value to be mapped (typically string from XML)
@@ -1558,38 +1627,20 @@ class DataMapper(DataMapperInterface):
         
         str_value = str(value).strip() if value is not None else ''
 
-        # Determine enum type: explicit enum_name takes priority over column name convention
-        if getattr(mapping, 'enum_name', None):
-            enum_type = mapping.enum_name
-        else:
-            enum_type = self._determine_enum_type(mapping.target_column)
-        
-        # Contract guarantee: Enum mapping exists for this target_column (validated at startup)
+        # Enum type and folded lookup table are resolved once per mapping (see _get_enum_lookup)
         # Note: enum_type can be None if column name doesn't match any pattern
-        if not enum_type or enum_type not in self._enum_mappings:
-            # No enum mapping available - handle as data issue below
-            enum_map = None
-        else:
-            enum_map = self._enum_mappings[enum_type]
-        
-        # If enum mapping exists, try to find a match
-        if enum_map:
-            # Try exact match first
-            if str_value in enum_map:
-                result = enum_map[str_value]
-                self.logger.debug(f"Enum mapping success: '{str_value}' -> {result}")
+        enum_type, enum_lookup = self._get_enum_lookup(mapping)
+        
+        # If enum mapping exists, resolve exact / case-insensitive match in one probe
+        if enum_lookup is not None:
+            result = enum_lookup.get(str_value)
+            if result is not MISSING:
                 return result
             
-            # Try case-insensitive match
-            for key, enum_value in enum_map.items():
-                if key.upper() == str_value.upper():
-                    self.logger.debug(f"Enum mapping success (case-insensitive): '{str_value}' -> {enum_value}")
-                    return enum_value
-            
             # Use default value if available
-            if '' in enum_map:
+            if enum_lookup.has_default:
                 self.logger.warning(f"Using default enum value for unmapped '{str_value}' in {enum_type}")
-                return enum_map['']
+                return enum_lookup.default
         
         # DATA ISSUE: No valid mapping for this value
         # CRITICAL FIX (DQ3): Check if this is a required (NOT NULL) enum field
@@ -2631,26 +2682,14 @@ class DataMapper(DataMapperInterface):
         """Apply bit conversion transformation using loaded bit conversions."""
         str_value = str(value).strip() if value is not None else ''
         
-        # Use char_to_bit conversion from loaded configuration
-        if 'char_to_bit' in self._bit_conversions:
-            bit_map = self._bit_conversions['char_to_bit']
-            
-            # Try exact match first
-            if str_value in bit_map:
-                result = bit_map[str_value]
-                self.logger.debug(f"Bit conversion: '{str_value}' -> {result}")
-                return result
-            
-            # Try case-insensitive match (uppercase)
-            upper_value = str_value.upper()
-            if upper_value in bit_map:
-                result = bit_map[upper_value]
-                self.logger.debug(f"Bit conversion (case-insensitive): '{str_value}' -> {result}")
+        # char_to_bit table resolves exact match, then upper-cased match, in one probe
+        if self._char_to_bit_lookup is not None:
+            result = self._char_to_bit_lookup.get(str_value)
+            if result is not MISSING:
                 return result
         
         # If no match and empty/null value, return the mapped default (which is 0 in char_to_bit)
-        if str_value in ['', 'null', 'None']:
-            self.logger.debug(f"Bit conversion: '{str_value}' (empty/null) -> 0 (default)")
+        if str_value in ('', 'null', 'None'):
             return 0
         
         # Default fallback
@@ -2659,23 +2698,20 @@ class DataMapper(DataMapperInterface):
     
     def _apply_boolean_to_bit_conversion(self, value):
         """Apply boolean to bit conversion transformation using loaded bit conversions."""
-        str_value = str(value).strip().lower() if value is not None else ''
+        str_value = str(value).strip() if value is not None else ''
         
-        # Use boolean_to_bit conversion from loaded configuration
-        if 'boolean_to_bit' in self._bit_conversions:
-            bit_map = self._bit_conversions['boolean_to_bit']
-            if str_value in bit_map:
-                result = bit_map[str_value]
-                self.logger.debug(f"Boolean-to-bit conversion: '{value}' -> {result}")
+        # boolean_to_bit table is keyed by lower-cased value
+        if self._boolean_to_bit_lookup is not None:
+            result = self._boolean_to_bit_lookup.get(str_value)
+            if result is not MISSING:
                 return result
             
             # If empty/null value, return the mapped default (which is 0 in boolean_to_bit)
-            if str_value in ['', 'null', 'none']:
-                self.logger.debug(f"Boolean-to-bit conversion: '{value}' (empty/null) -> 0 (default)")
+            if str_value.lower() in ('', 'null', 'none'):
                 return 0
         
         # Default fallback
-        self.logger.warning(f"No boolean_to_bit conversion found for value '{str_value}' - using default 0")
+        self.logger.warning(f"No boolean_to_bit conversion found for value '{str_value.lower()}' - using default 0")
         return 0
     
     def _apply_bit_conversion_with_default_tracking(self, value):
@@ -2715,7 +2751,7 @@ class DataMapper(DataMapperInterface):
         if not StringUtils.safe_string_check(value):
             return None
             
-        return StringUtils.extract_numeric_value(value)
+        return type_kernels.extract_numeric(value)
     
     def _extract_numeric_value_preserving_decimals(self, value):
         """
@@ -2726,7 +2762,7 @@ class DataMapper(DataMapperInterface):
         if not StringUtils.safe_string_check(value):
             return None
             
-        return StringUtils.extract_numeric_value_preserving_decimals(value)
+        return type_kernels.extract_numeric_preserving_decimals(value)
     
     def _transform_to_string(self, value, max_length):
         """Transform value to string with length limit."""
@@ -2744,9 +2780,8 @@ class DataMapper(DataMapperInterface):
                     return None
                 # Remove common thousands separators
                 value = value.replace(",", "")
-            # Use decimal for proper rounding (round half up)
-            val = Decimal(str(value)).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
-            return int(val)
+            # Use decimal for proper rounding (round half up) - memoized per distinct string
+            return type_kernels.quantize_integer(str(value))
         except (InvalidOperation, ValueError, TypeError) as e:
             self.logger.warning(f"Failed to convert '{value}' to integer: {e}")
             return None
@@ -2764,8 +2799,7 @@ class DataMapper(DataMapperInterface):
             if precision is None:
                 precision = 2
             # Use decimal.Decimal for proper rounding (round half up, not banker's rounding)
-            val = Decimal(str(value)).quantize(Decimal('0.' + '0' * precision), rounding=ROUND_HALF_UP)
-            return float(val)
+            return type_kernels.quantize_decimal(str(value), precision)
         except (ValueError, TypeError) as e:
             self.logger.warning(f"Decimal conversion failed for '{value}': {e}")
             return None  # Return None instead of 0.00 for invalid values
@@ -2780,8 +2814,7 @@ class DataMapper(DataMapperInterface):
             if str(value).strip() == '':
                 return None
             # Use decimal.Decimal for proper rounding (round half up, not banker's rounding)
-            val = Decimal(str(value)).quantize(Decimal('0.' + '0' * precision), rounding=ROUND_HALF_UP)
-            return float(val)
+            return type_kernels.quantize_decimal(str(value), precision)
         except (ValueError, TypeError) as e:
             self.logger.warning(f"Decimal conversion failed for '{value}' with precision {precision}: {e}")
             return None  # Return None instead of 0.00 for invalid values
@@ -2792,32 +2825,15 @@ class DataMapper(DataMapperInterface):
             # Return None - let the mapping contract default system handle missing values
             return None
         
+        # Strings go through the memoized kernel: known Provenir formats in fixed order
+        # (compiled once), then ISO 8601
+        if isinstance(value, str):
+            result = type_kernels.parse_datetime(value)
+            if result is None:
+                self.logger.warning(f"DateTime conversion failed for '{value}': no matching format")
+            return result
+        
         try:
-            # Handle various datetime formats
-            if isinstance(value, str):
-                # Clean up invalid datetime components first
-                cleaned_value = self._clean_datetime_string(value)
-                if not cleaned_value:
-                    return None
-                
-                # Try common formats including the specific format from the XML
-                formats_to_try = [
-                    '%Y-%m-%d %H:%M:%S.%f',  # 2023-10-3 16:26:23.886
-                    '%Y-%m-%d %H:%M:%S',     # 2023-10-3 16:26:23
-                    '%Y-%m-%d',              # 2023-10-3
-                    '%m/%d/%Y',              # 10/3/2023
-                    '%m/%d/%Y %H:%M:%S',     # 10/3/2023 16:26:23
-                    '%m/%d/%Y %I:%M:%S %p',  # 4/2/2020 5:53:20 AM
-                    '%d/%m/%Y',              # 14/12/1988 (UK/Intl)
-                    '%d/%m/%Y %H:%M:%S',     # 14/12/1988 16:26:23
-                ]
-                
-                for fmt in formats_to_try:
-                    try:
-                        return datetime.strptime(cleaned_value, fmt)
-                    except ValueError:
-                        continue
-                        
             return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
         except Exception as e:
             self.logger.warning(f"DateTime conversion failed for '{value}': {e}")
@@ -2830,23 +2846,8 @@ class DataMapper(DataMapperInterface):
             return None
         
         try:
-            # Handle invalid seconds (like 88 seconds)
-            # PERFORMANCE TUNING (Phase 1): Use pre-compiled regex
-            match = self._regex_invalid_datetime_seconds.match(datetime_str)
-            
-            if match:
-                prefix = match.group(1)  # "2024-8-8 8:08:"
-                seconds = int(match.group(2))  # 88
-                milliseconds = match.group(3) or ""  # ".008"
-                
-                # Fix invalid seconds (clamp to 59)
-                if seconds > 59:
-                    seconds = 59
-                    self.logger.debug(f"Fixed invalid seconds in datetime: {datetime_str}")
-                
-                return f"{prefix}{seconds:02d}{milliseconds}"
-            
-            return datetime_str
+            # Handle invalid seconds (like 88 seconds) - clamp to 59
+            return type_kernels.clean_datetime_string(datetime_str)
             
         except Exception as e:
             self.logger.warning(f"Error cleaning datetime string '{datetime_str}': {e}")
@@ -2945,8 +2946,7 @@ class DataMapper(DataMapperInterface):
                     if value is not None and mapping.data_type and mapping.data_type == 'decimal' and mapping.data_length is not None:
                         try:
                             # Use decimal for proper rounding (round half up, not banker's rounding)
-                            val = Decimal(str(value)).quantize(Decimal('0.' + '0' * mapping.data_length), rounding=ROUND_HALF_UP)
-                            return float(val)
+                            return type_kernels.quantize_decimal(str(value), mapping.data_length)
                         except Exception:
                             return value
                     return value
@@ -3088,9 +3088,7 @@ class DataMapper(DataMapperInterface):
                     value = selected_address.get(mapping.xml_attribute)
                     if value is not None and mapping.data_type == 'decimal' and mapping.data_length is not None:
                         try:
-                            from decimal import Decimal, ROUND_HALF_UP
-                            val = Decimal(str(value)).quantize(Decimal('0.' + '0' * mapping.data_length), rounding=ROUND_HALF_UP)
-                            return float(val)
+                            return type_kernels.quantize_decimal(str(value), mapping.data_length)
                         except Exception:
                             return value
                     return value
@@ -3189,6 +3187,10 @@ class DataMapper(DataMapperInterface):
         """Get transformation statistics."""
         return self._transformation_stats
     
+    def get_conversion_cache_stats(self):
+        """Get hit/miss counters of the memoized type-conversion kernels."""
+        return type_kernels.get_kernel_cache_stats()
+    
     def get_validation_errors(self):
         """Get validation errors."""
         return self._validation_errors 
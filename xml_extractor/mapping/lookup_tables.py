@@ -0,0 +1,120 @@
+"""
+Precomputed case-folded lookup tables for enum and bit conversions.
+
+DataMapper resolves enum values with an exact match, then a case-insensitive scan over the
+enum map, then the '' default; char_to_bit tries an exact match then the upper-cased value.
+Doing that per value costs a scan per miss. These tables are built once per map so a lookup
+is a single probe on the folded value while returning exactly what the original resolution
+order would have returned.
+
+Folded keys where an exact match would disagree with the case-insensitive result (e.g. a map
+with both 'y' and 'Y' pointing at different codes) are kept aside and resolved with an extra
+exact probe; contracts in practice have none, so the hot path stays one probe.
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+
+class _Missing:
+    """Sentinel for 'no mapping' (distinct from a mapped None)."""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+class CaseFoldedLookup:
+    """Single-probe lookup of a string value against a precomputed folded table."""
+
+    __slots__ = ('_fold', '_table', '_ambiguous', '_exact', 'has_default', 'default')
+
+    def __init__(self, fold: Callable[[str], str], table: Dict[str, Any], ambiguous: Dict[str, Any],
+                 exact: Dict[str, Any], default: Any = MISSING):
+        self._fold = fold
+        self._table = table
+        self._ambiguous = ambiguous
+        self._exact = exact
+        self.has_default = default is not MISSING
+        self.default = default
+
+    def __len__(self) -> int:
+        return len(self._table) + len(self._ambiguous)
+
+    def get(self, str_value: str) -> Any:
+        """
+        Resolve a (stripped) string value.
+
+        Returns:
+            Mapped value, or MISSING when neither an exact nor a case-insensitive key matches.
+            The map's default (if any) is not applied here so callers can log its use.
+        """
+        folded = self._fold(str_value)
+        result = self._table.get(folded, MISSING)
+        if result is MISSING and self._ambiguous and folded in self._ambiguous:
+            result = self._exact.get(str_value, MISSING)
+            if result is MISSING:
+                result = self._ambiguous[folded]
+        return result
+
+
+def _build(source: Dict[str, Any], fold: Callable[[str], str],
+           resolve_folded: Callable[[str], Any], exact_first: bool, default: Any = MISSING) -> CaseFoldedLookup:
+    """
+    Materialize a folded table for a str -> value map.
+
+    Args:
+        source: Original map from the contract
+        fold: Normalization applied to the probe value (str.upper / str.lower)
+        resolve_folded: Result for a value that is not an exact key, given its folded form
+        exact_first: Whether an exact key match takes priority over the folded resolution
+        default: Value returned by callers on MISSING (exposed, not applied)
+    """
+    keys_by_fold: Dict[str, list] = {}
+    for key in source:
+        keys_by_fold.setdefault(fold(key), []).append(key)
+
+    table: Dict[str, Any] = {}
+    ambiguous: Dict[str, Any] = {}
+    for folded, keys in keys_by_fold.items():
+        folded_result = resolve_folded(folded)
+        if exact_first and any(source[key] != folded_result for key in keys):
+            ambiguous[folded] = folded_result
+        elif folded_result is not MISSING:
+            table[folded] = folded_result
+
+    return CaseFoldedLookup(fold, table, ambiguous, dict(source) if ambiguous else {}, default)
+
+
+def build_enum_lookup(enum_map: Optional[Dict[str, Any]]) -> Optional[CaseFoldedLookup]:
+    """
+    Build the lookup for an enum map: exact key, else first key equal ignoring case, else '' default.
+
+    Returns:
+        CaseFoldedLookup, or None for a missing/empty map (treated as 'no enum mapping')
+    """
+    if not enum_map:
+        return None
+
+    first_by_upper: Dict[str, Any] = {}
+    for key, enum_value in enum_map.items():
+        first_by_upper.setdefault(key.upper(), enum_value)
+
+    return _build(enum_map, str.upper, lambda folded: first_by_upper.get(folded, MISSING),
+                  exact_first=True, default=enum_map.get('', MISSING))
+
+
+def build_char_to_bit_lookup(bit_map: Optional[Dict[str, Any]]) -> Optional[CaseFoldedLookup]:
+    """Build the char_to_bit lookup: exact key, else the upper-cased value as a key."""
+    if not bit_map:
+        return None
+    return _build(bit_map, str.upper, lambda folded: bit_map.get(folded, MISSING), exact_first=True, default=0)
+
+
+def build_boolean_to_bit_lookup(bit_map: Optional[Dict[str, Any]]) -> Optional[CaseFoldedLookup]:
+    """Build the boolean_to_bit lookup: the lower-cased value as a key (no exact step)."""
+    if not bit_map:
+        return None
+    return _build(bit_map, str.lower, lambda folded: bit_map.get(folded, MISSING), exact_first=False, default=0)
@@ -0,0 +1,258 @@
+"""
+Memoized type-conversion kernels for DataMapper.
+
+The same small set of strings (app_receive_date values, repeated amounts, 'Up to $40' style
+income bands) is converted over and over across apps. These kernels are pure functions of
+the input string, so each is wrapped in a bounded LRU cache:
+
+- parse_datetime: fixed-order Provenir date formats, compiled once into regexes that mirror
+  datetime.strptime exactly (same field patterns, same first-match-wins order)
+- quantize_decimal / quantize_integer: Decimal ROUND_HALF_UP quantization
+- extract_numeric / extract_numeric_preserving_decimals: StringUtils extraction rules
+- convert_column: converts a whole column at once, each distinct value converted only once
+
+Only str inputs are cached (everything else goes straight through), and results are
+immutable (datetime, float, int), so sharing them between records is safe.
+"""
+
+import re
+
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..utils import StringUtils
+
+
+# Bounded per kernel; distinct values per column are small, so this covers a whole run
+KERNEL_CACHE_SIZE = 8192
+
+# Invalid seconds like '2024-8-8 8:08:88' are clamped to 59 before parsing
+_INVALID_SECONDS = re.compile(r'(\d{4}-\d{1,2}-\d{1,2} \d{1,2}:\d{1,2}:)(\d{2})(\.\d+)?')
+
+# Field patterns identical to _strptime.TimeRE so matches agree with datetime.strptime
+_FIELD_PATTERNS = {
+    'Y': r'(?P<Y>\d\d\d\d)',
+    'm': r'(?P<m>1[0-2]|0[1-9]|[1-9])',
+    'd': r'(?P<d>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])',
+    'H': r'(?P<H>2[0-3]|[0-1]\d|\d)',
+    'M': r'(?P<M>[0-5]\d|\d)',
+    'S': r'(?P<S>6[0-1]|[0-5]\d|\d)',
+    'f': r'(?P<f>[0-9]{1,6})',
+    'I': r'(?P<I>1[0-2]|0[1-9]|[1-9])',
+    'p': r'(?P<p>am|pm)',
+}
+
+# Known Provenir date formats, tried in this order (first successful parse wins)
+DATETIME_FORMATS = (
+    '%Y-%m-%d %H:%M:%S.%f',  # 2023-10-3 16:26:23.886
+    '%Y-%m-%d %H:%M:%S',     # 2023-10-3 16:26:23
+    '%Y-%m-%d',              # 2023-10-3
+    '%m/%d/%Y',              # 10/3/2023
+    '%m/%d/%Y %H:%M:%S',     # 10/3/2023 16:26:23
+    '%m/%d/%Y %I:%M:%S %p',  # 4/2/2020 5:53:20 AM
+    '%d/%m/%Y',              # 14/12/1988 (UK/Intl)
+    '%d/%m/%Y %H:%M:%S',     # 14/12/1988 16:26:23
+)
+
+
+def _compile_format(fmt: str) -> 're.Pattern':
+    """Translate a strptime format into the regex strptime itself would build."""
+    pattern = []
+    i = 0
+    while i < len(fmt):
+        char = fmt[i]
+        if char == '%':
+            pattern.append(_FIELD_PATTERNS[fmt[i + 1]])
+            i += 2
+            continue
+        pattern.append(r'\s+' if char.isspace() else re.escape(char))
+        i += 1
+    return re.compile(''.join(pattern), re.IGNORECASE)
+
+
+_COMPILED_FORMATS = tuple(_compile_format(fmt) for fmt in DATETIME_FORMATS)
+
+
+def _build_datetime(fields: Dict[str, Optional[str]]) -> datetime:
+    """Build a datetime from matched fields the way strptime does (raises ValueError if invalid)."""
+    hour = 0
+    if fields.get('H') is not None:
+        hour = int(fields['H'])
+    elif fields.get('I') is not None:
+        hour = int(fields['I'])
+        if fields['p'].lower() == 'pm':
+            hour = 12 if hour == 12 else hour + 12
+        elif hour == 12:
+            hour = 0
+    fraction = fields.get('f')
+    microsecond = int(fraction + '0' * (6 - len(fraction))) if fraction else 0
+    return datetime(
+        int(fields['Y']), int(fields['m']), int(fields['d']),
+        hour, int(fields.get('M') or 0), int(fields.get('S') or 0), microsecond
+    )
+
+
+def clean_datetime_string(datetime_str: str) -> str:
+    """Clamp invalid seconds (e.g. 88 -> 59) in 'Y-M-D H:M:S[.f]' strings."""
+    match = _INVALID_SECONDS.match(datetime_str)
+    if match:
+        seconds = min(int(match.group(2)), 59)
+        return f"{match.group(1)}{seconds:02d}{match.group(3) or ''}"
+    return datetime_str
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def parse_datetime(value: str) -> Optional[datetime]:
+    """
+    Parse a datetime string using the known formats, then ISO 8601 as a fallback.
+
+    Returns:
+        datetime, or None if no format matches
+    """
+    cleaned_value = clean_datetime_string(value)
+    if cleaned_value:
+        for compiled in _COMPILED_FORMATS:
+            match = compiled.match(cleaned_value)
+            if match is None or match.end() != len(cleaned_value):
+                continue
+            try:
+                return _build_datetime(match.groupdict())
+            except ValueError:
+                continue
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+_QUANTIZERS: Dict[int, Decimal] = {}
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def quantize_decimal(str_value: str, precision: int) -> float:
+    """
+    Round a numeric string half-up to `precision` places.
+
+    Raises:
+        decimal.InvalidOperation / ValueError for non-numeric input (not cached)
+    """
+    quantizer = _QUANTIZERS.get(precision)
+    if quantizer is None:
+        quantizer = _QUANTIZERS.setdefault(precision, Decimal('0.' + '0' * precision))
+    return float(Decimal(str_value).quantize(quantizer, rounding=ROUND_HALF_UP))
+
+
+_INTEGER_QUANTIZER = Decimal('1')
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def quantize_integer(str_value: str) -> int:
+    """
+    Round a numeric string half-up to an integer.
+
+    Raises:
+        decimal.InvalidOperation / ValueError for non-numeric input (not cached)
+    """
+    return int(Decimal(str_value).quantize(_INTEGER_QUANTIZER, rounding=ROUND_HALF_UP))
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def _extract_numeric_cached(text: str) -> Optional[int]:
+    return StringUtils.extract_numeric_value(text)
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def _extract_numeric_preserving_decimals_cached(text: str) -> Optional[float]:
+    return StringUtils.extract_numeric_value_preserving_decimals(text)
+
+
+def extract_numeric(text: Any) -> Optional[int]:
+    """Memoized StringUtils.extract_numeric_value for str input."""
+    if isinstance(text, str):
+        return _extract_numeric_cached(text)
+    return StringUtils.extract_numeric_value(text)
+
+
+def extract_numeric_preserving_decimals(text: Any) -> Optional[float]:
+    """Memoized StringUtils.extract_numeric_value_preserving_decimals for str input."""
+    if isinstance(text, str):
+        return _extract_numeric_preserving_decimals_cached(text)
+    return StringUtils.extract_numeric_value_preserving_decimals(text)
+
+
+_KERNELS = {
+    'parse_datetime': parse_datetime,
+    'quantize_decimal': quantize_decimal,
+    'quantize_integer': quantize_integer,
+    'extract_numeric': _extract_numeric_cached,
+    'extract_numeric_preserving_decimals': _extract_numeric_preserving_decimals_cached,
+}
+
+
+def get_kernel_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss/size counters per kernel (for performance reporting)."""
+    stats = {}
+    for name, kernel in _KERNELS.items():
+        info = kernel.cache_info()
+        stats[name] = {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
+    return stats
+
+
+def clear_kernel_caches() -> None:
+    """Drop all memoized conversions."""
+    for kernel in _KERNELS.values():
+        kernel.cache_clear()
+
+
+_default_mapper = None
+
+
+def convert_column(values: Iterable[Any], target_type: str, precision: Optional[int] = None,
+                   mapper=None) -> List[Any]:
+    """
+    Convert a column of values to `target_type`, one conversion per distinct value.
+
+    Results match DataMapper.transform_data_types (or _transform_to_decimal_with_precision
+    when `precision` is given) applied value by value. Distinct values are keyed by
+    (type, value) so that 1, 1.0 and True are not conflated; unhashable values are
+    converted directly.
+
+    Args:
+        values: column values in row order
+        target_type: contract data_type (e.g. 'int', 'decimal', 'datetime', 'bit')
+        precision: decimal places for decimal columns, if the contract specifies one
+        mapper: DataMapper whose enum / bit configuration to use (a shared default if None)
+
+    Returns:
+        converted values, same length and order as `values`
+    """
+    if mapper is None:
+        global _default_mapper
+        if _default_mapper is None:
+            # Imported here: data_mapper imports this module
+            from .data_mapper import DataMapper
+            _default_mapper = DataMapper()
+        mapper = _default_mapper
+
+    if precision is not None:
+        def convert(value):
+            return mapper._transform_to_decimal_with_precision(value, precision)
+    else:
+        def convert(value):
+            return mapper.transform_data_types(value, target_type)
+
+    converted = {}
+    results = []
+    for value in values:
+        key = (value.__class__, value)
+        try:
+            hash(key)
+        except TypeError:
+            results.append(convert(value))
+            continue
+        if key not in converted:
+            converted[key] = convert(value)
+        results.append(converted[key])
+    return results
@@ -233,6 +233,8 @@ class ProcessingConfig:
         sql_server_connection_string: Connection string for SQL Server database
         enable_validation: Whether to enable data validation during processing
         checkpoint_interval: Interval for creating processing checkpoints
+        streaming_threshold_bytes: XML documents at or above this size are parsed with
+            iterparse and subtree clearing instead of a full tree (0 disables streaming)
     """
     batch_size: int = 1000
     parallel_processes: int = 4
@@ -241,6 +243,7 @@ class ProcessingConfig:
     sql_server_connection_string: str = ""
     enable_validation: bool = True
     checkpoint_interval: int = 50000
+    streaming_threshold_bytes: int = 1048576
     
     def __post_init__(self):
         """Validate processing configuration."""
@@ -250,6 +253,8 @@ class ProcessingConfig:
             raise ValueError("parallel_processes must be positive")
         if self.memory_limit_mb <= 0:
             raise ValueError("memory_limit_mb must be positive")
+        if self.streaming_threshold_bytes < 0:
+            raise ValueError("streaming_threshold_bytes cannot be negative")
 
 
 @dataclass
@@ -6,8 +6,27 @@ for benchmarking and production monitoring.
 """
 
 from .performance_monitor import PerformanceMonitor, PerformanceMetrics
+from .result_sink import AppResultSink, RunningAggregates, read_results
+from .latency_histogram import LatencyHistogram, StageHistograms
+from .openmetrics_exporter import LiveRunState, OpenMetricsExporter, render_openmetrics
+from .stage_profiler import StackSampler, ProfileAggregate
+from .slow_apps import SlowAppTracker
+from .memory_tracker import MemoryGrowthTracker, MemoryGrowthAggregate
 
 __all__ = [
     'PerformanceMonitor',
-    'PerformanceMetrics'
+    'PerformanceMetrics',
+    'AppResultSink',
+    'RunningAggregates',
+    'read_results',
+    'LatencyHistogram',
+    'StageHistograms',
+    'LiveRunState',
+    'OpenMetricsExporter',
+    'render_openmetrics',
+    'StackSampler',
+    'ProfileAggregate',
+    'SlowAppTracker',
+    'MemoryGrowthTracker',
+    'MemoryGrowthAggregate'
 ]
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Fixed-bucket latency histograms for per-stage timing.
+
+Averages hide the tail that matters for throughput (one slow insert holds a worker for the
+whole batch), so stage timings are recorded into HDR-style histograms instead:
+
+- Values are bucketed in microseconds: exact below 128us, then 64 linear sub-buckets per
+  power of two, so any reported value is within ~1.6% of the true one
+- Recording is an int conversion, a bit_length and a dict increment
+- Histograms merge by adding bucket counts, so per-batch histograms fold into a run total
+  (and results from any number of workers fold into a batch) without keeping samples
+
+StageHistograms groups one histogram per stage name ('validation', 'parsing', 'mapping',
+'duplicate_detection', 'insert.app_base', 'commit', 'source_fetch', ...) and reports
+count/mean/p50/p95/p99/max in milliseconds.
+"""
+
+import time
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+_SUB_BUCKET_BITS = 7
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS          # 128: values below this are exact
+_SUB_BUCKET_HALF = _SUB_BUCKET_COUNT >> 1          # 64 linear sub-buckets per power of two
+
+REPORTED_PERCENTILES = (50, 95, 99)
+
+
+def _bucket_index(micros: int) -> int:
+    if micros < _SUB_BUCKET_COUNT:
+        return micros
+    shift = micros.bit_length() - _SUB_BUCKET_BITS
+    return shift * _SUB_BUCKET_HALF + (micros >> shift)
+
+
+def _bucket_upper_micros(index: int) -> int:
+    """Highest value (in microseconds) that maps to a bucket."""
+    if index < _SUB_BUCKET_COUNT:
+        return index
+    shift = index // _SUB_BUCKET_HALF - 1
+    sub_bucket = index - shift * _SUB_BUCKET_HALF
+    return ((sub_bucket + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Mergeable latency histogram (seconds in, milliseconds out)."""
+
+    __slots__ = ('counts', 'count', 'total_seconds', 'max_seconds')
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float):
+        if seconds < 0:
+            seconds = 0.0
+        index = _bucket_index(int(seconds * 1_000_000))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        for index, bucket_count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + bucket_count
+        self.count += other.count
+        self.total_seconds += other.total_seconds
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+        return self
+
+    def percentile(self, percent: float) -> float:
+        """Value (seconds) at or below which `percent` of recordings fall; 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        target = max(1, -(-self.count * percent // 100))  # ceil without float error
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(_bucket_upper_micros(index) / 1_000_000, self.max_seconds)
+        return self.max_seconds
+
+    def cumulative_counts(self, bounds_seconds) -> list:
+        """Recordings at or below each bound (ascending), for Prometheus-style 'le' buckets."""
+        ordered = sorted(self.counts.items())
+        cumulative = []
+        seen = 0
+        position = 0
+        for bound in bounds_seconds:
+            limit = int(bound * 1_000_000)
+            while position < len(ordered) and _bucket_upper_micros(ordered[position][0]) <= limit:
+                seen += ordered[position][1]
+                position += 1
+            cumulative.append(seen)
+        return cumulative
+
+    def summary(self) -> Dict[str, Any]:
+        """count, mean and p50/p95/p99/max in milliseconds."""
+        result = {
+            'count': self.count,
+            'mean_ms': round(self.total_seconds / self.count * 1000, 3) if self.count else 0.0
+        }
+        for percent in REPORTED_PERCENTILES:
+            result[f'p{percent}_ms'] = round(self.percentile(percent) * 1000, 3)
+        result['max_ms'] = round(self.max_seconds * 1000, 3)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Lossless form for JSON (bucket counts keyed by index)."""
+        return {'counts': {str(k): v for k, v in self.counts.items()}, 'count': self.count,
+                'total_seconds': self.total_seconds, 'max_seconds': self.max_seconds}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        histogram = cls()
+        histogram.counts = {int(k): v for k, v in data.get('counts', {}).items()}
+        histogram.count = data.get('count', 0)
+        histogram.total_seconds = data.get('total_seconds', 0.0)
+        histogram.max_seconds = data.get('max_seconds', 0.0)
+        return histogram
+
+
+class StageHistograms:
+    """One LatencyHistogram per named stage."""
+
+    def __init__(self):
+        self.stages: Dict[str, LatencyHistogram] = {}
+
+    def record(self, stage: str, seconds: float):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def record_all(self, stage_times: Optional[Dict[str, float]]):
+        """Record one app's {stage: seconds} timings."""
+        if stage_times:
+            for stage, seconds in stage_times.items():
+                self.record(stage, seconds)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def merge(self, other: 'StageHistograms') -> 'StageHistograms':
+        for stage, histogram in other.stages.items():
+            existing = self.stages.get(stage)
+            if existing is None:
+                existing = self.stages[stage] = LatencyHistogram()
+            existing.merge(histogram)
+        return self
+
+    def __bool__(self) -> bool:
+        return bool(self.stages)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """{stage: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}} sorted by stage name."""
+        return {stage: self.stages[stage].summary() for stage in sorted(self.stages)}
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {stage: histogram.to_dict() for stage, histogram in self.stages.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict[str, Any]]) -> 'StageHistograms':
+        histograms = cls()
+        histograms.stages = {stage: LatencyHistogram.from_dict(h) for stage, h in data.items()}
+        return histograms
+
+    def format_table(self) -> str:
+        """Fixed-width table for logs/console."""
+        lines = [f"  {'Stage':28s} {'Count':>8s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}"]
+        for stage, stats in self.summary().items():
+            lines.append(f"  {stage:28s} {stats['count']:8d} {stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} "
+                         f"{stats['p99_ms']:9.1f} {stats['max_ms']:9.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,179 @@
+"""
+Opt-in memory growth tracking for worker processes.
+
+Long runs lose throughput without a confirmed cause (see
+performance_tuning/DEGRADATION_INVESTIGATION_LOG.md), and worker recycling hides leaks
+rather than locating them. With tracking on, each worker runs tracemalloc and every N apps:
+
+- diffs a snapshot against the previous one and against the worker's post-startup baseline,
+  grouped by allocation site (file:line), keeping the top growing sites
+- records RSS, traced memory and gc generation counts / collections
+
+The report rides back on that app's WorkResult (once every N apps, so IPC stays small) and
+the coordinator folds reports into a MemoryGrowthAggregate: per-worker trends plus run-wide
+top growing sites. RSS growth that tracemalloc does not account for ('untraced') points at
+native allocations (lxml trees, pyodbc buffers) rather than Python objects.
+
+tracemalloc slows allocation-heavy code noticeably; use it for diagnostic runs only.
+"""
+
+import gc
+import os
+import tracemalloc
+
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+
+DEFAULT_TOP_SITES = 10
+
+# Kept per worker in the run summary (oldest trend points are thinned out beyond this)
+_MAX_TREND_POINTS = 100
+
+_IGNORED_FILES = (tracemalloc.__file__, '<frozen importlib._bootstrap>', '<frozen importlib._bootstrap_external>', '<unknown>')
+
+
+def _mb(value: float) -> float:
+    return round(value / (1024 * 1024), 3)
+
+
+def _site_growth(current, previous, top_n: int) -> List[Dict[str, Any]]:
+    """Top allocation sites by growth between two snapshots."""
+    growth = []
+    for stat in current.compare_to(previous, 'lineno'):
+        if stat.size_diff <= 0:
+            continue
+        frame = stat.traceback[0]
+        growth.append({
+            'site': f"{frame.filename}:{frame.lineno}",
+            'size_diff_kb': round(stat.size_diff / 1024, 1),
+            'count_diff': stat.count_diff,
+            'size_kb': round(stat.size / 1024, 1)
+        })
+        if len(growth) >= top_n:
+            break
+    return growth
+
+
+class MemoryGrowthTracker:
+    """
+    Per-worker tracemalloc snapshots every N apps.
+
+    Usage (inside a worker):
+        tracker = MemoryGrowthTracker(every_n_apps=500).start()
+        ... after each app ...
+        report = tracker.after_app()   # None except every Nth app
+    """
+
+    def __init__(self, every_n_apps: int, top_n: int = DEFAULT_TOP_SITES, frames: int = 1):
+        self.every_n_apps = every_n_apps
+        self.top_n = top_n
+        self.frames = frames
+        self.apps_processed = 0
+        self._process = psutil.Process(os.getpid())
+        self._baseline = None
+        self._previous = None
+        self._baseline_rss = 0
+        self._baseline_traced = 0
+
+    def start(self) -> 'MemoryGrowthTracker':
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._baseline = self._previous = self._snapshot()
+        self._baseline_rss = self._process.memory_info().rss
+        self._baseline_traced = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_FILES]
+        )
+
+    def after_app(self) -> Optional[Dict[str, Any]]:
+        """Count one app; every N apps return a growth report (else None)."""
+        self.apps_processed += 1
+        if self._baseline is None or self.apps_processed % self.every_n_apps:
+            return None
+        snapshot = self._snapshot()
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        rss = self._process.memory_info().rss
+        report = {
+            'pid': self._process.pid,
+            'apps_processed': self.apps_processed,
+            'rss_mb': _mb(rss),
+            'rss_growth_mb': _mb(rss - self._baseline_rss),
+            'traced_mb': _mb(traced),
+            'traced_growth_mb': _mb(traced - self._baseline_traced),
+            'untraced_growth_mb': _mb((rss - self._baseline_rss) - (traced - self._baseline_traced)),
+            'traced_peak_mb': _mb(traced_peak),
+            'gc_counts': list(gc.get_count()),
+            'gc_collections': [generation['collections'] for generation in gc.get_stats()],
+            'gc_objects': len(gc.get_objects()),
+            'interval_growth': _site_growth(snapshot, self._previous, self.top_n),
+            'total_growth': _site_growth(snapshot, self._baseline, self.top_n)
+        }
+        self._previous = snapshot
+        return report
+
+
+class MemoryGrowthAggregate:
+    """Coordinator-side merge of worker reports: per-worker trends and run-wide top sites."""
+
+    def __init__(self, top_n: int = DEFAULT_TOP_SITES):
+        self.top_n = top_n
+        self.trends: Dict[int, List[Dict[str, Any]]] = {}
+        self.latest: Dict[int, Dict[str, Any]] = {}
+
+    def merge(self, report: Optional[Dict[str, Any]]):
+        if report is None:
+            return
+        pid = report['pid']
+        trend = self.trends.setdefault(pid, [])
+        trend.append({key: report[key] for key in ('apps_processed', 'rss_mb', 'traced_mb', 'untraced_growth_mb',
+                                                   'gc_counts', 'gc_collections', 'gc_objects')})
+        if len(trend) > _MAX_TREND_POINTS:
+            del trend[1::2]  # Keep the first point and every other one after it
+        self.latest[pid] = report
+
+    def __bool__(self) -> bool:
+        return bool(self.latest)
+
+    def top_sites(self) -> List[Dict[str, Any]]:
+        """Growth since each worker's baseline, summed across workers (latest report per worker)."""
+        size = Counter()
+        count = Counter()
+        workers = Counter()
+        for report in self.latest.values():
+            for site in report['total_growth']:
+                size[site['site']] += site['size_diff_kb']
+                count[site['site']] += site['count_diff']
+                workers[site['site']] += 1
+        return [
+            {'site': site, 'size_diff_kb': round(kb, 1), 'count_diff': count[site], 'workers': workers[site]}
+            for site, kb in size.most_common(self.top_n)
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'workers_reporting': len(self.latest),
+            'top_growing_sites': self.top_sites(),
+            'workers': {
+                str(pid): {
+                    'apps_processed': report['apps_processed'],
+                    'rss_growth_mb': report['rss_growth_mb'],
+                    'traced_growth_mb': report['traced_growth_mb'],
+                    'untraced_growth_mb': report['untraced_growth_mb'],
+                    'last_interval_growth': report['interval_growth'],
+                    'trend': self.trends[pid]
+                }
+                for pid, report in sorted(self.latest.items())
+            }
+        }
+
+    def format_top_sites(self) -> str:
+        lines = [f"  {'growth KB':>10s} {'objects':>9s} {'workers':>8s}  site"]
+        for site in self.top_sites():
+            lines.append(f"  {site['size_diff_kb']:10.1f} {site['count_diff']:9d} {site['workers']:8d}  {site['site']}")
+        return "\n".join(lines)
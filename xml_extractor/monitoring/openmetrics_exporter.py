@@ -0,0 +1,291 @@
+"""
+Live OpenMetrics exporter for production runs.
+
+During a run the only live signal used to be progress log lines. LiveRunState is fed by
+ParallelCoordinator as each app completes (in the coordinator process, so no extra IPC),
+and OpenMetricsExporter renders it on a background thread to either:
+
+- a textfile, rewritten atomically every interval (node_exporter textfile collector), or
+- a local HTTP endpoint (GET /metrics), rendered on demand
+
+The HTTP endpoint serves OpenMetrics text. The textfile uses classic Prometheus text naming
+(counter families declared as *_total, no # EOF), which is what the textfile collector
+parses. Each output keeps its own previous snapshot, so the per-interval rates of one are
+not cut short by renders for the other.
+
+Exposed series (prefix xml_extractor_):
+    apps_total{outcome}                  counter   completed apps by success/failed
+    app_failures_total{error_stage}      counter   failures by WorkResult.error_stage
+    rows_inserted_total{table}           counter   rows inserted per target table
+    apps_per_second / rows_per_second{table}  gauge  rate over the last render interval
+    stage_latency_seconds{stage}         histogram per-stage latency (validation, mapping, ...)
+    in_flight_apps / queued_apps         gauge     dispatched-but-unfinished / not yet dispatched
+    workers / worker_rss_bytes{pid}      gauge     live worker processes and their memory
+    worker_recycles_total{reason}        counter   worker replacements
+"""
+
+import logging
+import os
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+from .latency_histogram import StageHistograms
+
+
+METRIC_PREFIX = 'xml_extractor_'
+
+# 'le' bounds (seconds) published for stage histograms; the full-resolution buckets stay in metrics JSON
+LATENCY_BUCKETS_SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+DEFAULT_EXPORT_INTERVAL_SECONDS = 15.0
+
+
+class LiveRunState:
+    """Thread-safe running totals for the exporter, updated once per completed app."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.apps_by_outcome: Dict[str, int] = {'success': 0, 'failed': 0}
+        self.failures_by_stage: Dict[str, int] = {}
+        self.rows_by_table: Dict[str, int] = {}
+        self.stage_latency = StageHistograms()
+        self.load_provider: Optional[Callable[[], Dict[str, Any]]] = None
+        self.recycle_reasons_provider: Optional[Callable[[], Dict[str, int]]] = None
+
+    def record_result(self, success: bool, error_stage: Optional[str] = None,
+                      rows_by_table: Optional[Dict[str, int]] = None,
+                      stage_times: Optional[Dict[str, float]] = None):
+        with self._lock:
+            if success:
+                self.apps_by_outcome['success'] += 1
+            else:
+                self.apps_by_outcome['failed'] += 1
+                stage = error_stage or 'unknown'
+                self.failures_by_stage[stage] = self.failures_by_stage.get(stage, 0) + 1
+            if rows_by_table:
+                for table, rows in rows_by_table.items():
+                    self.rows_by_table[table] = self.rows_by_table.get(table, 0) + rows
+            self.stage_latency.record_all(stage_times)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-data copy of the state (histograms reduced to the published 'le' buckets)."""
+        with self._lock:
+            snapshot = {
+                'timestamp': time.time(),
+                'apps_by_outcome': dict(self.apps_by_outcome),
+                'failures_by_stage': dict(self.failures_by_stage),
+                'rows_by_table': dict(self.rows_by_table),
+                'stage_latency': {
+                    stage: {
+                        'buckets': histogram.cumulative_counts(LATENCY_BUCKETS_SECONDS),
+                        'count': histogram.count,
+                        'sum': histogram.total_seconds
+                    }
+                    for stage, histogram in sorted(self.stage_latency.stages.items())
+                }
+            }
+        load = self.load_provider() if self.load_provider else {}
+        snapshot['queued'] = load.get('queued', 0)
+        snapshot['in_flight'] = load.get('in_flight', 0)
+        snapshot['worker_rss'] = _worker_rss(load.get('worker_pids', []))
+        snapshot['recycle_reasons'] = self.recycle_reasons_provider() if self.recycle_reasons_provider else {}
+        return snapshot
+
+
+def _worker_rss(pids: List[int]) -> Dict[int, int]:
+    rss = {}
+    for pid in pids:
+        try:
+            rss[pid] = psutil.Process(pid).memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue  # Exited between listing and sampling
+    return rss
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+
+def render_openmetrics(snapshot: Dict[str, Any], previous: Optional[Dict[str, Any]] = None,
+                       const_labels: Optional[Dict[str, Any]] = None, prometheus_text: bool = False) -> str:
+    """
+    Render a LiveRunState snapshot in OpenMetrics text format.
+
+    Args:
+        snapshot: Current LiveRunState.snapshot()
+        previous: Previous snapshot (rates are computed over the gap; omitted when None)
+        const_labels: Labels added to every sample (e.g. session, instance)
+        prometheus_text: Classic Prometheus text exposition instead (counter families named
+                         *_total, no # EOF) for the node_exporter textfile collector
+    """
+    const_labels = dict(const_labels or {})
+    lines: List[str] = []
+
+    def family(name: str, metric_type: str, help_text: str):
+        if prometheus_text and metric_type == 'counter':
+            name += '_total'
+        lines.append(f"# TYPE {METRIC_PREFIX}{name} {metric_type}")
+        lines.append(f"# HELP {METRIC_PREFIX}{name} {help_text}")
+
+    def sample(name: str, value: Any, **labels):
+        lines.append(f"{METRIC_PREFIX}{name}{_labels({**const_labels, **labels})} {value}")
+
+    family('apps', 'counter', 'Applications completed')
+    for outcome, count in snapshot['apps_by_outcome'].items():
+        sample('apps_total', count, outcome=outcome)
+
+    family('app_failures', 'counter', 'Failed applications by error stage')
+    for stage, count in sorted(snapshot['failures_by_stage'].items()):
+        sample('app_failures_total', count, error_stage=stage)
+
+    family('rows_inserted', 'counter', 'Rows inserted by target table')
+    for table, rows in sorted(snapshot['rows_by_table'].items()):
+        sample('rows_inserted_total', rows, table=table)
+
+    if previous is not None:
+        elapsed = snapshot['timestamp'] - previous['timestamp']
+        if elapsed > 0:
+            apps_now = sum(snapshot['apps_by_outcome'].values())
+            apps_before = sum(previous['apps_by_outcome'].values())
+            family('apps_per_second', 'gauge', 'Applications completed per second over the last interval')
+            sample('apps_per_second', round((apps_now - apps_before) / elapsed, 3))
+            family('rows_per_second', 'gauge', 'Rows inserted per second over the last interval')
+            for table, rows in sorted(snapshot['rows_by_table'].items()):
+                rate = (rows - previous['rows_by_table'].get(table, 0)) / elapsed
+                sample('rows_per_second', round(rate, 3), table=table)
+
+    family('stage_latency_seconds', 'histogram', 'Per-application stage latency')
+    for stage, histogram in snapshot['stage_latency'].items():
+        for bound, cumulative in zip(LATENCY_BUCKETS_SECONDS, histogram['buckets']):
+            sample('stage_latency_seconds_bucket', cumulative, stage=stage, le=bound)
+        sample('stage_latency_seconds_bucket', histogram['count'], stage=stage, le='+Inf')
+        sample('stage_latency_seconds_count', histogram['count'], stage=stage)
+        sample('stage_latency_seconds_sum', round(histogram['sum'], 6), stage=stage)
+
+    family('in_flight_apps', 'gauge', 'Applications dispatched to workers and not yet finished')
+    sample('in_flight_apps', snapshot['in_flight'])
+    family('queued_apps', 'gauge', 'Applications in the current batch not yet dispatched')
+    sample('queued_apps', snapshot['queued'])
+
+    family('workers', 'gauge', 'Live worker processes')
+    sample('workers', len(snapshot['worker_rss']))
+    family('worker_rss_bytes', 'gauge', 'Worker resident set size')
+    for pid, rss in sorted(snapshot['worker_rss'].items()):
+        sample('worker_rss_bytes', rss, pid=pid)
+
+    family('worker_recycles', 'counter', 'Worker processes replaced, by reason')
+    for reason, count in sorted(snapshot['recycle_reasons'].items()):
+        sample('worker_recycles_total', count, reason=reason)
+
+    if not prometheus_text:
+        lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+class OpenMetricsExporter:
+    """
+    Publishes a LiveRunState as an OpenMetrics textfile and/or HTTP endpoint.
+
+    Usage:
+        exporter = OpenMetricsExporter(state, textfile_path='/var/lib/node_exporter/xml.prom')
+        exporter.start()
+        ...
+        exporter.stop()  # writes a final textfile
+    """
+
+    def __init__(self, state: LiveRunState, textfile_path: Optional[str] = None, http_port: Optional[int] = None,
+                 interval_seconds: float = DEFAULT_EXPORT_INTERVAL_SECONDS, const_labels: Optional[Dict[str, Any]] = None,
+                 http_host: str = '127.0.0.1'):
+        self.state = state
+        self.textfile_path = Path(textfile_path) if textfile_path else None
+        self.http_port = http_port
+        self.http_host = http_host
+        self.interval_seconds = interval_seconds
+        self.const_labels = const_labels or {}
+        self.logger = logging.getLogger(__name__)
+        self._previous: Dict[str, Dict[str, Any]] = {}  # Last snapshot per output ('http' / 'textfile')
+        self._render_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def render(self, output: str = 'http') -> str:
+        """Render the current state for one output; rates cover the time since that output's previous render."""
+        with self._render_lock:
+            snapshot = self.state.snapshot()
+            text = render_openmetrics(snapshot, self._previous.get(output), self.const_labels,
+                                      prometheus_text=(output == 'textfile'))
+            self._previous[output] = snapshot
+            return text
+
+    def write_textfile(self):
+        """Write atomically (temp file + rename) so the collector never reads a partial file."""
+        self.textfile_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.textfile_path.with_name(self.textfile_path.name + '.tmp')
+        temp_path.write_text(self.render('textfile'), encoding='utf-8')
+        os.replace(temp_path, self.textfile_path)
+
+    def start(self) -> 'OpenMetricsExporter':
+        if self.textfile_path:
+            self._thread = threading.Thread(target=self._textfile_loop, name='openmetrics-textfile', daemon=True)
+            self._thread.start()
+        if self.http_port is not None:
+            exporter = self
+
+            class _Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split('?')[0] != '/metrics':
+                        self.send_error(404)
+                        return
+                    body = exporter.render('http').encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/openmetrics-text; version=1.0.0; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass  # Scrapes would flood the run log
+
+            self._server = ThreadingHTTPServer((self.http_host, self.http_port), _Handler)
+            self.http_port = self._server.server_address[1]  # Resolved when 0 was requested
+            threading.Thread(target=self._server.serve_forever, name='openmetrics-http', daemon=True).start()
+            self.logger.info(f"OpenMetrics endpoint: http://{self.http_host}:{self.http_port}/metrics")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.interval_seconds + 5)
+            self._thread = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _textfile_loop(self):
+        while True:
+            try:
+                self.write_textfile()
+            except Exception as e:
+                # Never let monitoring take down the run
+                self.logger.warning(f"OpenMetrics textfile write failed: {e}")
+            if self._stop.wait(self.interval_seconds):
+                try:
+                    self.write_textfile()  # Final values
+                except Exception:
+                    pass
+                return
@@ -0,0 +1,186 @@
+"""
+Streaming per-app result sink for production runs.
+
+Instead of collecting every failed / quality-issue app (and, when instrumented, every
+individual result) in memory until the end-of-run metrics JSON is written, each app's
+outcome is appended to a JSONL file as soon as its batch completes. Only running
+aggregates (counts, failures by stage, a bounded sample of failed app_ids) are kept in
+memory, and a crash loses at most the batch in flight.
+
+File layout (one JSON object per line, compact separators):
+    {"type": "app", "batch": 3, "app_id": 123, "success": false, "error_stage": "mapping", ...}
+    {"type": "batch", "batch": 3, "total_applications_processed": 500, "duration_seconds": 41.2, ...}
+    {"type": "validation", "batch": 3, "app_id": 123, "passed": true, "errors": 0, "issues": [...], ...}
+
+Other record types ('validation' findings from inline validation) are appended with
+write_records() and do not touch the per-app aggregates.
+
+read_results() tolerates a truncated final line, so a file from a killed run can still be
+summarized (see diagnostics/summarize_failures.py).
+"""
+
+import json
+import os
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# Failed app_ids kept in memory for console/log summaries; the full list is in the stream
+FAILED_ID_SAMPLE_SIZE = 20
+
+
+@dataclass
+class RunningAggregates:
+    """In-memory totals maintained while results are streamed to disk."""
+    apps_written: int = 0
+    successful: int = 0
+    failed: int = 0
+    quality_issue_count: int = 0
+    records_inserted: int = 0
+    processing_time_total: float = 0.0
+    processing_time_max: float = 0.0
+    failures_by_stage: Dict[str, int] = field(default_factory=dict)
+    failed_app_ids_sample: List[Any] = field(default_factory=list)
+
+    def add(self, record: Dict[str, Any]):
+        self.apps_written += 1
+        processing_time = record.get('processing_time') or 0.0
+        self.processing_time_total += processing_time
+        self.processing_time_max = max(self.processing_time_max, processing_time)
+        if record.get('success'):
+            self.successful += 1
+            self.records_inserted += record.get('records_inserted') or 0
+            if record.get('quality_issues'):
+                self.quality_issue_count += 1
+            return
+        self.failed += 1
+        stage = record.get('error_stage') or 'unknown'
+        self.failures_by_stage[stage] = self.failures_by_stage.get(stage, 0) + 1
+        if len(self.failed_app_ids_sample) < FAILED_ID_SAMPLE_SIZE and record.get('app_id') is not None:
+            self.failed_app_ids_sample.append(record['app_id'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'apps_written': self.apps_written,
+            'successful': self.successful,
+            'failed': self.failed,
+            'quality_issue_count': self.quality_issue_count,
+            'records_inserted': self.records_inserted,
+            'avg_processing_time': self.processing_time_total / self.apps_written if self.apps_written else 0.0,
+            'max_processing_time': self.processing_time_max,
+            'failures_by_stage': dict(sorted(self.failures_by_stage.items())),
+            'failed_app_ids_sample': list(self.failed_app_ids_sample)
+        }
+
+
+class AppResultSink:
+    """
+    Append-only JSONL writer for per-app results with running aggregates.
+
+    Usage:
+        with AppResultSink('metrics/results_20260206_001448.jsonl') as sink:
+            sink.write_batch(3, individual_results, batch_summary)
+        sink.aggregates.to_dict()
+    """
+
+    def __init__(self, path, fsync: bool = False):
+        """
+        Args:
+            path: JSONL file to append to (parent directory is created)
+            fsync: fsync after every batch (survives host crashes, not just process crashes)
+        """
+        self.path = Path(path)
+        self.fsync = fsync
+        self.aggregates = RunningAggregates()
+        self.batches_written = 0
+        self.bytes_written = 0
+        self._file = None
+
+    def open(self) -> 'AppResultSink':
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return self
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_batch(self, batch_number: int, app_results: List[Dict[str, Any]],
+                    batch_summary: Optional[Dict[str, Any]] = None):
+        """
+        Append one batch's per-app results (and optional batch summary line), then flush.
+
+        Args:
+            batch_number: Batch the results belong to
+            app_results: Per-app dicts (app_id, success, error_stage, error_message, ...)
+            batch_summary: Per-batch figures written as a 'batch' line (e.g. duration, inserts)
+        """
+        self.open()
+        lines = []
+        for result in app_results:
+            record = {'type': 'app', 'batch': batch_number, **result}
+            self.aggregates.add(record)
+            lines.append(json.dumps(record, separators=(',', ':'), default=str))
+        if batch_summary is not None:
+            lines.append(json.dumps({'type': 'batch', 'batch': batch_number, **batch_summary},
+                                    separators=(',', ':'), default=str))
+        if not lines:
+            return
+        self._append(lines)
+        self.batches_written += 1
+
+    def write_records(self, batch_number: int, record_type: str, records: List[Dict[str, Any]]):
+        """
+        Append records of another type (e.g. 'validation' findings) for a batch, then flush.
+
+        Args:
+            batch_number: Batch the records arrived with
+            record_type: Value of the 'type' field ('app' and 'batch' are reserved for write_batch)
+            records: Dicts written one per line
+        """
+        if not records:
+            return
+        self.open()
+        self._append([json.dumps({'type': record_type, 'batch': batch_number, **record},
+                                 separators=(',', ':'), default=str) for record in records])
+
+    def _append(self, lines: List[str]):
+        data = '\n'.join(lines) + '\n'
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.bytes_written += len(data)
+
+
+def read_results(path, record_type: Optional[str] = 'app') -> Iterator[Dict[str, Any]]:
+    """
+    Stream records back from a result file.
+
+    Args:
+        path: JSONL file written by AppResultSink
+        record_type: 'app', 'batch', or None for every line
+
+    A partially written last line (process killed mid-write) is skipped.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record_type is None or record.get('type') == record_type:
+                yield record
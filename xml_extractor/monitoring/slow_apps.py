@@ -0,0 +1,118 @@
+"""
+Bounded top-N capture of the slowest applications.
+
+Stage histograms show that a tail exists, not which apps form it. SlowAppTracker keeps the
+N slowest apps by total time and by each stage ('validation', 'mapping', 'insert.app_base',
+...), each with its full stage breakdown and the facts that usually explain it:
+
+- xml_chars, element_count (extracted elements), contact_count
+- rows_by_table and insert_paths ({table: 'fast' | 'fallback' | 'mixed'})
+
+One min-heap of size N per ranking, so memory does not grow with the run and an app is
+only stored when it beats the fastest entry kept for some stage. Trackers merge (chunked
+runs, multiple instances) and are written to the metrics JSON under 'slow_apps';
+diagnostics/inspect_mapped_app.py --metrics-file replays the captured apps locally.
+"""
+
+import heapq
+import itertools
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_SLOW_APP_TOP_N = 10
+
+
+class SlowAppTracker:
+    """Slowest N apps per stage ('total' included), from per-app {stage: seconds} timings."""
+
+    def __init__(self, top_n: int = DEFAULT_SLOW_APP_TOP_N):
+        self.top_n = top_n or 0
+        self.apps_seen = 0
+        self._heaps: Dict[str, List[Tuple[float, int, Dict[str, Any]]]] = {}
+        self._tiebreak = itertools.count()
+
+    def record(self, app_id: int, stage_times: Optional[Dict[str, float]], details: Optional[Dict[str, Any]] = None):
+        """Offer one app; the entry (breakdown + details) is built only if it makes some top N."""
+        if not self.top_n or not stage_times:
+            return
+        self.apps_seen += 1
+        entry = None
+        for stage, seconds in stage_times.items():
+            if not self._qualifies(stage, seconds):
+                continue
+            if entry is None:
+                entry = {
+                    'app_id': app_id,
+                    'stage_ms': {name: round(value * 1000, 3) for name, value in stage_times.items()},
+                    **(details or {})
+                }
+            self._push(stage, seconds, entry)
+
+    def _qualifies(self, stage: str, seconds: float) -> bool:
+        heap = self._heaps.get(stage)
+        return heap is None or len(heap) < self.top_n or seconds > heap[0][0]
+
+    def _push(self, stage: str, seconds: float, entry: Dict[str, Any]):
+        heap = self._heaps.setdefault(stage, [])
+        item = (seconds, next(self._tiebreak), entry)
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heapreplace(heap, item)
+
+    def merge(self, other: 'SlowAppTracker') -> 'SlowAppTracker':
+        self.apps_seen += other.apps_seen
+        for stage, heap in other._heaps.items():
+            for seconds, _, entry in heap:
+                if self._qualifies(stage, seconds):
+                    self._push(stage, seconds, entry)
+        return self
+
+    def __bool__(self) -> bool:
+        return bool(self._heaps)
+
+    def slowest(self, stage: str = 'total') -> List[Dict[str, Any]]:
+        """Entries for one stage, slowest first."""
+        return [entry for _, _, entry in sorted(self._heaps.get(stage, []), key=lambda item: item[0], reverse=True)]
+
+    def app_ids(self, stage: Optional[str] = None) -> List[int]:
+        """Distinct app_ids for one stage (slowest first), or across all stages when stage is None."""
+        stages = [stage] if stage else ['total'] + sorted(s for s in self._heaps if s != 'total')
+        seen = []
+        for name in stages:
+            for entry in self.slowest(name):
+                if entry['app_id'] not in seen:
+                    seen.append(entry['app_id'])
+        return seen
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'top_n': self.top_n,
+            'apps_seen': self.apps_seen,
+            'by_stage': {stage: self.slowest(stage) for stage in sorted(self._heaps)}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SlowAppTracker':
+        tracker = cls(data.get('top_n', DEFAULT_SLOW_APP_TOP_N))
+        tracker.apps_seen = data.get('apps_seen', 0)
+        for stage, entries in (data.get('by_stage') or {}).items():
+            for entry in entries:
+                seconds = entry.get('stage_ms', {}).get(stage, 0.0) / 1000
+                if tracker._qualifies(stage, seconds):
+                    tracker._push(stage, seconds, entry)
+        return tracker
+
+    def format_table(self, stage: str = 'total', limit: int = 10) -> str:
+        """Fixed-width table of the slowest apps for one stage."""
+        lines = [f"  {'app_id':>10s} {stage + ' ms':>14s} {'xml chars':>10s} {'elements':>9s} {'contacts':>9s} "
+                 f"{'rows':>6s}  fallback tables"]
+        for entry in self.slowest(stage)[:limit]:
+            fallback = [table for table, path in (entry.get('insert_paths') or {}).items() if path != 'fast']
+            lines.append(
+                f"  {entry['app_id']:>10} {entry['stage_ms'].get(stage, 0.0):14.1f} {entry.get('xml_chars') or 0:10d} "
+                f"{entry.get('element_count') or 0:9d} {entry.get('contact_count') or 0:9d} "
+                f"{sum((entry.get('rows_by_table') or {}).values()):6d}  {', '.join(fallback) or '-'}"
+            )
+        return "\n".join(lines)
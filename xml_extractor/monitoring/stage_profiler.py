@@ -0,0 +1,206 @@
+"""
+Sampling profiler for the per-app pipeline, tagged by stage.
+
+Profiling every app would distort the run, so workers profile only every Nth app
+(app_id % N == 0). While a sampled app is processed, a background thread in the worker
+snapshots the main thread's stack every few milliseconds. Each stack is tagged with the
+pipeline stage it belongs to, found from the innermost known stage function on the stack
+(e.g. map_xml_to_database -> 'mapping'). No hooks are needed in the pipeline code.
+
+Each sampled app returns its {collapsed stack: samples} counts on its WorkResult; the
+coordinator merges them into a ProfileAggregate, which writes at run end:
+
+- <prefix>.collapsed              all stages, 'stage;outer;...;inner count' (flamegraph.pl /
+                                  speedscope / inferno input)
+- <prefix>.<stage>.collapsed      one file per stage
+- <prefix>_top_functions.txt      self / inclusive sample share per function
+"""
+
+import os
+import sys
+import threading
+import time
+
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+DEFAULT_SAMPLE_INTERVAL_SECONDS = 0.002
+
+# Innermost match wins, so duplicate detection inside execute_bulk_insert is its own stage
+STAGE_MARKERS = {
+    'validate_xml_for_processing': 'validation',
+    'parse_xml_stream': 'parsing',
+    'extract_elements': 'parsing',
+    'map_xml_to_database': 'mapping',
+    '_insert_mapped_data_with_fk_order': 'insert',
+    'execute_bulk_insert': 'insert',
+    'filter_duplicates': 'duplicate_detection',
+}
+
+# Frames above this one (worker pool loop) are dropped from every stack
+STACK_ROOT_FUNCTION = '_process_work_item'
+
+_MAX_STACK_DEPTH = 128
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame) -> Optional[str]:
+    """'stage;outer;...;inner' for a frame, rooted at STACK_ROOT_FUNCTION when present."""
+    codes = []
+    while frame is not None and len(codes) < _MAX_STACK_DEPTH:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    codes.reverse()  # outermost first
+
+    for i, code in enumerate(codes):
+        if code.co_name == STACK_ROOT_FUNCTION:
+            codes = codes[i:]
+            break
+
+    stage = 'other'
+    for code in reversed(codes):
+        marked = STAGE_MARKERS.get(code.co_name)
+        if marked is not None:
+            stage = marked
+            break
+    if not codes:
+        return None
+    return ';'.join([stage] + [_frame_label(code) for code in codes])
+
+
+class StackSampler:
+    """
+    Samples one thread's stack on a background thread while an app is being profiled.
+
+    Usage (inside a worker):
+        sampler = StackSampler()
+        sampler.begin()
+        ... process the app ...
+        samples = sampler.end()   # {collapsed stack: count}
+    """
+
+    def __init__(self, interval_seconds: float = DEFAULT_SAMPLE_INTERVAL_SECONDS,
+                 target_thread_id: Optional[int] = None):
+        self.interval_seconds = interval_seconds
+        self.target_thread_id = target_thread_id or threading.get_ident()
+        self._active = threading.Event()
+        self._samples: Counter = Counter()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='stage-sampler', daemon=True)
+        self._thread.start()
+
+    def begin(self):
+        with self._lock:
+            self._samples = Counter()
+        self._active.set()
+
+    def end(self) -> Dict[str, int]:
+        self._active.clear()
+        with self._lock:
+            samples, self._samples = self._samples, Counter()
+        return dict(samples)
+
+    def _run(self):
+        while True:
+            self._active.wait()
+            time.sleep(self.interval_seconds)
+            if not self._active.is_set():
+                continue
+            frame = sys._current_frames().get(self.target_thread_id)
+            stack = collapse_stack(frame) if frame is not None else None
+            if stack is not None:
+                with self._lock:
+                    self._samples[stack] += 1
+
+
+class ProfileAggregate:
+    """Run-level merge of per-app stack samples."""
+
+    def __init__(self, interval_seconds: float = DEFAULT_SAMPLE_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self.stacks: Counter = Counter()
+        self.apps_profiled = 0
+
+    def merge(self, samples: Optional[Dict[str, int]]):
+        if samples is None:
+            return
+        self.apps_profiled += 1
+        self.stacks.update(samples)
+
+    @property
+    def total_samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def samples_by_stage(self) -> Dict[str, int]:
+        by_stage: Counter = Counter()
+        for stack, count in self.stacks.items():
+            by_stage[stack.split(';', 1)[0]] += count
+        return dict(by_stage.most_common())
+
+    def top_functions(self, limit: int = 25) -> List[Dict[str, object]]:
+        """Functions by self samples, with inclusive samples (counted once per stack)."""
+        self_samples: Counter = Counter()
+        total_samples: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')[1:]
+            if not frames:
+                continue
+            self_samples[frames[-1]] += count
+            for frame in set(frames):
+                total_samples[frame] += count
+        grand_total = self.total_samples or 1
+        return [
+            {
+                'function': function,
+                'self_samples': self_samples[function],
+                'self_pct': round(self_samples[function] / grand_total * 100, 2),
+                'total_samples': total_samples[function],
+                'total_pct': round(total_samples[function] / grand_total * 100, 2)
+            }
+            for function, _ in self_samples.most_common(limit)
+        ]
+
+    def format_top_functions(self, limit: int = 25) -> str:
+        lines = [
+            f"Profiled apps: {self.apps_profiled}  samples: {self.total_samples}  "
+            f"(~{self.interval_seconds * 1000:g} ms each)",
+            "Samples by stage: " + ", ".join(f"{stage}={count}" for stage, count in self.samples_by_stage().items()),
+            "",
+            f"{'self %':>7s} {'total %':>8s} {'self':>7s} {'total':>7s}  function"
+        ]
+        for row in self.top_functions(limit):
+            lines.append(f"{row['self_pct']:7.2f} {row['total_pct']:8.2f} {row['self_samples']:7d} "
+                         f"{row['total_samples']:7d}  {row['function']}")
+        return "\n".join(lines)
+
+    def write(self, output_dir, prefix: str = 'profile') -> List[Path]:
+        """Write collapsed stacks (all stages and per stage) and the top-functions table."""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+
+        by_stage: Dict[str, List[str]] = {}
+        all_lines = []
+        for stack, count in sorted(self.stacks.items()):
+            line = f"{stack} {count}"
+            all_lines.append(line)
+            stage, _, rest = stack.partition(';')
+            by_stage.setdefault(stage, []).append(f"{rest} {count}")
+
+        path = output_dir / f"{prefix}.collapsed"
+        path.write_text("\n".join(all_lines) + "\n", encoding='utf-8')
+        written.append(path)
+        for stage, lines in sorted(by_stage.items()):
+            path = output_dir / f"{prefix}.{stage}.collapsed"
+            path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+            written.append(path)
+
+        path = output_dir / f"{prefix}_top_functions.txt"
+        path.write_text(self.format_top_functions() + "\n", encoding='utf-8')
+        written.append(path)
+        return written
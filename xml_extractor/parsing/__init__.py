@@ -1,5 +1,6 @@
 """XML parsing components."""
 
 from .xml_parser import XMLParser
+from .compact_elements import CompactElements, ElementRecord, PathTable
 
-__all__ = ['XMLParser']
\ No newline at end of file
+__all__ = ['XMLParser', 'CompactElements', 'ElementRecord', 'PathTable']
\ No newline at end of file
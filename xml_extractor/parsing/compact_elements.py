@@ -0,0 +1,173 @@
+"""
+Compact flattened-element representation for XMLParser output.
+
+The legacy flattened structure allocates a dict per element (tag/text/attributes/path/tail)
+plus a copied attribute dict, keyed by a freshly built path string. For apps with thousands
+of elements that dominates parse-stage allocation. This module keeps the same information in:
+
+- PathTable: interned XPath-like paths with stable integer IDs, shared across documents
+- ElementRecord: a __slots__ record per element holding the lxml attrib mapping as-is
+- CompactElements: per-document records keyed by path ID, with a read-only Mapping view
+  that materializes the legacy element dicts on demand for existing callers
+"""
+
+import sys
+
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class PathTable:
+    """
+    Interned path vocabulary with stable integer IDs.
+
+    Paths are derived from (parent_id, raw_tag) lookups, so building the path of an element
+    whose shape has been seen before allocates nothing. The table lives on the parser and is
+    shared by every document it parses; its size is bounded by the schema vocabulary, not by
+    the number of apps processed.
+    """
+
+    ROOT_ID = 0
+
+    def __init__(self):
+        self.paths: List[str] = ['']
+        self.tags: List[str] = ['']
+        self._ids: Dict[str, int] = {'': self.ROOT_ID}
+        self._children: List[Dict[Any, int]] = [{}]
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def child_id(self, parent_id: int, raw_tag: Any, clean_tag: Callable[[Any], str]) -> int:
+        """
+        Get the path ID of a child element, interning the path on first sight.
+
+        Args:
+            parent_id: Path ID of the parent element (ROOT_ID for the document root)
+            raw_tag: Tag as reported by lxml/ElementTree (cache key when it is a string)
+            clean_tag: Function that strips namespaces from a raw tag
+
+        Returns:
+            Integer path ID
+        """
+        children = self._children[parent_id]
+        cache_key = raw_tag if isinstance(raw_tag, str) else None
+        if cache_key is not None:
+            path_id = children.get(cache_key)
+            if path_id is not None:
+                return path_id
+
+        tag_name = clean_tag(raw_tag)
+        path_id = self.intern(f"{self.paths[parent_id]}/{tag_name}", tag_name)
+        if cache_key is not None:
+            children[cache_key] = path_id
+        return path_id
+
+    def intern(self, path: str, tag_name: Optional[str] = None) -> int:
+        """Get the ID for a full path string, adding it to the table if needed."""
+        path_id = self._ids.get(path)
+        if path_id is None:
+            path = sys.intern(path)
+            path_id = len(self.paths)
+            self.paths.append(path)
+            self.tags.append(sys.intern(tag_name if tag_name is not None else path.rsplit('/', 1)[-1]))
+            self._ids[path] = path_id
+            self._children.append({})
+        return path_id
+
+    def get_id(self, path: str) -> Optional[int]:
+        """Get the ID for a path without interning it."""
+        return self._ids.get(path)
+
+
+class ElementRecord:
+    """Flattened element: path ID, stripped text/tail and the element's attrib mapping (not copied)."""
+
+    __slots__ = ('path_id', 'text', 'tail', 'attrib')
+
+    def __init__(self, path_id: int, text: str, tail: Optional[str], attrib: Any):
+        self.path_id = path_id
+        self.text = text
+        self.tail = tail
+        self.attrib = attrib
+
+    def __repr__(self) -> str:
+        return f"ElementRecord(path_id={self.path_id}, text={self.text!r}, attrs={len(self.attrib)})"
+
+
+class CompactElements(Mapping):
+    """
+    Per-document flattened elements in compact form.
+
+    Records are stored in document (pre-order) position of the first occurrence of each path;
+    a repeated path keeps the last element seen, matching the legacy dict semantics.
+
+    As a Mapping, this is the compatibility view: indexing by path returns the legacy element
+    dict ({'tag', 'text', 'attributes', 'path'[, 'tail']}) built on demand. Callers that need
+    a real dict (isinstance checks, mutation) should use to_dict().
+    """
+
+    __slots__ = ('path_table', 'records', '_convert_attrib')
+
+    def __init__(self, path_table: PathTable, convert_attrib: Callable[[Any], Dict[str, str]]):
+        self.path_table = path_table
+        self.records: Dict[int, ElementRecord] = {}
+        self._convert_attrib = convert_attrib
+
+    def add(self, record: ElementRecord) -> None:
+        """Store a record, replacing any earlier element at the same path."""
+        self.records[record.path_id] = record
+
+    def path_of(self, record: ElementRecord) -> str:
+        """Get the interned path string of a record."""
+        return self.path_table.paths[record.path_id]
+
+    def tag_of(self, record: ElementRecord) -> str:
+        """Get the interned tag name of a record."""
+        return self.path_table.tags[record.path_id]
+
+    def attributes_of(self, record: ElementRecord) -> Dict[str, str]:
+        """Get the cleaned attribute dict of a record (namespace-stripped names, processed values)."""
+        return self._convert_attrib(record.attrib)
+
+    def iter_records(self) -> Iterator[ElementRecord]:
+        """Iterate records in document order."""
+        return iter(self.records.values())
+
+    def element_dict(self, record: ElementRecord) -> Dict[str, Any]:
+        """Materialize the legacy element dict for a record."""
+        path_id = record.path_id
+        element_data = {
+            'tag': self.path_table.tags[path_id],
+            'text': record.text,
+            'attributes': self._convert_attrib(record.attrib),
+            'path': self.path_table.paths[path_id]
+        }
+        if record.tail:
+            element_data['tail'] = record.tail
+        return element_data
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Materialize the full legacy flattened dict keyed by path."""
+        paths = self.path_table.paths
+        return {paths[path_id]: self.element_dict(record) for path_id, record in self.records.items()}
+
+    def __getitem__(self, path: str) -> Dict[str, Any]:
+        path_id = self.path_table.get_id(path)
+        record = self.records.get(path_id) if path_id is not None else None
+        if record is None:
+            raise KeyError(path)
+        return self.element_dict(record)
+
+    def __contains__(self, path: object) -> bool:
+        if not isinstance(path, str):
+            return False
+        path_id = self.path_table.get_id(path)
+        return path_id is not None and path_id in self.records
+
+    def __iter__(self) -> Iterator[str]:
+        paths = self.path_table.paths
+        return (paths[path_id] for path_id in self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
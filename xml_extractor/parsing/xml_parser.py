@@ -5,6 +5,8 @@ This module provides memory-efficient XML parsing using lxml with selective
 element parsing based on mapping contracts for optimal performance.
 """
 
+import html
+import io
 import logging
 
 from typing import Dict, Any, Optional, List, Set
@@ -21,6 +23,7 @@ except ImportError:
 from ..interfaces import XMLParserInterface
 from ..exceptions import XMLParsingError
 from ..models import ProcessingConfig, MappingContract
+from .compact_elements import CompactElements, ElementRecord, PathTable
 
 
 class XMLParser(XMLParserInterface):
@@ -39,6 +42,8 @@ class XMLParser(XMLParserInterface):
     - Attribute vs Element Distinction: Properly handles XML attributes vs child elements
     - Contact Deduplication: Implements "last valid element" logic for duplicate contact records
     - Memory-Efficient Flattening: Converts hierarchical XML to flat dictionary for fast lookups
+    - Compact Records: Elements are captured as __slots__ records keyed by interned path IDs,
+      keeping the lxml attrib mapping instead of copying it (see compact_elements.py)
 
     The parser produces a flattened data structure where:
     - Keys are XPath-like paths (e.g., "/Provenir/Request/CustData/application/app_id")
@@ -46,6 +51,13 @@ class XMLParser(XMLParserInterface):
     - Contact elements are deduplicated using the last valid element approach
     - Attributes are preserved with case-insensitive access
 
+    Streaming Mode (oversized documents):
+    - Documents at or above config.streaming_threshold_bytes are parsed with iterparse
+    - Only the CustData subtree and its ancestor spine (/Provenir, /Provenir/Request) are kept
+    - Everything else (Reports, Journals, Audits, ...) is cleared as it closes, so peak
+      memory per app is bounded by the mapped data rather than the document size
+    - The flattened structure is captured while parsing and handed back by extract_elements()
+
     Features:
     - Memory-efficient selective parsing (only processes required elements)
     - Streaming XML processing using lxml.etree.iterparse()
@@ -55,6 +67,9 @@ class XMLParser(XMLParserInterface):
     - Detailed error logging with source record identification
     """
     
+    # Subtree retained by streaming mode when the contract does not name an application path
+    DEFAULT_STREAMING_ROOT_PATH = '/Provenir/Request/CustData'
+    
     def __init__(self, config: Optional[ProcessingConfig] = None, mapping_contract: Optional[MappingContract] = None):
         """
         Initialize XML parser with configuration and optional mapping contract for selective parsing.
@@ -82,6 +97,15 @@ class XMLParser(XMLParserInterface):
         self.required_elements: Set[str] = set()
         self.core_structure_elements: Set[str] = set()
         
+        # Streaming scope: subtree kept intact when iterparse is used for oversized documents.
+        # Defaults to CustData (parent of the application element) for both product lines.
+        self.streaming_root_path = self.DEFAULT_STREAMING_ROOT_PATH
+        self._streamed_root = None
+        self._streamed_elements: Optional[CompactElements] = None
+        
+        # Interned path vocabulary shared by every document this parser handles
+        self.path_table = PathTable()
+        
         # Only build required paths if a mapping contract is provided.
         # This enables the parser to skip irrelevant XML sections for performance.
         if mapping_contract:
@@ -90,9 +114,11 @@ class XMLParser(XMLParserInterface):
         
         # Performance tracking
         self.parse_count = 0
+        self.streaming_parse_count = 0
         self.validation_count = 0
         self.elements_skipped = 0
         self.elements_processed = 0
+        self.elements_discarded = 0
         
         self.logger.debug(f"XMLParser initialized with lxml={'available' if LXML_AVAILABLE else 'not available'}")
         if self.required_paths:
@@ -153,6 +179,11 @@ class XMLParser(XMLParserInterface):
             if path:
                 self.core_structure_elements = set(path.split('/'))
                 self.logger.debug(f"Core structure elements from contract: {sorted(self.core_structure_elements)}")
+                # Streaming keeps the application's parent (CustData) so sibling app elements
+                # remain visible to product-line checks
+                parent_path = '/' + '/'.join(path.split('/')[:-1])
+                if parent_path != '/':
+                    self.streaming_root_path = parent_path
         else:
             # Fallback to default if not specified in contract
             self.core_structure_elements = {'Provenir', 'Request', 'CustData', 'application'}
@@ -169,6 +200,7 @@ class XMLParser(XMLParserInterface):
         self.required_paths.clear()
         self.required_elements.clear()
         self.core_structure_elements.clear()
+        self.streaming_root_path = self.DEFAULT_STREAMING_ROOT_PATH
         self._build_required_paths()
         self._build_core_structure_elements()
         self.logger.debug(f"Updated mapping contract - selective parsing for {len(self.required_paths)} paths")
@@ -200,7 +232,10 @@ class XMLParser(XMLParserInterface):
             cleaned_xml = self._clean_xml_content(xml_content)
             
             if LXML_AVAILABLE:
-                return self._parse_with_lxml(cleaned_xml, source_record_id)
+                xml_bytes = cleaned_xml.encode('utf-8')
+                if self._should_stream(xml_bytes):
+                    return self._parse_with_iterparse(xml_bytes, cleaned_xml, source_record_id)
+                return self._parse_with_lxml(xml_bytes, cleaned_xml, source_record_id)
             else:
                 return self._parse_with_etree(cleaned_xml, source_record_id)
                 
@@ -209,8 +244,10 @@ class XMLParser(XMLParserInterface):
             self.logger.error(f"{error_msg} (Record ID: {source_record_id})")
             raise XMLParsingError(error_msg, xml_content, source_record_id)
     
-    def _parse_with_lxml(self, xml_content: str, source_record_id: str) -> Element:
+    def _parse_with_lxml(self, xml_bytes: bytes, xml_content: str, source_record_id: str) -> Element:
         """Parse XML using lxml for optimal performance and features."""
+        self._streamed_root = None
+        self._streamed_elements = None
         try:
             # Use XMLParser with namespace handling and recovery
             parser = etree.XMLParser(
@@ -221,7 +258,7 @@ class XMLParser(XMLParserInterface):
             )
             
             # Parse with streaming for memory efficiency
-            root = etree.fromstring(xml_content.encode('utf-8'), parser)
+            root = etree.fromstring(xml_bytes, parser)
             
             # Convert lxml Element to standard Element for interface compatibility
             return self._convert_lxml_to_element(root)
@@ -231,6 +268,146 @@ class XMLParser(XMLParserInterface):
         except Exception as e:
             raise XMLParsingError(f"lxml parsing failed: {e}", xml_content, source_record_id)
     
+    def _should_stream(self, xml_bytes: bytes) -> bool:
+        """Check whether a document is large enough to switch to iterparse streaming mode."""
+        threshold = getattr(self.config, 'streaming_threshold_bytes', 0)
+        return bool(threshold) and len(xml_bytes) >= threshold
+    
+    def _parse_with_iterparse(self, xml_bytes: bytes, xml_content: str, source_record_id: str) -> Element:
+        """
+        Parse an oversized document with iterparse, discarding subtrees outside the streaming scope.
+        
+        Elements inside the streaming scope (see _is_streaming_retained) are kept in the tree so
+        the mapper can still run XPath against contacts/addresses. Their flattened representation
+        is captured as they open and close, and handed back by the next extract_elements() call
+        for this root. Everything else is cleared on its end event and dropped from its parent,
+        which keeps peak memory per app bounded regardless of how large Reports/Journals grow.
+        
+        Args:
+            xml_bytes: Cleaned XML content encoded as UTF-8
+            xml_content: Cleaned XML content (used for error reporting only)
+            source_record_id: Identifier used in error messages
+            
+        Returns:
+            Root element of the pruned tree
+        """
+        self._streamed_root = None
+        self._streamed_elements = None
+        
+        extracted = CompactElements(self.path_table, self._convert_attrib)
+        kept_elements = []        # (element, record) pairs needing text/tail after parsing
+        path_table = self.path_table
+        path_stack: List[int] = []
+        retained_stack: List[bool] = []
+        boundary_discards = set()  # Cleared elements whose parent is still retained
+        
+        try:
+            context = etree.iterparse(
+                io.BytesIO(xml_bytes),
+                events=('start', 'end'),
+                recover=True,
+                strip_cdata=False,
+                resolve_entities=False,
+                no_network=True
+            )
+            
+            for event, elem in context:
+                if event == 'start':
+                    parent_retained = retained_stack[-1] if retained_stack else True
+                    parent_id = path_stack[-1] if path_stack else PathTable.ROOT_ID
+                    path_id = path_table.child_id(parent_id, elem.tag, self._clean_tag_name)
+                    element_path = path_table.paths[path_id]
+                    tag_name = path_table.tags[path_id]
+                    path_stack.append(path_id)
+                    
+                    retained = parent_retained and self._is_streaming_retained(element_path)
+                    retained_stack.append(retained)
+                    if not retained:
+                        if parent_retained:
+                            self.elements_skipped += 1
+                        continue
+                    
+                    if self._should_process_element(element_path, tag_name):
+                        self.elements_processed += 1
+                        # Attributes are complete at the start event; text is filled on end
+                        record = ElementRecord(path_id, '', None, elem.attrib)
+                        extracted.add(record)
+                        kept_elements.append((elem, record))
+                    else:
+                        self.elements_skipped += 1
+                    continue
+                
+                # End event
+                path_stack.pop()
+                retained = retained_stack.pop()
+                if retained:
+                    continue
+                
+                parent_retained = retained_stack[-1] if retained_stack else True
+                elem.clear()
+                self.elements_discarded += 1
+                parent = elem.getparent()
+                if parent is None:
+                    continue
+                if parent_retained:
+                    # Drop earlier discarded siblings (retained siblings such as CustData stay)
+                    previous = elem.getprevious()
+                    while previous is not None and previous in boundary_discards:
+                        boundary_discards.discard(previous)
+                        parent.remove(previous)
+                        previous = elem.getprevious()
+                    boundary_discards.add(elem)
+                else:
+                    # Inside a discarded subtree every preceding sibling is discardable
+                    while elem.getprevious() is not None:
+                        del parent[0]
+            
+            root = context.root
+            for discarded in boundary_discards:
+                discarded_parent = discarded.getparent()
+                if discarded_parent is not None:
+                    discarded_parent.remove(discarded)
+            
+            # Text/tail are complete once the document has been consumed
+            for elem, record in kept_elements:
+                record.text = (elem.text or '').strip()
+                if elem.tail:
+                    record.tail = elem.tail.strip() or None
+            
+        except etree.XMLSyntaxError as e:
+            raise XMLParsingError(f"XML syntax error: {e}", xml_content, source_record_id)
+        except Exception as e:
+            raise XMLParsingError(f"lxml streaming parse failed: {e}", xml_content, source_record_id)
+        
+        if root is None:
+            raise XMLParsingError("lxml streaming parse produced no root element", xml_content, source_record_id)
+        
+        self.streaming_parse_count += 1
+        self._streamed_root = root
+        self._streamed_elements = extracted
+        self.logger.debug(
+            f"Streaming parse kept {len(extracted)} elements under {self.streaming_root_path} "
+            f"({len(xml_bytes)} bytes, record {source_record_id})"
+        )
+        return self._convert_lxml_to_element(root)
+    
+    def _is_streaming_retained(self, element_path: str) -> bool:
+        """
+        Determine whether an element survives streaming mode.
+        
+        Kept: the streaming root (CustData) and everything beneath it, its ancestors
+        (/Provenir, /Provenir/Request) so their attributes stay mappable, and with a
+        mapping contract any path the contract requires outside that subtree.
+        """
+        root_path = self.streaming_root_path
+        if element_path == root_path or element_path.startswith(root_path + '/'):
+            return True
+        if root_path.startswith(element_path + '/'):
+            return True
+        if self.mapping_contract and self.required_paths:
+            return element_path in self.required_paths or self._path_might_contain_required_elements(element_path)
+        return False
+    
     def _parse_with_etree(self, xml_content: str, source_record_id: str) -> Element:
         """Parse XML using standard ElementTree as fallback."""
         try:
@@ -386,6 +563,9 @@ class XMLParser(XMLParserInterface):
         - Attribute preservation for mapped elements only
         - Performance optimization by skipping unused elements
         
+        This is the compatibility entry point returning the legacy flattened dict; callers
+        that only read the structure should prefer extract_elements_compact().
+        
         Args:
             xml_node: XML element to extract data from
             
@@ -394,27 +574,53 @@ class XMLParser(XMLParserInterface):
         """
         if xml_node is None:
             return {}
+        return self.extract_elements_compact(xml_node).to_dict()
+    
+    def extract_elements_compact(self, xml_node: Element) -> CompactElements:
+        """
+        Extract elements from XML node into the compact record representation.
         
-        return self._extract_elements_selective(xml_node, "")
+        Same selection rules and ordering as extract_elements(), but each element is a
+        __slots__ record keyed by an interned path ID and holding the node's attrib mapping
+        rather than a copied dict. The result is a read-only Mapping of path -> legacy
+        element dict for callers that index it directly.
+        
+        Args:
+            xml_node: XML element to extract data from
+            
+        Returns:
+            CompactElements for the document
+        """
+        if xml_node is None:
+            return CompactElements(self.path_table, self._convert_attrib)
+        
+        # Streaming mode already captured the flattened structure while parsing
+        if self._streamed_root is not None and xml_node is self._streamed_root:
+            extracted = self._streamed_elements
+            self._streamed_root = None
+            self._streamed_elements = None
+            return extracted
+        
+        extracted = CompactElements(self.path_table, self._convert_attrib)
+        self._extract_elements_selective(xml_node, PathTable.ROOT_ID, extracted)
+        return extracted
     
-    def _extract_elements_selective(self, xml_node: Element, current_path: str) -> Dict[str, Any]:
+    def _extract_elements_selective(self, xml_node: Element, parent_id: int, extracted: CompactElements) -> None:
         """
         Recursively extract elements with selective parsing based on required paths.
         
         Args:
             xml_node: Current XML element
-            current_path: Current path in the XML tree
-            
-        Returns:
-            Dictionary of extracted element data
+            parent_id: Path ID of the parent element (PathTable.ROOT_ID at the document root)
+            extracted: Records collected so far for this document
         """
-        extracted_data = {}
-        element_path = current_path or "unknown"  # Initialize with fallback value
+        element_path = self.path_table.paths[parent_id] or "unknown"  # Fallback for error reporting
         
         try:
             # Build current element path
-            tag_name = self._clean_tag_name(xml_node.tag)
-            element_path = f"{current_path}/{tag_name}" if current_path else f"/{tag_name}"
+            path_id = self.path_table.child_id(parent_id, xml_node.tag, self._clean_tag_name)
+            element_path = self.path_table.paths[path_id]
+            tag_name = self.path_table.tags[path_id]
             
             # Check if this element or its children are required
             should_process = self._should_process_element(element_path, tag_name)
@@ -422,37 +628,28 @@ class XMLParser(XMLParserInterface):
             if should_process:
                 self.elements_processed += 1
                 
-                # Extract current element data
-                element_data = {
-                    'tag': tag_name,
-                    'text': (xml_node.text or '').strip(),
-                    'attributes': self.extract_attributes(xml_node),
-                    'path': element_path
-                }
-                
-                # Add tail text if present
-                if hasattr(xml_node, 'tail') and xml_node.tail:
-                    tail_text = xml_node.tail.strip()
-                    if tail_text:
-                        element_data['tail'] = tail_text
-                
-                extracted_data[element_path] = element_data
+                # Capture current element (attrib mapping kept as-is, tail only if non-blank)
+                tail = xml_node.tail
+                extracted.add(ElementRecord(
+                    path_id,
+                    (xml_node.text or '').strip(),
+                    (tail.strip() or None) if tail else None,
+                    xml_node.attrib
+                ))
                 
                 # Process children if this path might contain required elements
                 for child in xml_node:
-                    child_data = self._extract_elements_selective(child, element_path)
-                    extracted_data.update(child_data)
+                    self._extract_elements_selective(child, path_id, extracted)
             else:
                 self.elements_skipped += 1
                 # Still need to check if children might be required
                 # (e.g., we might skip <Reports> but need <Reports/SomeChild>)
                 if self._path_might_contain_required_elements(element_path):
                     for child in xml_node:
-                        child_data = self._extract_elements_selective(child, element_path)
-                        extracted_data.update(child_data)
-            
-            return extracted_data
+                        self._extract_elements_selective(child, path_id, extracted)
             
+        except XMLParsingError:
+            raise
         except Exception as e:
             self.logger.error(f"Error extracting elements from XML node at path {element_path}: {e}")
             raise XMLParsingError(f"Element extraction failed at {element_path}: {e}")
@@ -526,25 +723,35 @@ class XMLParser(XMLParserInterface):
             return {}
         
         try:
-            attributes = {}
-            
-            # Extract all attributes
-            if hasattr(xml_node, 'attrib') and xml_node.attrib:
-                for attr_name, attr_value in xml_node.attrib.items():
-                    # Clean attribute name (remove namespace prefixes if needed)
-                    clean_name = self._clean_attribute_name(attr_name)
-                    
-                    # Type-aware value processing
-                    processed_value = self._process_attribute_value(attr_value)
-                    
-                    attributes[clean_name] = processed_value
-            
-            return attributes
+            return self._convert_attrib(getattr(xml_node, 'attrib', None))
             
         except Exception as e:
             self.logger.error(f"Error extracting attributes from XML node: {e}")
             return {}
     
+    def _convert_attrib(self, attrib) -> Dict[str, str]:
+        """
+        Convert an element's attrib mapping into the cleaned attribute dict.
+        
+        Args:
+            attrib: lxml/ElementTree attrib mapping (may be None or empty)
+            
+        Returns:
+            Dictionary of namespace-stripped names to processed values
+        """
+        if not attrib:
+            return {}
+        
+        attributes = {}
+        for attr_name, attr_value in attrib.items():
+            # Clean attribute name (remove namespace prefixes if needed)
+            clean_name = self._clean_attribute_name(attr_name)
+            
+            # Type-aware value processing
+            attributes[clean_name] = self._process_attribute_value(attr_value)
+        
+        return attributes
+    
     def _get_element_path(self, element: Element) -> str:
         """
         Generate XPath-like path for an element.
@@ -657,12 +864,8 @@ class XMLParser(XMLParserInterface):
             return ''
         
         # Decode HTML entities if present
-        try:
-            import html
+        if '&' in value:
             value = html.unescape(value)
-        except ImportError:
-            # Fallback for basic entity decoding
-            value = value.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"').replace('&apos;', "'")
         
         return value
     
@@ -680,9 +883,11 @@ class XMLParser(XMLParserInterface):
         
         return {
             'parse_count': self.parse_count,
+            'streaming_parse_count': self.streaming_parse_count,
             'validation_count': self.validation_count,
             'elements_processed': self.elements_processed,
             'elements_skipped': self.elements_skipped,
+            'elements_discarded': self.elements_discarded,
             'skip_percentage': round(skip_percentage, 2),
             'selective_parsing_enabled': bool(self.mapping_contract),
             'required_paths_count': len(self.required_paths),
@@ -710,8 +915,10 @@ class XMLParser(XMLParserInterface):
     def reset_stats(self) -> None:
         """Reset performance statistics."""
         self.parse_count = 0
+        self.streaming_parse_count = 0
         self.validation_count = 0
         self.elements_processed = 0
         self.elements_skipped = 0
+        self.elements_discarded = 0
         
         self.logger.debug("XMLParser statistics reset")
\ No newline at end of file
@@ -6,9 +6,14 @@ processing with flexible batch processor implementations.
 """
 
 from .parallel_coordinator import ParallelCoordinator, WorkItem, WorkResult
+from .work_leases import LeaseBlock, WorkLeaseStore, SqliteLeaseStore, SqlServerLeaseStore
 
 __all__ = [
     'ParallelCoordinator',
     'WorkItem', 
-    'WorkResult'
+    'WorkResult',
+    'LeaseBlock',
+    'WorkLeaseStore',
+    'SqliteLeaseStore',
+    'SqlServerLeaseStore'
 ]
\ No newline at end of file
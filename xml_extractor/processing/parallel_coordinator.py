@@ -10,6 +10,20 @@ KEY FEATURES:
 - Atomic transactions: Single-connection per application (zero orphaned records)
 - Session tracking: Tracks session_id, app_id_start/end for processing_log audit trail
 - Performance: ~1,500-1,600 apps/min sustained (4 workers, batch-size=500)
+- Stage latency: every app reports per-stage durations, merged into a per-batch histogram
+  (p50/p95/p99/max) under performance_metrics['stage_latency']
+- Live state: run-wide counters in live_state, published by OpenMetricsExporter when enabled
+- Profiling (profile_every=N): workers stack-sample every Nth app by stage; merged in self.profile
+- Slow apps: the N slowest apps by total time and by stage (with XML size, element/contact
+  counts, rows per table and insert path) are kept in self.slow_apps
+- Memory tracking (memory_track_every=N): workers diff tracemalloc snapshots every N apps;
+  growth sites, RSS trends and gc counts are merged in self.memory
+- Worker recycling: workers persist across batches and are replaced individually once they
+  exceed an RSS-growth or task-count threshold (see worker_pool.py); recycle events go to metrics
+- Inline validation (validation_sample_rate / validate_quality_warnings): workers queue a sample
+  of inserted apps on a bounded queue to a separate ValidationOrchestrator process; findings merged
+  in self.inline_validation (drained at shutdown by finish_inline_validation), hot-path cost
+  recorded as the 'inline_validation_submit' stage
 
 ARCHITECTURE:
 - NOT a connection manager: Each worker creates its own independent connections
@@ -27,7 +41,16 @@ from datetime import datetime
 from typing import List, Tuple, Dict, Any, Optional
 from dataclasses import dataclass
 
+from .worker_pool import RecyclingWorkerPool
+from ..monitoring.latency_histogram import StageHistograms
+from ..monitoring.openmetrics_exporter import LiveRunState
+from ..monitoring.stage_profiler import StackSampler, ProfileAggregate, DEFAULT_SAMPLE_INTERVAL_SECONDS
+from ..monitoring.slow_apps import SlowAppTracker, DEFAULT_SLOW_APP_TOP_N
+from ..monitoring.memory_tracker import MemoryGrowthTracker, MemoryGrowthAggregate
+from ..config.processing_defaults import ProcessingDefaults
 from ..validation.pre_processing_validator import PreProcessingValidator
+from ..validation.inline_validation import (InlineValidationSampler, InlineValidationAggregate, InlineValidationService,
+                                           DEFAULT_QUEUE_SIZE, DEFAULT_DRAIN_TIMEOUT_SECONDS)
 from ..parsing.xml_parser import XMLParser
 from ..mapping.data_mapper import DataMapper
 from ..database.migration_engine import MigrationEngine
@@ -61,6 +84,12 @@ class WorkResult:
     db_insert_time: float = 0.0
     tables_populated: List[str] = None
     quality_issues: List[str] = None  # Non-fatal data quality warnings (e.g., validation errors during optional field processing)
+    stage_times: Dict[str, float] = None  # {stage: seconds} for latency histograms (always collected)
+    rows_by_table: Dict[str, int] = None  # {table: rows inserted} for live per-table throughput
+    profile_samples: Dict[str, int] = None  # {collapsed stack: samples} when this app was profiled
+    app_facts: Dict[str, Any] = None  # xml_chars, element_count, contact_count, insert_paths (slow-app capture)
+    memory_report: Dict[str, Any] = None  # Worker memory growth report (every Nth app when tracking)
+    validation_report: Dict[str, Any] = None  # Inline validation submit/drop counters when they changed
 
 
 class ParallelCoordinator(BatchProcessorInterface):
@@ -76,7 +105,8 @@ class ParallelCoordinator(BatchProcessorInterface):
     - Coordinates results aggregation and progress tracking
     
     Worker Lifecycle:
-    1. ParallelCoordinator creates mp.Pool(num_workers=4)
+    1. ParallelCoordinator creates a RecyclingWorkerPool(num_workers=4) on the first batch
+       and keeps it for the following batches (call close() when done)
     2. Each worker process runs _init_worker() once
        - Loads mapping contract
        - Creates its own MigrationEngine with connection string
@@ -86,6 +116,8 @@ class ParallelCoordinator(BatchProcessorInterface):
        - Maps to database schema (in-memory, fast)
        - Inserts via its own MigrationEngine connection
     4. Workers complete, results returned to main process
+    5. A worker whose RSS grew past worker_max_rss_growth_mb, or that processed
+       worker_max_tasks items, is replaced; the replacement initializes in the background
     
     Connection Management (IMPORTANT):
     - ParallelCoordinator does NOT manage connections
@@ -107,7 +139,13 @@ class ParallelCoordinator(BatchProcessorInterface):
     - If high I/O wait: Adding more workers makes it WORSE due to lock contention
     """
     
-    def __init__(self, connection_string: str, mapping_contract_path: str, num_workers: Optional[int] = None, batch_size: int = 1000, log_level: str = "INFO", log_file: str = None, session_id: str = None, app_id_start: int = None, app_id_end: int = None, enable_instrumentation: bool = False):
+    def __init__(self, connection_string: str, mapping_contract_path: str, num_workers: Optional[int] = None, batch_size: int = 1000, log_level: str = "INFO", log_file: str = None, session_id: str = None, app_id_start: int = None, app_id_end: int = None, enable_instrumentation: bool = False,
+                 worker_max_tasks: Optional[int] = ProcessingDefaults.WORKER_MAX_TASKS,
+                 worker_max_rss_growth_mb: Optional[float] = ProcessingDefaults.WORKER_MAX_RSS_GROWTH_MB,
+                 profile_every: int = 0, profile_interval_seconds: float = DEFAULT_SAMPLE_INTERVAL_SECONDS,
+                 slow_app_top_n: int = DEFAULT_SLOW_APP_TOP_N, memory_track_every: int = 0,
+                 validation_sample_rate: float = 0.0, validate_quality_warnings: bool = False,
+                 validation_queue_size: int = DEFAULT_QUEUE_SIZE):
         """
         Initialize the parallel coordinator.
         
@@ -121,6 +159,15 @@ class ParallelCoordinator(BatchProcessorInterface):
             session_id: Session identifier for processing_log tracking
             app_id_start: Starting app_id for range processing (for processing_log)
             app_id_end: Ending app_id for range processing (for processing_log)
+            worker_max_tasks: Recycle a worker after this many applications (0/None = never)
+            worker_max_rss_growth_mb: Recycle a worker once its RSS grew this much since startup (0/None = never)
+            profile_every: Stack-sample every Nth app (app_id % N == 0) in workers (0 = off)
+            profile_interval_seconds: Sampling interval while a profiled app runs
+            slow_app_top_n: Slowest apps kept per stage for diagnosis (0 = off)
+            memory_track_every: Diff tracemalloc snapshots in each worker every N apps (0 = off)
+            validation_sample_rate: Fraction of inserted apps (by app_id hash) validated off the hot path (0 = off)
+            validate_quality_warnings: Also validate every inserted app with data quality warnings
+            validation_queue_size: Apps queued for validation (all workers) before samples are dropped
         """
         self.logger = logging.getLogger(__name__)
         self.connection_string = connection_string
@@ -139,6 +186,35 @@ class ParallelCoordinator(BatchProcessorInterface):
         # Instrumentation flag: when True include per-record timings in metrics
         self.enable_instrumentation = enable_instrumentation
         
+        # Worker recycling thresholds (pool is created lazily and reused across batches)
+        self.worker_max_tasks = worker_max_tasks
+        self.worker_max_rss_growth_mb = worker_max_rss_growth_mb
+        self._pool: Optional[RecyclingWorkerPool] = None
+        
+        # Run-wide live totals (read by OpenMetricsExporter while batches run)
+        self.live_state = LiveRunState()
+        self.live_state.load_provider = lambda: self._pool.get_load() if self._pool else {}
+        self.live_state.recycle_reasons_provider = lambda: self._pool.get_stats()['recycle_reasons'] if self._pool else {}
+        
+        # Sampling profiler (per-app samples merged here as results arrive)
+        self.profile_every = profile_every or 0
+        self.profile_interval_seconds = profile_interval_seconds
+        self.profile = ProfileAggregate(profile_interval_seconds)
+        
+        # Slowest apps by total time and by stage (bounded, run-wide)
+        self.slow_apps = SlowAppTracker(slow_app_top_n)
+        
+        # Worker memory growth reports (tracemalloc diffs, RSS, gc), opt-in
+        self.memory_track_every = memory_track_every or 0
+        self.memory = MemoryGrowthAggregate()
+        
+        # Sampled post-extraction validation in a separate process fed by the workers, opt-in
+        self.validation_sample_rate = validation_sample_rate or 0.0
+        self.validate_quality_warnings = validate_quality_warnings
+        self.validation_queue_size = validation_queue_size
+        self.inline_validation = InlineValidationAggregate()
+        self._validation_service: Optional[InlineValidationService] = None
+        
         # Shared progress tracking
         self.manager = mp.Manager()
         self.progress_dict = self.manager.dict({
@@ -198,56 +274,58 @@ class ParallelCoordinator(BatchProcessorInterface):
             for i, (app_id, xml_content) in enumerate(xml_records, 1)
         ]
         
-        # Process in parallel using multiprocessing.Pool
-        results = []
-        try:
-            with mp.Pool(
-                processes=self.num_workers,
-                initializer=_init_worker,
-                initargs=(self.connection_string, self.mapping_contract_path, self.progress_dict, self.log_level, self.session_id, self.app_id_start, self.app_id_end, self.enable_instrumentation)
-            ) as pool:
-                
-                # Submit all work items
-                async_results = [
-                    pool.apply_async(_process_work_item, (work_item,))
-                    for work_item in work_items
-                ]
-                
-                # Collect results with progress tracking
-                for async_result in async_results:
-                    try:
-                        result = async_result.get(timeout=300)  # 5 minute timeout per item
-                        results.append(result)
-                        
-                        # Update progress
-                        self.progress_dict['completed_items'] += 1
-                        if result.success:
-                            self.progress_dict['successful_items'] += 1
-                        else:
-                            self.progress_dict['failed_items'] += 1
-                        
-                        # Log progress periodically
-                        if len(results) % 5 == 0 or len(results) == len(work_items):
-                            self._log_progress()
-                            
-                    except Exception as e:
-                        self.logger.error(f"Worker process failed: {e}")
-                        # Create failed result
-                        failed_result = WorkResult(
-                            sequence=len(results) + 1,
-                            app_id=0,
-                            success=False,
-                            error_stage='worker_process',
-                            error_message=str(e)
-                        )
-                        results.append(failed_result)
-                        self.progress_dict['completed_items'] += 1
-                        self.progress_dict['failed_items'] += 1
+        # Process in parallel on the persistent worker pool
+        results: List[Optional[WorkResult]] = [None] * len(work_items)
+        pool = self._get_pool()
+        events_before = len(pool.recycle_events)
+        stage_latency = StageHistograms()
+        validation_findings: List[Dict[str, Any]] = []
+        
+        def on_result(index: int, ok: bool, value: Any):
+            if ok:
+                result = value
+            else:
+                self.logger.error(f"Worker process failed: {value}")
+                result = WorkResult(
+                    sequence=work_items[index].sequence,
+                    app_id=work_items[index].app_id,
+                    success=False,
+                    error_stage='worker_process',
+                    error_message=str(value)
+                )
+            results[index] = result
+            stage_latency.record_all(result.stage_times)
+            self.live_state.record_result(result.success, result.error_stage, result.rows_by_table, result.stage_times)
+            self.profile.merge(result.profile_samples)
+            self.slow_apps.record(result.app_id, result.stage_times, _slow_app_details(result))
+            self.memory.merge(result.memory_report)
+            self.inline_validation.merge(result.validation_report)
+            if self._validation_service is not None:
+                validation_findings.extend(self.inline_validation.add_findings(self._validation_service.collect()))
+            
+            # Update progress
+            self.progress_dict['completed_items'] += 1
+            if result.success:
+                self.progress_dict['successful_items'] += 1
+            else:
+                self.progress_dict['failed_items'] += 1
+            
+            # Log progress periodically
+            completed = self.progress_dict['completed_items']
+            if completed % 5 == 0 or completed == len(work_items):
+                self._log_progress()
         
+        try:
+            pool.map(work_items, on_result=on_result)
         except Exception as e:
             self.logger.error(f"Parallel processing failed: {e}")
+            self.close()
             raise
         
+        batch_recycle_events = [event.to_dict() for event in pool.recycle_events[events_before:]]
+        if self._validation_service is not None:
+            validation_findings.extend(self.inline_validation.add_findings(self._validation_service.collect()))
+        
         # Calculate final metrics
         end_time = time.time()
         processing_time = end_time - start_time
@@ -270,6 +348,10 @@ class ParallelCoordinator(BatchProcessorInterface):
                 'avg_processing_time_per_record': processing_time / len(results) if results else 0,
                 'parallel_efficiency': self._calculate_parallel_efficiency(results, processing_time),
                 'worker_count': self.num_workers,
+                'worker_recycle_events': batch_recycle_events,
+                'worker_pool': pool.get_stats(),
+                'stage_latency': stage_latency,
+                'validation_findings': validation_findings,
                 'individual_results': [
                     (
                         {
@@ -311,6 +393,59 @@ class ParallelCoordinator(BatchProcessorInterface):
         
         return processing_result
     
+    def _get_pool(self) -> RecyclingWorkerPool:
+        """Create the worker pool on first use; later batches reuse the same (recycled) workers."""
+        if self._pool is None:
+            if (self.validation_sample_rate or self.validate_quality_warnings) and self._validation_service is None:
+                self._validation_service = InlineValidationService(
+                    self.mapping_contract_path, queue_size=self.validation_queue_size).start()
+            validation_queue = self._validation_service.tasks if self._validation_service is not None else None
+            self._pool = RecyclingWorkerPool(
+                num_workers=self.num_workers,
+                func=_process_work_item,
+                initializer=_init_worker,
+                initargs=(self.connection_string, self.mapping_contract_path, self.progress_dict, self.log_level, self.session_id, self.app_id_start, self.app_id_end, self.enable_instrumentation,
+                          self.profile_every, self.profile_interval_seconds, self.memory_track_every,
+                          self.validation_sample_rate, self.validate_quality_warnings, validation_queue),
+                max_tasks_per_worker=self.worker_max_tasks,
+                max_rss_growth_mb=self.worker_max_rss_growth_mb,
+                task_timeout=300  # 5 minute timeout per item
+            )
+            self._pool.start()
+        return self._pool
+    
+    def get_recycle_events(self) -> List[Dict[str, Any]]:
+        """All worker recycle/replacement events since the pool started."""
+        return [event.to_dict() for event in self._pool.recycle_events] if self._pool else []
+    
+    def get_pool_stats(self) -> Optional[Dict[str, Any]]:
+        """Worker pool counters (spawned workers, recycle reasons), or None before the first batch."""
+        return self._pool.get_stats() if self._pool else None
+    
+    def finish_inline_validation(self, timeout: float = DEFAULT_DRAIN_TIMEOUT_SECONDS) -> List[Dict[str, Any]]:
+        """
+        Stop the workers, then drain the validation processes: returns the findings not yet
+        reported in a batch result (merged into self.inline_validation, like batch findings).
+        Samples still unvalidated after timeout are counted as dropped at shutdown.
+        """
+        if self._validation_service is None:
+            return []
+        # Exiting workers flush the samples they queued, so the drain sees all of them
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        service, self._validation_service = self._validation_service, None
+        findings = self.inline_validation.add_findings(service.close(timeout))
+        self.inline_validation.record_shutdown(service.abandoned)
+        return findings
+    
+    def close(self):
+        """Shut down the worker pool (workers finish queued items first) and the validation processes."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        self.finish_inline_validation()
+    
     def _log_progress(self):
         """Log current progress with throughput metrics."""
         progress = dict(self.progress_dict)
@@ -369,6 +504,16 @@ class ParallelCoordinator(BatchProcessorInterface):
         return min(efficiency, 1.0)  # Cap at 100%
 
 
+def _slow_app_details(result: WorkResult) -> Dict[str, Any]:
+    """Facts stored with a slow-app entry."""
+    return {
+        'success': result.success,
+        'error_stage': result.error_stage,
+        'rows_by_table': result.rows_by_table or {},
+        **(result.app_facts or {})
+    }
+
+
 # Global worker state (initialized once per worker process)
 _worker_validator = None
 _worker_parser = None
@@ -379,9 +524,16 @@ _worker_session_id = None
 _worker_app_id_start = None
 _worker_app_id_end = None
 _worker_enable_instrumentation = False
+_worker_profile_every = 0
+_worker_sampler = None
+_worker_memory_tracker = None
+_worker_inline_validation = None
 
 
-def _init_worker(connection_string: str, mapping_contract_path: str, progress_dict, log_level: str = None, session_id: str = None, app_id_start: int = None, app_id_end: int = None, enable_instrumentation: bool = False):
+def _init_worker(connection_string: str, mapping_contract_path: str, progress_dict, log_level: str = None, session_id: str = None, app_id_start: int = None, app_id_end: int = None, enable_instrumentation: bool = False,
+                 profile_every: int = 0, profile_interval_seconds: float = DEFAULT_SAMPLE_INTERVAL_SECONDS,
+                 memory_track_every: int = 0, validation_sample_rate: float = 0.0,
+                 validate_quality_warnings: bool = False, validation_queue=None):
     """
     Initialize worker process with required components.
     
@@ -395,12 +547,19 @@ def _init_worker(connection_string: str, mapping_contract_path: str, progress_di
         session_id: Session identifier for processing_log tracking
         app_id_start: Starting app_id for range processing (for processing_log)
         app_id_end: Ending app_id for range processing (for processing_log)
+        profile_every: Stack-sample every Nth app (0 = no sampler thread at all)
+        profile_interval_seconds: Sampling interval for profiled apps
+        memory_track_every: Start tracemalloc and report memory growth every N apps (0 = off)
+        validation_sample_rate: Fraction of inserted apps queued for validation (0 = off)
+        validate_quality_warnings: Also queue inserted apps with data quality warnings
+        validation_queue: InlineValidationService.tasks (bounded; None = inline validation off)
     
     PERFORMANCE TUNING: Worker logging disabled for maximum performance.
     Only ERROR+ level logging is active in workers.
     """
     global _worker_validator, _worker_parser, _worker_mapper, _worker_migration_engine, _worker_progress_dict
     global _worker_session_id, _worker_app_id_start, _worker_app_id_end, _worker_enable_instrumentation
+    global _worker_profile_every, _worker_sampler, _worker_memory_tracker, _worker_inline_validation
     
     # Initialize worker processes with configurable logging (defaults to ERROR)
     import logging
@@ -412,12 +571,24 @@ def _init_worker(connection_string: str, mapping_contract_path: str, progress_di
         
     try:
         _worker_validator = PreProcessingValidator(mapping_contract_path=mapping_contract_path)
-        _worker_parser = XMLParser()
+        # Processing config carries the streaming threshold (XML_EXTRACTOR_STREAMING_THRESHOLD_BYTES)
+        from ..config.config_manager import get_config_manager
+        _worker_parser = XMLParser(config=get_config_manager().get_processing_config())
         _worker_mapper = DataMapper(mapping_contract_path=mapping_contract_path)
         _worker_migration_engine = MigrationEngine(connection_string, mapping_contract_path=mapping_contract_path)
         _worker_progress_dict = progress_dict
         # Worker-level instrumentation flag
         _worker_enable_instrumentation = bool(enable_instrumentation)
+        _worker_profile_every = profile_every or 0
+        _worker_sampler = StackSampler(profile_interval_seconds) if _worker_profile_every > 0 else None
+        if validation_queue is not None and (validation_sample_rate or validate_quality_warnings):
+            _worker_inline_validation = InlineValidationSampler(
+                validation_queue,
+                sample_rate=validation_sample_rate,
+                include_quality_warnings=validate_quality_warnings
+            )
+        else:
+            _worker_inline_validation = None
         
         # Store session metadata for processing_log
         _worker_session_id = session_id
@@ -432,13 +603,45 @@ def _init_worker(connection_string: str, mapping_contract_path: str, progress_di
             'failed': 0
         }
         
+        # Baseline taken after all components are loaded, so startup allocations are not "growth"
+        _worker_memory_tracker = MemoryGrowthTracker(memory_track_every).start() if memory_track_every else None
+        
     except Exception as e:
         logging.error(f"Worker initialization failed: {e}")
         raise
 
 
 def _process_work_item(work_item: WorkItem) -> WorkResult:
-    """Process a single work item in a worker process."""
+    """Process a single work item in a worker process, attaching its per-stage timings and facts."""
+    stage_times: Dict[str, float] = {}
+    app_facts: Dict[str, Any] = {'xml_chars': len(work_item.xml_content or ''), 'insert_paths': {}}
+    _worker_migration_engine.stage_timings = stage_times  # Collects duplicate_detection / insert.<table>
+    _worker_migration_engine.insert_paths = app_facts['insert_paths']
+    profiled = _worker_sampler is not None and work_item.app_id % _worker_profile_every == 0
+    if profiled:
+        _worker_sampler.begin()
+    try:
+        result = _process_work_item_stages(work_item, stage_times, app_facts)
+    finally:
+        _worker_migration_engine.stage_timings = None
+        _worker_migration_engine.insert_paths = None
+        profile_samples = _worker_sampler.end() if profiled else None
+    stage_times['total'] = result.processing_time
+    result.stage_times = stage_times
+    result.profile_samples = profile_samples
+    result.app_facts = app_facts
+    if _worker_memory_tracker is not None:
+        result.memory_report = _worker_memory_tracker.after_app()
+    if _worker_inline_validation is not None:
+        result.validation_report = _worker_inline_validation.report()
+    return result
+
+
+def _process_work_item_stages(work_item: WorkItem, stage_times: Dict[str, float],
+                              app_facts: Optional[Dict[str, Any]] = None) -> WorkResult:
+    """Validate, parse, map and insert one application, recording stage durations into stage_times."""
+    if app_facts is None:
+        app_facts = {}
     global _worker_validator, _worker_parser, _worker_mapper, _worker_migration_engine, _worker_progress_dict
     global _worker_session_id, _worker_app_id_start, _worker_app_id_end
     
@@ -451,6 +654,8 @@ def _process_work_item(work_item: WorkItem) -> WorkResult:
             work_item.xml_content,
             work_item.record_id
         )
+        stage_times['validation'] = time.time() - start_time
+        app_facts['contact_count'] = len(validation_result.valid_contacts or [])
         
         if not validation_result.is_valid or not validation_result.can_process:
             # Log validation failure to processing_log so app is not re-attempted
@@ -487,6 +692,8 @@ def _process_work_item(work_item: WorkItem) -> WorkResult:
         xml_data = _worker_parser.extract_elements(root)
         parse_end = time.time()
         parsing_duration = parse_end - parse_start
+        stage_times['parsing'] = parsing_duration
+        app_facts['element_count'] = len(xml_data) if xml_data else 0
         
         if root is None or not xml_data:
             # Log parsing failure to processing_log so app is not re-attempted
@@ -526,6 +733,7 @@ def _process_work_item(work_item: WorkItem) -> WorkResult:
         )
         mapping_end = time.time()
         mapping_duration = mapping_end - mapping_start
+        stage_times['mapping'] = mapping_duration
         if _worker_mapper.logger.isEnabledFor(logging.DEBUG):
             _worker_mapper.logger.debug(f"PERF Timing: Mapping logic for app_id {work_item.app_id} took {mapping_duration:.4f} seconds")
 
@@ -576,8 +784,9 @@ def _process_work_item(work_item: WorkItem) -> WorkResult:
         # Stage 4: Database Insertion
         # Direct blocking inserts with FK dependency ordering to prevent constraint violations
         db_insert_start = time.time()
-        insertion_results = _insert_mapped_data_with_fk_order(mapped_data)
+        insertion_results = _insert_mapped_data_with_fk_order(mapped_data, stage_times)
         db_insert_duration = time.time() - db_insert_start
+        stage_times['db_insert'] = db_insert_duration
         
         total_inserted = sum(insertion_results.values())
         
@@ -609,6 +818,14 @@ def _process_work_item(work_item: WorkItem) -> WorkResult:
                 processing_time=time.time() - start_time
             )
         
+        # Sampled post-extraction validation: only the enqueue happens on the hot path
+        if _worker_inline_validation is not None:
+            reasons = _worker_inline_validation.sample_reasons(work_item.app_id, quality_issues)
+            if reasons:
+                submit_start = time.time()
+                _worker_inline_validation.submit(work_item.app_id, work_item.xml_content, mapped_data, reasons)
+                stage_times['inline_validation_submit'] = time.time() - submit_start
+        
         # Update worker stats
         if worker_id in _worker_progress_dict['worker_stats']:
             _worker_progress_dict['worker_stats'][worker_id]['processed'] += 1
@@ -624,7 +841,8 @@ def _process_work_item(work_item: WorkItem) -> WorkResult:
             parsing_time=parsing_duration,
             db_insert_time=db_insert_duration,
             tables_populated=list(mapped_data.keys()),
-            quality_issues=quality_issues if quality_issues else None
+            quality_issues=quality_issues if quality_issues else None,
+            rows_by_table=insertion_results
         )
         
     except Exception as e:
@@ -683,7 +901,8 @@ def _process_work_item(work_item: WorkItem) -> WorkResult:
         )
 
 
-def _insert_mapped_data_with_fk_order(mapped_data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, int]:
+def _insert_mapped_data_with_fk_order(mapped_data: Dict[str, List[Dict[str, Any]]],
+                                     stage_times: Optional[Dict[str, float]] = None) -> Dict[str, int]:
     """
     Insert mapped data respecting FK dependency order with atomic transaction per application.
     
@@ -704,6 +923,7 @@ def _insert_mapped_data_with_fk_order(mapped_data: Dict[str, List[Dict[str, Any]
     
     Args:
         mapped_data: Dict of {table_name: [records]} from mapper
+        stage_times: Optional {stage: seconds} dict; receives the 'commit' duration
         
     Returns:
         Dict of {table_name: inserted_count} for each table processed
@@ -780,7 +1000,10 @@ def _insert_mapped_data_with_fk_order(mapped_data: Dict[str, List[Dict[str, Any]
                         insertion_results[table_name] = inserted_count
             
             # Commit transaction - all tables inserted successfully
+            commit_start = time.time()
             conn.commit()
+            if stage_times is not None:
+                stage_times['commit'] = time.time() - commit_start
             _worker_mapper.logger.debug(f"Committed transaction for application with {len(insertion_results)} tables")
             
         except Exception as e:
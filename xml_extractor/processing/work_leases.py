@@ -0,0 +1,318 @@
+"""
+Lease-Based Work Distribution - Dynamic app_id Block Claiming
+
+Replaces static modulo sharding (app_id % N == k) for multi-instance runs. The app_id range
+is split into fixed-size blocks in a shared lease table; each production_processor instance
+repeatedly claims the next free block, processes it, and marks it done. Fast instances simply
+claim more blocks, so one slow shard (e.g. a run of large RL apps) no longer sets the
+wall-clock time.
+
+LEASE LIFECYCLE:
+- pending -> leased (claim: instance_id + lease expiry) -> done (complete)
+- leased -> pending (release): an instance stopping early (--limit, error) hands back a
+  partly processed block so another instance can claim it without waiting for expiry
+- A leased block whose expiry has passed is claimable again (covers crashed instances);
+  the instance renews its lease after every batch, so live instances never lose a block
+- Processing is resume-safe (processing_log), so a re-claimed block only redoes what is left
+
+STORES:
+- SqlServerLeaseStore: [target_schema].[work_lease] table, claims via UPDLOCK/READPAST; the
+  table is created by the operator (config/samples/create_work_lease_table.sql)
+- SqliteLeaseStore: local single-file stand-in with the same semantics (tests, dev boxes)
+"""
+
+import sqlite3
+import time
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from ..exceptions import ConfigurationError
+
+
+# Default block size (app_ids per lease) and lease duration
+DEFAULT_BLOCK_SIZE = 1000
+DEFAULT_LEASE_SECONDS = 600
+
+
+@dataclass
+class LeaseBlock:
+    """A claimed block of app_ids (inclusive range)."""
+    run_id: str
+    block_id: int
+    start_id: int
+    end_id: int
+    instance_id: str
+    attempts: int = 1
+
+
+def plan_blocks(app_id_start: int, app_id_end: int, block_size: int) -> List[tuple]:
+    """Split an inclusive app_id range into (block_id, start_id, end_id) tuples."""
+    if block_size < 1:
+        raise ConfigurationError(f"Lease block size must be >= 1, got {block_size}")
+    if app_id_end < app_id_start:
+        raise ConfigurationError(f"Invalid lease range: {app_id_start} - {app_id_end}")
+    blocks = []
+    block_start = app_id_start
+    block_id = 0
+    while block_start <= app_id_end:
+        block_end = min(block_start + block_size - 1, app_id_end)
+        blocks.append((block_id, block_start, block_end))
+        block_start = block_end + 1
+        block_id += 1
+    return blocks
+
+
+class WorkLeaseStore(ABC):
+    """Shared lease table of app_id blocks for one or more runs."""
+
+    @abstractmethod
+    def initialize(self, run_id: str, app_id_start: int, app_id_end: int, block_size: int) -> int:
+        """Create the run's blocks if they do not exist yet (idempotent). Returns block count."""
+
+    @abstractmethod
+    def claim_next(self, run_id: str, instance_id: str, lease_seconds: int) -> Optional[LeaseBlock]:
+        """Atomically lease the lowest pending (or expired) block, or None when no work is left."""
+
+    @abstractmethod
+    def renew(self, block: LeaseBlock, lease_seconds: int) -> bool:
+        """Extend a held lease. Returns False if the block was re-claimed by another instance."""
+
+    @abstractmethod
+    def complete(self, block: LeaseBlock, processed_count: int) -> bool:
+        """Mark a held block done. Returns False if the block was re-claimed by another instance."""
+
+    @abstractmethod
+    def release(self, block: LeaseBlock) -> bool:
+        """Hand a held, unfinished block back as pending. Returns False if it was re-claimed by another instance."""
+
+    @abstractmethod
+    def get_lease_rows(self, run_id: str) -> List[Dict[str, Any]]:
+        """All blocks of a run as dicts (for reporting)."""
+
+
+class SqliteLeaseStore(WorkLeaseStore):
+    """
+    Local SQLite lease table - stand-in for the shared SQL Server table.
+
+    Safe for several processes on one machine: claims run inside BEGIN IMMEDIATE, which
+    takes SQLite's write lock, so two instances can never lease the same block.
+    """
+
+    _COLUMNS = ('run_id', 'block_id', 'start_id', 'end_id', 'status', 'instance_id',
+                'lease_expires_at', 'attempts', 'claimed_at', 'completed_at', 'processed_count')
+
+    def __init__(self, db_path: str, clock: Callable[[], float] = time.time):
+        self.db_path = str(db_path)
+        self._clock = clock
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS work_lease (
+                    run_id TEXT NOT NULL,
+                    block_id INTEGER NOT NULL,
+                    start_id INTEGER NOT NULL,
+                    end_id INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    instance_id TEXT,
+                    lease_expires_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    claimed_at REAL,
+                    completed_at REAL,
+                    processed_count INTEGER,
+                    PRIMARY KEY (run_id, block_id)
+                )
+            """)
+
+    @contextmanager
+    def _transaction(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def initialize(self, run_id: str, app_id_start: int, app_id_end: int, block_size: int) -> int:
+        blocks = plan_blocks(app_id_start, app_id_end, block_size)
+        with self._transaction() as conn:
+            existing = conn.execute("SELECT COUNT(*) FROM work_lease WHERE run_id = ?", (run_id,)).fetchone()[0]
+            if existing:
+                return existing
+            conn.executemany(
+                "INSERT INTO work_lease (run_id, block_id, start_id, end_id) VALUES (?, ?, ?, ?)",
+                [(run_id, block_id, start_id, end_id) for block_id, start_id, end_id in blocks]
+            )
+        return len(blocks)
+
+    def claim_next(self, run_id: str, instance_id: str, lease_seconds: int) -> Optional[LeaseBlock]:
+        with self._transaction() as conn:
+            now = self._clock()
+            row = conn.execute("""
+                SELECT block_id, start_id, end_id, attempts FROM work_lease
+                WHERE run_id = ? AND (status = 'pending' OR (status = 'leased' AND lease_expires_at < ?))
+                ORDER BY block_id LIMIT 1
+            """, (run_id, now)).fetchone()
+            if row is None:
+                return None
+            block_id, start_id, end_id, attempts = row
+            conn.execute("""
+                UPDATE work_lease
+                SET status = 'leased', instance_id = ?, lease_expires_at = ?, attempts = ?, claimed_at = ?
+                WHERE run_id = ? AND block_id = ?
+            """, (instance_id, now + lease_seconds, attempts + 1, now, run_id, block_id))
+        return LeaseBlock(run_id, block_id, start_id, end_id, instance_id, attempts + 1)
+
+    def renew(self, block: LeaseBlock, lease_seconds: int) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE work_lease SET lease_expires_at = ?
+                WHERE run_id = ? AND block_id = ? AND instance_id = ? AND status = 'leased'
+            """, (self._clock() + lease_seconds, block.run_id, block.block_id, block.instance_id))
+            return cursor.rowcount == 1
+
+    def complete(self, block: LeaseBlock, processed_count: int) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE work_lease SET status = 'done', completed_at = ?, processed_count = ?
+                WHERE run_id = ? AND block_id = ? AND instance_id = ? AND status = 'leased'
+            """, (self._clock(), processed_count, block.run_id, block.block_id, block.instance_id))
+            return cursor.rowcount == 1
+
+    def release(self, block: LeaseBlock) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE work_lease SET status = 'pending', instance_id = NULL, lease_expires_at = NULL
+                WHERE run_id = ? AND block_id = ? AND instance_id = ? AND status = 'leased'
+            """, (block.run_id, block.block_id, block.instance_id))
+            return cursor.rowcount == 1
+
+    def get_lease_rows(self, run_id: str) -> List[Dict[str, Any]]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            rows = conn.execute(f"SELECT {', '.join(self._COLUMNS)} FROM work_lease WHERE run_id = ? ORDER BY block_id",
+                                (run_id,)).fetchall()
+        finally:
+            conn.close()
+        return [dict(zip(self._COLUMNS, row)) for row in rows]
+
+
+class SqlServerLeaseStore(WorkLeaseStore):
+    """
+    Shared lease table in SQL Server ([target_schema].[work_lease]).
+
+    Args:
+        connection_factory: Context manager yielding a pyodbc connection with autocommit off
+                           (e.g. MigrationEngine.get_connection)
+        target_schema: Schema holding the lease table (same schema as processing_log)
+
+    Raises:
+        ConfigurationError: if the lease table has not been created in target_schema
+
+    Claims use UPDATE ... WITH (UPDLOCK, READPAST, ROWLOCK) so concurrent instances skip rows
+    another instance is claiming instead of blocking on them. Times are stored as epoch
+    seconds from the database clock so instances on different hosts agree on expiry.
+    """
+
+    _EPOCH_NOW = "CAST(DATEDIFF_BIG(millisecond, '1970-01-01', SYSUTCDATETIME()) AS FLOAT) / 1000.0"
+
+    def __init__(self, connection_factory, target_schema: str = 'dbo'):
+        self._connect = connection_factory
+        self.table = f"[{target_schema}].[work_lease]"
+        # The table is created outside the application (config/samples/create_work_lease_table.sql)
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT OBJECT_ID(?, N'U')", f"{target_schema}.work_lease")
+            exists = cursor.fetchone()[0] is not None
+            conn.commit()
+        if not exists:
+            raise ConfigurationError(
+                f"Lease table {self.table} does not exist. Create it with "
+                f"config/samples/create_work_lease_table.sql (in schema '{target_schema}') before a leased run, "
+                f"or use --lease-db for a local SQLite lease file."
+            )
+
+    def initialize(self, run_id: str, app_id_start: int, app_id_end: int, block_size: int) -> int:
+        blocks = plan_blocks(app_id_start, app_id_end, block_size)
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            # HOLDLOCK serializes concurrent initializers of the same run
+            cursor.execute(f"SELECT COUNT(*) FROM {self.table} WITH (UPDLOCK, HOLDLOCK) WHERE run_id = ?", run_id)
+            existing = cursor.fetchone()[0]
+            if existing:
+                conn.commit()
+                return existing
+            cursor.fast_executemany = True
+            cursor.executemany(
+                f"INSERT INTO {self.table} (run_id, block_id, start_id, end_id) VALUES (?, ?, ?, ?)",
+                [(run_id, block_id, start_id, end_id) for block_id, start_id, end_id in blocks]
+            )
+            conn.commit()
+        return len(blocks)
+
+    def claim_next(self, run_id: str, instance_id: str, lease_seconds: int) -> Optional[LeaseBlock]:
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                WITH next_block AS (
+                    SELECT TOP (1) * FROM {self.table} WITH (UPDLOCK, READPAST, ROWLOCK)
+                    WHERE run_id = ? AND (status = 'pending' OR (status = 'leased' AND lease_expires_at < {self._EPOCH_NOW}))
+                    ORDER BY block_id
+                )
+                UPDATE next_block
+                SET status = 'leased', instance_id = ?, lease_expires_at = {self._EPOCH_NOW} + ?,
+                    attempts = attempts + 1, claimed_at = {self._EPOCH_NOW}
+                OUTPUT inserted.block_id, inserted.start_id, inserted.end_id, inserted.attempts;
+            """, run_id, instance_id, lease_seconds)
+            row = cursor.fetchone()
+            conn.commit()
+        if row is None:
+            return None
+        return LeaseBlock(run_id, row[0], row[1], row[2], instance_id, row[3])
+
+    def renew(self, block: LeaseBlock, lease_seconds: int) -> bool:
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                UPDATE {self.table} SET lease_expires_at = {self._EPOCH_NOW} + ?
+                WHERE run_id = ? AND block_id = ? AND instance_id = ? AND status = 'leased'
+            """, lease_seconds, block.run_id, block.block_id, block.instance_id)
+            renewed = cursor.rowcount == 1
+            conn.commit()
+        return renewed
+
+    def complete(self, block: LeaseBlock, processed_count: int) -> bool:
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                UPDATE {self.table} SET status = 'done', completed_at = {self._EPOCH_NOW}, processed_count = ?
+                WHERE run_id = ? AND block_id = ? AND instance_id = ? AND status = 'leased'
+            """, processed_count, block.run_id, block.block_id, block.instance_id)
+            completed = cursor.rowcount == 1
+            conn.commit()
+        return completed
+
+    def release(self, block: LeaseBlock) -> bool:
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                UPDATE {self.table} SET status = 'pending', instance_id = NULL, lease_expires_at = NULL
+                WHERE run_id = ? AND block_id = ? AND instance_id = ? AND status = 'leased'
+            """, block.run_id, block.block_id, block.instance_id)
+            released = cursor.rowcount == 1
+            conn.commit()
+        return released
+
+    def get_lease_rows(self, run_id: str) -> List[Dict[str, Any]]:
+        columns = SqliteLeaseStore._COLUMNS
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {', '.join(columns)} FROM {self.table} WHERE run_id = ? ORDER BY block_id", run_id)
+            rows = cursor.fetchall()
+        return [dict(zip(columns, row)) for row in rows]
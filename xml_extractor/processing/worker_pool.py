@@ -0,0 +1,396 @@
+"""
+Recycling Worker Pool - Persistent Workers with Memory/Task-Triggered Replacement
+
+Long runs degrade as worker processes accumulate lxml caches, pyodbc metadata and type
+caches (see performance_tuning/DEGRADATION_INVESTIGATION_LOG.md). Restarting a whole
+production_processor.py every chunk fixes that but pays full startup (interpreter, contract
+load, connections) for every worker each time. This pool instead keeps workers alive across
+batches and replaces a single worker once it has grown too much:
+
+- RSS growth: worker RSS (psutil) minus its RSS right after initialization exceeds a limit
+- Task count: the worker has processed a fixed number of items
+
+RECYCLING WITHOUT A THROUGHPUT DIP:
+    The worker checks its thresholds after each item. When one is crossed it announces
+    'retiring' and keeps working through the items already queued to it; the pool stops
+    dispatching to it and immediately starts the replacement, which initializes in the
+    background while every other worker (and the retiring one) keeps processing.
+
+DISPATCH:
+    Each worker has its own inbox with a small prefetch depth, so the pool always knows which
+    items a worker holds. Items held by a worker that dies (or exceeds the item timeout) are
+    reported as lost; items it never started are re-dispatched to other workers. Workers
+    report back over their own pipe with synchronous sends, so every result written before a
+    crash is received (a queue's background feeder thread would drop it).
+"""
+
+import logging
+import multiprocessing as mp
+import os
+import time
+
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import psutil
+
+
+# Items queued per worker ahead of the one it is working on
+PREFETCH_PER_WORKER = 2
+
+
+@dataclass
+class RecycleEvent:
+    """A worker replacement (recycle or crash) for metrics."""
+    timestamp: float
+    worker_pid: int
+    reason: str              # 'rss_growth', 'task_count', 'crash', 'timeout'
+    tasks_completed: int
+    rss_mb: float = 0.0
+    rss_growth_mb: float = 0.0
+    replacement_pid: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'timestamp': self.timestamp,
+            'worker_pid': self.worker_pid,
+            'reason': self.reason,
+            'tasks_completed': self.tasks_completed,
+            'rss_mb': round(self.rss_mb, 1),
+            'rss_growth_mb': round(self.rss_growth_mb, 1),
+            'replacement_pid': self.replacement_pid
+        }
+
+
+class WorkerLostError(Exception):
+    """Item could not be completed because its worker died or timed out."""
+
+
+@dataclass
+class _WorkerHandle:
+    process: Any
+    inbox: Any
+    results: Any
+    assigned: Deque[int] = field(default_factory=deque)
+    retiring: bool = False
+    ready: bool = False
+    tasks_completed: int = 0
+    last_progress: float = field(default_factory=time.time)
+
+
+def _worker_main(slot: int, inbox, outbox, func: Callable, initializer: Optional[Callable], initargs: tuple,
+                 max_tasks: Optional[int], max_rss_growth_bytes: Optional[int]):
+    """Worker process loop: initialize once, process items until told to stop."""
+    pid = os.getpid()
+    try:
+        if initializer is not None:
+            initializer(*initargs)
+    except BaseException as e:
+        outbox.send(('init_failed', slot, pid, repr(e)))
+        return
+
+    process = psutil.Process(pid)
+    baseline_rss = process.memory_info().rss
+    outbox.send(('ready', slot, pid, baseline_rss))
+
+    completed = 0
+    announced = False
+    while True:
+        task = inbox.get()
+        if task is None:
+            break
+        task_id, item = task
+        try:
+            outbox.send(('done', slot, task_id, True, func(item)))
+        except BaseException as e:
+            outbox.send(('done', slot, task_id, False, repr(e)))
+        completed += 1
+
+        if not announced:
+            reason = None
+            rss = 0
+            if max_tasks and completed >= max_tasks:
+                reason = 'task_count'
+            if max_rss_growth_bytes:
+                rss = process.memory_info().rss
+                if reason is None and rss - baseline_rss >= max_rss_growth_bytes:
+                    reason = 'rss_growth'
+            if reason:
+                announced = True
+                outbox.send(('retiring', slot, pid, reason, completed, rss or process.memory_info().rss, baseline_rss))
+
+    outbox.send(('exited', slot, pid, completed))
+
+
+class RecyclingWorkerPool:
+    """
+    Fixed-size pool of persistent worker processes with background recycling.
+
+    Args:
+        num_workers: Number of active workers
+        func: Module-level function applied to each item (runs in the worker)
+        initializer: Module-level function run once in each worker before any item
+        initargs: Arguments for initializer
+        max_tasks_per_worker: Recycle a worker after this many items (None/0 = never)
+        max_rss_growth_mb: Recycle a worker once its RSS grew this much since init (None/0 = never)
+        task_timeout: Seconds a worker may go without finishing an item before it is replaced
+    """
+
+    def __init__(self, num_workers: int, func: Callable, initializer: Optional[Callable] = None,
+                 initargs: tuple = (), max_tasks_per_worker: Optional[int] = None,
+                 max_rss_growth_mb: Optional[float] = None, task_timeout: float = 300.0):
+        self.logger = logging.getLogger(__name__)
+        self.num_workers = max(1, num_workers)
+        self.func = func
+        self.initializer = initializer
+        self.initargs = initargs
+        self.max_tasks_per_worker = max_tasks_per_worker or None
+        self.max_rss_growth_bytes = int(max_rss_growth_mb * 1024 * 1024) if max_rss_growth_mb else None
+        self.task_timeout = task_timeout
+
+        self._workers: Dict[int, _WorkerHandle] = {}
+        self._next_slot = 0
+        self._started = False
+        self._on_result = None
+        self._pending: Optional[Deque[int]] = None  # Items not yet dispatched (during map)
+
+        self.recycle_events: List[RecycleEvent] = []
+        self.workers_spawned = 0
+
+    # ------------------------------------------------------------------ lifecycle
+
+    def _spawn(self) -> _WorkerHandle:
+        slot = self._next_slot
+        self._next_slot += 1
+        inbox = mp.Queue()
+        reader, writer = mp.Pipe(duplex=False)
+        process = mp.Process(
+            target=_worker_main,
+            args=(slot, inbox, writer, self.func, self.initializer, self.initargs,
+                  self.max_tasks_per_worker, self.max_rss_growth_bytes),
+            daemon=True
+        )
+        process.start()
+        writer.close()  # The worker owns the write end
+        handle = _WorkerHandle(process=process, inbox=inbox, results=reader)
+        self._workers[slot] = handle
+        self.workers_spawned += 1
+        return handle
+
+    def start(self):
+        """Start the workers (called automatically by map)."""
+        if self._started:
+            return
+        for _ in range(self.num_workers):
+            self._spawn()
+        self._started = True
+
+    def close(self, timeout: float = 10.0):
+        """Stop all workers (finishing queued items first)."""
+        for handle in self._workers.values():
+            if handle.process.is_alive():
+                handle.inbox.put(None)
+        deadline = time.time() + timeout
+        for handle in self._workers.values():
+            handle.process.join(max(0.0, deadline - time.time()))
+            if handle.process.is_alive():
+                handle.process.terminate()
+                handle.process.join(1)
+            handle.results.close()
+        self._workers.clear()
+        self._started = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_load(self) -> Dict[str, Any]:
+        """Queued/in-flight item counts and live worker pids (safe to call from another thread)."""
+        handles = list(self._workers.values())
+        pending = self._pending
+        return {
+            'queued': len(pending) if pending is not None else 0,
+            'in_flight': sum(len(h.assigned) for h in handles),
+            'worker_pids': [h.process.pid for h in handles if h.process.pid is not None]
+        }
+
+    @property
+    def worker_pids(self) -> List[int]:
+        return [h.process.pid for h in self._workers.values() if not h.retiring]
+
+    # ------------------------------------------------------------------ processing
+
+    def map(self, items: List[Any],
+            on_result: Optional[Callable[[int, bool, Any], None]] = None) -> List[Tuple[bool, Any]]:
+        """
+        Process items on the pool.
+
+        Args:
+            items: Picklable items passed to func one at a time
+            on_result: Called in this process as on_result(index, ok, value) when each item finishes
+
+        Returns:
+            One (ok, value) pair per item, in input order. ok=False carries the exception
+            repr raised by func, or a WorkerLostError when the item's worker died/timed out.
+        """
+        self.start()
+        self._on_result = on_result
+        results: List[Optional[Tuple[bool, Any]]] = [None] * len(items)
+        pending: Deque[int] = deque(range(len(items)))
+        self._pending = pending
+        remaining = len(items)
+
+        while remaining:
+            self._dispatch(pending, items)
+            connections = {h.results: h for h in self._workers.values()}
+            ready = wait(list(connections), timeout=0.5)
+            for connection in ready:
+                try:
+                    message = connection.recv()
+                except (EOFError, OSError):
+                    connections[connection].process.join(1)  # Pipe closed - the worker is exiting
+                    continue
+                remaining -= self._handle_message(message, pending, results)
+            remaining -= self._check_workers(pending, results)
+
+        self._pending = None
+        return results
+
+    def _dispatch(self, pending: Deque[int], items: List[Any]):
+        """Top up each active worker's inbox to the prefetch depth."""
+        for handle in self._workers.values():
+            if handle.retiring:
+                continue
+            if pending and not handle.assigned:
+                handle.last_progress = time.time()  # Idle until now - start its timeout clock
+            while pending and len(handle.assigned) < PREFETCH_PER_WORKER:
+                task_id = pending.popleft()
+                handle.assigned.append(task_id)
+                handle.inbox.put((task_id, items[task_id]))
+            if not pending:
+                return
+
+    def _handle_message(self, message: tuple, pending: Deque[int], results: list) -> int:
+        """Apply one worker message; returns the number of items completed by it."""
+        kind, slot = message[0], message[1]
+        handle = self._workers.get(slot)
+
+        if kind == 'done':
+            _, _, task_id, ok, value = message
+            if handle is not None:
+                if task_id in handle.assigned:
+                    handle.assigned.remove(task_id)
+                handle.tasks_completed += 1
+                handle.last_progress = time.time()
+            if results[task_id] is None:
+                self._record(results, task_id, ok, value)
+                return 1
+            return 0
+
+        if kind == 'ready':
+            if handle is not None:
+                handle.ready = True
+                handle.last_progress = time.time()
+            return 0
+
+        if kind == 'retiring':
+            _, _, pid, reason, completed, rss, baseline_rss = message
+            if handle is not None and not handle.retiring:
+                # Stop feeding it, let it finish what it holds, and start the replacement now
+                handle.retiring = True
+                handle.inbox.put(None)
+                replacement = self._spawn()
+                event = RecycleEvent(time.time(), pid, reason, completed, rss / 1048576,
+                                     (rss - baseline_rss) / 1048576, replacement.process.pid)
+                self.recycle_events.append(event)
+                self.logger.info(f"Recycling worker {pid} ({reason}: {completed} items, "
+                                 f"RSS +{event.rss_growth_mb:.0f} MB) -> replacement {replacement.process.pid}")
+            return 0
+
+        if kind == 'exited':
+            if handle is not None:
+                handle.process.join(5)
+                handle.results.close()
+                # Anything still assigned was never started - hand it to other workers
+                pending.extendleft(reversed(handle.assigned))
+                del self._workers[slot]
+            return 0
+
+        if kind == 'init_failed':
+            _, _, pid, error = message
+            self.close()
+            raise RuntimeError(f"Worker {pid} failed to initialize: {error}")
+
+        return 0
+
+    def _drain(self, handle: _WorkerHandle, pending: Deque[int], results: list) -> int:
+        """Handle every message left in a dead worker's pipe; returns items completed."""
+        completed = 0
+        try:
+            while handle.results.poll():
+                completed += self._handle_message(handle.results.recv(), pending, results)
+        except (EOFError, OSError):
+            pass
+        return completed
+
+    def _record(self, results: list, task_id: int, ok: bool, value: Any):
+        results[task_id] = (ok, value)
+        if self._on_result is not None:
+            self._on_result(task_id, ok, value)
+
+    def _check_workers(self, pending: Deque[int], results: list) -> int:
+        """Replace workers that died or stopped making progress; returns items completed or failed as lost."""
+        lost = 0
+        now = time.time()
+        for slot, handle in list(self._workers.items()):
+            alive = handle.process.is_alive()
+            stuck = alive and handle.ready and handle.assigned and now - handle.last_progress > self.task_timeout
+            if alive and not stuck:
+                continue
+            if not alive:
+                # Results sent before it died are still in the pipe
+                lost += self._drain(handle, pending, results)
+                if slot not in self._workers:
+                    continue  # Its 'exited' message was among them
+
+            reason = 'timeout' if stuck else 'crash'
+            if stuck:
+                handle.process.terminate()
+            handle.process.join(1)
+            handle.results.close()
+            del self._workers[slot]
+
+            # The item at the head was in progress; the rest were never started
+            if handle.assigned:
+                in_progress = handle.assigned.popleft()
+                if results[in_progress] is None:
+                    self._record(results, in_progress, False, WorkerLostError(
+                        f"Worker {handle.process.pid} {'timed out' if stuck else 'exited unexpectedly'} "
+                        f"(exit code {handle.process.exitcode})"))
+                    lost += 1
+                pending.extendleft(reversed(handle.assigned))
+
+            # A retiring worker already has its replacement
+            replacement = None if handle.retiring else self._spawn()
+            self.recycle_events.append(RecycleEvent(now, handle.process.pid, reason, handle.tasks_completed,
+                                                    replacement_pid=replacement.process.pid if replacement else None))
+            self.logger.warning(f"Worker {handle.process.pid} replaced ({reason})")
+        return lost
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool counters for metrics."""
+        reasons: Dict[str, int] = {}
+        for event in self.recycle_events:
+            reasons[event.reason] = reasons.get(event.reason, 0) + 1
+        return {
+            'workers_spawned': self.workers_spawned,
+            'recycle_count': len(self.recycle_events),
+            'recycle_reasons': reasons,
+            'max_tasks_per_worker': self.max_tasks_per_worker,
+            'max_rss_growth_mb': (self.max_rss_growth_bytes / 1048576) if self.max_rss_growth_bytes else None
+        }
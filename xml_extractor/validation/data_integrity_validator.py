@@ -28,7 +28,9 @@ import logging
 import time
 import uuid
 
-from typing import Dict, List, Any, Optional, Set
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Sequence, Set, Tuple
 from datetime import datetime
 
 from ..models import MappingContract
@@ -43,6 +45,56 @@ from .validation_models import (
 )
 
 
+# (source_xml_data, extracted_tables, source_record_id) for one app in a validate_extraction_batch call
+BatchItem = Tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]], Optional[str]]
+
+# Types _is_value_of_expected_type actually checks; any other declared type accepts every value
+_CHECKED_TYPES = ('int', 'smallint', 'bigint', 'tinyint', 'float', 'bit', 'varchar', 'char', 'nvarchar',
+                  'nchar', 'datetime', 'smalldatetime', 'date')
+
+
+@dataclass(frozen=True)
+class ColumnRule:
+    """Constraint rule for one target column, resolved once from the mapping contract."""
+    expected_type: Optional[str] = None     # None: no type check applies
+    max_length: Optional[int] = None        # None: no length check applies
+
+
+class ContractRules:
+    """
+    Per-column type/length rules and field-level check paths, precomputed from a mapping contract.
+
+    Resolves exactly what the per-record lookups (_get_expected_type_for_field,
+    _get_max_length_for_field) would return, so batch and per-app validation agree; columns
+    without any applicable rule are absent from `columns`.
+    """
+
+    def __init__(self, validator: 'DataIntegrityValidator', mapping_contract: MappingContract):
+        self.mapping_contract = mapping_contract
+        mappings = mapping_contract.mappings or []
+
+        expected_types: Dict[str, Optional[str]] = {}
+        max_lengths: Dict[str, int] = {}
+        for mapping in mappings:
+            expected_types.setdefault(mapping.target_column, mapping.data_type)
+            if mapping.target_column not in max_lengths:
+                length = validator._get_max_length_for_field(mapping.target_column, mapping_contract)
+                if length:
+                    max_lengths[mapping.target_column] = length
+
+        self.columns: Dict[str, ColumnRule] = {}
+        for column, expected_type in expected_types.items():
+            checked = expected_type if expected_type and (
+                expected_type in _CHECKED_TYPES or expected_type.startswith('decimal')) else None
+            if checked or column in max_lengths:
+                self.columns[column] = ColumnRule(expected_type=checked, max_length=max_lengths.get(column))
+
+        # Field-level consistency: same sample as _validate_field_level_consistency, paths pre-split
+        self.field_checks: List[Tuple[Any, List[str]]] = [
+            (mapping, mapping.xml_path.strip('/').split('/')) for mapping in mappings[:20]
+        ]
+
+
 class DataIntegrityValidator:
     """
     Core validation engine for comprehensive post-extraction checks (Not yet deployed to production).
@@ -77,7 +129,13 @@ class DataIntegrityValidator:
         """
         self.logger = logging.getLogger(__name__)
         self.config = config or ValidationConfig()
+        self._contract_rules: Optional[ContractRules] = None
 
+    def rules_for(self, mapping_contract: MappingContract) -> ContractRules:
+        """Precomputed column rules for a contract (cached for the last contract seen)."""
+        if self._contract_rules is None or self._contract_rules.mapping_contract is not mapping_contract:
+            self._contract_rules = ContractRules(self, mapping_contract)
+        return self._contract_rules
         
     def validate_extraction_results(
         self,
@@ -179,12 +237,228 @@ class DataIntegrityValidator:
         
         return result
     
+    def validate_extraction_batch(
+        self,
+        batch: Sequence[BatchItem],
+        mapping_contract: MappingContract
+    ) -> List[ValidationResult]:
+        """
+        Validate many apps' extraction results at once; one ValidationResult per app, in batch order.
+
+        Produces the same errors, counts and pass/fail outcome as calling validate_extraction_results
+        per app, but constraint compliance (required fields, data types, lengths, business rules)
+        runs as one columnar pass per table over all apps' rows, against per-column rules resolved
+        once per contract (see ContractRules). Errors within a result are grouped by check rather
+        than by record. Each app's execution_time_ms includes an equal share of the columnar pass.
+
+        Args:
+            batch: (source_xml_data, extracted_tables, source_record_id) per app
+            mapping_contract: FieldMapping definitions used during extraction
+
+        Returns:
+            List of ValidationResult, one per batch item
+        """
+        rules = self.rules_for(mapping_contract)
+        results: List[ValidationResult] = []
+        elapsed_ms: List[float] = []
+        failed: Set[int] = set()  # apps whose checks raised; like the per-app path, no further checks run
+
+        for source_xml_data, extracted_tables, source_record_id in batch:
+            start_time = time.time()
+            result = ValidationResult(
+                validation_id=str(uuid.uuid4()),
+                timestamp=datetime.now(),
+                source_record_id=source_record_id
+            )
+            result.total_records_validated = sum(len(records) for records in extracted_tables.values())
+            try:
+                if self.config.enable_end_to_end_validation:
+                    self._validate_end_to_end_consistency(
+                        source_xml_data, extracted_tables, mapping_contract, result, rules.field_checks
+                    )
+                if self.config.enable_referential_integrity:
+                    self._validate_referential_integrity(extracted_tables, result)
+            except Exception as e:
+                self._add_validation_failure(result, e)
+                failed.add(len(results))
+            results.append(result)
+            elapsed_ms.append((time.time() - start_time) * 1000)
+
+        active = [index for index in range(len(results)) if index not in failed]
+        if self.config.enable_constraint_compliance and active:
+            start_time = time.time()
+            self._validate_constraint_compliance_batch(batch, results, active, rules)
+            share_ms = (time.time() - start_time) * 1000 / len(active)
+            for index in active:
+                elapsed_ms[index] += share_ms
+
+        for index, (source_xml_data, extracted_tables, _) in enumerate(batch):
+            start_time = time.time()
+            result = results[index]
+            if index not in failed:
+                try:
+                    if self.config.enable_data_quality_checks:
+                        self._calculate_data_quality_metrics(
+                            source_xml_data, extracted_tables, mapping_contract, result
+                        )
+                except Exception as e:
+                    self._add_validation_failure(result, e)
+                    failed.add(index)
+            if index not in failed:
+                result.validation_passed = (
+                    result.total_errors == 0 if self.config.strict_mode
+                    else not result.has_critical_errors
+                )
+            result.execution_time_ms = elapsed_ms[index] + (time.time() - start_time) * 1000
+            result.generate_summary()
+
+        self.logger.info(
+            f"Batch validation completed: {len(results)} apps, "
+            f"{sum(1 for r in results if not r.validation_passed)} failed"
+        )
+        return results
+
+    def _add_validation_failure(self, result: ValidationResult, e: Exception) -> None:
+        """Record an unexpected validation exception the way validate_extraction_results does."""
+        self.logger.error(f"Validation {result.validation_id} failed with exception: {e}")
+        result.add_error(ValidationError(
+            error_type=ValidationType.DATA_INTEGRITY,
+            severity=ValidationSeverity.CRITICAL,
+            message=f"Validation process failed: {e}"
+        ))
+        result.validation_passed = False
+
+    def _validate_constraint_compliance_batch(
+        self,
+        batch: Sequence[BatchItem],
+        results: List[ValidationResult],
+        app_indexes: List[int],
+        rules: ContractRules
+    ) -> None:
+        """Columnar constraint compliance: each table's rows from the given apps, checked column by column."""
+        check_results = {
+            app_index: IntegrityCheckResult(check_name="Constraint Compliance", passed=True) for app_index in app_indexes
+        }
+
+        try:
+            # table -> [(app_index, record_index, record)]
+            rows_by_table: Dict[str, List[Tuple[int, int, Dict[str, Any]]]] = defaultdict(list)
+            for app_index in app_indexes:
+                extracted_tables = batch[app_index][1]
+                for table_name, records in extracted_tables.items():
+                    rows_by_table[table_name].extend(
+                        (app_index, record_index, record) for record_index, record in enumerate(records)
+                    )
+                check_results[app_index].records_checked = sum(len(records) for records in extracted_tables.values())
+
+            def report(app_index: int, error: ValidationError, is_error: bool) -> None:
+                results[app_index].add_error(error)
+                if is_error:
+                    check_results[app_index].errors_found += 1
+                    check_results[app_index].passed = False
+                else:
+                    check_results[app_index].warnings_found += 1
+
+            for table_name, rows in rows_by_table.items():
+                # Required fields (NOT NULL constraints)
+                for field_name in self._get_required_fields_for_table(table_name):
+                    for app_index, record_index, record in rows:
+                        field_value = record.get(field_name)
+                        if field_value is None or field_value == '':
+                            report(app_index, ValidationError(
+                                error_type=ValidationType.CONSTRAINT_COMPLIANCE,
+                                severity=ValidationSeverity.ERROR,
+                                message=f"Required field '{field_name}' is null or empty",
+                                table_name=table_name,
+                                record_index=record_index,
+                                field_name=field_name,
+                                actual_value=field_value
+                            ), True)
+
+                # Data types and lengths, only for columns that have a rule
+                present_columns = set()
+                for _, _, record in rows:
+                    present_columns.update(record)
+                for field_name in present_columns & rules.columns.keys():
+                    rule = rules.columns[field_name]
+                    for app_index, record_index, record in rows:
+                        if field_name not in record:
+                            continue
+                        field_value = record[field_name]
+                        if field_value is None:
+                            continue
+                        if rule.expected_type and not self._is_value_of_expected_type(field_value, rule.expected_type):
+                            report(app_index, ValidationError(
+                                error_type=ValidationType.CONSTRAINT_COMPLIANCE,
+                                severity=ValidationSeverity.WARNING,
+                                message=f"Data type mismatch: expected {rule.expected_type}, got {type(field_value).__name__}",
+                                table_name=table_name,
+                                record_index=record_index,
+                                field_name=field_name,
+                                expected_value=rule.expected_type,
+                                actual_value=type(field_value).__name__
+                            ), False)
+                        if rule.max_length and isinstance(field_value, str) and len(field_value) > rule.max_length:
+                            report(app_index, ValidationError(
+                                error_type=ValidationType.CONSTRAINT_COMPLIANCE,
+                                severity=ValidationSeverity.ERROR,
+                                message=f"Field length exceeds maximum: {len(field_value)} > {rule.max_length}",
+                                table_name=table_name,
+                                record_index=record_index,
+                                field_name=field_name,
+                                expected_value=rule.max_length,
+                                actual_value=len(field_value)
+                            ), True)
+
+                # Business rules (SSN format, birth date range)
+                if 'ssn' in present_columns:
+                    for app_index, record_index, record in rows:
+                        ssn = record.get('ssn')
+                        if ssn and not self._is_valid_ssn(ssn):
+                            report(app_index, ValidationError(
+                                error_type=ValidationType.CONSTRAINT_COMPLIANCE,
+                                severity=ValidationSeverity.ERROR,
+                                message=f"Invalid SSN format: {ssn}",
+                                table_name=table_name,
+                                record_index=record_index,
+                                field_name='ssn',
+                                actual_value=ssn
+                            ), True)
+                if 'birth_date' in present_columns:
+                    for app_index, record_index, record in rows:
+                        birth_date = record.get('birth_date')
+                        if birth_date and not self._is_valid_birth_date(birth_date):
+                            report(app_index, ValidationError(
+                                error_type=ValidationType.CONSTRAINT_COMPLIANCE,
+                                severity=ValidationSeverity.WARNING,
+                                message=f"Suspicious birth date: {birth_date}",
+                                table_name=table_name,
+                                record_index=record_index,
+                                field_name='birth_date',
+                                actual_value=birth_date
+                            ), False)
+
+        except Exception as e:
+            self.logger.error(f"Constraint compliance validation failed: {e}")
+            for app_index, check_result in check_results.items():
+                results[app_index].add_error(ValidationError(
+                    error_type=ValidationType.CONSTRAINT_COMPLIANCE,
+                    severity=ValidationSeverity.ERROR,
+                    message=f"Constraint compliance validation error: {e}"
+                ))
+                check_result.errors_found += 1
+                check_result.passed = False
+
+        for app_index, check_result in check_results.items():
+            results[app_index].add_integrity_check(check_result)
+    
     def _validate_end_to_end_consistency(
         self,
         source_xml_data: Dict[str, Any],
         extracted_tables: Dict[str, List[Dict[str, Any]]],
         mapping_contract: MappingContract,
-        result: ValidationResult
+        result: ValidationResult,
+        field_checks: Optional[List[Tuple[Any, List[str]]]] = None
     ) -> None:
         """Validate consistency between source XML and extracted relational data."""
         check_start = time.time()
@@ -226,7 +500,7 @@ class DataIntegrityValidator:
             
             # Validate field-level data consistency
             self._validate_field_level_consistency(
-                source_xml_data, extracted_tables, mapping_contract, result, check_result
+                source_xml_data, extracted_tables, mapping_contract, result, check_result, field_checks
             )
             
             # Count records checked
@@ -542,16 +816,24 @@ class DataIntegrityValidator:
         extracted_tables: Dict[str, List[Dict[str, Any]]],
         mapping_contract: MappingContract,
         result: ValidationResult,
-        check_result: IntegrityCheckResult
+        check_result: IntegrityCheckResult,
+        field_checks: Optional[List[Tuple[Any, List[str]]]] = None
     ) -> None:
-        """Validate field-level consistency between source XML and extracted data."""
-        # Sample a subset of fields for validation to avoid performance issues
-        sample_mappings = mapping_contract.mappings[:20]  # Validate first 20 mappings
+        """Validate field-level consistency between source XML and extracted data.
+
+        field_checks: (mapping, pre-split xml_path) pairs from ContractRules; computed here when omitted.
+        """
+        if field_checks is None:
+            # Sample a subset of fields for validation to avoid performance issues
+            field_checks = [
+                (mapping, mapping.xml_path.strip('/').split('/'))
+                for mapping in mapping_contract.mappings[:20]  # Validate first 20 mappings
+            ]
         
-        for mapping in sample_mappings:
+        for mapping, path_parts in field_checks:
             try:
                 # Extract value from source XML
-                source_value = self._extract_value_from_xml_path(source_xml_data, mapping.xml_path, mapping.xml_attribute)
+                source_value = self._extract_value_from_path_parts(source_xml_data, path_parts, mapping.xml_attribute)
                 
                 # Find corresponding extracted value
                 if mapping.target_table in extracted_tables:
@@ -741,9 +1023,13 @@ class DataIntegrityValidator:
     # Helper methods
     def _extract_value_from_xml_path(self, xml_data: Dict[str, Any], xml_path: str, xml_attribute: Optional[str] = None) -> Any:
         """Extract value from XML data using XPath-like navigation."""
+        return self._extract_value_from_path_parts(xml_data, xml_path.strip('/').split('/'), xml_attribute)
+
+    def _extract_value_from_path_parts(self, xml_data: Dict[str, Any], path_parts: List[str],
+                                       xml_attribute: Optional[str] = None) -> Any:
+        """Extract value from XML data by walking pre-split path parts."""
         try:
             current_data = xml_data
-            path_parts = xml_path.strip('/').split('/')
             
             for part in path_parts:
                 if isinstance(current_data, dict) and part in current_data:
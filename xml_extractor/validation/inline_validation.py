@@ -0,0 +1,422 @@
+"""
+Sampled inline post-extraction validation for production runs.
+
+Full post-extraction validation (ValidationOrchestrator / DataIntegrityValidator) is too
+expensive to run on every application (see POST_EXTRACTION_VALIDATION_COST_BENEFIT.md), but
+running it on nothing means mapping regressions are only found by later audits. In this mode
+each worker hands a sample of the applications it has just inserted to a validation process:
+
+- a deterministic fraction of app_ids (hash of app_id, so a rerun samples the same apps), and
+- optionally every app whose mapping produced data quality warnings
+
+The hot path only decides and enqueues the app's XML string and mapped rows on a bounded
+multiprocessing queue shared by all workers (pickling happens on the queue's feeder thread).
+InlineValidationService owns that queue and a small pool of validation processes (one by
+default), which re-parse the XML into the nested source structure the validator expects and
+run ValidationOrchestrator with their own GIL. When validation falls behind, samples are
+dropped and counted rather than slowing inserts.
+
+Findings go back to the coordinator on a result queue; it folds them into an
+InlineValidationAggregate and production_processor streams each one to the results JSONL as a
+'validation' line. Worker submit/drop counters ride back on WorkResults (like memory reports).
+At shutdown the workers exit first (flushing their queued samples), then close() drains the
+validation processes; samples still unvalidated after its timeout are counted as
+'dropped_at_shutdown'.
+"""
+
+import logging
+import multiprocessing as mp
+import os
+import queue
+import time
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Union
+
+from ..models import MappingContract
+from ..monitoring.latency_histogram import StageHistograms
+from ..parsing.xml_parser import XMLParser
+from .validation_integration import ValidationOrchestrator
+from .validation_models import ValidationConfig, ValidationSeverity
+
+
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_VALIDATION_PROCESSES = 1
+
+# Seconds close() waits for the validation processes to finish the queued samples
+DEFAULT_DRAIN_TIMEOUT_SECONDS = 30.0
+
+# Issues carried per finding (counts cover all of them)
+MAX_ISSUES_PER_FINDING = 5
+
+# Failed app_ids and issue keys kept in the run summary
+FAILED_ID_SAMPLE_SIZE = 20
+TOP_ISSUE_KEYS = 20
+
+# Tables written for bookkeeping rather than mapped from the XML
+_UNVALIDATED_TABLES = ('processing_log',)
+
+_HASH_MULTIPLIER = 2654435761  # Knuth multiplicative hash; spreads consecutive app_ids evenly
+_HASH_SPACE = 1 << 32
+
+
+def sample_fraction(app_id: int) -> float:
+    """Stable position of an app_id in [0, 1); apps below the sample rate are validated."""
+    return ((int(app_id) * _HASH_MULTIPLIER) % _HASH_SPACE) / _HASH_SPACE
+
+
+def element_to_source_data(element) -> Dict[str, Any]:
+    """
+    Nested dict of an XML tree, in the shape DataIntegrityValidator walks:
+    {'Provenir': {'Request': {'ID': '1', 'CustData': {...}}}}.
+
+    Attributes become keys; a repeated child tag becomes a list of dicts.
+    """
+    def convert(node) -> Dict[str, Any]:
+        data: Dict[str, Any] = dict(node.attrib)
+        for child in node:
+            tag = child.tag
+            if not isinstance(tag, str):
+                continue  # Comments / processing instructions
+            value = convert(child)
+            existing = data.get(tag)
+            if existing is None:
+                data[tag] = value
+            elif isinstance(existing, list):
+                existing.append(value)
+            else:
+                data[tag] = [existing, value]
+        return data
+
+    if element is None:
+        return {}
+    return {element.tag: convert(element)}
+
+
+class InlineValidationSampler:
+    """
+    Worker-side sampling and non-blocking submit to the shared validation queue.
+
+    Usage (inside a worker; the queue comes from InlineValidationService.tasks):
+        sampler = InlineValidationSampler(tasks, sample_rate=0.01, include_quality_warnings=True)
+        reasons = sampler.sample_reasons(app_id, quality_issues)
+        if reasons:
+            sampler.submit(app_id, xml_content, mapped_data, reasons)   # never blocks
+        report = sampler.report()   # None unless something changed since the last report
+    """
+
+    def __init__(self, tasks, sample_rate: float = 0.0, include_quality_warnings: bool = False):
+        self.tasks = tasks
+        self.sample_rate = max(0.0, min(1.0, sample_rate or 0.0))
+        self.include_quality_warnings = include_quality_warnings
+        self.submitted = 0
+        self.dropped = 0
+        self.submit_seconds = 0.0
+        self._changed = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or self.include_quality_warnings
+
+    def sample_reasons(self, app_id: int, quality_issues: Optional[List[str]] = None) -> List[str]:
+        """Why this app should be validated (empty list = not sampled)."""
+        reasons = []
+        if self.sample_rate > 0 and sample_fraction(app_id) < self.sample_rate:
+            reasons.append('sampled')
+        if self.include_quality_warnings and quality_issues:
+            reasons.append('quality_warnings')
+        return reasons
+
+    def submit(self, app_id: int, xml_content: str, mapped_data: Dict[str, List[Dict[str, Any]]],
+               reasons: List[str]) -> bool:
+        """Queue an inserted app for validation; returns False (and counts a drop) when the queue is full."""
+        start = time.perf_counter()
+        tables = {table: rows for table, rows in mapped_data.items() if table not in _UNVALIDATED_TABLES}
+        try:
+            # Wall clock: the queue wait is measured in another process
+            self.tasks.put_nowait((app_id, xml_content, tables, reasons, time.time()))
+            self.submitted += 1
+            accepted = True
+        except queue.Full:
+            self.dropped += 1
+            accepted = False
+        self._changed = True
+        self.submit_seconds += time.perf_counter() - start
+        return accepted
+
+    def report(self) -> Optional[Dict[str, Any]]:
+        """Cumulative submit/drop counters, or None if nothing changed since the last call."""
+        if not self._changed:
+            return None
+        self._changed = False
+        return {
+            'pid': os.getpid(),
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'submit_seconds': self.submit_seconds
+        }
+
+
+class InlineValidator:
+    """Validates one sampled app and returns its finding (the validation process's unit of work)."""
+
+    def __init__(self, mapping_contract: MappingContract, config: Optional[ValidationConfig] = None):
+        self.mapping_contract = mapping_contract
+        self.orchestrator = ValidationOrchestrator(config=config, keep_history=False)
+        self._parser = XMLParser()
+
+    def validate(self, app_id: int, xml_content: str, tables: Dict[str, List[Dict[str, Any]]],
+                 reasons: List[str], queue_wait_seconds: float = 0.0) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            source_data = element_to_source_data(self._parser.parse_xml_stream(xml_content))
+        except Exception as e:
+            source_data = {}
+            logging.getLogger(__name__).debug(f"Inline validation could not re-parse app_id {app_id}: {e}")
+        result = self.orchestrator.validate_complete_extraction(
+            source_xml_data=source_data,
+            extracted_tables=tables,
+            mapping_contract=self.mapping_contract,
+            source_record_id=str(app_id)
+        )
+        return {
+            'app_id': app_id,
+            'reasons': reasons,
+            'passed': result.validation_passed,
+            'errors': result.total_errors,
+            'warnings': result.total_warnings,
+            'critical': len(result.critical_errors),
+            'records_validated': result.total_records_validated,
+            'queue_wait_ms': round(queue_wait_seconds * 1000, 3),
+            'validation_ms': round((time.perf_counter() - start) * 1000, 3),
+            'issues': [
+                {
+                    'type': error.error_type.value,
+                    'severity': error.severity.value,
+                    'table': error.table_name,
+                    'field': error.field_name,
+                    'message': error.message
+                }
+                for error in _most_severe(result.errors)[:MAX_ISSUES_PER_FINDING]
+            ]
+        }
+
+    def validate_task(self, task: tuple) -> Dict[str, Any]:
+        """Finding for one queued (app_id, xml, tables, reasons, queued_at); validator errors become a failed finding."""
+        app_id, xml_content, tables, reasons, queued_at = task
+        try:
+            return self.validate(app_id, xml_content, tables, reasons, max(0.0, time.time() - queued_at))
+        except Exception as e:
+            return {'app_id': app_id, 'reasons': reasons, 'passed': False, 'errors': 1, 'warnings': 0,
+                    'critical': 1, 'records_validated': 0, 'queue_wait_ms': 0.0, 'validation_ms': 0.0,
+                    'issues': [{'type': 'validator', 'severity': 'critical', 'table': None, 'field': None,
+                                'message': f"Inline validation failed: {e}"}]}
+
+
+def _validation_process_main(tasks, results, mapping_contract: Union[MappingContract, str],
+                             config: Optional[ValidationConfig]):
+    """Validation process loop: validate queued samples until the None sentinel."""
+    if isinstance(mapping_contract, str):
+        from ..config.config_manager import get_config_manager
+        mapping_contract = get_config_manager().load_mapping_contract(contract_path=mapping_contract)
+    validator = InlineValidator(mapping_contract, config)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        results.put(validator.validate_task(task))
+
+
+class InlineValidationService:
+    """
+    Coordinator-side bounded sample queue and validation process pool.
+
+    Usage (in the coordinator, before the workers start):
+        service = InlineValidationService(contract_path).start()
+        ...workers get service.tasks and submit through InlineValidationSampler...
+        findings = service.collect()              # non-blocking, any time
+        findings = service.close()                # at shutdown, after the workers exited
+        service.abandoned                         # samples never validated
+    """
+
+    def __init__(self, mapping_contract: Union[MappingContract, str], queue_size: int = DEFAULT_QUEUE_SIZE,
+                 processes: int = DEFAULT_VALIDATION_PROCESSES, config: Optional[ValidationConfig] = None):
+        """
+        Args:
+            mapping_contract: MappingContract, or a contract path loaded in each validation process
+            queue_size: Samples queued (across all workers) before further samples are dropped
+            processes: Validation processes
+            config: ValidationConfig for ValidationOrchestrator
+        """
+        self.logger = logging.getLogger(__name__)
+        self.mapping_contract = mapping_contract
+        self.num_processes = max(1, processes)
+        self.config = config
+        self.tasks = mp.Queue(maxsize=max(1, queue_size))
+        self._results = mp.Queue()
+        self._processes: List[Any] = []
+        self.abandoned = 0
+        self.closed = False
+
+    def start(self) -> 'InlineValidationService':
+        if not self._processes and not self.closed:
+            for index in range(self.num_processes):
+                process = mp.Process(target=_validation_process_main, name=f'inline-validation-{index}',
+                                     args=(self.tasks, self._results, self.mapping_contract, self.config),
+                                     daemon=True)
+                process.start()
+                self._processes.append(process)
+        return self
+
+    @property
+    def pids(self) -> List[int]:
+        return [process.pid for process in self._processes]
+
+    def collect(self, wait_seconds: float = 0.0) -> List[Dict[str, Any]]:
+        """Findings completed so far (waits up to wait_seconds for the first one)."""
+        findings = []
+        try:
+            findings.append(self._results.get(timeout=wait_seconds) if wait_seconds > 0 else self._results.get_nowait())
+            while True:
+                findings.append(self._results.get_nowait())
+        except (queue.Empty, OSError, ValueError):
+            pass
+        return findings
+
+    def close(self, timeout: float = DEFAULT_DRAIN_TIMEOUT_SECONDS) -> List[Dict[str, Any]]:
+        """
+        Let the validation processes finish the queued samples (up to timeout seconds) and stop them.
+
+        Returns the findings not yet collected; samples left unvalidated are counted in self.abandoned.
+        Call after the workers have exited so their queued samples are already on the queue.
+        """
+        if self.closed:
+            return []
+        self.closed = True
+        findings: List[Dict[str, Any]] = []
+        deadline = time.time() + max(0.0, timeout)
+        for process in self._processes:
+            # Behind the queued samples; when the queue stays full the process is terminated below
+            while process.is_alive():
+                try:
+                    self.tasks.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    findings.extend(self.collect())
+                    if time.time() >= deadline:
+                        break
+        while any(process.is_alive() for process in self._processes) and time.time() < deadline:
+            findings.extend(self.collect(wait_seconds=0.1))
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+            process.join(1)
+        findings.extend(self.collect(wait_seconds=0.1))
+
+        while True:
+            try:
+                task = self.tasks.get(timeout=0.1)
+            except (queue.Empty, OSError, ValueError):
+                break
+            if task is not None:
+                self.abandoned += 1
+        if self.abandoned:
+            self.logger.warning(f"Inline validation: {self.abandoned} queued samples not validated before shutdown")
+        for q in (self.tasks, self._results):
+            q.close()
+            q.cancel_join_thread()
+        return findings
+
+
+_SEVERITY_ORDER = {ValidationSeverity.CRITICAL: 0, ValidationSeverity.ERROR: 1,
+                   ValidationSeverity.WARNING: 2, ValidationSeverity.INFO: 3}
+
+
+def _most_severe(errors) -> list:
+    return sorted(errors, key=lambda error: _SEVERITY_ORDER.get(error.severity, 4))
+
+
+class InlineValidationAggregate:
+    """Coordinator-side merge of worker counters and validation findings: totals, overhead and drops."""
+
+    def __init__(self):
+        self.workers: Dict[int, Dict[str, Any]] = {}
+        self.dropped_at_shutdown = 0
+        self.apps_validated = 0
+        self.passed = 0
+        self.failed = 0
+        self.errors = 0
+        self.warnings = 0
+        self.critical = 0
+        self.by_reason: Counter = Counter()
+        self.issue_counts: Counter = Counter()
+        self.failed_app_ids_sample: List[Any] = []
+        self.latency = StageHistograms()
+
+    def merge(self, report: Optional[Dict[str, Any]]):
+        """Keep a worker's latest submit/drop counters (from InlineValidationSampler.report)."""
+        if report is not None:
+            self.workers[report['pid']] = dict(report)
+
+    def record_shutdown(self, abandoned: int):
+        """Count samples the validation processes never got to (InlineValidationService.abandoned)."""
+        self.dropped_at_shutdown += abandoned
+
+    def add_findings(self, findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fold findings from the validation processes in; returns them (for streaming)."""
+        for finding in findings:
+            self.apps_validated += 1
+            self.errors += finding['errors']
+            self.warnings += finding['warnings']
+            self.critical += finding['critical']
+            self.by_reason.update(finding['reasons'])
+            if finding['passed']:
+                self.passed += 1
+            else:
+                self.failed += 1
+                if len(self.failed_app_ids_sample) < FAILED_ID_SAMPLE_SIZE:
+                    self.failed_app_ids_sample.append(finding['app_id'])
+            for issue in finding['issues']:
+                location = '.'.join(part for part in (issue['table'], issue['field']) if part)
+                self.issue_counts[f"{issue['severity']} {issue['type']} {location}".rstrip()] += 1
+            self.latency.record('queue_wait', finding['queue_wait_ms'] / 1000)
+            self.latency.record('validate', finding['validation_ms'] / 1000)
+        return findings
+
+    def __bool__(self) -> bool:
+        return bool(self.workers) or self.apps_validated > 0
+
+    def summary(self) -> Dict[str, Any]:
+        submitted = sum(worker['submitted'] for worker in self.workers.values())
+        submit_seconds = sum(worker['submit_seconds'] for worker in self.workers.values())
+        attempts = submitted + sum(worker['dropped'] for worker in self.workers.values())
+        return {
+            'apps_validated': self.apps_validated,
+            'passed': self.passed,
+            'failed': self.failed,
+            'errors': self.errors,
+            'warnings': self.warnings,
+            'critical': self.critical,
+            'by_reason': dict(self.by_reason),
+            'failed_app_ids_sample': list(self.failed_app_ids_sample),
+            'top_issues': dict(self.issue_counts.most_common(TOP_ISSUE_KEYS)),
+            'submitted': submitted,
+            'dropped': sum(worker['dropped'] for worker in self.workers.values()),
+            'dropped_at_shutdown': self.dropped_at_shutdown,
+            # Submitted but neither validated nor counted at shutdown (lost with a worker or validation process)
+            'pending': max(0, submitted - self.apps_validated - self.dropped_at_shutdown),
+            'hot_path': {
+                'total_seconds': round(submit_seconds, 6),
+                'mean_submit_ms': round(submit_seconds / attempts * 1000, 4) if attempts else 0.0
+            },
+            'off_path_latency': self.latency.summary(),
+            'workers_reporting': len(self.workers)
+        }
+
+    def format_summary(self) -> str:
+        summary = self.summary()
+        return (f"  validated {summary['apps_validated']} (passed {summary['passed']}, failed {summary['failed']}), "
+                f"{summary['errors']} errors / {summary['warnings']} warnings; "
+                f"dropped {summary['dropped']} (+{summary['dropped_at_shutdown']} at shutdown), "
+                f"pending {summary['pending']}; "
+                f"hot-path {summary['hot_path']['mean_submit_ms']:.4f} ms per sampled app")
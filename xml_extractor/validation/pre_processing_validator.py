@@ -16,7 +16,8 @@ Integration Points:
 - Called by CLI tools and batch processors before initiating extraction
 - Used by ValidationOrchestrator for comprehensive validation workflows
 - Provides ValidationResult with detailed error/warning categorization
-- Supports both individual file and batch validation scenarios
+- Supports both individual file and batch validation scenarios (batches can fan out over a
+  process pool in chunks, with results streamed back in input order)
 
 The framework implements a "fail fast with detailed feedback" approach, catching
 issues early to prevent wasted processing time and providing actionable error messages
@@ -25,15 +26,24 @@ for data quality improvement.
 
 import logging
 
-from typing import Dict, List, Any, Optional, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
 from dataclasses import dataclass
 
 from ..parsing.xml_parser import XMLParser
+from ..parsing.compact_elements import CompactElements
+from .xml_prescan import DEFAULT_MAX_SCAN_CHARS, prescan_xml
 from ..mapping.data_mapper import DataMapper
 from ..models import MappingContract
 from ..config.config_manager import get_config_manager
 
 
+# Records per task sent to a batch worker process (amortizes pickling/IPC per record)
+DEFAULT_BATCH_CHUNK_SIZE = 50
+
+
 @dataclass
 class ValidationResult:
     """Result of pre-processing validation."""
@@ -86,17 +96,24 @@ class PreProcessingValidator:
     - Enables early rejection of invalid data to optimize processing efficiency
     """
     
-    def __init__(self, mapping_contract: Optional[MappingContract] = None, mapping_contract_path: Optional[str] = None):
+    def __init__(self, mapping_contract: Optional[MappingContract] = None, mapping_contract_path: Optional[str] = None,
+                 enable_prescan: bool = True, prescan_max_chars: int = DEFAULT_MAX_SCAN_CHARS):
         """
         Initialize validator with optional mapping contract.
         
         Args:
             mapping_contract: Optional pre-loaded mapping contract object
             mapping_contract_path: Optional path to mapping contract file (for lazy loading)
+            enable_prescan: Reject wrong-product-line / missing-ID rows with a raw-content scan
+                before lxml is invoked (rows that pass still get full validation)
+            prescan_max_chars: Bound on how much of each document the pre-scan examines
         """
         self.logger = logging.getLogger(__name__)
-        self.parser = XMLParser()
+        self.parser = XMLParser(config=get_config_manager().get_processing_config())
         self.mapping_contract_path = mapping_contract_path
+        self.enable_prescan = enable_prescan
+        self.prescan_max_chars = prescan_max_chars
+        self.prescan_rejections = 0
         
         # Load contract immediately if path provided but no contract object
         if not mapping_contract and mapping_contract_path:
@@ -143,6 +160,13 @@ class PreProcessingValidator:
         }
         
         try:
+            # Step 0: Raw-content pre-scan - reject misrouted rows before lxml is invoked at all
+            # (Step 1's well-formedness check is already a full parse)
+            if self.enable_prescan:
+                prescan_result = self._prescan_for_rejection(xml_content, source_record_id, skipped_elements)
+                if prescan_result is not None:
+                    return prescan_result
+            
             # Step 1: Basic XML structure validation
             if not self._validate_basic_xml_structure(xml_content):
                 return ValidationResult(
@@ -158,7 +182,7 @@ class PreProcessingValidator:
             try:
                 cleaned_content = self._clean_xml_content(xml_content)
                 root = self.parser.parse_xml_stream(cleaned_content)
-                elements = self.parser.extract_elements(root)
+                elements = self.parser.extract_elements_compact(root)
                 
                 # Store the parsed root for contact extraction
                 self._current_xml_root = root
@@ -280,6 +304,32 @@ class PreProcessingValidator:
                 skipped_elements=skipped_elements
             )
     
+    def _prescan_for_rejection(self, xml_content: str, source_record_id: Optional[str],
+                               skipped_elements: Dict[str, List[str]]) -> Optional[ValidationResult]:
+        """
+        Run the bounded raw-content scan and build a failed result if it is conclusive.
+        
+        Returns:
+            ValidationResult for a definitively invalid row, or None to continue with full validation
+        """
+        expected_app_element = getattr(self.mapping_contract, 'source_application_table', None) if self.mapping_contract else None
+        scan = prescan_xml(xml_content, self.prescan_max_chars)
+        errors = scan.rejection_errors(expected_app_element)
+        if not errors:
+            return None
+        
+        self.prescan_rejections += 1
+        app_id = scan.app_id
+        self._log_validation_summary(source_record_id, False, app_id, [], errors, [], skipped_elements)
+        return ValidationResult(
+            is_valid=False,
+            app_id=app_id,
+            valid_contacts=[],
+            validation_errors=errors,
+            validation_warnings=[],
+            skipped_elements=skipped_elements
+        )
+    
     def _validate_basic_xml_structure(self, xml_content: str) -> bool:
         """Validate basic XML structure and Provenir format."""
         try:
@@ -666,41 +716,56 @@ class PreProcessingValidator:
         return self.parser._clean_xml_content(xml_content)
     
     def _convert_elements_to_data_structure(self, elements: Dict[str, Any]) -> Dict[str, Any]:
-        """Convert parsed elements to nested data structure."""
+        """
+        Convert parsed elements to nested data structure.
+        
+        Accepts either the compact records from XMLParser.extract_elements_compact() (read
+        directly, no per-element dicts) or the legacy flattened dict from extract_elements().
+        """
         result = {}
         
+        if isinstance(elements, CompactElements):
+            for record in elements.iter_records():
+                node = self._get_nested_node(result, elements.path_of(record))
+                node.update(elements.attributes_of(record))
+                if record.text:
+                    node['_text'] = record.text
+            return result
+        
         for path, element_data in elements.items():
             if not isinstance(element_data, dict):
                 continue
             
-            path_parts = path.strip('/').split('/')
-            current = result
-            
-            # Navigate/create nested structure
-            for i, part in enumerate(path_parts):
-                if i == len(path_parts) - 1:
-                    # Last part - store element data
-                    if part not in current:
-                        current[part] = {}
-                    elif not isinstance(current[part], dict):
-                        # If it's not a dict (e.g., a string), convert it to dict
-                        current[part] = {}
-                    
-                    # Merge attributes
-                    if 'attributes' in element_data:
-                        current[part].update(element_data['attributes'])
-                    
-                    # Add text content
-                    if 'text' in element_data and element_data['text']:
-                        current[part]['_text'] = element_data['text']
-                else:
-                    # Intermediate part
-                    if part not in current:
-                        current[part] = {}
-                    current = current[part]
+            node = self._get_nested_node(result, path)
+            
+            # Merge attributes
+            if 'attributes' in element_data:
+                node.update(element_data['attributes'])
+            
+            # Add text content
+            if 'text' in element_data and element_data['text']:
+                node['_text'] = element_data['text']
         
         return result
     
+    def _get_nested_node(self, result: Dict[str, Any], path: str) -> Dict[str, Any]:
+        """Navigate/create the nested dict for a flattened path, returning the leaf node."""
+        path_parts = path.strip('/').split('/')
+        current = result
+        
+        for part in path_parts[:-1]:
+            # Intermediate part
+            if part not in current:
+                current[part] = {}
+            current = current[part]
+        
+        # Last part - element data is stored here
+        last = path_parts[-1]
+        if last not in current or not isinstance(current[last], dict):
+            # If it's not a dict (e.g., a string), convert it to dict
+            current[last] = {}
+        return current[last]
+    
     def _log_validation_summary(self, source_record_id: Optional[str], 
                               is_valid: bool, app_id: Optional[str],
                               valid_contacts: List[Dict[str, Any]], 
@@ -737,19 +802,57 @@ class PreProcessingValidator:
         #         if items:
         #             self.logger.debug(f"    {element_type}: {len(items)} skipped")
     
-    def validate_batch(self, xml_records: List[Tuple[str, str]]) -> Dict[str, Any]:
+    def iter_batch(self, xml_records: Iterable[Tuple[str, str]], workers: int = 1,
+                   chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE) -> Iterator[Tuple[str, ValidationResult]]:
+        """
+        Validate records and yield (record_id, ValidationResult) in input order as they complete.
+        
+        With workers > 1, records are read lazily in chunks of chunk_size and validated in a
+        process pool; each worker builds one validator (same contract and pre-scan settings)
+        and reuses it for every chunk. At most workers + 1 chunks are held at a time, so
+        xml_records can be a cursor or generator over a large staging table.
+        
+        Args:
+            xml_records: Iterable of (record_id, xml_content) tuples
+            workers: Worker processes (1 = validate in this process)
+            chunk_size: Records per worker task
+        """
+        if workers is None or workers <= 1:
+            for record_id, xml_content in xml_records:
+                yield record_id, self.validate_xml_for_processing(xml_content, record_id)
+            return
+        
+        records = iter(xml_records)
+        initargs = (self.mapping_contract, self.mapping_contract_path, self.enable_prescan, self.prescan_max_chars)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=initargs) as pool:
+            pending = deque()
+            while True:
+                chunk = list(islice(records, max(1, chunk_size)))
+                if chunk:
+                    pending.append(pool.submit(_validate_batch_chunk, chunk))
+                if pending and (not chunk or len(pending) > workers):
+                    yield from pending.popleft().result()
+                elif not chunk:
+                    break
+    
+    def validate_batch(self, xml_records: Iterable[Tuple[str, str]], workers: int = 1,
+                       chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE, keep_results: bool = True) -> Dict[str, Any]:
         """
         Validate a batch of XML records.
         
         Args:
-            xml_records: List of (record_id, xml_content) tuples
+            xml_records: Iterable of (record_id, xml_content) tuples
+            workers: Worker processes for iter_batch (1 = serial, os.cpu_count() for all cores)
+            chunk_size: Records per worker task
+            keep_results: Collect per-record results; pass False for summary-only pre-flight checks
+                          of large tables (use iter_batch to consume results as they arrive)
             
         Returns:
             Dictionary with validation summary and results
         """
         results = []
         summary = {
-            'total_records': len(xml_records),
+            'total_records': 0,
             'valid_records': 0,
             'invalid_records': 0,
             'records_with_warnings': 0,
@@ -758,10 +861,11 @@ class PreProcessingValidator:
             'total_skipped_elements': 0
         }
         
-        for record_id, xml_content in xml_records:
-            result = self.validate_xml_for_processing(xml_content, record_id)
-            results.append((record_id, result))
+        for record_id, result in self.iter_batch(xml_records, workers=workers, chunk_size=chunk_size):
+            if keep_results:
+                results.append((record_id, result))
             
+            summary['total_records'] += 1
             if result.is_valid:
                 summary['valid_records'] += 1
             else:
@@ -777,10 +881,11 @@ class PreProcessingValidator:
             )
         
         # Log batch summary
-        self.logger.debug(
-            f"Batch validation complete: {summary['valid_records']}/{summary['total_records']} "
-            f"valid ({summary['valid_records']/summary['total_records']*100:.1f}%)"
-        )
+        if summary['total_records']:
+            self.logger.debug(
+                f"Batch validation complete: {summary['valid_records']}/{summary['total_records']} "
+                f"valid ({summary['valid_records']/summary['total_records']*100:.1f}%)"
+            )
         
         return {
             'summary': summary,
@@ -788,6 +893,24 @@ class PreProcessingValidator:
         }
 
 
+# Per-process validator for iter_batch workers (built once by _init_batch_worker)
+_batch_validator: Optional[PreProcessingValidator] = None
+
+
+def _init_batch_worker(mapping_contract: Optional[MappingContract], mapping_contract_path: Optional[str],
+                       enable_prescan: bool, prescan_max_chars: int):
+    global _batch_validator
+    _batch_validator = PreProcessingValidator(mapping_contract=mapping_contract,
+                                              mapping_contract_path=mapping_contract_path,
+                                              enable_prescan=enable_prescan,
+                                              prescan_max_chars=prescan_max_chars)
+
+
+def _validate_batch_chunk(chunk: List[Tuple[str, str]]) -> List[Tuple[str, ValidationResult]]:
+    return [(record_id, _batch_validator.validate_xml_for_processing(xml_content, record_id))
+            for record_id, xml_content in chunk]
+
+
 def create_sample_validation_scenarios() -> List[Tuple[str, str]]:
     """Create sample XML scenarios for testing validation using real sample data."""
     
@@ -56,11 +56,21 @@ class ValidationOrchestrator:
     
     def __init__(self, 
                  validator: Optional[DataIntegrityValidator] = None,
-                 config: Optional[ValidationConfig] = None):
-        """Initialize the validation orchestrator."""
+                 config: Optional[ValidationConfig] = None,
+                 keep_history: bool = True):
+        """
+        Initialize the validation orchestrator.
+        
+        Args:
+            validator: Validator to run (a DataIntegrityValidator with config by default)
+            config: Validation configuration
+            keep_history: Keep every result for get_validation_statistics(); long-running
+                          callers that consume results themselves (inline validation) turn it off
+        """
         self.logger = logging.getLogger(__name__)
         self.validator = validator or DataIntegrityValidator(config)
         self.config = config or ValidationConfig()
+        self.keep_history = keep_history
         self._validation_history = []
         
     def validate_complete_extraction(self,
@@ -92,7 +102,8 @@ class ValidationOrchestrator:
             )
             
             # Store validation history
-            self._validation_history.append(validation_result)
+            if self.keep_history:
+                self._validation_history.append(validation_result)
             
             # Log validation summary
             self._log_validation_summary(validation_result)
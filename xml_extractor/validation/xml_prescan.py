@@ -0,0 +1,157 @@
+"""
+Pre-parse scan of raw XML for product-line and shape rejection.
+
+PreProcessingValidator otherwise has to fully parse and flatten a document before it can
+discover a wrong product line (application vs IL_application) or a missing Request/@ID.
+Misrouted staging rows burn a whole parse for nothing. This scan looks at a bounded prefix
+of the raw content with a handful of regex searches and reports only *definitive* failures;
+anything ambiguous (truncated window, entity-encoded IDs, unusual markup) is left to the
+full lxml validation.
+"""
+
+import re
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
+
+
+# CustData is ~35KB even on the largest samples; Reports/Journals follow it
+DEFAULT_MAX_SCAN_CHARS = 262144
+
+APPLICATION_ELEMENTS = ('application', 'IL_application')
+
+_NS = r'(?:[\w.-]+:)?'
+_ATTRS = r'''((?:[^>"']|"[^"]*"|'[^']*')*)'''
+_REQUEST_TAG = re.compile(r'<' + _NS + r'Request(?=[\s/>])' + _ATTRS + r'>')
+_REQUEST_ID_ATTR = re.compile(r'''(?:^|\s)''' + _NS + r'''(?:ID|id)\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+_CUSTDATA_OPEN = re.compile(r'<' + _NS + r'CustData(?=[\s/>])' + _ATTRS + r'>')
+_CUSTDATA_CLOSE = re.compile(r'</' + _NS + r'CustData\s*>')
+_APP_ELEMENT_TAG = re.compile(r'<' + _NS + r'(' + '|'.join(APPLICATION_ELEMENTS) + r')(?=[\s/>])')
+
+
+@dataclass
+class PreScanResult:
+    """Findings of a bounded raw-content scan (None/False means 'not established', not 'absent')."""
+    request_found: bool = False
+    request_id: Optional[str] = None
+    request_id_present: bool = False
+    custdata_complete: bool = False
+    app_elements: Tuple[str, ...] = field(default_factory=tuple)
+    truncated: bool = False
+
+    @property
+    def product_line_element(self) -> Optional[str]:
+        """Application element found under CustData when exactly one kind is present."""
+        if self.custdata_complete and len(self.app_elements) == 1:
+            return self.app_elements[0]
+        return None
+
+    def rejection_errors(self, expected_app_element: Optional[str] = None) -> List[str]:
+        """
+        Errors that the full validation would certainly also raise.
+
+        Messages match PreProcessingValidator so downstream failure summaries group them
+        together regardless of which stage rejected the row.
+
+        Args:
+            expected_app_element: Contract's source_application_table, if known
+
+        Returns:
+            List of error messages; empty means the row must go through full validation
+        """
+        errors = []
+
+        if self.request_found:
+            if not self.request_id_present:
+                errors.append("CRITICAL: Missing app_id (/Provenir/Request/@ID)")
+            elif self.request_id is not None:
+                app_id_str = self.request_id.strip()
+                if not app_id_str:
+                    # Blank attribute values are dropped during attribute processing
+                    errors.append("CRITICAL: Missing app_id (/Provenir/Request/@ID)")
+                else:
+                    try:
+                        if int(app_id_str) <= 0:
+                            errors.append(f"CRITICAL: Invalid app_id value: {app_id_str} (must be positive integer)")
+                    except ValueError:
+                        errors.append(f"CRITICAL: Invalid app_id format: {app_id_str} (must be integer)")
+
+        if expected_app_element and self.custdata_complete and expected_app_element not in self.app_elements:
+            opposite_elements = [e for e in self.app_elements if e != expected_app_element]
+            if opposite_elements:
+                opposite_element = opposite_elements[0]
+                product_line_name = "Credit Card" if opposite_element == 'application' else "Rec Lending"
+                errors.append(f"Wrong product line: Found {product_line_name} XML (/{opposite_element}) but contract expects '{expected_app_element}'. This XML is not compatible with the current contract.")
+            else:
+                errors.append(f"Missing required application element: /Provenir/Request/CustData/{expected_app_element}. Contract expects '{expected_app_element}' for this product line.")
+
+        return errors
+
+    @property
+    def app_id(self) -> Optional[str]:
+        """Request ID when it is a valid positive integer, otherwise None."""
+        if self.request_id is None:
+            return None
+        app_id_str = self.request_id.strip()
+        try:
+            return app_id_str if int(app_id_str) > 0 else None
+        except ValueError:
+            return None
+
+
+def prescan_xml(xml_content: Union[str, bytes], max_scan_chars: int = DEFAULT_MAX_SCAN_CHARS) -> PreScanResult:
+    """
+    Scan the start of a document for Request/@ID and the CustData application element.
+
+    Args:
+        xml_content: Raw XML as str or UTF-8 bytes
+        max_scan_chars: Upper bound on how much of the document is examined
+
+    Returns:
+        PreScanResult describing what could be established within the window
+    """
+    result = PreScanResult()
+    if not xml_content:
+        return result
+
+    window = xml_content[:max_scan_chars]
+    if isinstance(window, bytes):
+        window = window.decode('utf-8', errors='replace')
+    result.truncated = len(xml_content) > max_scan_chars
+
+    request_match = _REQUEST_TAG.search(window)
+    if request_match is None:
+        return result
+    result.request_found = True
+
+    id_matches = _REQUEST_ID_ATTR.findall(request_match.group(1))
+    if id_matches:
+        result.request_id_present = True
+        if len(id_matches) == 1:
+            id_value = id_matches[0][0] or id_matches[0][1]
+            # Entity-encoded values need the real parser to decode; leave them undetermined
+            result.request_id = id_value if '&' not in id_value else None
+
+    if request_match.group(1).rstrip().endswith('/'):
+        return result  # <Request .../> has no CustData
+
+    custdata_match = _CUSTDATA_OPEN.search(window, request_match.end())
+    if custdata_match is None:
+        return result
+
+    if custdata_match.group(1).rstrip().endswith('/'):
+        result.custdata_complete = True  # Empty <CustData/>
+        return result
+
+    close_match = _CUSTDATA_CLOSE.search(window, custdata_match.end())
+    if close_match is None:
+        return result
+    result.custdata_complete = True
+
+    found = []
+    for tag_match in _APP_ELEMENT_TAG.finditer(window, custdata_match.end(), close_match.start()):
+        element = tag_match.group(1)
+        if element not in found:
+            found.append(element)
+    result.app_elements = tuple(found)
+    return result